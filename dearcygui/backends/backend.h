@@ -33,6 +33,9 @@ public:
 	// makeUploadContextCurrent must be called before any texture
 	// operations are performed, and releaseUploadContext must be
 	// called after the texture operations are done.
+	// filtering_mode: 0 bilinear, 1 nearest, 2 font (single channel
+	// displayed as 111A, bilinear), 3 signed distance field font
+	// (same as 2, but rendered with the distance field shader).
     virtual void* allocateTexture(unsigned width, unsigned height, unsigned num_chans, 
                                 unsigned dynamic, unsigned type, unsigned filtering_mode) = 0;
     virtual void freeTexture(void* texture) = 0;
@@ -42,6 +45,23 @@ public:
     virtual bool updateStaticTexture(void* texture, unsigned width, unsigned height,
                                    unsigned num_chans, unsigned type, void* data, 
                                    unsigned src_stride) = 0;
+    // Updates the (x, y, width, height) sub-rectangle of an
+    // already uploaded texture. The texture format is unchanged.
+    virtual bool updateTextureRegion(void* texture, unsigned x, unsigned y,
+                                   unsigned width, unsigned height,
+                                   unsigned num_chans, unsigned type, void* data,
+                                   unsigned src_stride) = 0;
+    // Renders the content of draw_list (an ImDrawList) into an
+    // RGBA8 texture of size (width, height) during the next frame
+    // rendering, before the viewport content is rendered.
+    // (x, y) is the position of the top left of the texture
+    // in the coordinate space of the draw list. The texture
+    // size is in framebuffer pixels (see DisplayFramebufferScale).
+    // The content is rendered with premultiplied colors, and
+    // composited as such when the texture is drawn.
+    // The draw list is copied and can be reused after the call.
+    virtual bool queueTextureRendering(void* texture, unsigned width, unsigned height,
+                                       float x, float y, void* draw_list) = 0;
     virtual bool downloadBackBuffer(void* data, int size) = 0;
 
 	// Window state
@@ -123,6 +143,12 @@ public:
     virtual bool updateStaticTexture(void* texture, unsigned width, unsigned height,
                                      unsigned num_chans, unsigned type, void* data, 
                                      unsigned src_stride) override;
+    virtual bool updateTextureRegion(void* texture, unsigned x, unsigned y,
+                                     unsigned width, unsigned height,
+                                     unsigned num_chans, unsigned type, void* data,
+                                     unsigned src_stride) override;
+    virtual bool queueTextureRendering(void* texture, unsigned width, unsigned height,
+                                       float x, float y, void* draw_list) override;
     virtual bool downloadBackBuffer(void* data, int size) override;
 
     static SDLViewport* create(render_fun render,
@@ -142,5 +168,18 @@ private:
     bool hasSDL3Init = false;
     bool hasResized = false;
 
+    struct pendingTextureRendering {
+        void* texture;
+        unsigned width;
+        unsigned height;
+        float x;
+        float y;
+        ImVec2 scale; // framebuffer scale
+        ImDrawList* drawList;
+    };
+    std::vector<pendingTextureRendering> pendingTextureRenderings;
+    std::mutex pendingTextureRenderingsLock;
+
+    void renderPendingTextures();
     void preparePresentFrame();
 };
\ No newline at end of file
@@ -28,6 +28,8 @@ cdef extern from "backend.h" nogil:
         void freeTexture(void*)
         bint updateDynamicTexture(void*, unsigned, unsigned, unsigned, unsigned, void*, unsigned)
         bint updateStaticTexture(void*, unsigned, unsigned, unsigned, unsigned, void*, unsigned)
+        bint updateTextureRegion(void*, unsigned, unsigned, unsigned, unsigned, unsigned, unsigned, void*, unsigned)
+        bint queueTextureRendering(void*, unsigned, unsigned, float, float, void*)
 
         bint downloadBackBuffer(void*, int)
 
@@ -20,6 +20,182 @@
 static std::unordered_map<GLuint, GLuint> PBO_ids;
 static std::unordered_set<GLuint> Allocated_ids;
 
+/* Textures holding signed distance field glyphs (filtering_mode 3).
+   Allocated from the upload context, read during rendering. */
+static std::unordered_set<GLuint> SDF_ids;
+/* Textures rendered with queueTextureRendering, which hold
+   premultiplied colors. */
+static std::unordered_set<GLuint> Premultiplied_ids;
+static std::mutex SDF_ids_mutex; // Guards SDF_ids and Premultiplied_ids
+
+/* Shader rendering signed distance field glyphs. The alpha channel
+   of the texture holds the distance to the edge of the glyph (0.5
+   at the edge), which is turned into a coverage antialiased
+   over one screen pixel. The vertex shader and the attribute
+   locations are the same as the ImGui shader. */
+static GLuint SDF_program = 0;
+static GLint SDF_proj_mtx_location = -1;
+static GLint SDF_texture_location = -1;
+static GLuint SDF_failed_program = 0; // ImGui program for which creation failed
+
+static bool createSDFProgram(GLuint imgui_program)
+{
+    static const char* vertex_source =
+        "#version 150\n"
+        "uniform mat4 ProjMtx;\n"
+        "in vec2 Position;\n"
+        "in vec2 UV;\n"
+        "in vec4 Color;\n"
+        "out vec2 Frag_UV;\n"
+        "out vec4 Frag_Color;\n"
+        "void main()\n"
+        "{\n"
+        "    Frag_UV = UV;\n"
+        "    Frag_Color = Color;\n"
+        "    gl_Position = ProjMtx * vec4(Position.xy, 0, 1);\n"
+        "}\n";
+    static const char* fragment_source =
+        "#version 150\n"
+        "uniform sampler2D Texture;\n"
+        "in vec2 Frag_UV;\n"
+        "in vec4 Frag_Color;\n"
+        "out vec4 Out_Color;\n"
+        "void main()\n"
+        "{\n"
+        "    float distance = texture(Texture, Frag_UV.st).a;\n"
+        "    float width = max(0.7 * fwidth(distance), 1e-4);\n"
+        "    float coverage = smoothstep(0.5 - width, 0.5 + width, distance);\n"
+        "    Out_Color = vec4(Frag_Color.rgb, Frag_Color.a * coverage);\n"
+        "}\n";
+    GLint status;
+    GLuint shaders[2] = {glCreateShader(GL_VERTEX_SHADER), glCreateShader(GL_FRAGMENT_SHADER)};
+    glShaderSource(shaders[0], 1, &vertex_source, NULL);
+    glShaderSource(shaders[1], 1, &fragment_source, NULL);
+    GLuint program = glCreateProgram();
+    bool success = true;
+    for (GLuint shader : shaders) {
+        glCompileShader(shader);
+        glGetShaderiv(shader, GL_COMPILE_STATUS, &status);
+        success = success && status == GL_TRUE;
+        glAttachShader(program, shader);
+    }
+    // Same attribute locations as the ImGui program, which sets up the vertex arrays
+    const char* attributes[3] = {"Position", "UV", "Color"};
+    for (const char* attribute : attributes) {
+        GLint location = glGetAttribLocation(imgui_program, attribute);
+        if (location >= 0)
+            glBindAttribLocation(program, (GLuint)location, attribute);
+    }
+    if (success) {
+        glLinkProgram(program);
+        glGetProgramiv(program, GL_LINK_STATUS, &status);
+        success = status == GL_TRUE;
+    }
+    for (GLuint shader : shaders) {
+        glDetachShader(program, shader);
+        glDeleteShader(shader);
+    }
+    if (!success) {
+        glDeleteProgram(program);
+        return false;
+    }
+    SDF_program = program;
+    SDF_proj_mtx_location = glGetUniformLocation(program, "ProjMtx");
+    SDF_texture_location = glGetUniformLocation(program, "Texture");
+    return true;
+}
+
+/* Draw callback switching to the SDF program, with the
+   projection of the ImGui program currently bound. */
+static void SDFRenderCallback(const ImDrawList*, const ImDrawCmd*)
+{
+    GLint current_program;
+    glGetIntegerv(GL_CURRENT_PROGRAM, &current_program);
+    GLuint imgui_program = (GLuint)current_program;
+    if (imgui_program == 0 || imgui_program == SDF_program)
+        return;
+    if (SDF_program == 0) {
+        // If the shader is not supported, the distance field is
+        // displayed as is, which gives blurry but readable text.
+        if (SDF_failed_program == imgui_program || !createSDFProgram(imgui_program)) {
+            SDF_failed_program = imgui_program;
+            return;
+        }
+    }
+    GLfloat projection[16];
+    glGetUniformfv(imgui_program, glGetUniformLocation(imgui_program, "ProjMtx"), projection);
+    glUseProgram(SDF_program);
+    glUniformMatrix4fv(SDF_proj_mtx_location, 1, GL_FALSE, projection);
+    glUniform1i(SDF_texture_location, 0);
+}
+
+/* Draw callback compositing premultiplied colors */
+static void PremultipliedBlendCallback(const ImDrawList*, const ImDrawCmd*)
+{
+    glBlendFuncSeparate(GL_ONE, GL_ONE_MINUS_SRC_ALPHA, GL_ONE, GL_ONE_MINUS_SRC_ALPHA);
+}
+
+/* Surrounds the draw commands using SDF textures, or premultiplied
+   textures, by callbacks enabling the SDF program or the premultiplied
+   blending, and restoring the ImGui render state afterwards */
+static void prepareDrawCallbacks(ImDrawList* draw_list)
+{
+    std::lock_guard<std::mutex> lock(SDF_ids_mutex);
+    if (SDF_ids.empty() && Premultiplied_ids.empty())
+        return;
+    // 0: default, 1: SDF, 2: premultiplied
+    auto mode = [](const ImDrawCmd& cmd) {
+        if (cmd.UserCallback != NULL || cmd.ElemCount == 0)
+            return 0;
+        GLuint texture = (GLuint)(size_t)cmd.TextureId;
+        if (SDF_ids.count(texture) != 0)
+            return 1;
+        if (Premultiplied_ids.count(texture) != 0)
+            return 2;
+        return 0;
+    };
+    bool found = false;
+    for (const ImDrawCmd& cmd : draw_list->CmdBuffer)
+        found = found || mode(cmd) != 0;
+    if (!found)
+        return;
+    ImVector<ImDrawCmd> commands;
+    commands.reserve(draw_list->CmdBuffer.Size + 8);
+    int current_mode = 0;
+    auto push_callback = [&](const ImDrawCmd& cmd, ImDrawCallback callback) {
+        ImDrawCmd callback_cmd = cmd;
+        callback_cmd.UserCallback = callback;
+        callback_cmd.UserCallbackData = NULL;
+        callback_cmd.ElemCount = 0;
+        commands.push_back(callback_cmd);
+    };
+    for (const ImDrawCmd& cmd : draw_list->CmdBuffer) {
+        int cmd_mode = mode(cmd);
+        // Commands without vertices keep the current state
+        if (cmd.UserCallback == NULL && cmd.ElemCount == 0)
+            cmd_mode = current_mode;
+        if (cmd_mode != current_mode) {
+            if (current_mode != 0)
+                push_callback(cmd, ImDrawCallback_ResetRenderState);
+            if (cmd_mode == 1)
+                push_callback(cmd, SDFRenderCallback);
+            else if (cmd_mode == 2)
+                push_callback(cmd, PremultipliedBlendCallback);
+            current_mode = cmd_mode;
+        }
+        commands.push_back(cmd);
+    }
+    if (current_mode != 0)
+        push_callback(commands.back(), ImDrawCallback_ResetRenderState);
+    draw_list->CmdBuffer.swap(commands);
+}
+
+static void prepareDrawCallbacks(ImDrawData* draw_data)
+{
+    for (ImDrawList* draw_list : draw_data->CmdLists)
+        prepareDrawCallbacks(draw_list);
+}
+
 bool platformViewport::fastActivityCheck() {
     ImGuiContext& g = *GImGui;
 
@@ -67,9 +243,11 @@ void SDLViewport::preparePresentFrame() {
     desired_interval = hasVSync ? 1 : 0;
     if (desired_interval != current_interval)
         SDL_GL_SetSwapInterval(desired_interval);
+    renderPendingTextures();
     glViewport(0, 0, frameWidth, frameHeight);
     glClearColor(clearColor[0], clearColor[1], clearColor[2], clearColor[3]);
     glClear(GL_COLOR_BUFFER_BIT);
+    prepareDrawCallbacks(ImGui::GetDrawData());
     ImGui_ImplOpenGL3_RenderDrawData(ImGui::GetDrawData());
     SDL_GL_MakeCurrent(windowHandle, NULL);
     renderContextLock.unlock();
@@ -103,7 +281,7 @@ void* SDLViewport::allocateTexture(unsigned width, unsigned height, unsigned num
 
     // Duplicate the first channel on g and b to display as gray
     if (num_chans == 1) {
-        if (filtering_mode == 2) {
+        if (filtering_mode == 2 || filtering_mode == 3) {
             /* Font. Load as 111A */
             glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_SWIZZLE_R, GL_ONE);
             glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_SWIZZLE_G, GL_ONE);
@@ -139,6 +317,10 @@ void* SDLViewport::allocateTexture(unsigned width, unsigned height, unsigned num
     // Unbind texture and PBO
     glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0);
     glBindTexture(GL_TEXTURE_2D, 0);
+    if (filtering_mode == 3) {
+        std::lock_guard<std::mutex> lock(SDF_ids_mutex);
+        SDF_ids.insert(image_texture);
+    }
     //releaseUploadContext();
     return (void*)(size_t)(GLuint)image_texture;
 }
@@ -155,6 +337,11 @@ void SDLViewport::freeTexture(void* texture) {
     }
     if (Allocated_ids.find(out_srv) != Allocated_ids.end())
         Allocated_ids.erase(out_srv);
+    {
+        std::lock_guard<std::mutex> lock(SDF_ids_mutex);
+        SDF_ids.erase(out_srv);
+        Premultiplied_ids.erase(out_srv);
+    }
 
     glDeleteTextures(1, &out_srv);
     //releaseUploadContext();
@@ -259,6 +446,120 @@ bool SDLViewport::updateStaticTexture(void* texture, unsigned width, unsigned he
     return updateDynamicTexture(texture, width, height, num_chans, type, data, src_stride);
 }
 
+bool SDLViewport::updateTextureRegion(void* texture, unsigned x, unsigned y,
+                                      unsigned width, unsigned height,
+                                      unsigned num_chans, unsigned type, void* data,
+                                      unsigned src_stride) {
+    auto textureId = (GLuint)(size_t)texture;
+    unsigned gl_format = GL_RGBA;
+    unsigned gl_type = GL_FLOAT;
+    unsigned type_size = 4;
+
+    // The texture storage must have been allocated
+    // by a previous full upload.
+    if (Allocated_ids.find(textureId) == Allocated_ids.end())
+        return false;
+
+    switch (num_chans)
+    {
+    case 4:
+        gl_format = GL_RGBA;
+        break;
+    case 3:
+        gl_format = GL_RGB;
+        break;
+    case 2:
+        gl_format = GL_RG;
+        break;
+    case 1:
+    default:
+        gl_format = GL_RED;
+        break;
+    }
+
+    if (type == 1) {
+        gl_type = GL_UNSIGNED_BYTE;
+        type_size = 1;
+    }
+
+    if (src_stride % (num_chans * type_size) != 0)
+        return false;
+
+    // Upload directly from client memory: the region
+    // is typically small and the PBO is sized for the
+    // full texture.
+    glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0);
+    glBindTexture(GL_TEXTURE_2D, textureId);
+    if (glGetError() != GL_NO_ERROR)
+        return false;
+
+    glPixelStorei(GL_UNPACK_ROW_LENGTH, src_stride / (num_chans * type_size));
+    glTexSubImage2D(GL_TEXTURE_2D, 0, x, y, width, height, gl_format, gl_type, data);
+    bool success = glGetError() == GL_NO_ERROR;
+    glPixelStorei(GL_UNPACK_ROW_LENGTH, 0);
+
+    glBindTexture(GL_TEXTURE_2D, 0);
+    return success;
+}
+
+bool SDLViewport::queueTextureRendering(void* texture, unsigned width, unsigned height,
+                                        float x, float y, void* draw_list) {
+    auto textureId = (GLuint)(size_t)texture;
+    // The texture storage must have been allocated
+    // by a previous full upload.
+    if (Allocated_ids.find(textureId) == Allocated_ids.end())
+        return false;
+    {
+        // The rendered content has premultiplied colors
+        std::lock_guard<std::mutex> lock(SDF_ids_mutex);
+        Premultiplied_ids.insert(textureId);
+    }
+    ImDrawList* copy = ((ImDrawList*)draw_list)->CloneOutput();
+    copy->_PopUnusedDrawCmd();
+    ImVec2 scale = ImGui::GetIO().DisplayFramebufferScale;
+    pendingTextureRenderingsLock.lock();
+    pendingTextureRenderings.push_back({texture, width, height, x, y, scale, copy});
+    pendingTextureRenderingsLock.unlock();
+    return true;
+}
+
+void SDLViewport::renderPendingTextures() {
+    // Must be called with the rendering context current
+    std::vector<pendingTextureRendering> pending;
+    pendingTextureRenderingsLock.lock();
+    pending.swap(pendingTextureRenderings);
+    pendingTextureRenderingsLock.unlock();
+    if (pending.empty())
+        return;
+
+    GLuint fbo;
+    glGenFramebuffers(1, &fbo);
+    glBindFramebuffer(GL_FRAMEBUFFER, fbo);
+    for (auto& target : pending) {
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D,
+                               (GLuint)(size_t)target.texture, 0);
+        if (glCheckFramebufferStatus(GL_FRAMEBUFFER) == GL_FRAMEBUFFER_COMPLETE) {
+            glViewport(0, 0, target.width, target.height);
+            glClearColor(0., 0., 0., 0.);
+            glClear(GL_COLOR_BUFFER_BIT);
+            // Minimal draw data pointing to our single draw list
+            ImDrawData draw_data;
+            draw_data.Valid = true;
+            draw_data.DisplayPos = ImVec2(target.x, target.y);
+            draw_data.DisplaySize = ImVec2((float)target.width / target.scale.x,
+                                           (float)target.height / target.scale.y);
+            draw_data.FramebufferScale = target.scale;
+            draw_data.AddDrawList(target.drawList);
+            prepareDrawCallbacks(&draw_data);
+            ImGui_ImplOpenGL3_RenderDrawData(&draw_data);
+        }
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, 0, 0);
+        IM_DELETE(target.drawList);
+    }
+    glBindFramebuffer(GL_FRAMEBUFFER, 0);
+    glDeleteFramebuffers(1, &fbo);
+}
+
 SDLViewport* SDLViewport::create(render_fun render,
                              on_resize_fun on_resize,
                              on_close_fun on_close,
@@ -305,6 +606,10 @@ void SDLViewport::cleanup() {
     if (hasOpenGL3Init) {
         renderContextLock.lock();
         SDL_GL_MakeCurrent(windowHandle, glContext);
+        if (SDF_program != 0) {
+            glDeleteProgram(SDF_program);
+            SDF_program = 0;
+        }
         ImGui_ImplOpenGL3_Shutdown();
         SDL_GL_MakeCurrent(windowHandle, NULL);
         renderContextLock.unlock();
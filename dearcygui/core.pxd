@@ -109,6 +109,7 @@ cdef class Context:
     cdef void queue_callback_arg3long1int(self, Callback, baseItem, baseItem, long long, long long, long long, int) noexcept nogil
     cdef void queue_callback_argdoubletriplet(self, Callback, baseItem, baseItem, double, double, double, double, double, double) noexcept nogil
     cdef void queue_callback_arg1int1stringvector(self, Callback, baseItem, baseItem, int, vector[string]) noexcept nogil
+    cdef void queue_callback_arg1intvector1int(self, Callback, baseItem, baseItem, vector[int], int) noexcept nogil
     cpdef void push_next_parent(self, baseItem next_parent)
     cpdef void pop_next_parent(self)
     cpdef object fetch_parent_queue_back(self)
@@ -181,6 +182,8 @@ cdef class baseItem:
     cdef itemState* p_state # pointer to the itemState. set to NULL if the item doesn't have any.
     ### protected variables ###
     cdef vector[PyObject*] _handlers # type baseHandler. Always empty if p_state is NULL.
+    cdef bint _drawings_changed # a drawing descendant was modified
+    cdef void* _draw_cache # see draw_drawing_children_cached. NULL if not cached
     ### private variables ###
     cdef int _external_lock
     cdef object __weakref__
@@ -304,8 +307,11 @@ cdef class Viewport(baseItem):
     cdef ThemeEnablers _current_theme_activation_condition_enabled
     cdef ThemeCategories _current_theme_activation_condition_category
     cdef float _scale
+    cdef vector[PyObject*] _frame_end_fonts # type baseFont. Not owned: the fonts unregister in __del__
     ### public methods ###
     cdef void coordinate_to_screen(self, float *dst_p, double[2] src_p) noexcept nogil
+    cdef void coordinates_to_screen(self, float *dst_p, const double *src_p, int count, Py_ssize_t stride) noexcept nogil
+    cdef void coordinates_to_screen_float(self, float *dst_p, const float *src_p, int count, Py_ssize_t stride) noexcept nogil
     cdef void screen_to_coordinate(self, double *dst_p, float[2] src_p) noexcept nogil
     cdef void push_pending_theme_actions(self, ThemeEnablers, ThemeCategories) noexcept nogil
     cdef void push_pending_theme_actions_on_subset(self, int, int) noexcept nogil
@@ -338,6 +344,31 @@ cdef inline void draw_drawing_children(baseItem item,
         (<drawingItem>child).draw(drawlist) # drawlist is imgui.ImDrawList*
         child = <PyObject *>(<baseItem>child).next_sibling
 
+cdef bint drawing_view_translation(Viewport viewport,
+                                   float* reference,
+                                   float* multipliers,
+                                   const float* recorded_reference,
+                                   const float* recorded_multipliers,
+                                   float* dx,
+                                   float* dy) noexcept nogil
+cdef void* create_draw_cache() noexcept nogil
+cdef void destroy_draw_cache(void*) noexcept nogil
+cdef void draw_drawing_children_cached(baseItem item,
+                                       void* drawlist) noexcept nogil
+
+cdef void* create_text_layout() noexcept nogil
+cdef void destroy_text_layout(void*) noexcept nogil
+cdef void invalidate_text_layouts() noexcept nogil
+cdef Vec2 layout_text(void* layout,
+                      const string& text,
+                      float size,
+                      float wrap_width,
+                      unsigned int color) noexcept nogil
+cdef void draw_text_layout(void* layout,
+                           void* drawlist,
+                           float x,
+                           float y) noexcept nogil
+
 cdef inline void draw_menubar_children(baseItem item) noexcept nogil:
     if item.last_menubar_child is None:
         return
@@ -405,8 +436,13 @@ Drawing Items
 
 cdef class drawingItem(baseItem):
     cdef bint _show
+    cdef double[4] _bounds # xmin, ymin, xmax, ymax in coordinate space
+    cdef float _bounds_margin # extent around _bounds in unscaled pixels
+    cdef bint _bounds_dirty
     cdef void draw(self, void *) noexcept nogil # imgui.ImDrawList*
-    pass
+    cdef void update_bounds(self) noexcept nogil
+    cdef void bounds_changed(self)
+    cdef void drawings_changed(self)
 
 
 cdef bint button_area(Context context,
@@ -675,10 +711,12 @@ cdef class Texture(baseItem):
     cdef int _filtering_mode
     cdef bint _readonly
     cdef void set_content(self, cnp.ndarray content)
+    cdef void set_content_region(self, cnp.ndarray content, int x, int y)
 
 cdef class baseFont(baseItem):
     cdef void push(self) noexcept nogil
     cdef void pop(self) noexcept nogil
+    cdef void end_frame(self) noexcept nogil
 
 """
 Theme base class:
@@ -37,7 +37,8 @@ from libcpp.cmath cimport floor
 from libcpp.cmath cimport round as cround
 from libcpp.set cimport set as cpp_set
 from libcpp.vector cimport vector
-from libc.math cimport M_PI, INFINITY
+from libc.math cimport M_PI, INFINITY, fabs
+from cpython.object cimport PyObject_GenericSetAttr
 cimport dearcygui.backends.time as ctime
 
 from .c_types cimport unique_lock, recursive_mutex, defer_lock_t
@@ -672,6 +673,32 @@ cdef class Context:
             except Exception as e:
                 print(traceback.format_exc())
 
+    cdef void queue_callback_arg1intvector1int(self, Callback callback, baseItem parent_item, baseItem target_item,
+                                               vector[int] arg1, int arg2) noexcept nogil:
+        """
+        Queue a callback with one vector of integers and one integer arguments.
+
+        Parameters:
+        callback : Callback
+            The callback to be queued.
+        parent_item : baseItem
+            The parent item.
+        target_item : baseItem
+            The target item.
+        arg1 : vector[int]
+            The first argument, passed as an int32 array.
+        arg2 : int
+            The second argument.
+        """
+        if callback is None:
+            return
+        with gil:
+            try:
+                self._queue.submit(callback, parent_item, target_item,
+                                   (np.array(arg1, dtype=np.int32), arg2))
+            except Exception as e:
+                print(traceback.format_exc())
+
     cpdef void push_next_parent(self, baseItem next_parent):
         """
         Each time 'with' is used on an item, it is pushed
@@ -1225,6 +1252,8 @@ cdef class baseItem:
 
     def __dealloc__(self):
         clear_obj_vector(self._handlers)
+        if self._draw_cache != NULL:
+            destroy_draw_cache(self._draw_cache)
 
     @property
     def context(self):
@@ -1847,6 +1876,8 @@ cdef class baseItem:
                 target_parent.last_window_child = <Window>self
                 attached = True
         assert(attached) # because we checked before compatibility
+        if self.element_child_category == child_type.cat_drawing:
+            (<drawingItem>self).bounds_changed()
         if not(self.parent.__check_rendered()): # TODO: could be optimized. Also not totally correct (attaching to a menu for instance)
             self.set_hidden_and_propagate_to_children_no_handlers()
 
@@ -1911,6 +1942,8 @@ cdef class baseItem:
         self.prev_sibling = prev_sibling
         self.next_sibling = target_before
         target_before.prev_sibling = self
+        if self.element_child_category == child_type.cat_drawing:
+            (<drawingItem>self).bounds_changed()
         if not(self.parent.__check_rendered()):
             self.set_hidden_and_propagate_to_children_no_handlers()
 
@@ -1959,6 +1992,9 @@ cdef class baseItem:
                     self.parent.last_widgets_child = self.prev_sibling
                 elif self.parent.last_window_child is self:
                     self.parent.last_window_child = self.prev_sibling
+        if self.element_child_category == child_type.cat_drawing:
+            # The aggregated bounds of the parents change
+            (<drawingItem>self).bounds_changed()
         # Free references
         self.parent = None
         self.prev_sibling = None
@@ -2383,6 +2419,142 @@ class wrap_this_and_parents_mutex:
         return False # Do not catch exceptions
 
 
+cdef extern from * nogil:
+    """
+    #include <cfloat>
+    #include <cmath>
+    #include "implot_internal.h"
+
+    /* Maps drawing coordinates to screen pixels, per axis:
+       pixel = a * F(v * scale + shift) + b
+       with F the axis transform (identity outside plots) */
+    struct DCGCoordTransform {
+        double scales[2];
+        double shifts[2];
+        double a[2];
+        double b[2];
+        int kind[2]; /* 0: linear (and time), 1: log10, 2: symlog, 3: custom */
+        ImPlotTransform forward[2];
+        void* forward_data[2];
+    };
+
+    /* Fills a and b (and the transform kind) for the current plot axes */
+    void DCGSetPlotTransform(DCGCoordTransform& t)
+    {
+        ImPlotPlot& plot = *ImPlot::GetCurrentPlot();
+        const ImPlotAxis* axes[2] = {&plot.Axes[plot.CurrentX], &plot.Axes[plot.CurrentY]};
+        for (int k = 0; k < 2; k++) {
+            const ImPlotAxis& axis = *axes[k];
+            t.forward[k] = axis.TransformForward;
+            t.forward_data[k] = axis.TransformData;
+            if (axis.TransformForward == nullptr) {
+                t.kind[k] = 0;
+                t.a[k] = axis.ScaleToPixel;
+                t.b[k] = axis.PixelMin - axis.ScaleToPixel * axis.Range.Min;
+                continue;
+            }
+            /* Same as ImPlotAxis::PlotToPixels, with the constants folded */
+            t.kind[k] = axis.Scale == ImPlotScale_Log10 ? 1 :
+                        axis.Scale == ImPlotScale_SymLog ? 2 : 3;
+            t.a[k] = axis.ScaleToPixel * axis.Range.Size() / (axis.ScaleMax - axis.ScaleMin);
+            t.b[k] = axis.PixelMin - t.a[k] * axis.ScaleMin;
+        }
+    }
+
+    template <typename T>
+    void DCGTransformAxis(const DCGCoordTransform& t, int k, float* dst,
+                          const char* src, Py_ssize_t stride, int count)
+    {
+        const double s = t.scales[k], sh = t.shifts[k];
+        const double a = t.a[k], b = t.b[k];
+        src += k * sizeof(T);
+        dst += k;
+        switch (t.kind[k]) {
+            case 0: {
+                /* Single affine map */
+                const double a2 = a * s, b2 = a * sh + b;
+                for (int i = 0; i < count; i++)
+                    dst[2*i] = (float)(a2 * (double)*(const T*)(src + i * stride) + b2);
+                break;
+            }
+            case 1:
+                for (int i = 0; i < count; i++) {
+                    double v = (double)*(const T*)(src + i * stride) * s + sh;
+                    dst[2*i] = (float)(a * std::log10(v <= 0. ? DBL_MIN : v) + b);
+                }
+                break;
+            case 2:
+                for (int i = 0; i < count; i++) {
+                    double v = (double)*(const T*)(src + i * stride) * s + sh;
+                    dst[2*i] = (float)(a * 2. * std::asinh(v / 2.) + b);
+                }
+                break;
+            default:
+                for (int i = 0; i < count; i++) {
+                    double v = (double)*(const T*)(src + i * stride) * s + sh;
+                    dst[2*i] = (float)(a * t.forward[k](v, t.forward_data[k]) + b);
+                }
+                break;
+        }
+    }
+
+    /* dst: count packed (x, y) floats. src: count points
+       of two consecutive T, separated by stride bytes */
+    template <typename T>
+    void DCGTransformPoints(const DCGCoordTransform& t, float* dst,
+                            const T* src, Py_ssize_t stride, int count, bool fit)
+    {
+        const char* data = (const char*)src;
+        if (fit) {
+            for (int i = 0; i < count; i++) {
+                const T* p = (const T*)(data + i * stride);
+                ImPlot::FitPointX((double)p[0] * t.scales[0] + t.shifts[0]);
+                ImPlot::FitPointY((double)p[1] * t.scales[1] + t.shifts[1]);
+            }
+        }
+        if (t.kind[0] == 0 && t.kind[1] == 0) {
+            const double ax = t.a[0] * t.scales[0], bx = t.a[0] * t.shifts[0] + t.b[0];
+            const double ay = t.a[1] * t.scales[1], by = t.a[1] * t.shifts[1] + t.b[1];
+            for (int i = 0; i < count; i++) {
+                const T* p = (const T*)(data + i * stride);
+                dst[2*i] = (float)(ax * (double)p[0] + bx);
+                dst[2*i+1] = (float)(ay * (double)p[1] + by);
+            }
+            return;
+        }
+        DCGTransformAxis<T>(t, 0, dst, data, stride, count);
+        DCGTransformAxis<T>(t, 1, dst, data, stride, count);
+    }
+    """
+    struct DCGCoordTransform:
+        double scales[2]
+        double shifts[2]
+        double a[2]
+        double b[2]
+        int kind[2]
+    void DCGSetPlotTransform(DCGCoordTransform&)
+    void DCGTransformPoints[T](DCGCoordTransform&, float*, const T*, Py_ssize_t, int, bint)
+
+
+cdef inline void fill_coordinate_transform(DCGCoordTransform &t,
+                                           Viewport viewport) noexcept nogil:
+    t.scales[0] = viewport.scales[0]
+    t.scales[1] = viewport.scales[1]
+    t.shifts[0] = viewport.shifts[0]
+    t.shifts[1] = viewport.shifts[1]
+    if viewport.in_plot:
+        # When in a plot, the plot axes are applied
+        # after scales and shifts
+        DCGSetPlotTransform(t)
+    else:
+        t.a[0] = 1.
+        t.a[1] = 1.
+        t.b[0] = 0.
+        t.b[1] = 0.
+        t.kind[0] = 0
+        t.kind[1] = 0
+
+
 @cython.final
 @cython.no_gc_clear
 cdef class Viewport(baseItem):
@@ -3113,6 +3285,7 @@ cdef class Viewport(baseItem):
     cdef void __render(self) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         cdef bint any_change = False
+        cdef int i
         self.last_t_before_rendering = ctime.monotonic_ns()
         # Initialize drawing state
         imgui.SetMouseCursor(self._cursor)
@@ -3142,6 +3315,8 @@ cdef class Viewport(baseItem):
         if self._font is not None:
             self._font.pop()
         self.run_handlers()
+        for i in range(<int>self._frame_end_fonts.size()):
+            (<baseFont>self._frame_end_fonts[i]).end_frame()
         self.last_t_after_rendering = ctime.monotonic_ns()
         if self.redraw_needed:
             (<platformViewport*>self._platform).needsRefresh.store(True)
@@ -3166,27 +3341,35 @@ cdef class Viewport(baseItem):
         """
         Used during rendering as helper to convert drawing coordinates to pixel coordinates
         """
+        self.coordinates_to_screen(dst_p, src_p, 1, 2 * sizeof(double))
+
+    cdef void coordinates_to_screen(self, float *dst_p, const double *src_p,
+                                    int count, Py_ssize_t stride) noexcept nogil:
+        """
+        Batched version of coordinate_to_screen.
+
+        Converts count points into dst_p (packed x, y floats,
+        as ImVec2). Each point of src_p is made of two
+        consecutive doubles, and points are separated
+        by stride bytes.
+        The transform constants are computed once for all
+        the points.
+        """
         # assumes imgui + viewport mutex are held
+        cdef DCGCoordTransform t
+        fill_coordinate_transform(t, self)
+        DCGTransformPoints[double](t, dst_p, src_p, stride, count,
+                                   self.in_plot and self.plot_fit)
 
-        cdef imgui.ImVec2 plot_transformed
-        cdef double[2] p
-        p[0] = src_p[0] * self.scales[0] + self.shifts[0]
-        p[1] = src_p[1] * self.scales[1] + self.shifts[1]
-        if self.in_plot:
-            if self.plot_fit:
-                implot.FitPointX(src_p[0])
-                implot.FitPointY(src_p[1])
-            plot_transformed = \
-                implot.PlotToPixels(src_p[0],
-                                    src_p[1],
-                                    -1,
-                                    -1)
-            dst_p[0] = plot_transformed.x
-            dst_p[1] = plot_transformed.y
-        else:
-            # When in a plot, PlotToPixel already handles that.
-            dst_p[0] = <float>p[0]
-            dst_p[1] = <float>p[1]
+    cdef void coordinates_to_screen_float(self, float *dst_p, const float *src_p,
+                                          int count, Py_ssize_t stride) noexcept nogil:
+        """
+        Same as coordinates_to_screen, for float coordinates
+        """
+        cdef DCGCoordTransform t
+        fill_coordinate_transform(t, self)
+        DCGTransformPoints[float](t, dst_p, src_p, stride, count,
+                                  self.in_plot and self.plot_fit)
 
     cdef void screen_to_coordinate(self, double *dst_p, float[2] src_p) noexcept nogil:
         """
@@ -3202,8 +3385,8 @@ cdef class Viewport(baseItem):
                 implot.PixelsToPlot(screen_pos,
                                     implot.IMPLOT_AUTO,
                                     implot.IMPLOT_AUTO)
-            dst_p[0] = plot_pos.x
-            dst_p[1] = plot_pos.y
+            dst_p[0] = (plot_pos.x - self.shifts[0]) / self.scales[0]
+            dst_p[1] = (plot_pos.y - self.shifts[1]) / self.scales[1]
         else:
             dst_p[0] = <double>(src_p[0] - self.shifts[0]) / <double>self.scales[0]
             dst_p[1] = <double>(src_p[1] - self.shifts[1]) / <double>self.scales[1]
@@ -3642,6 +3825,9 @@ cdef void update_current_mouse_states(itemState& state) noexcept nogil:
 
 # Drawing items base class
 
+# Attributes of drawing items that do not impact the rendering
+_non_drawing_attributes = frozenset(["user_data", "callback", "callbacks", "handlers"])
+
 cdef class drawingItem(baseItem):
     """
     A simple item with no UI state that inherits from the drawing area of its parent.
@@ -3650,6 +3836,10 @@ cdef class drawingItem(baseItem):
         self._show = True
         self.element_child_category = child_type.cat_drawing
         self.can_have_sibling = True
+        # Unknown bounds: never culled
+        self._bounds = [-INFINITY, -INFINITY, INFINITY, INFINITY]
+        self._bounds_margin = 0.
+        self._bounds_dirty = False
 
     @property
     def show(self):
@@ -3676,6 +3866,596 @@ cdef class drawingItem(baseItem):
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         return
 
+    def invalidate(self):
+        """
+        Notifies that the data of the item was modified in place,
+        for instance an array returned by one of its attributes,
+        which are not copies.
+
+        Such modifications are not detected: without this call,
+        the item may be culled using its previous geometry, and
+        the cached drawings of its parents are not updated.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self.bounds_changed()
+        self.drawings_changed()
+
+    cdef void update_bounds(self) noexcept nogil:
+        """
+        Computes _bounds and _bounds_margin from the item geometry.
+
+        Called with the mutex held, before drawing, when
+        _bounds_dirty is set. Items that do not implement it
+        keep infinite bounds, and are thus never culled.
+        """
+        return
+
+    cdef void bounds_changed(self):
+        """
+        Marks the bounds of the item, and the aggregated
+        bounds of its parent drawing items, as outdated.
+
+        Must be called when the geometry of the item changes,
+        or when a child is attached or detached.
+        """
+        self._bounds_dirty = True
+        cdef baseItem parent = self.parent
+        while parent is not None:
+            parent._drawings_changed = True
+            if not(isinstance(parent, drawingItem)):
+                break
+            (<drawingItem>parent)._bounds_dirty = True
+            parent = parent.parent
+
+    cdef void drawings_changed(self):
+        """
+        Marks the drawing caches of the parents as outdated.
+        """
+        cdef baseItem parent = self.parent
+        while parent is not None:
+            parent._drawings_changed = True
+            if not(isinstance(parent, drawingItem)):
+                break
+            parent = parent.parent
+
+    def __setattr__(self, name, value):
+        PyObject_GenericSetAttr(self, name, value)
+        # Setting an attribute that may change the rendering
+        # invalidates the drawing caches. Plain attributes of
+        # subclasses (stored in the instance dict) do not.
+        if name in _non_drawing_attributes or \
+           not(hasattr(getattr(type(self), name, None), '__set__')):
+            return
+        self.drawings_changed()
+
+
+cdef extern from * nogil:
+    """
+    #include <vector>
+    #include <cstring>
+
+    /* Vertices and indices emitted by a drawing subtree,
+       recorded once in a private draw list, and replayed
+       (with a translation) into the target draw list. */
+    struct DCGDrawCache {
+        struct Segment {
+            ImTextureID texture;
+            ImVec4 clip_rect;
+            bool clipped; // clip_rect was pushed by a descendant
+            unsigned int idx_count;
+        };
+        ImDrawList* recorder = nullptr;
+        std::vector<ImDrawVert> vertices;
+        std::vector<ImDrawIdx> indices;
+        std::vector<Segment> segments;
+        bool valid = false;
+        float reference[6] = {}; // screen position of the reference points
+        float multipliers[3] = {};
+    };
+
+    /* Large enough for nothing to be culled while recording */
+    static const float DCG_CACHE_CLIP = 1e7f;
+
+    void* DCGDrawCacheCreate()
+    {
+        return new DCGDrawCache();
+    }
+
+    void DCGDrawCacheDestroy(void* data)
+    {
+        DCGDrawCache* cache = (DCGDrawCache*)data;
+        if (cache->recorder != nullptr)
+            IM_DELETE(cache->recorder);
+        delete cache;
+    }
+
+    ImDrawList* DCGDrawCacheBeginRecording(void* data, ImDrawList* target)
+    {
+        DCGDrawCache* cache = (DCGDrawCache*)data;
+        if (cache->recorder == nullptr)
+            cache->recorder = IM_NEW(ImDrawList)(target->_Data);
+        ImDrawList* recorder = cache->recorder;
+        recorder->_ResetForNewFrame();
+        recorder->Flags = target->Flags;
+        recorder->_FringeScale = target->_FringeScale;
+        recorder->PushTextureID(target->_CmdHeader.TextureId);
+        recorder->PushClipRect(ImVec2(-DCG_CACHE_CLIP, -DCG_CACHE_CLIP),
+                               ImVec2(DCG_CACHE_CLIP, DCG_CACHE_CLIP),
+                               false);
+        return recorder;
+    }
+
+    void DCGDrawCacheEndRecording(void* data)
+    {
+        DCGDrawCache* cache = (DCGDrawCache*)data;
+        ImDrawList* recorder = cache->recorder;
+        cache->vertices.assign(recorder->VtxBuffer.Data,
+                               recorder->VtxBuffer.Data + recorder->VtxBuffer.Size);
+        cache->indices.clear();
+        cache->segments.clear();
+        for (int i = 0; i < recorder->CmdBuffer.Size; i++) {
+            const ImDrawCmd& cmd = recorder->CmdBuffer[i];
+            /* Draw callbacks are not recorded */
+            if (cmd.ElemCount == 0 || cmd.UserCallback != nullptr)
+                continue;
+            bool clipped = cmd.ClipRect.x != -DCG_CACHE_CLIP || cmd.ClipRect.y != -DCG_CACHE_CLIP ||
+                           cmd.ClipRect.z != DCG_CACHE_CLIP || cmd.ClipRect.w != DCG_CACHE_CLIP;
+            if (!cache->segments.empty() &&
+                cache->segments.back().texture == cmd.TextureId &&
+                cache->segments.back().clipped == clipped &&
+                (!clipped || memcmp(&cache->segments.back().clip_rect, &cmd.ClipRect, sizeof(ImVec4)) == 0))
+                cache->segments.back().idx_count += cmd.ElemCount;
+            else
+                cache->segments.push_back({cmd.TextureId, cmd.ClipRect, clipped, cmd.ElemCount});
+            for (unsigned int k = 0; k < cmd.ElemCount; k++)
+                cache->indices.push_back((ImDrawIdx)(recorder->IdxBuffer[cmd.IdxOffset + k] + cmd.VtxOffset));
+        }
+        /* Release the recording buffers */
+        IM_DELETE(recorder);
+        cache->recorder = nullptr;
+        cache->valid = true;
+    }
+
+    void DCGDrawCacheReplay(void* data, ImDrawList* target, float dx, float dy)
+    {
+        const DCGDrawCache* cache = (const DCGDrawCache*)data;
+        if (cache->vertices.empty() || cache->segments.empty())
+            return;
+        unsigned int base_idx = target->_VtxCurrentIdx;
+        int vtx_count = (int)cache->vertices.size();
+        const ImDrawIdx* idx_src = cache->indices.data();
+        for (const DCGDrawCache::Segment& segment : cache->segments) {
+            /* The clip rects of the descendants (DrawingClip) are
+               translated, and intersected with the current one */
+            if (segment.clipped)
+                target->PushClipRect(ImVec2(segment.clip_rect.x + dx, segment.clip_rect.y + dy),
+                                     ImVec2(segment.clip_rect.z + dx, segment.clip_rect.w + dy),
+                                     true);
+            bool push_texture = segment.texture != target->_CmdHeader.TextureId;
+            if (push_texture)
+                target->PushTextureID(segment.texture);
+            /* All vertices are written with the first segment */
+            target->PrimReserve((int)segment.idx_count, vtx_count);
+            if (vtx_count > 0) {
+                ImDrawVert* vtx_dst = target->_VtxWritePtr;
+                std::memcpy(vtx_dst, cache->vertices.data(), vtx_count * sizeof(ImDrawVert));
+                if (dx != 0.f || dy != 0.f) {
+                    for (int k = 0; k < vtx_count; k++) {
+                        vtx_dst[k].pos.x += dx;
+                        vtx_dst[k].pos.y += dy;
+                    }
+                }
+                target->_VtxWritePtr += vtx_count;
+                target->_VtxCurrentIdx += vtx_count;
+                vtx_count = 0;
+            }
+            ImDrawIdx* idx_dst = target->_IdxWritePtr;
+            for (unsigned int k = 0; k < segment.idx_count; k++)
+                idx_dst[k] = (ImDrawIdx)(base_idx + idx_src[k]);
+            target->_IdxWritePtr += segment.idx_count;
+            idx_src += segment.idx_count;
+            if (push_texture)
+                target->PopTextureID();
+            if (segment.clipped)
+                target->PopClipRect();
+        }
+    }
+
+    bool DCGDrawCacheIsValid(void* data)
+    {
+        return ((DCGDrawCache*)data)->valid;
+    }
+
+    void DCGDrawCacheInvalidate(void* data)
+    {
+        ((DCGDrawCache*)data)->valid = false;
+    }
+
+    float* DCGDrawCacheReference(void* data)
+    {
+        return ((DCGDrawCache*)data)->reference;
+    }
+
+    float* DCGDrawCacheMultipliers(void* data)
+    {
+        return ((DCGDrawCache*)data)->multipliers;
+    }
+    """
+    void* DCGDrawCacheCreate()
+    void DCGDrawCacheDestroy(void*)
+    imgui.ImDrawList* DCGDrawCacheBeginRecording(void*, imgui.ImDrawList*)
+    void DCGDrawCacheEndRecording(void*)
+    void DCGDrawCacheReplay(void*, imgui.ImDrawList*, float, float)
+    bint DCGDrawCacheIsValid(void*)
+    void DCGDrawCacheInvalidate(void*)
+    float* DCGDrawCacheReference(void*)
+    float* DCGDrawCacheMultipliers(void*)
+
+cdef void* create_draw_cache() noexcept nogil:
+    """Allocates the cache of draw_drawing_children_cached"""
+    return DCGDrawCacheCreate()
+
+cdef void destroy_draw_cache(void* cache) noexcept nogil:
+    DCGDrawCacheDestroy(cache)
+
+cdef bint drawing_view_translation(Viewport viewport,
+                                   float* reference,
+                                   float* multipliers,
+                                   const float* recorded_reference,
+                                   const float* recorded_multipliers,
+                                   float* dx,
+                                   float* dy) noexcept nogil:
+    """
+    Fills reference (6 floats) and multipliers (3 floats)
+    with the description of the current view, and returns
+    whether drawings recorded for the recorded view can be
+    reused, translated by (dx, dy) in screen space.
+    Used by the items that cache the rendering of their
+    children.
+    """
+    # Screen position of reference points. The transforms act on
+    # each axis independently, thus the view is only translated if
+    # all references are translated identically.
+    # The points must not take part in plot fits.
+    cdef double[6] samples = [1., 1., 2., 2., 10., 10.]
+    cdef DCGCoordTransform transform
+    fill_coordinate_transform(transform, viewport)
+    DCGTransformPoints[double](transform, reference, samples,
+                               2 * sizeof(double), 3, False)
+    multipliers[0] = viewport.size_multiplier
+    multipliers[1] = viewport.thickness_multiplier
+    multipliers[2] = viewport.global_scale
+
+    dx[0] = reference[0] - recorded_reference[0]
+    dy[0] = reference[1] - recorded_reference[1]
+    cdef int i
+    for i in range(3):
+        if multipliers[i] != recorded_multipliers[i]:
+            return False
+    for i in range(1, 3):
+        # False for NaN
+        if not(fabs(reference[2*i] - recorded_reference[2*i] - dx[0]) < 0.01 and \
+               fabs(reference[2*i+1] - recorded_reference[2*i+1] - dy[0]) < 0.01):
+            return False
+    # During the auto-fit frames of plots, the children
+    # must be drawn for their points to be fitted.
+    if viewport.in_plot and viewport.plot_fit:
+        return False
+    return True
+
+cdef void draw_drawing_children_cached(baseItem item,
+                                       void* drawlist) noexcept nogil:
+    """
+    Same as draw_drawing_children, but the vertices and indices
+    emitted by the children are recorded once in item._draw_cache,
+    and replayed on the next frames, translated if the view only
+    moved. The recording is invalidated when a descendant is
+    modified. The item mutex must be held.
+    """
+    cdef void* cache = item._draw_cache
+    if item._drawings_changed:
+        item._drawings_changed = False
+        DCGDrawCacheInvalidate(cache)
+
+    cdef float[6] reference
+    cdef float[3] multipliers
+    cdef float* recorded_reference = DCGDrawCacheReference(cache)
+    cdef float* recorded_multipliers = DCGDrawCacheMultipliers(cache)
+    cdef float dx, dy
+    cdef bint valid = drawing_view_translation(item.context.viewport,
+                                               reference, multipliers,
+                                               recorded_reference,
+                                               recorded_multipliers,
+                                               &dx, &dy)
+    if not(DCGDrawCacheIsValid(cache)):
+        valid = False
+
+    cdef int i
+    cdef imgui.ImDrawList* recorder
+    if not(valid):
+        recorder = DCGDrawCacheBeginRecording(cache, <imgui.ImDrawList*>drawlist)
+        draw_drawing_children(item, recorder)
+        DCGDrawCacheEndRecording(cache)
+        for i in range(6):
+            recorded_reference[i] = reference[i]
+        for i in range(3):
+            recorded_multipliers[i] = multipliers[i]
+        dx = 0.
+        dy = 0.
+    DCGDrawCacheReplay(cache, <imgui.ImDrawList*>drawlist, dx, dy)
+
+def _get_cached(baseItem self):
+    cdef unique_lock[recursive_mutex] m
+    lock_gil_friendly(m, self.mutex)
+    return self._draw_cache != NULL
+
+def _set_cached(baseItem self, bint value):
+    cdef unique_lock[recursive_mutex] m
+    lock_gil_friendly(m, self.mutex)
+    if value and self._draw_cache == NULL:
+        self._draw_cache = create_draw_cache()
+    elif not(value) and self._draw_cache != NULL:
+        destroy_draw_cache(self._draw_cache)
+        self._draw_cache = NULL
+    self._drawings_changed = True
+
+# cached attribute of the items drawing their
+# children with draw_drawing_children_cached
+_cached_property = property(_get_cached, _set_cached, doc=
+    """
+    Writable attribute: Record the vertices and indices emitted
+    by the drawing children once, and replay them on the next
+    frames instead of drawing the children again.
+
+    Suited for large static content. When only the view is
+    translated (scrolling, plot panning), the recording is
+    translated. Any other change of the view, any modification
+    of a descendant (setting one of its attributes, attaching or
+    detaching an item), and the auto-fit frames of plots trigger
+    a new recording. In-place modifications of arrays, of textures
+    and of shared values are not detected: set the attribute again,
+    or call invalidate() on the modified item.
+    Interactive items (DrawInvisibleButton), and draw callbacks,
+    are not supported in a cached subtree.
+    """)
+
+
+cdef extern from * nogil:
+    """
+    #include <algorithm>
+    #include <atomic>
+    #include <string>
+    #include <vector>
+    #include "imgui_internal.h"
+
+    /* Glyph quads of a text laid out with a given font, size, wrap
+       width and color. The quads of each line are stored relative
+       to the text position, such that drawing the text reduces to
+       copying the quads of the visible lines. */
+    struct DCGTextLayout {
+        struct Line { float y0, y1; int vtx_start, vtx_end; };
+        std::string text;
+        ImFont* font = nullptr;
+        float font_size = 0.f;
+        float wrap_width = 0.f;
+        ImU32 color = 0;
+        unsigned long long generation = 0;
+        bool valid = false;
+        ImVec2 size = ImVec2(0.f, 0.f);
+        std::vector<Line> lines;
+        std::vector<ImDrawVert> vertices; // 4 per glyph
+    };
+
+    /* Incremented whenever the glyphs of a font are modified or released */
+    static std::atomic<unsigned long long> dcg_text_layout_generation(1);
+
+    void* DCGTextLayoutCreate()
+    {
+        return new DCGTextLayout();
+    }
+
+    void DCGTextLayoutDestroy(void* data)
+    {
+        delete (DCGTextLayout*)data;
+    }
+
+    void DCGTextLayoutInvalidateAll()
+    {
+        dcg_text_layout_generation++;
+    }
+
+    /* Same as ImFont::RenderText, with the line breaks of
+       ImFont::CalcTextSizeA. */
+    static void DCGTextLayoutBuild(DCGTextLayout* l)
+    {
+        ImFont* font = l->font;
+        const float scale = l->font_size / font->FontSize;
+        const float line_height = l->font_size;
+        const bool word_wrap = l->wrap_width > 0.f;
+        const ImU32 col_untinted = l->color | ~IM_COL32_A_MASK;
+        const char* s = l->text.c_str();
+        const char* text_end = s + l->text.size();
+        const char* word_wrap_eol = nullptr;
+        float x = 0.f, y = 0.f, width = 0.f;
+        l->lines.clear();
+        l->vertices.clear();
+        l->lines.push_back({0.f, line_height, 0, 0});
+        auto new_line = [&]() {
+            width = ImMax(width, x);
+            x = 0.f;
+            y += line_height;
+            l->lines.back().vtx_end = (int)l->vertices.size();
+            l->lines.push_back({y, y + line_height, (int)l->vertices.size(), 0});
+        };
+        while (s < text_end) {
+            if (word_wrap) {
+                if (word_wrap_eol == nullptr)
+                    word_wrap_eol = font->CalcWordWrapPositionA(scale, s, text_end, l->wrap_width - x);
+                if (s >= word_wrap_eol) {
+                    new_line();
+                    word_wrap_eol = nullptr;
+                    // Skip the blanks and the line return at the wrap point
+                    while (s < text_end && ImCharIsBlankA(*s))
+                        s++;
+                    if (s < text_end && *s == '\\n')
+                        s++;
+                    continue;
+                }
+            }
+            unsigned int c = (unsigned int)*s;
+            if (c < 0x80)
+                s += 1;
+            else
+                s += ImTextCharFromUtf8(&c, s, text_end);
+            if (c < 32) {
+                if (c == '\\n') {
+                    new_line();
+                    continue;
+                }
+                if (c == '\\r')
+                    continue;
+            }
+            const ImFontGlyph* glyph = font->FindGlyph((ImWchar)c);
+            if (glyph == nullptr)
+                continue;
+            if (glyph->Visible) {
+                const ImU32 col = glyph->Colored ? col_untinted : l->color;
+                const float x0 = x + glyph->X0 * scale, x1 = x + glyph->X1 * scale;
+                const float y0 = y + glyph->Y0 * scale, y1 = y + glyph->Y1 * scale;
+                l->vertices.push_back({ImVec2(x0, y0), ImVec2(glyph->U0, glyph->V0), col});
+                l->vertices.push_back({ImVec2(x1, y0), ImVec2(glyph->U1, glyph->V0), col});
+                l->vertices.push_back({ImVec2(x1, y1), ImVec2(glyph->U1, glyph->V1), col});
+                l->vertices.push_back({ImVec2(x0, y1), ImVec2(glyph->U0, glyph->V1), col});
+            }
+            x += glyph->AdvanceX * scale;
+        }
+        width = ImMax(width, x);
+        l->lines.back().vtx_end = (int)l->vertices.size();
+        // As CalcTextSize, a trailing empty line does not count
+        const float height = (x > 0.f || y == 0.f) ? y + line_height : y;
+        l->size = ImVec2(IM_TRUNC(width + 0.99999f), height);
+    }
+
+    ImVec2 DCGTextLayoutUpdate(void* data, const std::string& text,
+                               float font_size, float wrap_width, ImU32 color)
+    {
+        DCGTextLayout* l = (DCGTextLayout*)data;
+        ImFont* font = ImGui::GetFont();
+        if (font_size <= 0.f)
+            font_size = ImGui::GetFontSize();
+        unsigned long long generation = dcg_text_layout_generation.load();
+        if (l->valid && l->font == font && l->font_size == font_size &&
+            l->wrap_width == wrap_width && l->color == color &&
+            l->generation == generation && l->text == text)
+            return l->size;
+        l->text = text;
+        l->font = font;
+        l->font_size = font_size;
+        l->wrap_width = wrap_width;
+        l->color = color;
+        l->generation = generation;
+        DCGTextLayoutBuild(l);
+        l->valid = true;
+        return l->size;
+    }
+
+    void DCGTextLayoutDraw(void* data, ImDrawList* target, ImVec2 pos)
+    {
+        typedef DCGTextLayout::Line Line;
+        const DCGTextLayout* l = (const DCGTextLayout*)data;
+        if (!l->valid || l->vertices.empty() || (l->color & IM_COL32_A_MASK) == 0)
+            return;
+        const float x = IM_TRUNC(pos.x), y = IM_TRUNC(pos.y);
+        // Lines intersecting the clipping region
+        const ImVec4& clip = target->_CmdHeader.ClipRect;
+        auto first = std::lower_bound(l->lines.begin(), l->lines.end(), clip.y - y,
+                                      [](const Line& line, float v) { return line.y1 < v; });
+        auto last = std::lower_bound(first, l->lines.end(), clip.w - y,
+                                     [](const Line& line, float v) { return line.y0 < v; });
+        if (first == last)
+            return;
+        const int vtx_start = first->vtx_start;
+        const int vtx_count = (last - 1)->vtx_end - vtx_start;
+        if (vtx_count == 0)
+            return;
+        ImTextureID texture = l->font->ContainerAtlas->TexID;
+        bool push_texture = texture != target->_CmdHeader.TextureId;
+        if (push_texture)
+            target->PushTextureID(texture);
+        target->PrimReserve(vtx_count / 4 * 6, vtx_count);
+        const ImDrawVert* vtx_src = l->vertices.data() + vtx_start;
+        ImDrawVert* vtx_dst = target->_VtxWritePtr;
+        ImDrawIdx* idx_dst = target->_IdxWritePtr;
+        const unsigned int idx = target->_VtxCurrentIdx;
+        for (int k = 0; k < vtx_count; k++) {
+            vtx_dst[k] = vtx_src[k];
+            vtx_dst[k].pos.x += x;
+            vtx_dst[k].pos.y += y;
+        }
+        for (int k = 0; k < vtx_count; k += 4) {
+            idx_dst[0] = (ImDrawIdx)(idx + k);
+            idx_dst[1] = (ImDrawIdx)(idx + k + 1);
+            idx_dst[2] = (ImDrawIdx)(idx + k + 2);
+            idx_dst[3] = (ImDrawIdx)(idx + k);
+            idx_dst[4] = (ImDrawIdx)(idx + k + 2);
+            idx_dst[5] = (ImDrawIdx)(idx + k + 3);
+            idx_dst += 6;
+        }
+        target->_VtxWritePtr += vtx_count;
+        target->_VtxCurrentIdx += vtx_count;
+        target->_IdxWritePtr = idx_dst;
+        if (push_texture)
+            target->PopTextureID();
+    }
+    """
+    void* DCGTextLayoutCreate()
+    void DCGTextLayoutDestroy(void*)
+    void DCGTextLayoutInvalidateAll()
+    imgui.ImVec2 DCGTextLayoutUpdate(void*, const string&, float, float, unsigned int)
+    void DCGTextLayoutDraw(void*, imgui.ImDrawList*, imgui.ImVec2)
+
+cdef void* create_text_layout() noexcept nogil:
+    """Allocates the cache of layout_text"""
+    return DCGTextLayoutCreate()
+
+cdef void destroy_text_layout(void* layout) noexcept nogil:
+    DCGTextLayoutDestroy(layout)
+
+cdef void invalidate_text_layouts() noexcept nogil:
+    """
+    To call when the glyphs of a font are modified or released:
+    all the layouts are computed again the next time they are used.
+    """
+    DCGTextLayoutInvalidateAll()
+
+cdef Vec2 layout_text(void* layout,
+                      const string& text,
+                      float size,
+                      float wrap_width,
+                      unsigned int color) noexcept nogil:
+    """
+    Lays out the text with the current font, and returns its size
+    (same as imgui.CalcTextSize). The line breaks and the glyph quads
+    are kept in the layout, and are only computed again when the
+    text, the font, the size, the wrap width or the color change.
+    size: 0 for the current font size.
+    wrap_width: <= 0 for no wrapping.
+    """
+    return ImVec2Vec2(DCGTextLayoutUpdate(layout, text, size, wrap_width, color))
+
+cdef void draw_text_layout(void* layout,
+                           void* drawlist,
+                           float x,
+                           float y) noexcept nogil:
+    """
+    Emits in the drawlist (imgui.ImDrawList*) the quads of the
+    lines of the last layout_text call that are in the clipping
+    region, the top left of the text being at (x, y).
+    """
+    DCGTextLayoutDraw(layout, <imgui.ImDrawList*>drawlist, imgui.ImVec2(x, y))
+
+
 
 """
 InvisibleDrawButton: main difference with InvisibleButton
@@ -6628,6 +7408,62 @@ cdef class Texture(baseItem):
         if not(success):
             raise MemoryError("Failed to upload target texture")
 
+    cdef void set_content_region(self, cnp.ndarray content, int x, int y):
+        # Updates the sub-rectangle starting at (x, y) of the
+        # current content. Contrary to set_content, the format
+        # (type and number of channels) must match the current
+        # content, and no reallocation is performed.
+        cdef unique_lock[recursive_mutex] m
+        cdef unique_lock[recursive_mutex] m2
+        lock_gil_friendly(m, self._write_mutex)
+        lock_gil_friendly(m2, self.mutex)
+        if self._readonly:
+            raise ValueError("Target texture is read-only")
+        if self.allocated_texture == NULL:
+            raise ValueError("Texture has no content to update")
+        cdef int ndim = cnp.PyArray_NDIM(content)
+        if ndim > 3 or ndim == 0:
+            raise ValueError("Invalid number of texture dimensions")
+        cdef int height = 1
+        cdef int width = 1
+        cdef int num_chans = 1
+        if ndim >= 1:
+            height = cnp.PyArray_DIM(content, 0)
+        if ndim >= 2:
+            width = cnp.PyArray_DIM(content, 1)
+        if ndim >= 3:
+            num_chans = cnp.PyArray_DIM(content, 2)
+        if width * height * num_chans == 0:
+            return
+        if num_chans != self.num_chans:
+            raise ValueError("The number of channels must match the texture content")
+        if x < 0 or y < 0 or x + width > self.width or y + height > self.height:
+            raise ValueError("Region outside the texture content")
+        content = np.asarray(content, dtype=np.uint8 if self._buffer_type == 1 else np.float32)
+        if ndim >= 2 and cnp.PyArray_STRIDE(content, 1) != (num_chans * (1 if self._buffer_type == 1 else 4)):
+            content = np.ascontiguousarray(content)
+        cdef unsigned stride = cnp.PyArray_STRIDE(content, 0)
+        cdef bint success
+        with nogil:
+            m2.unlock()
+            (<platformViewport*>self.context.viewport._platform).makeUploadContextCurrent()
+            m2.lock()
+            success = (<platformViewport*>self.context.viewport._platform).updateTextureRegion(
+                                                self.allocated_texture,
+                                                x,
+                                                y,
+                                                width,
+                                                height,
+                                                num_chans,
+                                                self._buffer_type,
+                                                cnp.PyArray_DATA(content),
+                                                stride)
+            (<platformViewport*>self.context.viewport._platform).releaseUploadContext()
+            m.unlock()
+            m2.unlock()
+        if not(success):
+            raise MemoryError("Failed to upload target texture")
+
 
 cdef class baseFont(baseItem):
     def __cinit__(self, context, *args, **kwargs):
@@ -6639,6 +7475,14 @@ cdef class baseFont(baseItem):
     cdef void pop(self) noexcept nogil:
         return
 
+    cdef void end_frame(self) noexcept nogil:
+        """
+        Called at the end of the frame, once all
+        items have been drawn, for the fonts registered
+        in the viewport _frame_end_fonts list.
+        """
+        return
+
 
 cdef class baseTheme(baseItem):
     """
@@ -1643,7 +1643,15 @@ def add_2d_histogram_series(x : Union[List[float], Tuple[float, ...]], y : Union
         warnings.warn('id keyword renamed to tag', DeprecationWarning, 2)
         tag=kwargs['id']
 
-    #return add_2d_histogram_series(x, y, label=label, user_data=user_data, show=show, xbins=xbins, ybins=ybins, xmin_range=xmin_range, xmax_range=xmax_range, ymin_range=ymin_range, ymax_range=ymax_range, density=density, outliers=outliers, col_major=col_major, **kwargs)
+    parent = kwargs.pop("parent", None)
+    if parent is None:
+        axis_y = LOCAL_STORAGE.CURRENT_Y_AXIS
+    else:
+        axis_y = parent
+
+    plot = axis_y.plot
+
+    return dcg.PlotHistogram2D(CONTEXT, parent=plot, axes=(dcg.Axis.X1, axis_y.axis), X=x, Y=y, label=label, user_data=user_data, show=show, x_bins=xbins, y_bins=ybins, x_min_range=xmin_range, x_max_range=xmax_range, y_min_range=ymin_range, y_max_range=ymax_range, density=density, no_outliers=not(outliers), **kwargs)
 
 def add_3d_slider(*, label: str =None, user_data: Any =None, width: int =0, height: int =0, indent: int =0, payload_type: str ='$$DPG_PAYLOAD', callback: Callable =None, drag_callback: Callable =None, drop_callback: Callable =None, show: bool =True, pos: Union[List[int], Tuple[int, ...]] =[], filter_key: str ='', tracked: bool =False, track_offset: float =0.5, default_value: Union[List[float], Tuple[float, ...]] =(0.0, 0.0, 0.0, 0.0), max_x: float =100.0, max_y: float =100.0, max_z: float =100.0, min_x: float =0.0, min_y: float =0.0, min_z: float =0.0, scale: float =1.0, **kwargs) -> Union[int, str]:
     """     Adds a 3D box slider.
@@ -3373,7 +3381,17 @@ def heat_series(x : Union[List[float], Tuple[float, ...]], rows : int, cols : in
         warnings.warn('id keyword renamed to tag', DeprecationWarning, 2)
         tag=kwargs['id']
 
-    #return heat_series(x, rows, cols, label=label, user_data=user_data, show=show, scale_min=scale_min, scale_max=scale_max, bounds_min=bounds_min, bounds_max=bounds_max, format=format, contribute_to_bounds=contribute_to_bounds, col_major=col_major, **kwargs)
+    parent = kwargs.pop("parent", None)
+    if parent is None:
+        axis_y = LOCAL_STORAGE.CURRENT_Y_AXIS
+    else:
+        axis_y = parent
+
+    plot = axis_y.plot
+
+    values = np.asarray(x).reshape((rows, cols), order='F' if col_major else 'C')
+
+    return dcg.PlotHeatmap(CONTEXT, parent=plot, axes=(dcg.Axis.X1, axis_y.axis), values=values, label=label, user_data=user_data, show=show, scale_min=scale_min, scale_max=scale_max, bounds_min=bounds_min, bounds_max=bounds_max, label_format=format, ignore_fit=not(contribute_to_bounds), **kwargs)
 
 def histogram_series(x : Union[List[float], Tuple[float, ...]], *, label: str =None, user_data: Any =None, show: bool =True, bins: int =-1, bar_scale: float =1.0, min_range: float =0.0, max_range: float =0.0, cumulative: bool =False, density: bool =False, outliers: bool =True, horizontal: bool =False, contribute_to_bounds: bool =True, **kwargs) -> Union[int, str]:
     """     Adds a histogram series to a plot.
@@ -3408,9 +3426,17 @@ def histogram_series(x : Union[List[float], Tuple[float, ...]], *, label: str =N
 
     if 'cumlative' in kwargs.keys():
         warnings.warn('cumlative keyword renamed to cumulative', DeprecationWarning, 2)
-        cumulative=kwargs['cumlative']
+        cumulative=kwargs.pop('cumlative')
+
+    parent = kwargs.pop("parent", None)
+    if parent is None:
+        axis_y = LOCAL_STORAGE.CURRENT_Y_AXIS
+    else:
+        axis_y = parent
+
+    plot = axis_y.plot
 
-    #return histogram_series(x, label=label, user_data=user_data, show=show, bins=bins, bar_scale=bar_scale, min_range=min_range, max_range=max_range, cumulative=cumulative, density=density, outliers=outliers, horizontal=horizontal, contribute_to_bounds=contribute_to_bounds, **kwargs)
+    return dcg.PlotHistogram(CONTEXT, parent=plot, axes=(dcg.Axis.X1, axis_y.axis), X=x, label=label, user_data=user_data, show=show, bins=bins, bar_scale=bar_scale, min_range=min_range, max_range=max_range, cumulative=cumulative, density=density, no_outliers=not(outliers), horizontal=horizontal, ignore_fit=not(contribute_to_bounds), **kwargs)
 
 def image(texture_tag : Union[int, str], *, label: str =None, user_data: Any =None, width: int =0, height: int =0, indent: int =0, payload_type: str ='$$DPG_PAYLOAD', drag_callback: Callable =None, drop_callback: Callable =None, show: bool =True, pos: Union[List[int], Tuple[int, ...]] =[], filter_key: str ='', tracked: bool =False, track_offset: float =0.5, tint_color: Union[List[float], Tuple[float, ...]] =-1, border_color: Union[List[float], Tuple[float, ...]] =(0, 0, 0, 0), uv_min: Union[List[float], Tuple[float, ...]] =(0.0, 0.0), uv_max: Union[List[float], Tuple[float, ...]] =(1.0, 1.0), **kwargs) -> Union[int, str]:
     """     Adds an image from a specified texture. uv_min and uv_max represent the normalized texture coordinates of the original image that will be shown. Using range (0.0,0.0)->(1.0,1.0) for texture coordinates will generally display the entire texture.
@@ -1,15 +1,34 @@
-from .core cimport drawingItem, Texture, baseFont, SharedValue
+from .core cimport drawingItem, Texture, baseFont, SharedValue, Callback
+from .font cimport FontRenderer
 from .c_types cimport double2, float2
 
 from libcpp.string cimport string
 from libcpp.vector cimport vector
 
+cimport numpy as cnp
+
 cdef class ViewportDrawList(drawingItem):
     cdef bint _front
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawingList(drawingItem):
-    pass
+    cdef bint _indexed
+    cdef void* _index
+    cdef float _index_margin
+    cdef void build_index(self) noexcept nogil
+    cdef void draw_indexed(self, void*) noexcept nogil
+    cdef void update_bounds(self) noexcept nogil
+    cdef void draw(self, void*) noexcept nogil
+
+cdef class DrawingLayer(drawingItem):
+    cdef void* _recorder
+    cdef Texture _texture
+    cdef bint _dirty
+    cdef float[6] _reference
+    cdef float[3] _multipliers
+    cdef float[4] _region
+    cdef bint resize_texture(self, int, int) noexcept nogil
+    cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawingClip(drawingItem):
     cdef double[2] _pmin
@@ -37,6 +56,7 @@ cdef class DrawArrow(drawingItem):
     cdef unsigned int _color # imgui.ImU32
     cdef float _thickness
     cdef float _size
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
     cdef void __compute_tip(self)
 
@@ -48,6 +68,7 @@ cdef class DrawBezierCubic(drawingItem):
     cdef unsigned int _color # imgui.ImU32
     cdef float _thickness
     cdef int _segments
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawBezierQuadratic(drawingItem):
@@ -57,6 +78,7 @@ cdef class DrawBezierQuadratic(drawingItem):
     cdef unsigned int _color # imgui.ImU32
     cdef float _thickness
     cdef int _segments
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawCircle(drawingItem):
@@ -66,6 +88,31 @@ cdef class DrawCircle(drawingItem):
     cdef unsigned int _fill # imgui.ImU32
     cdef float _thickness
     cdef int _segments
+    cdef void update_bounds(self) noexcept nogil
+    cdef void draw(self, void*) noexcept nogil
+
+cdef class DrawCircles(drawingItem):
+    cdef cnp.ndarray _centers # (N, 2) float64 or float32
+    cdef cnp.ndarray _radii # (N,) float32
+    cdef cnp.ndarray _color # (N,) uint32 (imgui.ImU32)
+    cdef cnp.ndarray _fill # (N,) uint32 (imgui.ImU32)
+    cdef cnp.ndarray _thickness # (N,) float32
+    cdef int _segments
+    cdef void update_bounds(self) noexcept nogil
+    cdef void draw(self, void*) noexcept nogil
+
+cdef class DrawDragPoints(drawingItem):
+    cdef cnp.ndarray _points # (N, 2) float64, C-contiguous, writeable
+    cdef float _radius
+    cdef unsigned int _color # imgui.ImU32
+    cdef unsigned int _hovered_color # imgui.ImU32
+    cdef Callback _callback
+    cdef double _callback_interval
+    cdef double _last_callback_time
+    cdef int _hovered_index
+    cdef int _active_index
+    cdef float[2] _grab_offset
+    cdef vector[int] _changed
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawEllipse(drawingItem):
@@ -77,6 +124,7 @@ cdef class DrawEllipse(drawingItem):
     cdef int _segments
     cdef vector[double2] _points
     cdef void __fill_points(self)
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawImage(drawingItem):
@@ -97,6 +145,7 @@ cdef class DrawImage(drawingItem):
     cdef Texture _texture
     cdef void update_center(self) noexcept nogil
     cdef void update_extremities(self) noexcept nogil
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawLine(drawingItem):
@@ -109,22 +158,46 @@ cdef class DrawLine(drawingItem):
     cdef float _thickness
     cdef void update_center(self) noexcept nogil
     cdef void update_extremities(self) noexcept nogil
+    cdef void update_bounds(self) noexcept nogil
+    cdef void draw(self, void*) noexcept nogil
+
+cdef class DrawLines(drawingItem):
+    cdef cnp.ndarray _p1 # (N, 2) float64 or float32
+    cdef cnp.ndarray _p2 # (N, 2) float64 or float32
+    cdef cnp.ndarray _color # (N,) uint32 (imgui.ImU32)
+    cdef cnp.ndarray _thickness # (N,) float32
+    cdef void update_bounds(self) noexcept nogil
+    cdef void draw(self, void*) noexcept nogil
+
+cdef class DrawMesh(drawingItem):
+    cdef cnp.ndarray _vertices # (N, 2) float64 or float32
+    cdef cnp.ndarray _indices # (M, 3) uint32
+    cdef long long _max_index
+    cdef cnp.ndarray _color # (N,) uint32 (imgui.ImU32)
+    cdef cnp.ndarray _uv # (N, 2) float32
+    cdef Texture _texture
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawPolyline(drawingItem):
     cdef unsigned int _color # imgui.ImU32
     cdef float _thickness
     cdef bint _closed
-    cdef vector[double2] _points
+    cdef cnp.ndarray _points # (N, 2) float64 or float32
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawPolygon(drawingItem):
     cdef unsigned int _color # imgui.ImU32
     cdef unsigned int _fill # imgui.ImU32
     cdef float _thickness
-    cdef vector[double2] _points
-    cdef int[:,:] _triangulation_indices
-    cdef void __triangulate(self)
+    cdef cnp.ndarray _points # (N, 2) float64 or float32
+    cdef cnp.ndarray _hole_points # (M, 2) float64, all holes
+    cdef vector[int] _hole_starts
+    cdef vector[unsigned int] _triangulation_indices
+    cdef bint _triangulation_dirty
+    cdef void triangulate(self) noexcept nogil
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawQuad(drawingItem):
@@ -135,6 +208,7 @@ cdef class DrawQuad(drawingItem):
     cdef unsigned int _color # imgui.ImU32
     cdef unsigned int _fill # imgui.ImU32
     cdef float _thickness
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawRect(drawingItem):
@@ -149,6 +223,17 @@ cdef class DrawRect(drawingItem):
     cdef float _rounding
     cdef float _thickness
     cdef bint _multicolor
+    cdef void update_bounds(self) noexcept nogil
+    cdef void draw(self, void*) noexcept nogil
+
+cdef class DrawRects(drawingItem):
+    cdef cnp.ndarray _pmin # (N, 2) float64 or float32
+    cdef cnp.ndarray _pmax # (N, 2) float64 or float32
+    cdef cnp.ndarray _color # (N,) uint32 (imgui.ImU32)
+    cdef cnp.ndarray _fill # (N,) uint32 (imgui.ImU32)
+    cdef cnp.ndarray _thickness # (N,) float32
+    cdef float _rounding
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawRegularPolygon(drawingItem):
@@ -161,6 +246,7 @@ cdef class DrawRegularPolygon(drawingItem):
     cdef int _num_points
     cdef vector[float2] _points
     cdef bint _dirty
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawStar(drawingItem):
@@ -175,6 +261,7 @@ cdef class DrawStar(drawingItem):
     cdef vector[float2] _points
     cdef vector[float2] _inner_points
     cdef bint _dirty
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawText(drawingItem):
@@ -183,6 +270,46 @@ cdef class DrawText(drawingItem):
     cdef unsigned int _color # imgui.ImU32
     cdef float _size
     cdef baseFont _font
+    cdef void* _layout
+    cdef void draw(self, void*) noexcept nogil
+
+cdef class DrawTexts(drawingItem):
+    cdef cnp.ndarray _pos # (N, 2) float64 or float32
+    cdef string _text_data # all texts, concatenated
+    cdef vector[int] _text_starts
+    cdef cnp.ndarray _color # (N,) uint32 (imgui.ImU32)
+    cdef float _size
+    cdef baseFont _font
+    cdef void draw(self, void*) noexcept nogil
+
+cdef class DrawLabels(drawingItem):
+    cdef cnp.ndarray _pos # (N, 2) float64 or float32
+    cdef list _texts
+    cdef cnp.ndarray _color # (N,) uint32 (imgui.ImU32)
+    cdef cnp.ndarray _priority # (N,) float32
+    cdef cnp.ndarray _order # (N,) int32, decreasing priority. Empty if broadcast
+    cdef cnp.ndarray _min_scale # (N,) float32
+    cdef FontRenderer _font_renderer
+    cdef float _size
+    cdef float[2] _alignment
+    cdef bint _avoid_overlaps
+    cdef void* _overlaps # DCGOverlapGrid*
+    # Atlas of the rendered texts
+    cdef Texture _texture
+    cdef cnp.ndarray _atlas # (H, W, 4) uint8
+    cdef dict _atlas_entries # text -> index in _rects, or -1 if empty
+    cdef cnp.ndarray _rects # (M, 4) int32: x, y, width, height in _atlas
+    cdef cnp.ndarray _label_entry # (N,) int32 index in _rects of each label
+    cdef int _shelf_x
+    cdef int _shelf_y
+    cdef int _shelf_height
+    cdef int _max_label_size
+    cdef float _raster_scale # global scale at which the atlas was rendered
+    cdef bint _atlas_dirty
+    cdef bint _atlas_reset
+    cdef void _update_atlas(self)
+    cdef void _reset_atlas(self, int height)
+    cdef object _pack(self, cnp.ndarray boxes)
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawTriangle(drawingItem):
@@ -192,6 +319,7 @@ cdef class DrawTriangle(drawingItem):
     cdef unsigned int _color # imgui.ImU32
     cdef unsigned int _fill # imgui.ImU32
     cdef float _thickness
+    cdef void update_bounds(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawValue(drawingItem):
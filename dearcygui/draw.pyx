@@ -15,22 +15,634 @@
 #distutils: language=c++
 
 from dearcygui.wrapper cimport imgui
-from .core cimport baseItem, drawingItem, \
-    lock_gil_friendly, draw_drawing_children, read_point, read_coord
-from .widget cimport SharedBool, SharedInt, SharedFloat, SharedDouble, \
+from .core cimport baseItem, drawingItem, Viewport, Texture, Callback, \
+    lock_gil_friendly, button_area, draw_drawing_children, draw_drawing_children_cached, \
+    drawing_view_translation, \
+    read_point, read_coord, \
+    create_text_layout, destroy_text_layout, layout_text, draw_text_layout
+from .backends.backend cimport platformViewport
+from .widget cimport DrawInvisibleButton, SharedBool, SharedInt, SharedFloat, SharedDouble, \
     SharedColor, SharedInt4, SharedFloat4, SharedDouble4, SharedStr
 from .imgui_types cimport \
     unparse_color, parse_color
 from .c_types cimport *
 from .types cimport child_type, Coord
+from .core import _cached_property
+from .font cimport FontRenderer
 
 from libcpp.algorithm cimport swap
-from libcpp.cmath cimport atan, atan2, sin, cos, sqrt, trunc, floor, round as cround
-from libc.math cimport M_PI, INFINITY
+from libcpp.cmath cimport atan, atan2, sin, cos, sqrt, trunc, floor, ceil, round as cround
+from libcpp.vector cimport vector
+from libc.math cimport M_PI, INFINITY, fabs, fmin, fmax, isinf
+from libc.string cimport memchr, memcpy
 from libcpp cimport bool
+from cpython.ref cimport PyObject
+from cpython.object cimport PyTypeObject
 
-import scipy
-import scipy.spatial
+import numpy as np
+cimport numpy as cnp
+cnp.import_array()
+import traceback
+
+
+cdef extern from * nogil:
+    """
+    #include <algorithm>
+    #include <cmath>
+    #include <vector>
+
+    /* Ear clipping triangulation of polygons with holes.
+       Port of the mapbox earcut algorithm (without z-order hashing).
+       Nodes are referenced by index as the pool may grow. */
+    class DCGEarcut {
+    public:
+        /* points: (x, y) doubles of all the rings, outer ring first.
+           ring_starts: num_rings + 1 offsets (in points) of the rings.
+           Appends the triangles (point indices) to triangles. */
+        void triangulate(const double* points, const int* ring_starts, int num_rings,
+                         std::vector<unsigned int>& triangles)
+        {
+            nodes.clear();
+            out = &triangles;
+            if (num_rings <= 0)
+                return;
+            int outer = linkedList(points, ring_starts[0], ring_starts[1], true);
+            if (outer < 0 || nodes[outer].next == nodes[outer].prev)
+                return;
+            if (num_rings > 1)
+                outer = eliminateHoles(points, ring_starts, num_rings, outer);
+            earcutLinked(outer, 0);
+        }
+
+    private:
+        struct Node {
+            int i;
+            double x, y;
+            int prev, next;
+        };
+        std::vector<Node> nodes;
+        std::vector<unsigned int>* out;
+
+        inline Node& N(int k) { return nodes[k]; }
+
+        int createNode(int i, double x, double y)
+        {
+            Node n;
+            n.i = i; n.x = x; n.y = y; n.prev = -1; n.next = -1;
+            nodes.push_back(n);
+            return (int)nodes.size() - 1;
+        }
+
+        int insertNode(int i, double x, double y, int last)
+        {
+            int p = createNode(i, x, y);
+            if (last < 0) {
+                N(p).prev = p;
+                N(p).next = p;
+            } else {
+                N(p).next = N(last).next;
+                N(p).prev = last;
+                N(N(last).next).prev = p;
+                N(last).next = p;
+            }
+            return p;
+        }
+
+        void removeNode(int p)
+        {
+            N(N(p).next).prev = N(p).prev;
+            N(N(p).prev).next = N(p).next;
+        }
+
+        bool equals(int a, int b) { return N(a).x == N(b).x && N(a).y == N(b).y; }
+
+        double area(int p, int q, int r)
+        {
+            return (N(q).y - N(p).y) * (N(r).x - N(q).x) - (N(q).x - N(p).x) * (N(r).y - N(q).y);
+        }
+
+        static bool pointInTriangle(double ax, double ay, double bx, double by,
+                                    double cx, double cy, double px, double py)
+        {
+            return (cx - px) * (ay - py) >= (ax - px) * (cy - py) &&
+                   (ax - px) * (by - py) >= (bx - px) * (ay - py) &&
+                   (bx - px) * (cy - py) >= (cx - px) * (by - py);
+        }
+
+        int linkedList(const double* points, int start, int end, bool clockwise)
+        {
+            double sum = 0.;
+            for (int i = start, j = end - 1; i < end; j = i++)
+                sum += (points[2*j] - points[2*i]) * (points[2*i+1] + points[2*j+1]);
+            int last = -1;
+            if (clockwise == (sum > 0)) {
+                for (int i = start; i < end; i++)
+                    last = insertNode(i, points[2*i], points[2*i+1], last);
+            } else {
+                for (int i = end - 1; i >= start; i--)
+                    last = insertNode(i, points[2*i], points[2*i+1], last);
+            }
+            if (last >= 0 && equals(last, N(last).next)) {
+                int next = N(last).next;
+                removeNode(last);
+                last = next;
+            }
+            return last;
+        }
+
+        int filterPoints(int start, int end = -1)
+        {
+            if (start < 0)
+                return start;
+            if (end < 0)
+                end = start;
+            int p = start;
+            bool again;
+            do {
+                again = false;
+                if (equals(p, N(p).next) || area(N(p).prev, p, N(p).next) == 0.) {
+                    removeNode(p);
+                    p = end = N(p).prev;
+                    if (p == N(p).next)
+                        break;
+                    again = true;
+                } else {
+                    p = N(p).next;
+                }
+            } while (again || p != end);
+            return end;
+        }
+
+        bool isEar(int ear)
+        {
+            int a = N(ear).prev, b = ear, c = N(ear).next;
+            if (area(a, b, c) >= 0.)
+                return false; /* reflex */
+            int p = N(c).next;
+            while (p != a) {
+                if (pointInTriangle(N(a).x, N(a).y, N(b).x, N(b).y, N(c).x, N(c).y, N(p).x, N(p).y) &&
+                    area(N(p).prev, p, N(p).next) >= 0.)
+                    return false;
+                p = N(p).next;
+            }
+            return true;
+        }
+
+        void pushTriangle(int a, int b, int c)
+        {
+            out->push_back((unsigned int)N(a).i);
+            out->push_back((unsigned int)N(b).i);
+            out->push_back((unsigned int)N(c).i);
+        }
+
+        void earcutLinked(int ear, int pass)
+        {
+            if (ear < 0)
+                return;
+            int stop = ear;
+            while (N(ear).prev != N(ear).next) {
+                int prev = N(ear).prev, next = N(ear).next;
+                if (isEar(ear)) {
+                    pushTriangle(prev, ear, next);
+                    removeNode(ear);
+                    ear = N(next).next;
+                    stop = N(next).next;
+                    continue;
+                }
+                ear = next;
+                if (ear == stop) {
+                    /* No ear found: try to recover */
+                    if (pass == 0) {
+                        earcutLinked(filterPoints(ear), 1);
+                    } else if (pass == 1) {
+                        ear = cureLocalIntersections(filterPoints(ear));
+                        earcutLinked(ear, 2);
+                    } else if (pass == 2) {
+                        splitEarcut(ear);
+                    }
+                    break;
+                }
+            }
+        }
+
+        static int sign(double v) { return v > 0. ? 1 : (v < 0. ? -1 : 0); }
+
+        bool onSegment(int p, int q, int r)
+        {
+            return N(q).x <= std::max(N(p).x, N(r).x) && N(q).x >= std::min(N(p).x, N(r).x) &&
+                   N(q).y <= std::max(N(p).y, N(r).y) && N(q).y >= std::min(N(p).y, N(r).y);
+        }
+
+        bool intersects(int p1, int q1, int p2, int q2)
+        {
+            int o1 = sign(area(p1, q1, p2));
+            int o2 = sign(area(p1, q1, q2));
+            int o3 = sign(area(p2, q2, p1));
+            int o4 = sign(area(p2, q2, q1));
+            if (o1 != o2 && o3 != o4) return true;
+            if (o1 == 0 && onSegment(p1, p2, q1)) return true;
+            if (o2 == 0 && onSegment(p1, q2, q1)) return true;
+            if (o3 == 0 && onSegment(p2, p1, q2)) return true;
+            if (o4 == 0 && onSegment(p2, q1, q2)) return true;
+            return false;
+        }
+
+        bool locallyInside(int a, int b)
+        {
+            return area(N(a).prev, a, N(a).next) < 0. ?
+                area(a, b, N(a).next) >= 0. && area(a, N(a).prev, b) >= 0. :
+                area(a, b, N(a).prev) < 0. || area(a, N(a).next, b) < 0.;
+        }
+
+        int cureLocalIntersections(int start)
+        {
+            int p = start;
+            do {
+                int a = N(p).prev, b = N(N(p).next).next;
+                if (!equals(a, b) && intersects(a, p, N(p).next, b) &&
+                    locallyInside(a, b) && locallyInside(b, a)) {
+                    pushTriangle(a, p, b);
+                    int pn = N(p).next;
+                    removeNode(p);
+                    removeNode(pn);
+                    p = start = b;
+                }
+                p = N(p).next;
+            } while (p != start);
+            return filterPoints(p);
+        }
+
+        bool intersectsPolygon(int a, int b)
+        {
+            int p = a;
+            do {
+                int pn = N(p).next;
+                if (N(p).i != N(a).i && N(pn).i != N(a).i && N(p).i != N(b).i && N(pn).i != N(b).i &&
+                    intersects(p, pn, a, b))
+                    return true;
+                p = pn;
+            } while (p != a);
+            return false;
+        }
+
+        bool middleInside(int a, int b)
+        {
+            int p = a;
+            bool inside = false;
+            double px = (N(a).x + N(b).x) / 2., py = (N(a).y + N(b).y) / 2.;
+            do {
+                int pn = N(p).next;
+                if (((N(p).y > py) != (N(pn).y > py)) && N(pn).y != N(p).y &&
+                    (px < (N(pn).x - N(p).x) * (py - N(p).y) / (N(pn).y - N(p).y) + N(p).x))
+                    inside = !inside;
+                p = pn;
+            } while (p != a);
+            return inside;
+        }
+
+        bool isValidDiagonal(int a, int b)
+        {
+            return N(N(a).next).i != N(b).i && N(N(a).prev).i != N(b).i && !intersectsPolygon(a, b) &&
+                ((locallyInside(a, b) && locallyInside(b, a) && middleInside(a, b) &&
+                  (area(N(a).prev, a, N(b).prev) != 0. || area(a, N(b).prev, b) != 0.)) ||
+                 (equals(a, b) && area(N(a).prev, a, N(a).next) > 0. && area(N(b).prev, b, N(b).next) > 0.));
+        }
+
+        /* Links a and b with a bridge. Returns the copy of b */
+        int splitPolygon(int a, int b)
+        {
+            int a2 = createNode(N(a).i, N(a).x, N(a).y);
+            int b2 = createNode(N(b).i, N(b).x, N(b).y);
+            int an = N(a).next, bp = N(b).prev;
+            N(a).next = b; N(b).prev = a;
+            N(a2).next = an; N(an).prev = a2;
+            N(b2).next = a2; N(a2).prev = b2;
+            N(bp).next = b2; N(b2).prev = bp;
+            return b2;
+        }
+
+        void splitEarcut(int start)
+        {
+            int a = start;
+            do {
+                int b = N(N(a).next).next;
+                while (b != N(a).prev) {
+                    if (N(a).i != N(b).i && isValidDiagonal(a, b)) {
+                        int c = splitPolygon(a, b);
+                        a = filterPoints(a, N(a).next);
+                        c = filterPoints(c, N(c).next);
+                        earcutLinked(a, 0);
+                        earcutLinked(c, 0);
+                        return;
+                    }
+                    b = N(b).next;
+                }
+                a = N(a).next;
+            } while (a != start);
+        }
+
+        int getLeftmost(int start)
+        {
+            int p = start, leftmost = start;
+            do {
+                if (N(p).x < N(leftmost).x || (N(p).x == N(leftmost).x && N(p).y < N(leftmost).y))
+                    leftmost = p;
+                p = N(p).next;
+            } while (p != start);
+            return leftmost;
+        }
+
+        bool sectorContainsSector(int m, int p)
+        {
+            return area(N(m).prev, m, N(p).prev) < 0. && area(N(p).next, m, N(m).prev) < 0.;
+        }
+
+        int findHoleBridge(int hole, int outer)
+        {
+            int p = outer;
+            double hx = N(hole).x, hy = N(hole).y;
+            double qx = -INFINITY;
+            int m = -1;
+            /* Find a segment intersected by a ray from the hole's
+               leftmost point to the left */
+            do {
+                int pn = N(p).next;
+                if (hy <= N(p).y && hy >= N(pn).y && N(pn).y != N(p).y) {
+                    double x = N(p).x + (hy - N(p).y) * (N(pn).x - N(p).x) / (N(pn).y - N(p).y);
+                    if (x <= hx && x > qx) {
+                        qx = x;
+                        m = N(p).x < N(pn).x ? p : pn;
+                        if (x == hx)
+                            return m;
+                    }
+                }
+                p = pn;
+            } while (p != outer);
+            if (m < 0)
+                return -1;
+            /* Look for points inside the triangle (hole point,
+               intersection, endpoint). The one with the smallest
+               angle with the ray is the connection point */
+            int stop = m;
+            double mx = N(m).x, my = N(m).y;
+            double tan_min = INFINITY;
+            p = m;
+            do {
+                if (hx >= N(p).x && N(p).x >= mx && hx != N(p).x &&
+                    pointInTriangle(hy < my ? hx : qx, hy, mx, my, hy < my ? qx : hx, hy, N(p).x, N(p).y)) {
+                    double tan_cur = std::fabs(hy - N(p).y) / (hx - N(p).x);
+                    if (locallyInside(p, hole) &&
+                        (tan_cur < tan_min || (tan_cur == tan_min &&
+                         (N(p).x > N(m).x || (N(p).x == N(m).x && sectorContainsSector(m, p)))))) {
+                        m = p;
+                        tan_min = tan_cur;
+                    }
+                }
+                p = N(p).next;
+            } while (p != stop);
+            return m;
+        }
+
+        int eliminateHole(int hole, int outer)
+        {
+            int bridge = findHoleBridge(hole, outer);
+            if (bridge < 0)
+                return outer;
+            int bridge_reverse = splitPolygon(bridge, hole);
+            filterPoints(bridge_reverse, N(bridge_reverse).next);
+            return filterPoints(bridge, N(bridge).next);
+        }
+
+        int eliminateHoles(const double* points, const int* ring_starts, int num_rings, int outer)
+        {
+            std::vector<int> queue;
+            for (int r = 1; r < num_rings; r++) {
+                int list = linkedList(points, ring_starts[r], ring_starts[r+1], false);
+                if (list < 0)
+                    continue;
+                if (list == N(list).next)
+                    continue;
+                queue.push_back(getLeftmost(list));
+            }
+            std::sort(queue.begin(), queue.end(),
+                      [this](int a, int b) { return N(a).x < N(b).x; });
+            for (size_t k = 0; k < queue.size(); k++)
+                outer = eliminateHole(queue[k], outer);
+            return outer;
+        }
+    };
+
+    /* Returns the triangle indices (3 per triangle) of the polygon */
+    void DCGTriangulatePolygon(const double* points, const int* ring_starts, int num_rings,
+                               std::vector<unsigned int>& triangles)
+    {
+        DCGEarcut earcut;
+        triangles.clear();
+        earcut.triangulate(points, ring_starts, num_rings, triangles);
+    }
+    """
+    void DCGTriangulatePolygon(const double*, const int*, int, vector[unsigned int]&)
+
+
+cdef cnp.ndarray read_points_array(value):
+    """
+    Converts value into a (N, 2) array of points.
+
+    float64 and float32 arrays whose two coordinates
+    are contiguous for each point (any stride between
+    points) are used without copy. Other inputs,
+    including lists of coordinates, are converted to
+    float64.
+    """
+    cdef cnp.ndarray array
+    cdef double2 p
+    cdef int i
+    try:
+        array = np.asarray(value)
+    except Exception:
+        array = None
+    if array is None or array.ndim != 2 or array.shape[1] != 2 or \
+       not(np.issubdtype(array.dtype, np.number)):
+        # Generic sequence of coordinates
+        array = np.empty((len(value), 2), dtype=np.float64)
+        for i in range(len(value)):
+            read_coord(p.p, value[i])
+            array[i, 0] = p.p[0]
+            array[i, 1] = p.p[1]
+        return array
+    if (cnp.PyArray_TYPE(array) == cnp.NPY_DOUBLE or \
+        cnp.PyArray_TYPE(array) == cnp.NPY_FLOAT) and \
+       cnp.PyArray_ISNOTSWAPPED(array) and \
+       cnp.PyArray_STRIDE(array, 1) == cnp.PyArray_ITEMSIZE(array):
+        return array
+    return np.ascontiguousarray(array, dtype=np.float64)
+
+cdef inline void points_to_screen(Viewport viewport,
+                                  vector[imgui.ImVec2] &dst,
+                                  cnp.ndarray points,
+                                  int start=0) noexcept nogil:
+    """
+    Transforms an array returned by read_points_array into
+    screen coordinates, written in dst starting from index start.
+    """
+    cdef int count = points.shape[0]
+    dst.resize(start + count)
+    if count == 0:
+        return
+    if cnp.PyArray_TYPE(points) == cnp.NPY_FLOAT:
+        viewport.coordinates_to_screen_float(<float*>(dst.data() + start),
+                                             <const float*>cnp.PyArray_DATA(points),
+                                             count,
+                                             cnp.PyArray_STRIDE(points, 0))
+    else:
+        viewport.coordinates_to_screen(<float*>(dst.data() + start),
+                                       <const double*>cnp.PyArray_DATA(points),
+                                       count,
+                                       cnp.PyArray_STRIDE(points, 0))
+
+
+cdef cnp.ndarray read_values_array(value):
+    """
+    Reads a scalar, or a sequence of values, as a (N,) float32 array.
+    float32 arrays are used as is, without copy.
+    """
+    return np.ascontiguousarray(np.atleast_1d(value), dtype=np.float32).reshape(-1)
+
+cdef cnp.ndarray read_colors_array(value):
+    """
+    Reads a single color, or a sequence of colors,
+    as a (N,) uint32 array of packed colors.
+
+    A single color accepts the same formats as parse_color.
+    A sequence can be a (N,) array of packed colors (used without
+    copy if uint32), or a (N, 3) or (N, 4) array of components,
+    integers in the [0, 255] range or floats in the [0, 1] range.
+    """
+    if not(isinstance(value, np.ndarray)):
+        try:
+            return np.array([parse_color(value)], dtype=np.uint32)
+        except (TypeError, ValueError):
+            value = np.asarray(value)
+    if value.ndim <= 1:
+        if value.dtype.kind in 'iu':
+            return np.ascontiguousarray(np.atleast_1d(value), dtype=np.uint32)
+        return np.array([parse_color(value.tolist())], dtype=np.uint32)
+    if value.ndim != 2 or value.shape[1] not in (3, 4):
+        raise ValueError("Colors must be a (N,) array of packed colors, or a (N, 3) or (N, 4) array")
+    if value.dtype.kind == 'f':
+        # Same rounding as imgui ColorConvertFloat4ToU32
+        value = np.clip(value, 0., 1.) * 255. + 0.5
+    components = np.asarray(value, dtype=np.uint32)
+    colors = components[:, 0] | (components[:, 1] << 8) | (components[:, 2] << 16)
+    if components.shape[1] == 4:
+        colors |= components[:, 3] << 24
+    else:
+        colors |= np.uint32(0xff000000)
+    return np.ascontiguousarray(colors, dtype=np.uint32)
+
+cdef inline int batch_size(int count, cnp.ndarray column) noexcept nogil:
+    """
+    Number of elements of a batch that can be drawn, given
+    one of its columns. A column with a single element is
+    broadcast to all the elements.
+    """
+    cdef int size = column.shape[0]
+    if size == 1:
+        return count
+    return min(count, size)
+
+cdef inline int batch_step(cnp.ndarray column) noexcept nogil:
+    """Index increment of a column (0 when the column is broadcast)"""
+    return 0 if column.shape[0] == 1 else 1
+
+cdef inline bint is_outside_clip(imgui.ImVec2 &clip_min,
+                                 imgui.ImVec2 &clip_max,
+                                 float xmin, float ymin,
+                                 float xmax, float ymax) noexcept nogil:
+    """Returns whether a screen space bounding box is outside the clip rect"""
+    return xmax < clip_min.x or ymax < clip_min.y or \
+           xmin > clip_max.x or ymin > clip_max.y
+
+
+cdef inline void reset_bounds(drawingItem item) noexcept nogil:
+    """Sets empty bounds, to be extended with the item geometry"""
+    item._bounds[0] = INFINITY
+    item._bounds[1] = INFINITY
+    item._bounds[2] = -INFINITY
+    item._bounds[3] = -INFINITY
+    item._bounds_margin = 0.
+
+cdef inline void extend_bounds(drawingItem item, const double* p) noexcept nogil:
+    """Extends the bounds of item to contain p"""
+    item._bounds[0] = fmin(item._bounds[0], p[0])
+    item._bounds[1] = fmin(item._bounds[1], p[1])
+    item._bounds[2] = fmax(item._bounds[2], p[0])
+    item._bounds[3] = fmax(item._bounds[3], p[1])
+
+cdef void extend_bounds_array(drawingItem item, cnp.ndarray points) noexcept nogil:
+    """Extends the bounds of item to contain an array returned by read_points_array"""
+    cdef int count = points.shape[0]
+    cdef const char* data = <const char*>cnp.PyArray_DATA(points)
+    cdef Py_ssize_t stride = cnp.PyArray_STRIDE(points, 0)
+    cdef bint is_float = cnp.PyArray_TYPE(points) == cnp.NPY_FLOAT
+    cdef double[2] p
+    cdef int i
+    for i in range(count):
+        if is_float:
+            p[0] = (<const float*>(data + i * stride))[0]
+            p[1] = (<const float*>(data + i * stride))[1]
+        else:
+            p[0] = (<const double*>(data + i * stride))[0]
+            p[1] = (<const double*>(data + i * stride))[1]
+        extend_bounds(item, p)
+
+cdef float max_abs_value(cnp.ndarray values) noexcept nogil:
+    """Maximum absolute value of an array returned by read_values_array"""
+    cdef const float* data = <const float*>cnp.PyArray_DATA(values)
+    cdef float result = 0.
+    cdef int i
+    for i in range(values.shape[0]):
+        result = fmax(result, fabs(data[i]))
+    return result
+
+cdef bint is_culled(drawingItem item, void* drawlist) noexcept nogil:
+    """
+    Returns whether the bounds of item, in screen space,
+    are outside the clip rect of drawlist, in which case
+    nothing needs to be drawn. The item mutex must be held.
+    """
+    if item._bounds_dirty:
+        item._bounds_dirty = False
+        item.update_bounds()
+    if not(item._bounds[0] <= item._bounds[2] and \
+           item._bounds[1] <= item._bounds[3]):
+        # Empty
+        return True
+    if isinf(item._bounds[0]) or isinf(item._bounds[1]) or \
+       isinf(item._bounds[2]) or isinf(item._bounds[3]):
+        # Unknown
+        return False
+    cdef double[2] bmin = [item._bounds[0], item._bounds[1]]
+    cdef double[2] bmax = [item._bounds[2], item._bounds[3]]
+    cdef float[2] pmin
+    cdef float[2] pmax
+    item.context.viewport.coordinate_to_screen(pmin, bmin)
+    item.context.viewport.coordinate_to_screen(pmax, bmax)
+    # The margin upper bounds the thickness and screen space sizes.
+    # + 1 for the antialiasing fringe.
+    cdef float margin = item._bounds_margin * \
+        max(item.context.viewport.size_multiplier,
+            item.context.viewport.global_scale) * \
+        max(item.context.viewport.thickness_multiplier, 1.) + 1.
+    cdef imgui.ImDrawList* draw_list = <imgui.ImDrawList*>drawlist
+    cdef imgui.ImVec2 clip_min = draw_list.GetClipRectMin()
+    cdef imgui.ImVec2 clip_max = draw_list.GetClipRectMax()
+    # The transform is monotonic on each axis, but might invert them
+    return is_outside_clip(clip_min, clip_max,
+                           min(pmin[0], pmax[0]) - margin,
+                           min(pmin[1], pmax[1]) - margin,
+                           max(pmin[0], pmax[0]) + margin,
+                           max(pmin[1], pmax[1]) + margin)
 
 
 cdef class ViewportDrawList(drawingItem):
@@ -88,22 +700,648 @@ cdef class ViewportDrawList(drawingItem):
 Draw containers
 """
 
+cdef extern from "Python.h" nogil:
+    bint PyObject_TypeCheck(PyObject*, PyTypeObject*)
+
+cdef extern from * nogil:
+    """
+    #include <algorithm>
+    #include <cmath>
+    #include <vector>
+
+    /* Children of a DrawingList, with a uniform grid over the
+       (coordinate space) boxes of the invisible buttons, to find
+       the buttons near the mouse without testing all of them. */
+    struct DCGButtonIndex {
+        std::vector<PyObject*> children; // borrowed, in drawing order
+        std::vector<bool> is_button;
+        std::vector<int> buttons; // child index of each box
+        std::vector<double> boxes; // xmin, ymin, xmax, ymax
+        std::vector<int> engaged; // buttons hovered or active
+        std::vector<int> large; // boxes spanning too many cells
+        std::vector<int> cell_starts;
+        std::vector<int> cell_entries;
+        std::vector<int> order; // buttons to process this frame
+        double origin[2] = {0., 0.};
+        double cell_size[2] = {1., 1.};
+        int nx = 0;
+        int ny = 0;
+
+        int cell_x(double x) const {
+            double c = std::floor((x - origin[0]) / cell_size[0]);
+            return (int)std::min(std::max(c, 0.), (double)(nx - 1));
+        }
+        int cell_y(double y) const {
+            double c = std::floor((y - origin[1]) / cell_size[1]);
+            return (int)std::min(std::max(c, 0.), (double)(ny - 1));
+        }
+    };
+
+    /* Boxes covering more cells are tested every frame */
+    static const int DCG_INDEX_MAX_CELLS = 16;
+
+    void* DCGButtonIndexCreate()
+    {
+        return new DCGButtonIndex();
+    }
+
+    void DCGButtonIndexDestroy(void* data)
+    {
+        delete (DCGButtonIndex*)data;
+    }
+
+    void DCGButtonIndexClear(void* data)
+    {
+        DCGButtonIndex* index = (DCGButtonIndex*)data;
+        index->children.clear();
+        index->is_button.clear();
+        index->buttons.clear();
+        index->boxes.clear();
+        index->engaged.clear();
+        index->nx = 0;
+        index->ny = 0;
+    }
+
+    void DCGButtonIndexAddOther(void* data, PyObject* child)
+    {
+        DCGButtonIndex* index = (DCGButtonIndex*)data;
+        index->children.push_back(child);
+        index->is_button.push_back(false);
+    }
+
+    void DCGButtonIndexAddButton(void* data, PyObject* child,
+                                 double xmin, double ymin,
+                                 double xmax, double ymax,
+                                 bool engaged)
+    {
+        DCGButtonIndex* index = (DCGButtonIndex*)data;
+        int i = (int)index->children.size();
+        if (engaged)
+            index->engaged.push_back(i);
+        index->buttons.push_back(i);
+        index->boxes.insert(index->boxes.end(), {xmin, ymin, xmax, ymax});
+        index->children.push_back(child);
+        index->is_button.push_back(true);
+    }
+
+    void DCGButtonIndexBuild(void* data)
+    {
+        DCGButtonIndex* index = (DCGButtonIndex*)data;
+        int n = (int)index->buttons.size();
+        const double* boxes = index->boxes.data();
+        index->large.clear();
+        index->cell_starts.clear();
+        index->cell_entries.clear();
+        index->nx = 0;
+        index->ny = 0;
+        double xmin = INFINITY, ymin = INFINITY, xmax = -INFINITY, ymax = -INFINITY;
+        for (int i = 0; i < n; i++) {
+            const double* box = &boxes[4*i];
+            if (!(std::isfinite(box[0]) && std::isfinite(box[1]) &&
+                  std::isfinite(box[2]) && std::isfinite(box[3])))
+                continue;
+            xmin = std::min(xmin, box[0]);
+            ymin = std::min(ymin, box[1]);
+            xmax = std::max(xmax, box[2]);
+            ymax = std::max(ymax, box[3]);
+        }
+        if (!(xmin <= xmax && ymin <= ymax)) {
+            // No finite box
+            for (int i = 0; i < n; i++)
+                index->large.push_back(i);
+            return;
+        }
+        int side = std::max(1, std::min(1024, (int)std::sqrt((double)n)));
+        index->nx = side;
+        index->ny = side;
+        index->origin[0] = xmin;
+        index->origin[1] = ymin;
+        index->cell_size[0] = xmax > xmin ? (xmax - xmin) / side : 1.;
+        index->cell_size[1] = ymax > ymin ? (ymax - ymin) / side : 1.;
+
+        // Counting sort of the boxes into the cells
+        std::vector<int>& starts = index->cell_starts;
+        starts.assign(side * side + 1, 0);
+        std::vector<int> ranges(4 * n);
+        for (int i = 0; i < n; i++) {
+            const double* box = &boxes[4*i];
+            int* r = &ranges[4*i];
+            bool finite = std::isfinite(box[0]) && std::isfinite(box[1]) &&
+                          std::isfinite(box[2]) && std::isfinite(box[3]);
+            if (finite) {
+                r[0] = index->cell_x(box[0]);
+                r[1] = index->cell_y(box[1]);
+                r[2] = index->cell_x(box[2]);
+                r[3] = index->cell_y(box[3]);
+            }
+            if (!finite || (r[2] - r[0] + 1) * (r[3] - r[1] + 1) > DCG_INDEX_MAX_CELLS) {
+                index->large.push_back(i);
+                r[0] = 1;
+                r[2] = 0;
+                continue;
+            }
+            for (int y = r[1]; y <= r[3]; y++)
+                for (int x = r[0]; x <= r[2]; x++)
+                    starts[y * side + x + 1]++;
+        }
+        for (int c = 0; c < side * side; c++)
+            starts[c + 1] += starts[c];
+        index->cell_entries.resize(starts[side * side]);
+        std::vector<int> fill(starts.begin(), starts.end() - 1);
+        for (int i = 0; i < n; i++) {
+            const int* r = &ranges[4*i];
+            for (int y = r[1]; y <= r[3]; y++)
+                for (int x = r[0]; x <= r[2]; x++)
+                    index->cell_entries[fill[y * side + x]++] = i;
+        }
+    }
+
+    /* Returns the sorted child indices of the buttons to process:
+       the buttons whose box intersects the query box, and the
+       engaged buttons. The engaged buttons are reset. */
+    const std::vector<int>& DCGButtonIndexQuery(void* data,
+                                                double xmin, double ymin,
+                                                double xmax, double ymax)
+    {
+        DCGButtonIndex* index = (DCGButtonIndex*)data;
+        std::vector<int>& order = index->order;
+        order.assign(index->engaged.begin(), index->engaged.end());
+        index->engaged.clear();
+        const double* boxes = index->boxes.data();
+        auto test = [&](int i) {
+            const double* box = &boxes[4*i];
+            // Non-finite boxes are always tested by the button
+            if (!(box[0] > xmax || box[2] < xmin || box[1] > ymax || box[3] < ymin))
+                order.push_back(index->buttons[i]);
+        };
+        bool valid_query = std::isfinite(xmin) && std::isfinite(ymin) &&
+                           std::isfinite(xmax) && std::isfinite(ymax);
+        for (int i : index->large) {
+            const double* box = &boxes[4*i];
+            if (!valid_query || !(std::isfinite(box[0]) && std::isfinite(box[1]) &&
+                                  std::isfinite(box[2]) && std::isfinite(box[3])))
+                order.push_back(index->buttons[i]);
+            else
+                test(i);
+        }
+        if (valid_query && index->nx > 0) {
+            int x0 = index->cell_x(xmin), x1 = index->cell_x(xmax);
+            int y0 = index->cell_y(ymin), y1 = index->cell_y(ymax);
+            for (int y = y0; y <= y1; y++) {
+                for (int x = x0; x <= x1; x++) {
+                    int c = y * index->nx + x;
+                    for (int e = index->cell_starts[c]; e < index->cell_starts[c + 1]; e++)
+                        test(index->cell_entries[e]);
+                }
+            }
+        }
+        std::sort(order.begin(), order.end());
+        order.erase(std::unique(order.begin(), order.end()), order.end());
+        return order;
+    }
+
+    int DCGButtonIndexSize(void* data)
+    {
+        return (int)((DCGButtonIndex*)data)->children.size();
+    }
+
+    PyObject* DCGButtonIndexChild(void* data, int i)
+    {
+        return ((DCGButtonIndex*)data)->children[i];
+    }
+
+    bool DCGButtonIndexIsButton(void* data, int i)
+    {
+        return ((DCGButtonIndex*)data)->is_button[i];
+    }
+
+    void DCGButtonIndexEngage(void* data, int i)
+    {
+        ((DCGButtonIndex*)data)->engaged.push_back(i);
+    }
+    """
+    void* DCGButtonIndexCreate()
+    void DCGButtonIndexDestroy(void*)
+    void DCGButtonIndexClear(void*)
+    void DCGButtonIndexAddOther(void*, PyObject*)
+    void DCGButtonIndexAddButton(void*, PyObject*, double, double, double, double, bint)
+    void DCGButtonIndexBuild(void*)
+    const vector[int]& DCGButtonIndexQuery(void*, double, double, double, double)
+    int DCGButtonIndexSize(void*)
+    PyObject* DCGButtonIndexChild(void*, int)
+    bint DCGButtonIndexIsButton(void*, int)
+    void DCGButtonIndexEngage(void*, int)
+
+cdef PyTypeObject* _invisible_button_type = <PyTypeObject*>DrawInvisibleButton
+
+
 cdef class DrawingList(drawingItem):
     """
     A simple drawing item that renders its children.
 
     Useful to arrange your items and quickly
     hide/show/delete them by manipulating the list.
+
+    The bounds of the children are aggregated, such
+    that the whole list is skipped when they are
+    outside the visible region.
+
+    For static content, the cached attribute avoids
+    drawing the children again every frame. For many
+    DrawInvisibleButton children, the indexed attribute
+    avoids testing all of them every frame.
     """
     def __cinit__(self):
         self.can_have_drawing_child = True
+        self._bounds_dirty = True
+        self._indexed = False
+        self._index = NULL
+        self._index_margin = 0.
+
+    def __dealloc__(self):
+        if self._index != NULL:
+            DCGButtonIndexDestroy(self._index)
+
+    cached = _cached_property
+
+    @property
+    def indexed(self):
+        """
+        Writable attribute: Maintain a spatial index of the
+        DrawInvisibleButton children, such that only the buttons
+        near the mouse are processed each frame.
+
+        Suited for a large number of buttons (nodes of a diagram,
+        markers, etc). The buttons far from the mouse, and neither
+        hovered nor active, only draw their children: their states
+        are not updated and their handlers are not run. The other
+        children of the list are drawn as usual. The index is
+        rebuilt when a descendant is modified. Ignored when cached
+        is set.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._indexed
+    @indexed.setter
+    def indexed(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value and self._index == NULL:
+            self._index = DCGButtonIndexCreate()
+        self._indexed = value
+        self._drawings_changed = True
+
+    cdef void build_index(self) noexcept nogil:
+        """
+        Collect the children in drawing order, and
+        index the boxes of the invisible buttons.
+        """
+        DCGButtonIndexClear(self._index)
+        self._index_margin = 0.
+        if self.last_drawings_child is None:
+            DCGButtonIndexBuild(self._index)
+            return
+        cdef PyObject *child = <PyObject*> self.last_drawings_child
+        while (<baseItem>child).prev_sibling is not None:
+            child = <PyObject *>(<baseItem>child).prev_sibling
+        cdef unique_lock[recursive_mutex] m
+        while (<baseItem>child) is not None:
+            if not(PyObject_TypeCheck(child, _invisible_button_type)):
+                DCGButtonIndexAddOther(self._index, child)
+                child = <PyObject *>(<baseItem>child).next_sibling
+                continue
+            m = unique_lock[recursive_mutex]((<DrawInvisibleButton>child).mutex)
+            DCGButtonIndexAddButton(self._index, child,
+                                    fmin((<DrawInvisibleButton>child)._p1[0],
+                                         (<DrawInvisibleButton>child)._p2[0]),
+                                    fmin((<DrawInvisibleButton>child)._p1[1],
+                                         (<DrawInvisibleButton>child)._p2[1]),
+                                    fmax((<DrawInvisibleButton>child)._p1[0],
+                                         (<DrawInvisibleButton>child)._p2[0]),
+                                    fmax((<DrawInvisibleButton>child)._p1[1],
+                                         (<DrawInvisibleButton>child)._p2[1]),
+                                    (<DrawInvisibleButton>child).state.cur.hovered or \
+                                    (<DrawInvisibleButton>child).state.cur.active or \
+                                    (<DrawInvisibleButton>child)._capture_mouse)
+            self._index_margin = fmax(self._index_margin,
+                                      (<DrawInvisibleButton>child)._min_side)
+            m.unlock()
+            child = <PyObject *>(<baseItem>child).next_sibling
+        DCGButtonIndexBuild(self._index)
+
+    cdef void draw_indexed(self, void* drawlist) noexcept nogil:
+        """
+        Draw the children, without processing the
+        invisible buttons far from the mouse.
+        """
+        if self._drawings_changed:
+            self._drawings_changed = False
+            self.build_index()
+
+        # Query box: the mouse position, enlarged by the
+        # minimum size of the buttons, in coordinate space.
+        cdef imgui.ImVec2 mouse = imgui.GetMousePos()
+        cdef float margin = self._index_margin * 0.5 + 1.
+        cdef float[2] screen_p
+        cdef double[2] c1
+        cdef double[2] c2
+        screen_p[0] = mouse.x - margin
+        screen_p[1] = mouse.y - margin
+        self.context.viewport.screen_to_coordinate(c1, screen_p)
+        screen_p[0] = mouse.x + margin
+        screen_p[1] = mouse.y + margin
+        self.context.viewport.screen_to_coordinate(c2, screen_p)
+
+        cdef const vector[int]* order = &DCGButtonIndexQuery(self._index,
+                                                            fmin(c1[0], c2[0]),
+                                                            fmin(c1[1], c2[1]),
+                                                            fmax(c1[0], c2[0]),
+                                                            fmax(c1[1], c2[1]))
+        cdef unique_lock[recursive_mutex] m
+        cdef PyObject *child
+        cdef int i
+        cdef int j = 0
+        cdef int num_buttons = <int>order.size()
+        for i in range(DCGButtonIndexSize(self._index)):
+            child = DCGButtonIndexChild(self._index, i)
+            if not(DCGButtonIndexIsButton(self._index, i)):
+                (<drawingItem>child).draw(drawlist)
+                continue
+            if j >= num_buttons or order[0][j] != i:
+                # Far from the mouse: only draw its children
+                (<DrawInvisibleButton>child).draw_button(drawlist, False)
+                continue
+            j += 1
+            (<DrawInvisibleButton>child).draw_button(drawlist, True)
+            m = unique_lock[recursive_mutex]((<DrawInvisibleButton>child).mutex)
+            if (<DrawInvisibleButton>child).state.cur.hovered or \
+               (<DrawInvisibleButton>child).state.cur.active:
+                # Keep processing it until it is released
+                DCGButtonIndexEngage(self._index, i)
+            m.unlock()
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        if self.last_drawings_child is None:
+            return
+        cdef PyObject *child = <PyObject*> self.last_drawings_child
+        cdef unique_lock[recursive_mutex] m
+        while (<baseItem>child) is not None:
+            m = unique_lock[recursive_mutex]((<drawingItem>child).mutex)
+            if (<drawingItem>child)._bounds_dirty:
+                (<drawingItem>child)._bounds_dirty = False
+                (<drawingItem>child).update_bounds()
+            self._bounds[0] = fmin(self._bounds[0], (<drawingItem>child)._bounds[0])
+            self._bounds[1] = fmin(self._bounds[1], (<drawingItem>child)._bounds[1])
+            self._bounds[2] = fmax(self._bounds[2], (<drawingItem>child)._bounds[2])
+            self._bounds[3] = fmax(self._bounds[3], (<drawingItem>child)._bounds[3])
+            self._bounds_margin = fmax(self._bounds_margin,
+                                       (<drawingItem>child)._bounds_margin)
+            m.unlock()
+            child = <PyObject *>(<baseItem>child).prev_sibling
 
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
-        draw_drawing_children(self, drawlist)
+        if is_culled(self, drawlist):
+            return
+        if self._draw_cache != NULL:
+            draw_drawing_children_cached(self, drawlist)
+        elif self._indexed:
+            self.draw_indexed(drawlist)
+        else:
+            draw_drawing_children(self, drawlist)
+
+
+cdef extern from * nogil:
+    """
+    /* Private draw list receiving the drawings of a DrawingLayer */
+    ImDrawList* DCGLayerCreateRecorder(ImDrawList* target)
+    {
+        return IM_NEW(ImDrawList)(target->_Data);
+    }
+
+    void DCGLayerDestroyRecorder(void* recorder)
+    {
+        IM_DELETE((ImDrawList*)recorder);
+    }
+
+    /* Resets the recorder to receive the drawings of
+       the (clip_min, clip_max) region of target */
+    void DCGLayerResetRecorder(ImDrawList* recorder, ImDrawList* target,
+                               ImVec2 clip_min, ImVec2 clip_max)
+    {
+        recorder->_ResetForNewFrame();
+        recorder->Flags = target->Flags;
+        recorder->_FringeScale = target->_FringeScale;
+        recorder->PushTextureID(target->_CmdHeader.TextureId);
+        recorder->PushClipRect(clip_min, clip_max, false);
+    }
+    """
+    imgui.ImDrawList* DCGLayerCreateRecorder(imgui.ImDrawList*)
+    void DCGLayerDestroyRecorder(void*)
+    void DCGLayerResetRecorder(imgui.ImDrawList*, imgui.ImDrawList*, imgui.ImVec2, imgui.ImVec2)
+
+
+cdef class DrawingLayer(drawingItem):
+    """
+    A drawing container that renders its children into
+    a texture, and then only draws that texture.
+
+    The texture covers the visible drawing region (for
+    instance the content area of a DrawInWindow, or the
+    plot area of a DrawInPlot). It is rendered again only
+    when needed: when a descendant is modified, when the
+    view changes (scrolling, zoom, resizing), or when
+    invalidate() is called. On the other frames, drawing
+    the layer costs a single textured quad, whatever
+    the number of children.
+
+    Suited for heavy content that rarely changes. In-place
+    modifications of arrays, of textures and of shared values
+    are not detected: call invalidate() after them.
+    The texture holds premultiplied colors, and is composited
+    as such, thus semi-transparent content (including
+    antialiased edges) looks as when drawn directly.
+    Only drawing subtrees are supported: interactive items
+    (DrawInvisibleButton) do not work inside a layer.
+    """
+    def __cinit__(self):
+        self.can_have_drawing_child = True
+        self._recorder = NULL
+        self._texture = Texture(self.context)
+        self._texture._readonly = True
+        self._dirty = True
+
+    def __dealloc__(self):
+        if self._recorder != NULL:
+            DCGLayerDestroyRecorder(self._recorder)
+
+    @property
+    def dirty(self):
+        """
+        Readonly attribute: whether the texture will
+        be rendered again the next time the layer is drawn,
+        due to a modification of the descendants or a call
+        to invalidate().
+
+        Changes of the view are detected at draw time,
+        and are not reflected by this attribute.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._dirty or self._drawings_changed
+
+    @property
+    def texture(self):
+        """
+        Readonly attribute: the Texture the children
+        are rendered into.
+
+        The texture is reallocated when the size of the
+        drawing region changes. It has the resolution of the
+        framebuffer, and is RGBA with premultiplied alpha and
+        the rows stored bottom to top.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._texture
+
+    def invalidate(self):
+        """
+        Request the children to be rendered again
+        into the texture the next time the layer is drawn.
+
+        Needed after modifications that are not detected
+        automatically (in-place array modifications,
+        texture content updates, shared values, etc).
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._dirty = True
+        drawingItem.invalidate(self)
+
+    cdef bint resize_texture(self, int width, int height) noexcept nogil:
+        """
+        (Re)allocate an empty RGBA texture of the target size.
+        Returns False on failure.
+        """
+        cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self._texture.mutex)
+        if self._texture.allocated_texture != NULL and \
+           self._texture.width == width and self._texture.height == height:
+            return True
+        cdef platformViewport* platform = <platformViewport*>self.context.viewport._platform
+        # The storage is allocated by a full upload
+        cdef vector[unsigned char] empty
+        empty.resize(width * height * 4)
+        cdef bint success
+        platform.makeUploadContextCurrent()
+        if self._texture.allocated_texture != NULL:
+            platform.freeTexture(self._texture.allocated_texture)
+        self._texture.allocated_texture = platform.allocateTexture(width, height, 4, 0, 1, 0)
+        success = self._texture.allocated_texture != NULL
+        if success:
+            success = platform.updateStaticTexture(self._texture.allocated_texture,
+                                                   width, height, 4, 1,
+                                                   empty.data(), width * 4)
+        platform.releaseUploadContext()
+        if not(success):
+            if self._texture.allocated_texture != NULL:
+                platform.makeUploadContextCurrent()
+                platform.freeTexture(self._texture.allocated_texture)
+                platform.releaseUploadContext()
+            self._texture.allocated_texture = NULL
+            self._texture.width = 0
+            self._texture.height = 0
+            self._texture.num_chans = 0
+            return False
+        self._texture.width = width
+        self._texture.height = height
+        self._texture.num_chans = 4
+        self._texture._buffer_type = 1
+        return True
+
+    cdef void draw(self,
+                   void* drawlist) noexcept nogil:
+        cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
+        if not(self._show):
+            return
+        if self.last_drawings_child is None:
+            return
+
+        cdef imgui.ImDrawList* draw_list = <imgui.ImDrawList*>drawlist
+        cdef imgui.ImVec2 clip_min = draw_list.GetClipRectMin()
+        cdef imgui.ImVec2 clip_max = draw_list.GetClipRectMax()
+        clip_min.x = floor(clip_min.x)
+        clip_min.y = floor(clip_min.y)
+        cdef int width = <int>ceil(clip_max.x - clip_min.x)
+        cdef int height = <int>ceil(clip_max.y - clip_min.y)
+        if width <= 0 or height <= 0:
+            return
+        clip_max.x = clip_min.x + width
+        clip_max.y = clip_min.y + height
+        # Render at the resolution of the framebuffer
+        cdef imgui.ImVec2 framebuffer_scale = imgui.GetIO().DisplayFramebufferScale
+        cdef int texture_width = <int>ceil(width * framebuffer_scale.x)
+        cdef int texture_height = <int>ceil(height * framebuffer_scale.y)
+
+        # Detect changes of the view, as for cached drawings.
+        # The texture is reused only if the view did not move.
+        cdef float[6] reference
+        cdef float[3] multipliers
+        cdef float dx, dy
+        cdef int i
+        cdef bint dirty = self._dirty or self._drawings_changed
+        if not(drawing_view_translation(self.context.viewport,
+                                        reference, multipliers,
+                                        self._reference, self._multipliers,
+                                        &dx, &dy)):
+            dirty = True
+        # False for NaN
+        if not(fabs(dx) < 0.01 and fabs(dy) < 0.01):
+            dirty = True
+        if clip_min.x != self._region[0] or clip_min.y != self._region[1] or \
+           clip_max.x != self._region[2] or clip_max.y != self._region[3]:
+            dirty = True
+        if self._texture.allocated_texture == NULL or \
+           self._texture.width != texture_width or \
+           self._texture.height != texture_height:
+            dirty = True
+
+        if dirty:
+            if not(self.resize_texture(texture_width, texture_height)):
+                # Fallback to direct drawing
+                draw_drawing_children(self, drawlist)
+                return
+            if self._recorder == NULL:
+                self._recorder = DCGLayerCreateRecorder(draw_list)
+            DCGLayerResetRecorder(<imgui.ImDrawList*>self._recorder,
+                                  draw_list, clip_min, clip_max)
+            draw_drawing_children(self, self._recorder)
+            if not((<platformViewport*>self.context.viewport._platform).queueTextureRendering(
+                    self._texture.allocated_texture,
+                    texture_width, texture_height,
+                    clip_min.x, clip_min.y,
+                    self._recorder)):
+                return
+            self._dirty = False
+            self._drawings_changed = False
+            for i in range(6):
+                self._reference[i] = reference[i]
+            for i in range(3):
+                self._multipliers[i] = multipliers[i]
+            self._region[0] = clip_min.x
+            self._region[1] = clip_min.y
+            self._region[2] = clip_max.x
+            self._region[3] = clip_max.y
+
+        # Rendered textures are stored bottom to top
+        draw_list.AddImage(<imgui.ImTextureID>self._texture.allocated_texture,
+                           clip_min, clip_max,
+                           imgui.ImVec2(0., 1.), imgui.ImVec2(1., 0.),
+                           4294967295)
 
 
 cdef class DrawingClip(drawingItem):
@@ -457,6 +1695,7 @@ cdef class DrawArrow(drawingItem):
         size (float): Size of the arrow head
     """
     def __cinit__(self):
+        self._bounds_dirty = True
         # p1, p2, etc are zero init by cython
         self._color = 4294967295 # 0xffffffff
         self._thickness = 1.
@@ -472,6 +1711,7 @@ cdef class DrawArrow(drawingItem):
         lock_gil_friendly(m, self.mutex)
         read_coord(self._end, value)
         self.__compute_tip()
+        self.bounds_changed()
     @property
     def p2(self):
         cdef unique_lock[recursive_mutex] m
@@ -483,6 +1723,7 @@ cdef class DrawArrow(drawingItem):
         lock_gil_friendly(m, self.mutex)
         read_coord(self._start, value)
         self.__compute_tip()
+        self.bounds_changed()
     @property
     def color(self):
         cdef unique_lock[recursive_mutex] m
@@ -506,6 +1747,7 @@ cdef class DrawArrow(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
         self.__compute_tip()
+        self.bounds_changed()
     @property
     def size(self):
         cdef unique_lock[recursive_mutex] m
@@ -517,6 +1759,7 @@ cdef class DrawArrow(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._size = value
         self.__compute_tip()
+        self.bounds_changed()
 
     cdef void __compute_tip(self):
         # Copy paste from original code
@@ -548,11 +1791,21 @@ cdef class DrawArrow(drawingItem):
         self._corner2 = [x1 + 0.5 * self._size * cos((M_PI / 2.0) - angle),
                         y1 - 0.5 * self._size * sin((M_PI / 2.0) - angle)]
 
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds(self, self._start)
+        extend_bounds(self, self._end)
+        extend_bounds(self, self._corner1)
+        extend_bounds(self, self._corner2)
+        self._bounds_margin = fabs(self._thickness)
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
+        if is_culled(self, drawlist):
+            return
 
         cdef float thickness = self._thickness
         thickness *= self.context.viewport.thickness_multiplier
@@ -593,6 +1846,7 @@ cdef class DrawBezierCubic(drawingItem):
         segments (int): Number of line segments used to approximate the curve
     """
     def __cinit__(self):
+        self._bounds_dirty = True
         # p1, etc are zero init by cython
         self._color = 4294967295 # 0xffffffff
         self._thickness = 0.
@@ -608,6 +1862,7 @@ cdef class DrawBezierCubic(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p1, value)
+        self.bounds_changed()
     @property
     def p2(self):
         cdef unique_lock[recursive_mutex] m
@@ -618,6 +1873,7 @@ cdef class DrawBezierCubic(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p2, value)
+        self.bounds_changed()
     @property
     def p3(self):
         cdef unique_lock[recursive_mutex] m
@@ -628,6 +1884,7 @@ cdef class DrawBezierCubic(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p3, value)
+        self.bounds_changed()
     @property
     def p4(self):
         cdef unique_lock[recursive_mutex] m
@@ -638,6 +1895,7 @@ cdef class DrawBezierCubic(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p4, value)
+        self.bounds_changed()
     @property
     def color(self):
         cdef unique_lock[recursive_mutex] m
@@ -660,6 +1918,7 @@ cdef class DrawBezierCubic(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
+        self.bounds_changed()
     @property
     def segments(self):
         cdef unique_lock[recursive_mutex] m
@@ -671,11 +1930,22 @@ cdef class DrawBezierCubic(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._segments = value
 
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        # The curve is inside the convex hull of the control points
+        extend_bounds(self, self._p1)
+        extend_bounds(self, self._p2)
+        extend_bounds(self, self._p3)
+        extend_bounds(self, self._p4)
+        self._bounds_margin = fabs(self._thickness)
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
+        if is_culled(self, drawlist):
+            return
 
         cdef float thickness = self._thickness
         thickness *= self.context.viewport.thickness_multiplier
@@ -712,6 +1982,7 @@ cdef class DrawBezierQuadratic(drawingItem):
         segments (int): Number of line segments used to approximate the curve
     """
     def __cinit__(self):
+        self._bounds_dirty = True
         # p1, etc are zero init by cython
         self._color = 4294967295 # 0xffffffff
         self._thickness = 0.
@@ -727,6 +1998,7 @@ cdef class DrawBezierQuadratic(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p1, value)
+        self.bounds_changed()
     @property
     def p2(self):
         cdef unique_lock[recursive_mutex] m
@@ -737,6 +2009,7 @@ cdef class DrawBezierQuadratic(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p2, value)
+        self.bounds_changed()
     @property
     def p3(self):
         cdef unique_lock[recursive_mutex] m
@@ -747,6 +2020,7 @@ cdef class DrawBezierQuadratic(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p3, value)
+        self.bounds_changed()
     @property
     def color(self):
         cdef unique_lock[recursive_mutex] m
@@ -769,6 +2043,7 @@ cdef class DrawBezierQuadratic(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
+        self.bounds_changed()
     @property
     def segments(self):
         cdef unique_lock[recursive_mutex] m
@@ -780,11 +2055,21 @@ cdef class DrawBezierQuadratic(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._segments = value
 
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        # The curve is inside the convex hull of the control points
+        extend_bounds(self, self._p1)
+        extend_bounds(self, self._p2)
+        extend_bounds(self, self._p3)
+        self._bounds_margin = fabs(self._thickness)
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
+        if is_culled(self, drawlist):
+            return
 
         cdef float thickness = self._thickness
         thickness *= self.context.viewport.thickness_multiplier
@@ -818,6 +2103,7 @@ cdef class DrawCircle(drawingItem):
         segments (int): Number of segments used to approximate the circle
     """
     def __cinit__(self):
+        self._bounds_dirty = True
         # center is zero init by cython
         self._color = 4294967295 # 0xffffffff
         self._fill = 0
@@ -835,6 +2121,7 @@ cdef class DrawCircle(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._center, value)
+        self.bounds_changed()
     @property
     def radius(self):
         cdef unique_lock[recursive_mutex] m
@@ -845,6 +2132,7 @@ cdef class DrawCircle(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._radius = value
+        self.bounds_changed()
     @property
     def color(self):
         cdef unique_lock[recursive_mutex] m
@@ -879,6 +2167,7 @@ cdef class DrawCircle(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
+        self.bounds_changed()
     @property
     def segments(self):
         cdef unique_lock[recursive_mutex] m
@@ -890,11 +2179,18 @@ cdef class DrawCircle(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._segments = value
 
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds(self, self._center)
+        self._bounds_margin = fabs(self._radius) + fabs(self._thickness)
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
+        if is_culled(self, drawlist):
+            return
 
         cdef float thickness = self._thickness
         cdef float radius = self._radius
@@ -916,123 +2212,132 @@ cdef class DrawCircle(drawingItem):
         (<imgui.ImDrawList*>drawlist).AddCircle(icenter, radius, <imgui.ImU32>self._color, self._segments, thickness)
 
 
-cdef class DrawEllipse(drawingItem):
+cdef class DrawCircles(drawingItem):
     """
-    Draws an ellipse in coordinate space.
+    Draws a batch of circles in coordinate space.
 
-    The ellipse is defined by its bounding box and can be filled and/or outlined.
+    All the circles are described by columnar arrays, and are
+    drawn in a single pass, skipping the ones outside the
+    clipping region. This is much faster than one DrawCircle
+    item per circle.
+
+    Each column can have a single element, in which case
+    it applies to all the circles. Arrays of the expected
+    type (float32 for radii and thicknesses, uint32 for colors,
+    float64 or float32 for centers) are referenced without copy.
 
     Attributes:
-        pmin (tuple): Top-left corner coordinates (x, y)
-        pmax (tuple): Bottom-right corner coordinates (x, y)
-        color (list): RGBA color of the outline
-        fill (list): RGBA color of the fill
-        thickness (float): Outline thickness
-        segments (int): Number of segments used to approximate the ellipse
+        centers (array): (N, 2) array of the centers coordinates
+        radii (array): Radius of each circle. Negative means screen space units.
+        color (array): Packed RGBA outline color of each circle
+        fill (array): Packed RGBA fill color of each circle
+        thickness (array): Outline thickness of each circle
+        segments (int): Number of segments used to approximate the circles
     """
-    # TODO: I adapted the original code,
-    # But these deserves rewrite: call the imgui Ellipse functions instead
-    # and add rotation parameter
     def __cinit__(self):
-        # pmin/pmax is zero init by cython
-        self._color = 4294967295 # 0xffffffff
-        self._fill = 0
-        self._thickness = 1.
+        self._bounds_dirty = True
+        self._centers = np.zeros((0, 2), dtype=np.float64)
+        self._radii = np.ones(1, dtype=np.float32)
+        self._color = np.array([4294967295], dtype=np.uint32) # 0xffffffff
+        self._fill = np.zeros(1, dtype=np.uint32)
+        self._thickness = np.ones(1, dtype=np.float32)
         self._segments = 0
+
     @property
-    def pmin(self):
+    def centers(self):
         """
-        Top-left corner position of the drawing in coordinate space.
-        
+        Coordinates of the centers of the circles.
+
         Returns:
-            tuple: (x, y) coordinates
+            array: (N, 2) array (not a copy)
+
+        Call invalidate() after modifying it in place.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        return Coord.build(self._pmin)
-    @pmin.setter
-    def pmin(self, value):
+        return self._centers
+    @centers.setter
+    def centers(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        read_coord(self._pmin, value)
-        self.__fill_points()
+        self._centers = read_points_array(value)
+        self.bounds_changed()
     @property
-    def pmax(self):
+    def radii(self):
         """
-        Bottom-right corner position of the drawing in coordinate space.
-        
+        Radius of each circle, or of all circles if
+        a single value is set. Negative means screen space units.
+
         Returns:
-            tuple: (x, y) coordinates
+            array: (N,) float32 array (not a copy)
+
+        Call invalidate() after modifying it in place.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        return Coord.build(self._pmax)
-    @pmax.setter
-    def pmax(self, value):
+        return self._radii
+    @radii.setter
+    def radii(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        read_coord(self._pmax, value)
-        self.__fill_points()
+        self._radii = read_values_array(value)
+        self.bounds_changed()
     @property
     def color(self):
         """
-        Color of the drawing outline.
-        
+        Outline color of each circle, or of all circles
+        if a single color is set.
+
         Returns:
-            list: RGBA values in [0,1] range
+            array: (N,) uint32 array of packed RGBA colors
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        cdef float[4] color
-        unparse_color(color, self._color)
-        return list(color)
+        return self._color
     @color.setter
     def color(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        self._color = parse_color(value)
+        self._color = read_colors_array(value)
     @property
     def fill(self):
         """
-        Fill color of the drawing.
-        
+        Fill color of each circle, or of all circles
+        if a single color is set.
+
         Returns:
-            list: RGBA values in [0,1] range
+            array: (N,) uint32 array of packed RGBA colors
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        cdef float[4] fill
-        unparse_color(fill, self._fill)
-        return list(fill)
+        return self._fill
     @fill.setter
     def fill(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        self._fill = parse_color(value)
+        self._fill = read_colors_array(value)
     @property
     def thickness(self):
         """
-        Line thickness of the drawing outline.
-        
+        Outline thickness of each circle, or of all circles
+        if a single value is set.
+
         Returns:
-            float: Thickness value in pixels
+            array: (N,) float32 array (not a copy)
+
+        Call invalidate() after modifying it in place.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         return self._thickness
     @thickness.setter
-    def thickness(self, float value):
+    def thickness(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        self._thickness = value
+        self._thickness = read_values_array(value)
+        self.bounds_changed()
     @property
     def segments(self):
-        """
-        Number of segments used to approximate the ellipse.
-        
-        Returns:
-            int: Number of segments
-        """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         return self._segments
@@ -1041,92 +2346,575 @@ cdef class DrawEllipse(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._segments = value
-        self.__fill_points()
 
-    cdef void __fill_points(self):
-        cdef int segments = max(self._segments, 3)
-        cdef double width = self._pmax[0] - self._pmin[0]
-        cdef double height = self._pmax[1] - self._pmin[1]
-        cdef double cx = width / 2. + self._pmin[0]
-        cdef double cy = height / 2. + self._pmin[1]
-        cdef double radian_inc = (M_PI * 2.) / <double>segments
-        self._points.clear()
-        self._points.reserve(segments+1)
-        cdef int i
-        # vector needs double2 rather than double[2]
-        cdef double2 p
-        width = abs(width)
-        height = abs(height)
-        for i in range(segments):
-            p.p[0] = cx + cos(<double>i * radian_inc) * width / 2.
-            p.p[1] = cy - sin(<double>i * radian_inc) * height / 2.
-            self._points.push_back(p)
-        self._points.push_back(self._points[0])
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds_array(self, self._centers)
+        self._bounds_margin = max_abs_value(self._radii) + max_abs_value(self._thickness)
 
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
-        if not(self._show) or self._points.size() < 3:
+        if not(self._show):
+            return
+        if is_culled(self, drawlist):
             return
 
-        cdef float thickness = self._thickness
-        thickness *= self.context.viewport.thickness_multiplier
-        if thickness > 0:
-            thickness *= self.context.viewport.size_multiplier
-        thickness = abs(thickness)
-
-        cdef vector[imgui.ImVec2] transformed_points
-        transformed_points.reserve(self._points.size())
-        cdef int i
-        cdef float[2] p
-        for i in range(<int>self._points.size()):
-            self.context.viewport.coordinate_to_screen(p, self._points[i].p)
-            transformed_points.push_back(imgui.ImVec2(p[0], p[1]))
-        # TODO imgui requires clockwise order for correct AA
-        # Reverse order if needed
-        if self._fill & imgui.IM_COL32_A_MASK != 0:
-            (<imgui.ImDrawList*>drawlist).AddConvexPolyFilled(transformed_points.data(),
-                                                <int>transformed_points.size(),
-                                                self._fill)
-        (<imgui.ImDrawList*>drawlist).AddPolyline(transformed_points.data(),
-                                    <int>transformed_points.size(),
-                                    self._color,
-                                    0,
-                                    thickness)
+        cdef int count = self._centers.shape[0]
+        count = batch_size(count, self._radii)
+        count = batch_size(count, self._color)
+        count = batch_size(count, self._fill)
+        count = batch_size(count, self._thickness)
+        if count <= 0:
+            return
 
+        cdef vector[imgui.ImVec2] centers
+        points_to_screen(self.context.viewport, centers, self._centers)
+
+        cdef imgui.ImDrawList* draw_list = <imgui.ImDrawList*>drawlist
+        cdef imgui.ImVec2 clip_min = draw_list.GetClipRectMin()
+        cdef imgui.ImVec2 clip_max = draw_list.GetClipRectMax()
+        cdef const float* radii = <const float*>cnp.PyArray_DATA(self._radii)
+        cdef const imgui.ImU32* colors = <const imgui.ImU32*>cnp.PyArray_DATA(self._color)
+        cdef const imgui.ImU32* fills = <const imgui.ImU32*>cnp.PyArray_DATA(self._fill)
+        cdef const float* thicknesses = <const float*>cnp.PyArray_DATA(self._thickness)
+        cdef int radius_step = batch_step(self._radii)
+        cdef int color_step = batch_step(self._color)
+        cdef int fill_step = batch_step(self._fill)
+        cdef int thickness_step = batch_step(self._thickness)
+        cdef float thickness_multiplier = self.context.viewport.thickness_multiplier
+        cdef float size_multiplier = self.context.viewport.size_multiplier
+        cdef float global_scale = self.context.viewport.global_scale
 
-cdef class DrawImage(drawingItem):
+        cdef int i
+        cdef float radius, thickness, extent
+        cdef imgui.ImU32 color, fill
+        for i in range(count):
+            radius = radii[i * radius_step]
+            if radius > 0:
+                radius *= size_multiplier
+            else:
+                radius *= global_scale
+            radius = abs(radius)
+            thickness = thicknesses[i * thickness_step] * thickness_multiplier
+            if thickness > 0:
+                thickness *= size_multiplier
+            thickness = abs(thickness)
+            extent = radius + thickness
+            if is_outside_clip(clip_min, clip_max,
+                               centers[i].x - extent, centers[i].y - extent,
+                               centers[i].x + extent, centers[i].y + extent):
+                continue
+            fill = fills[i * fill_step]
+            if fill & imgui.IM_COL32_A_MASK != 0:
+                draw_list.AddCircleFilled(centers[i], radius, fill, self._segments)
+            color = colors[i * color_step]
+            draw_list.AddCircle(centers[i], radius, color, self._segments, thickness)
+
+
+cdef class DrawDragPoints(drawingItem):
     """
-    Draw an image in coordinate space.
+    A set of points that can be dragged with the mouse.
 
-    DrawImage supports three ways to express its position in space:
-    - p1, p2, p3, p4, the positions of the corners of the image, in
-       a clockwise order
-    - pmin and pmax, where pmin = p1, and pmax = p3, and p2/p4
-        are automatically set such that the image is parallel
-        to the axes.
-    - center, direction, width, height for the coordinate of the center,
-        the angle of (center, middle of p2 and p3) against the x horizontal axis,
-        and the width/height of the image at direction 0.
+    The points are stored in a (N, 2) float64 array, which
+    is updated in place while dragging. Hit-testing and
+    dragging are done natively, and a single callback
+    reports the indices of the moved points when the drag
+    ends (and optionally at a limited rate during the drag).
+    This is much faster than one DragPoint (utils) per point.
 
-    uv1/uv2/uv3/uv4 are the normalized texture coordinates at p1/p2/p3/p4
+    The callback receives as data a tuple (indices, finished),
+    with indices an int32 array of the moved points, and finished
+    whether the drag has ended.
 
-    The systems are similar, but writing to p1/p2/p3/p4 is more expressive
-    as it allows to have non-rectangular shapes.
-    The last system enables to indicate a size in screen space rather
-    than in coordinate space by passing negative values to width and height.
+    Attributes:
+        points (array): (N, 2) float64 array of the coordinates of the points
+        radius (float): Radius of the points in screen space (unscaled pixels)
+        color (list): RGBA color of the points
+        hovered_color (list): RGBA color of the hovered or dragged point
+        callback (Callback): Called with the moved points
+        callback_interval (float): Minimum delay in seconds between callbacks
+            during a drag. 0 to only call the callback when the drag ends.
+        hovered_index (int): Index of the hovered point, -1 if None
+        active_index (int): Index of the dragged point, -1 if None
     """
-
     def __cinit__(self):
-        self.uv1 = [0., 0.]
-        self.uv2 = [1., 0.]
-        self.uv3 = [1., 1.]
-        self.uv4 = [0., 1.]
-        self._color_multiplier = 4294967295 # 0xffffffff
+        self._points = np.zeros((0, 2), dtype=np.float64)
+        self._radius = 4.
+        self._color = 4278255360 # 0xff00ff00
+        self._hovered_color = 4294967295 # 0xffffffff
+        self._callback = None
+        self._callback_interval = 0.
+        self._last_callback_time = 0.
+        self._hovered_index = -1
+        self._active_index = -1
+
     @property
-    def texture(self):
-        """Image content"""
-        cdef unique_lock[recursive_mutex] m
+    def points(self):
+        """
+        Coordinates of the points.
+
+        The array is modified in place when
+        a point is dragged. Assigning a float64
+        C-contiguous writeable array uses it
+        without copy.
+
+        Returns:
+            array: (N, 2) float64 array (not a copy)
+
+        Call invalidate() after modifying it in place.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._points
+    @points.setter
+    def points(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef cnp.ndarray array = np.ascontiguousarray(read_points_array(value),
+                                                      dtype=np.float64)
+        if not(array.flags.writeable):
+            array = array.copy()
+        self._points = array
+        # Indices might not be valid anymore
+        self._hovered_index = -1
+        self._active_index = -1
+        self._changed.clear()
+        self.bounds_changed()
+    @property
+    def radius(self):
+        """
+        Radius of the points in screen space,
+        before global scaling. Also defines the
+        area in which a point can be grabbed.
+
+        Returns:
+            float: Radius
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._radius
+    @radius.setter
+    def radius(self, float value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._radius = value
+    @property
+    def color(self):
+        """
+        Color of the points.
+
+        Returns:
+            list: RGBA values in [0,1] range
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef float[4] color
+        unparse_color(color, self._color)
+        return list(color)
+    @color.setter
+    def color(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._color = parse_color(value)
+    @property
+    def hovered_color(self):
+        """
+        Color of the hovered or dragged point.
+
+        Returns:
+            list: RGBA values in [0,1] range
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef float[4] color
+        unparse_color(color, self._hovered_color)
+        return list(color)
+    @hovered_color.setter
+    def hovered_color(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._hovered_color = parse_color(value)
+    @property
+    def callback(self):
+        """
+        Callback called with the moved points.
+
+        The data argument is a tuple (indices, finished).
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._callback
+    @callback.setter
+    def callback(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._callback = value if isinstance(value, Callback) or value is None else Callback(value)
+    @property
+    def callback_interval(self):
+        """
+        Minimum delay in seconds between two callbacks
+        during a drag. If 0 (default), the callback is only
+        called when the drag ends.
+
+        Returns:
+            float: Delay in seconds
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._callback_interval
+    @callback_interval.setter
+    def callback_interval(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._callback_interval = value
+    @property
+    def hovered_index(self):
+        """
+        Readonly attribute: index of the point
+        under the mouse, -1 if None.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._hovered_index
+    @property
+    def active_index(self):
+        """
+        Readonly attribute: index of the point
+        being dragged, -1 if None.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._active_index
+
+    cdef void draw(self,
+                   void* drawlist) noexcept nogil:
+        cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
+        if not(self._show):
+            return
+
+        cdef int count = self._points.shape[0]
+        if self._active_index >= count:
+            self._active_index = -1
+        cdef vector[imgui.ImVec2] points
+        points_to_screen(self.context.viewport, points, self._points)
+
+        cdef float radius = abs(self._radius) * self.context.viewport.global_scale
+        cdef imgui.ImVec2 mouse = imgui.GetMousePos()
+        cdef int i
+        cdef float dx, dy, distance
+        cdef float best_distance = radius * radius
+
+        # Hit test: the dragged point, or the point
+        # closest to the mouse within the radius.
+        cdef int candidate = self._active_index
+        if candidate < 0:
+            for i in range(count):
+                dx = points[i].x - mouse.x
+                dy = points[i].y - mouse.y
+                distance = dx * dx + dy * dy
+                if distance <= best_distance:
+                    best_distance = distance
+                    candidate = i
+
+        cdef bool hovered = False
+        cdef bool held = False
+        cdef bint activated = False
+        if candidate >= 0:
+            activated = button_area(self.context,
+                                    self.uuid,
+                                    make_Vec2(points[candidate].x - radius,
+                                              points[candidate].y - radius),
+                                    make_Vec2(2. * radius, 2. * radius),
+                                    1, # left button
+                                    True,
+                                    True,
+                                    False,
+                                    &hovered,
+                                    &held)
+        if activated and self._active_index < 0:
+            self._active_index = candidate
+            self._grab_offset[0] = mouse.x - points[candidate].x
+            self._grab_offset[1] = mouse.y - points[candidate].y
+
+        cdef float[2] screen_p
+        cdef double[2] coord
+        cdef double* data = <double*>cnp.PyArray_DATA(self._points)
+        cdef double now
+        cdef bint finished = False
+        if held and self._active_index >= 0:
+            i = self._active_index
+            screen_p[0] = mouse.x - self._grab_offset[0]
+            screen_p[1] = mouse.y - self._grab_offset[1]
+            if screen_p[0] != points[i].x or screen_p[1] != points[i].y:
+                self.context.viewport.screen_to_coordinate(coord, screen_p)
+                data[2*i] = coord[0]
+                data[2*i+1] = coord[1]
+                points[i].x = screen_p[0]
+                points[i].y = screen_p[1]
+                if self._changed.empty() or self._changed.back() != i:
+                    self._changed.push_back(i)
+                # The parents' bounds and drawing caches are outdated
+                with gil:
+                    self.bounds_changed()
+                    self.drawings_changed()
+        elif self._active_index >= 0:
+            self._active_index = -1
+            finished = True
+
+        # Coalesced report of the moved points
+        if not(self._changed.empty()):
+            now = imgui.GetTime()
+            if finished or (self._callback_interval > 0. and \
+               now - self._last_callback_time >= self._callback_interval):
+                self.context.queue_callback_arg1intvector1int(self._callback,
+                                                              self,
+                                                              self,
+                                                              self._changed,
+                                                              finished)
+                self._changed.clear()
+                self._last_callback_time = now
+
+        self._hovered_index = candidate if hovered or held else -1
+        if self._hovered_index >= 0:
+            imgui.SetMouseCursor(imgui.ImGuiMouseCursor_ResizeAll)
+
+        cdef imgui.ImDrawList* draw_list = <imgui.ImDrawList*>drawlist
+        cdef imgui.ImVec2 clip_min = draw_list.GetClipRectMin()
+        cdef imgui.ImVec2 clip_max = draw_list.GetClipRectMax()
+        for i in range(count):
+            if is_outside_clip(clip_min, clip_max,
+                               points[i].x - radius, points[i].y - radius,
+                               points[i].x + radius, points[i].y + radius):
+                continue
+            draw_list.AddCircleFilled(points[i], radius,
+                                      self._hovered_color if i == self._hovered_index else self._color,
+                                      0)
+
+
+cdef class DrawEllipse(drawingItem):
+    """
+    Draws an ellipse in coordinate space.
+
+    The ellipse is defined by its bounding box and can be filled and/or outlined.
+
+    Attributes:
+        pmin (tuple): Top-left corner coordinates (x, y)
+        pmax (tuple): Bottom-right corner coordinates (x, y)
+        color (list): RGBA color of the outline
+        fill (list): RGBA color of the fill
+        thickness (float): Outline thickness
+        segments (int): Number of segments used to approximate the ellipse
+    """
+    # TODO: I adapted the original code,
+    # But these deserves rewrite: call the imgui Ellipse functions instead
+    # and add rotation parameter
+    def __cinit__(self):
+        self._bounds_dirty = True
+        # pmin/pmax is zero init by cython
+        self._color = 4294967295 # 0xffffffff
+        self._fill = 0
+        self._thickness = 1.
+        self._segments = 0
+    @property
+    def pmin(self):
+        """
+        Top-left corner position of the drawing in coordinate space.
+        
+        Returns:
+            tuple: (x, y) coordinates
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return Coord.build(self._pmin)
+    @pmin.setter
+    def pmin(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        read_coord(self._pmin, value)
+        self.__fill_points()
+        self.bounds_changed()
+    @property
+    def pmax(self):
+        """
+        Bottom-right corner position of the drawing in coordinate space.
+        
+        Returns:
+            tuple: (x, y) coordinates
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return Coord.build(self._pmax)
+    @pmax.setter
+    def pmax(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        read_coord(self._pmax, value)
+        self.__fill_points()
+        self.bounds_changed()
+    @property
+    def color(self):
+        """
+        Color of the drawing outline.
+        
+        Returns:
+            list: RGBA values in [0,1] range
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef float[4] color
+        unparse_color(color, self._color)
+        return list(color)
+    @color.setter
+    def color(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._color = parse_color(value)
+    @property
+    def fill(self):
+        """
+        Fill color of the drawing.
+        
+        Returns:
+            list: RGBA values in [0,1] range
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef float[4] fill
+        unparse_color(fill, self._fill)
+        return list(fill)
+    @fill.setter
+    def fill(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._fill = parse_color(value)
+    @property
+    def thickness(self):
+        """
+        Line thickness of the drawing outline.
+        
+        Returns:
+            float: Thickness value in pixels
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._thickness
+    @thickness.setter
+    def thickness(self, float value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._thickness = value
+        self.bounds_changed()
+    @property
+    def segments(self):
+        """
+        Number of segments used to approximate the ellipse.
+        
+        Returns:
+            int: Number of segments
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._segments
+    @segments.setter
+    def segments(self, int value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._segments = value
+        self.__fill_points()
+
+    cdef void __fill_points(self):
+        cdef int segments = max(self._segments, 3)
+        cdef double width = self._pmax[0] - self._pmin[0]
+        cdef double height = self._pmax[1] - self._pmin[1]
+        cdef double cx = width / 2. + self._pmin[0]
+        cdef double cy = height / 2. + self._pmin[1]
+        cdef double radian_inc = (M_PI * 2.) / <double>segments
+        self._points.clear()
+        self._points.reserve(segments+1)
+        cdef int i
+        # vector needs double2 rather than double[2]
+        cdef double2 p
+        width = abs(width)
+        height = abs(height)
+        for i in range(segments):
+            p.p[0] = cx + cos(<double>i * radian_inc) * width / 2.
+            p.p[1] = cy - sin(<double>i * radian_inc) * height / 2.
+            self._points.push_back(p)
+        self._points.push_back(self._points[0])
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds(self, self._pmin)
+        extend_bounds(self, self._pmax)
+        self._bounds_margin = fabs(self._thickness)
+
+    cdef void draw(self,
+                   void* drawlist) noexcept nogil:
+        cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
+        if not(self._show) or self._points.size() < 3:
+            return
+        if is_culled(self, drawlist):
+            return
+
+        cdef float thickness = self._thickness
+        thickness *= self.context.viewport.thickness_multiplier
+        if thickness > 0:
+            thickness *= self.context.viewport.size_multiplier
+        thickness = abs(thickness)
+
+        cdef vector[imgui.ImVec2] transformed_points
+        transformed_points.resize(self._points.size())
+        self.context.viewport.coordinates_to_screen(<float*>transformed_points.data(),
+                                                    <const double*>self._points.data(),
+                                                    <int>self._points.size(),
+                                                    sizeof(double2))
+        # TODO imgui requires clockwise order for correct AA
+        # Reverse order if needed
+        if self._fill & imgui.IM_COL32_A_MASK != 0:
+            (<imgui.ImDrawList*>drawlist).AddConvexPolyFilled(transformed_points.data(),
+                                                <int>transformed_points.size(),
+                                                self._fill)
+        (<imgui.ImDrawList*>drawlist).AddPolyline(transformed_points.data(),
+                                    <int>transformed_points.size(),
+                                    self._color,
+                                    0,
+                                    thickness)
+
+
+cdef class DrawImage(drawingItem):
+    """
+    Draw an image in coordinate space.
+
+    DrawImage supports three ways to express its position in space:
+    - p1, p2, p3, p4, the positions of the corners of the image, in
+       a clockwise order
+    - pmin and pmax, where pmin = p1, and pmax = p3, and p2/p4
+        are automatically set such that the image is parallel
+        to the axes.
+    - center, direction, width, height for the coordinate of the center,
+        the angle of (center, middle of p2 and p3) against the x horizontal axis,
+        and the width/height of the image at direction 0.
+
+    uv1/uv2/uv3/uv4 are the normalized texture coordinates at p1/p2/p3/p4
+
+    The systems are similar, but writing to p1/p2/p3/p4 is more expressive
+    as it allows to have non-rectangular shapes.
+    The last system enables to indicate a size in screen space rather
+    than in coordinate space by passing negative values to width and height.
+    """
+
+    def __cinit__(self):
+        self._bounds_dirty = True
+        self.uv1 = [0., 0.]
+        self.uv2 = [1., 0.]
+        self.uv3 = [1., 1.]
+        self.uv4 = [0., 1.]
+        self._color_multiplier = 4294967295 # 0xffffffff
+    @property
+    def texture(self):
+        """Image content"""
+        cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         return self._texture
     @texture.setter
@@ -1155,6 +2943,7 @@ cdef class DrawImage(drawingItem):
         self._p2[1] = self._p1[1]
         self._p4[0] = self._p1[0]
         self.update_center()
+        self.bounds_changed()
     @property
     def pmax(self):
         """
@@ -1174,6 +2963,7 @@ cdef class DrawImage(drawingItem):
         self._p2[0] = self._p3[0]
         self._p4[1] = self._p3[1]
         self.update_center()
+        self.bounds_changed()
     @property
     def center(self):
         """
@@ -1194,6 +2984,7 @@ cdef class DrawImage(drawingItem):
         lock_gil_friendly(m, self.mutex)
         read_coord(self._center, value)
         self.update_extremities()
+        self.bounds_changed()
     @property
     def height(self):
         """
@@ -1211,6 +3002,7 @@ cdef class DrawImage(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._height = value
         self.update_extremities()
+        self.bounds_changed()
     @property
     def width(self):
         """
@@ -1228,6 +3020,7 @@ cdef class DrawImage(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._width = value
         self.update_extremities()
+        self.bounds_changed()
     @property
     def direction(self):
         """
@@ -1244,6 +3037,7 @@ cdef class DrawImage(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._direction = value
+        self.bounds_changed()
     @property
     def p1(self):
         """
@@ -1261,6 +3055,7 @@ cdef class DrawImage(drawingItem):
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p1, value)
         self.update_center()
+        self.bounds_changed()
     @property
     def p2(self):
         """
@@ -1277,6 +3072,7 @@ cdef class DrawImage(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p2, value)
+        self.bounds_changed()
     @property
     def p3(self):
         """
@@ -1294,6 +3090,7 @@ cdef class DrawImage(drawingItem):
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p3, value)
         self.update_center()
+        self.bounds_changed()
     @property
     def p4(self):
         """ 
@@ -1310,6 +3107,7 @@ cdef class DrawImage(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p4, value)
+        self.bounds_changed()
     @property
     def uv_min(self):
         """
@@ -1484,11 +3282,23 @@ cdef class DrawImage(drawingItem):
                 x - self._center[0]
                 )
 
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds(self, self._p1)
+        extend_bounds(self, self._p2)
+        extend_bounds(self, self._p3)
+        extend_bounds(self, self._p4)
+        extend_bounds(self, self._center)
+        # Negative width or height are in screen space
+        self._bounds_margin = fmax(fmax(-self._width, -self._height), 0.)
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
+        if is_culled(self, drawlist):
+            return
         if self._texture is None:
             return
         cdef unique_lock[recursive_mutex] m2 = unique_lock[recursive_mutex](self._texture.mutex)
@@ -1575,6 +3385,7 @@ cdef class DrawLine(drawingItem):
     to indicate a length in screen space rather than in coordinate space.
     """
     def __cinit__(self):
+        self._bounds_dirty = True
         # p1, p2 are zero init by cython
         self._color = 4294967295 # 0xffffffff
         self._thickness = 1.
@@ -1596,6 +3407,7 @@ cdef class DrawLine(drawingItem):
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p1, value)
         self.update_center()
+        self.bounds_changed()
     @property
     def p2(self):
         """
@@ -1613,6 +3425,7 @@ cdef class DrawLine(drawingItem):
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p2, value)
         self.update_center()
+        self.bounds_changed()
 
     cdef void update_extremities(self) noexcept nogil:
         cdef double length = abs(self._length)
@@ -1642,6 +3455,7 @@ cdef class DrawLine(drawingItem):
         lock_gil_friendly(m, self.mutex)
         read_coord(self._center, value)
         self.update_extremities()
+        self.bounds_changed()
     @property
     def length(self):
         """
@@ -1659,104 +3473,476 @@ cdef class DrawLine(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._length = value
         self.update_extremities()
+        self.bounds_changed()
+    @property
+    def direction(self):
+        """
+        Angle (rad) of the line segment relative to the horizontal axis.
+        
+        Returns:
+            float: Angle in radians
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._direction
+    @direction.setter
+    def direction(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._direction = value
+        self.update_extremities()
+        self.bounds_changed()
+
+    cdef void update_center(self) noexcept nogil:
+        self._center[0] = (self._p1[0] + self._p2[0]) * 0.5
+        self._center[1] = (self._p1[1] + self._p2[1]) * 0.5
+        cdef double length2 = (self._p1[0] - self._p2[0]) * (self._p1[0] - self._p2[0]) +\
+            (self._p1[1] - self._p2[1]) * (self._p1[1] - self._p2[1])
+        self._length = sqrt(length2)
+        if length2 < 1e-60:
+            self._direction = 0
+        else:
+            self._direction = atan2( \
+                self._p2[1] - self._center[1],
+                self._p2[0] - self._center[0]
+                )
+
+    @property
+    def color(self):
+        cdef unique_lock[recursive_mutex] m
+        """
+        Color of the drawing outline.
+        
+        Returns:
+            list: RGBA values in [0,1] range
+        """
+        lock_gil_friendly(m, self.mutex)
+        cdef float[4] color
+        unparse_color(color, self._color)
+        return list(color)
+    @color.setter
+    def color(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._color = parse_color(value)
+    @property
+    def thickness(self):
+        cdef unique_lock[recursive_mutex] m
+        """
+        Line thickness of the drawing outline.
+        
+        Returns:
+            float: Thickness value in pixels
+        """
+        lock_gil_friendly(m, self.mutex)
+        return self._thickness
+    @thickness.setter
+    def thickness(self, float value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._thickness = value
+        self.bounds_changed()
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds(self, self._p1)
+        extend_bounds(self, self._p2)
+        extend_bounds(self, self._center)
+        self._bounds_margin = fabs(self._thickness)
+        if self._length < 0:
+            # screen space length
+            self._bounds_margin += -0.5 * self._length
+
+    cdef void draw(self,
+                   void* drawlist) noexcept nogil:
+        cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
+        if not(self._show):
+            return
+        if is_culled(self, drawlist):
+            return
+
+        cdef float thickness = self._thickness
+        thickness *= self.context.viewport.thickness_multiplier
+        if thickness > 0:
+            thickness *= self.context.viewport.size_multiplier
+        thickness = abs(thickness)
+
+        cdef float[2] p1
+        cdef float[2] p2
+        cdef float[2] center
+        cdef float dx, dy
+        if self._length >= 0:
+            self.context.viewport.coordinate_to_screen(p1, self._p1)
+            self.context.viewport.coordinate_to_screen(p2, self._p2)
+        else:
+            self.context.viewport.coordinate_to_screen(center, self._center)
+            dx = -0.5 * cos(self._direction) * self._length
+            dy = -0.5 * sin(self._direction) * self._length
+            p1[0] = center[0] - dx
+            p1[1] = center[1] - dy
+            p2[0] = center[0] + dx
+            p2[1] = center[1] + dy
+
+        cdef imgui.ImVec2 ip1 = imgui.ImVec2(p1[0], p1[1])
+        cdef imgui.ImVec2 ip2 = imgui.ImVec2(p2[0], p2[1])
+        (<imgui.ImDrawList*>drawlist).AddLine(ip1, ip2, <imgui.ImU32>self._color, thickness)
+
+cdef class DrawLines(drawingItem):
+    """
+    Draws a batch of line segments in coordinate space.
+
+    All the segments are described by columnar arrays, and are
+    drawn in a single pass, skipping the ones outside the
+    clipping region. This is much faster than one DrawLine
+    item per segment.
+
+    Each column can have a single element, in which case
+    it applies to all the segments. Arrays of the expected
+    type (float32 for thicknesses, uint32 for colors,
+    float64 or float32 for coordinates) are referenced without copy.
+
+    Attributes:
+        p1 (array): (N, 2) array of the first extremity of each segment
+        p2 (array): (N, 2) array of the second extremity of each segment
+        color (array): Packed RGBA color of each segment
+        thickness (array): Thickness of each segment
+    """
+    def __cinit__(self):
+        self._bounds_dirty = True
+        self._p1 = np.zeros((0, 2), dtype=np.float64)
+        self._p2 = np.zeros((0, 2), dtype=np.float64)
+        self._color = np.array([4294967295], dtype=np.uint32) # 0xffffffff
+        self._thickness = np.ones(1, dtype=np.float32)
+
+    @property
+    def p1(self):
+        """
+        Coordinates of the first extremity of each segment
+
+        Returns:
+            array: (N, 2) array (not a copy)
+
+        Call invalidate() after modifying it in place.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._p1
+    @p1.setter
+    def p1(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._p1 = read_points_array(value)
+        self.bounds_changed()
+    @property
+    def p2(self):
+        """
+        Coordinates of the second extremity of each segment
+
+        Returns:
+            array: (N, 2) array (not a copy)
+
+        Call invalidate() after modifying it in place.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._p2
+    @p2.setter
+    def p2(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._p2 = read_points_array(value)
+        self.bounds_changed()
+    @property
+    def color(self):
+        """
+        Color of each segment, or of all segments
+        if a single color is set.
+
+        Returns:
+            array: (N,) uint32 array of packed RGBA colors
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._color
+    @color.setter
+    def color(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._color = read_colors_array(value)
+    @property
+    def thickness(self):
+        """
+        Thickness of each segment, or of all segments
+        if a single value is set.
+
+        Returns:
+            array: (N,) float32 array (not a copy)
+
+        Call invalidate() after modifying it in place.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._thickness
+    @thickness.setter
+    def thickness(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._thickness = read_values_array(value)
+        self.bounds_changed()
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds_array(self, self._p1)
+        extend_bounds_array(self, self._p2)
+        self._bounds_margin = max_abs_value(self._thickness)
+
+    cdef void draw(self,
+                   void* drawlist) noexcept nogil:
+        cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
+        if not(self._show):
+            return
+        if is_culled(self, drawlist):
+            return
+
+        cdef int count = min(self._p1.shape[0], self._p2.shape[0])
+        count = batch_size(count, self._color)
+        count = batch_size(count, self._thickness)
+        if count <= 0:
+            return
+
+        # p1 then p2
+        cdef vector[imgui.ImVec2] points
+        points_to_screen(self.context.viewport, points, self._p1)
+        points_to_screen(self.context.viewport, points, self._p2, self._p1.shape[0])
+        cdef int p2_start = self._p1.shape[0]
+
+        cdef imgui.ImDrawList* draw_list = <imgui.ImDrawList*>drawlist
+        cdef imgui.ImVec2 clip_min = draw_list.GetClipRectMin()
+        cdef imgui.ImVec2 clip_max = draw_list.GetClipRectMax()
+        cdef const imgui.ImU32* colors = <const imgui.ImU32*>cnp.PyArray_DATA(self._color)
+        cdef const float* thicknesses = <const float*>cnp.PyArray_DATA(self._thickness)
+        cdef int color_step = batch_step(self._color)
+        cdef int thickness_step = batch_step(self._thickness)
+        cdef float thickness_multiplier = self.context.viewport.thickness_multiplier
+        cdef float size_multiplier = self.context.viewport.size_multiplier
+
+        cdef int i
+        cdef float thickness
+        cdef imgui.ImVec2 p1, p2
+        for i in range(count):
+            p1 = points[i]
+            p2 = points[p2_start + i]
+            thickness = thicknesses[i * thickness_step] * thickness_multiplier
+            if thickness > 0:
+                thickness *= size_multiplier
+            thickness = abs(thickness)
+            if is_outside_clip(clip_min, clip_max,
+                               min(p1.x, p2.x) - thickness,
+                               min(p1.y, p2.y) - thickness,
+                               max(p1.x, p2.x) + thickness,
+                               max(p1.y, p2.y) + thickness):
+                continue
+            draw_list.AddLine(p1, p2, colors[i * color_step], thickness)
+
+
+cdef class DrawMesh(drawingItem):
+    """
+    Draws a triangle mesh in coordinate space.
+
+    The mesh is described by its vertices, optional per-vertex
+    colors and texture coordinates, and an array of triangles
+    indexing the vertices. It is written directly into the
+    draw list, which makes it suitable for custom visualizations
+    (terrains, Voronoi fills, etc) with a large number of triangles.
+
+    Arrays of the expected type (float64 or float32 for vertices,
+    uint32 for colors, float32 for uv) are referenced without copy.
+    The indices are copied, as they are validated when set.
+
+    Triangles are not antialiased.
+
+    Attributes:
+        vertices (array): (N, 2) array of the vertices coordinates
+        indices (array): (M, 3) array of the vertex indices of each triangle
+        color (array): Packed RGBA color of each vertex, or of all vertices
+        uv (array): (N, 2) array of the normalized texture coordinates of each vertex
+        texture (Texture): Optional texture sampled with uv
+    """
+    def __cinit__(self):
+        self._bounds_dirty = True
+        self._vertices = np.zeros((0, 2), dtype=np.float64)
+        self._indices = np.zeros((0, 3), dtype=np.uint32)
+        self._max_index = -1
+        self._color = np.array([4294967295], dtype=np.uint32) # 0xffffffff
+        self._uv = np.zeros((0, 2), dtype=np.float32)
+
+    @property
+    def vertices(self):
+        """
+        Coordinates of the vertices of the mesh.
+
+        Returns:
+            array: (N, 2) array (not a copy)
+
+        Call invalidate() after modifying it in place.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._vertices
+    @vertices.setter
+    def vertices(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._vertices = read_points_array(value)
+        self.bounds_changed()
     @property
-    def direction(self):
+    def indices(self):
         """
-        Angle (rad) of the line segment relative to the horizontal axis.
-        
+        Indices in vertices of the three vertices
+        of each triangle.
+
+        The indices are copied when set, and checked
+        against the number of vertices before drawing.
+
         Returns:
-            float: Angle in radians
+            array: (M, 3) uint32 read-only array
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        return self._direction
-    @direction.setter
-    def direction(self, double value):
+        return self._indices
+    @indices.setter
+    def indices(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        self._direction = value
-        self.update_extremities()
-
-    cdef void update_center(self) noexcept nogil:
-        self._center[0] = (self._p1[0] + self._p2[0]) * 0.5
-        self._center[1] = (self._p1[1] + self._p2[1]) * 0.5
-        cdef double length2 = (self._p1[0] - self._p2[0]) * (self._p1[0] - self._p2[0]) +\
-            (self._p1[1] - self._p2[1]) * (self._p1[1] - self._p2[1])
-        self._length = sqrt(length2)
-        if length2 < 1e-60:
-            self._direction = 0
-        else:
-            self._direction = atan2( \
-                self._p2[1] - self._center[1],
-                self._p2[0] - self._center[0]
-                )
-
+        indices = np.asarray(value)
+        if indices.size > 0 and np.min(indices) < 0:
+            raise ValueError("indices must be positive")
+        # Copied, such that _max_index remains valid
+        indices = np.array(indices, dtype=np.uint32, order='C', copy=True)
+        if indices.size % 3 != 0:
+            raise ValueError("indices must be a (M, 3) array")
+        indices.flags.writeable = False
+        self._indices = indices.reshape(-1, 3)
+        # Checked against the number of vertices during rendering
+        self._max_index = np.max(indices) if indices.size > 0 else -1
     @property
     def color(self):
-        cdef unique_lock[recursive_mutex] m
         """
-        Color of the drawing outline.
-        
+        Color of each vertex, or of all vertices
+        if a single color is set. When a texture is
+        set, the texture is multiplied by the color.
+
         Returns:
-            list: RGBA values in [0,1] range
+            array: (N,) uint32 array of packed RGBA colors
         """
+        cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        cdef float[4] color
-        unparse_color(color, self._color)
-        return list(color)
+        return self._color
     @color.setter
     def color(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        self._color = parse_color(value)
+        self._color = read_colors_array(value)
     @property
-    def thickness(self):
-        cdef unique_lock[recursive_mutex] m
+    def uv(self):
         """
-        Line thickness of the drawing outline.
-        
+        Normalized texture coordinates of each vertex.
+        Required when texture is set.
+
         Returns:
-            float: Thickness value in pixels
+            array: (N, 2) float32 array
         """
+        cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        return self._thickness
-    @thickness.setter
-    def thickness(self, float value):
+        return self._uv
+    @uv.setter
+    def uv(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        self._thickness = value
+        if value is None:
+            self._uv = np.zeros((0, 2), dtype=np.float32)
+            return
+        uv = np.ascontiguousarray(value, dtype=np.float32)
+        if uv.size % 2 != 0:
+            raise ValueError("uv must be a (N, 2) array")
+        self._uv = uv.reshape(-1, 2)
+    @property
+    def texture(self):
+        """Optional texture applied to the mesh"""
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._texture
+    @texture.setter
+    def texture(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if not(isinstance(value, Texture)) and value is not None:
+            raise TypeError("texture must be a Texture")
+        self._texture = value
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds_array(self, self._vertices)
 
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
+        if is_culled(self, drawlist):
+            return
 
-        cdef float thickness = self._thickness
-        thickness *= self.context.viewport.thickness_multiplier
-        if thickness > 0:
-            thickness *= self.context.viewport.size_multiplier
-        thickness = abs(thickness)
+        cdef int num_vertices = batch_size(self._vertices.shape[0], self._color)
+        cdef int num_indices = 3 * self._indices.shape[0]
+        if num_vertices <= 0 or num_indices == 0 or \
+           self._max_index >= num_vertices:
+            return
 
-        cdef float[2] p1
-        cdef float[2] p2
-        cdef float[2] center
-        cdef float dx, dy
-        if self._length >= 0:
-            self.context.viewport.coordinate_to_screen(p1, self._p1)
-            self.context.viewport.coordinate_to_screen(p2, self._p2)
-        else:
-            self.context.viewport.coordinate_to_screen(center, self._center)
-            dx = -0.5 * cos(self._direction) * self._length
-            dy = -0.5 * sin(self._direction) * self._length
-            p1[0] = center[0] - dx
-            p1[1] = center[1] - dy
-            p2[0] = center[0] + dx
-            p2[1] = center[1] + dy
+        cdef unique_lock[recursive_mutex] m2
+        cdef bint textured = self._texture is not None
+        if textured:
+            if self._uv.shape[0] < num_vertices:
+                return
+            m2 = unique_lock[recursive_mutex](self._texture.mutex)
+            if self._texture.allocated_texture == NULL:
+                return
+
+        cdef vector[imgui.ImVec2] vertices
+        points_to_screen(self.context.viewport, vertices, self._vertices)
+
+        cdef imgui.ImDrawList* draw_list = <imgui.ImDrawList*>drawlist
+        cdef imgui.ImVec2 clip_min = draw_list.GetClipRectMin()
+        cdef imgui.ImVec2 clip_max = draw_list.GetClipRectMax()
+        cdef int i
+        cdef float xmin = INFINITY, ymin = INFINITY
+        cdef float xmax = -INFINITY, ymax = -INFINITY
+        for i in range(num_vertices):
+            xmin = min(xmin, vertices[i].x)
+            ymin = min(ymin, vertices[i].y)
+            xmax = max(xmax, vertices[i].x)
+            ymax = max(ymax, vertices[i].y)
+        if is_outside_clip(clip_min, clip_max, xmin, ymin, xmax, ymax):
+            return
+
+        cdef const imgui.ImU32* colors = <const imgui.ImU32*>cnp.PyArray_DATA(self._color)
+        cdef int color_step = batch_step(self._color)
+        cdef const imgui.ImVec2* uvs = <const imgui.ImVec2*>cnp.PyArray_DATA(self._uv)
+        cdef const unsigned int* indices = <const unsigned int*>cnp.PyArray_DATA(self._indices)
+        cdef imgui.ImVec2 uv_white = imgui.GetFontTexUvWhitePixel()
+
+        if textured:
+            draw_list.PushTextureID(<imgui.ImTextureID>self._texture.allocated_texture)
+        draw_list.PrimReserve(num_indices, num_vertices)
+        cdef unsigned int base_idx = draw_list._VtxCurrentIdx
+        for i in range(num_vertices):
+            draw_list.PrimWriteVtx(vertices[i],
+                                   uvs[i] if textured else uv_white,
+                                   colors[i * color_step])
+        for i in range(num_indices):
+            draw_list.PrimWriteIdx(<imgui.ImDrawIdx>(base_idx + indices[i]))
+        if textured:
+            draw_list.PopTextureID()
 
-        cdef imgui.ImVec2 ip1 = imgui.ImVec2(p1[0], p1[1])
-        cdef imgui.ImVec2 ip2 = imgui.ImVec2(p2[0], p2[1])
-        (<imgui.ImDrawList*>drawlist).AddLine(ip1, ip2, <imgui.ImU32>self._color, thickness)
 
 cdef class DrawPolyline(drawingItem):
     """
@@ -1766,13 +3952,14 @@ cdef class DrawPolyline(drawingItem):
     Can optionally be closed to form a complete loop.
 
     Attributes:
-        points (list): List of (x,y) coordinates defining the vertices
+        points (array): (N, 2) array of the vertices coordinates
         color (list): RGBA color of the lines
         thickness (float): Line thickness
         closed (bool): Whether to connect the last point back to the first
     """
     def __cinit__(self):
-        # points is empty init by cython
+        self._bounds_dirty = True
+        self._points = np.zeros((0, 2), dtype=np.float64)
         self._color = 4294967295 # 0xffffffff
         self._thickness = 1.
         self._closed = False
@@ -1780,29 +3967,28 @@ cdef class DrawPolyline(drawingItem):
     @property
     def points(self):
         """
-        List of vertex positions defining the shape.
-        
+        Vertex positions defining the shape.
+
+        Accepts a (N, 2) array or a list of (x, y)
+        coordinates. float64 and float32 arrays are
+        used directly for the internal backing (no copy)
+        as long as the x and y of each point are
+        contiguous.
+
         Returns:
-            list: List of (x,y) coordinate tuples
+            numpy.ndarray: The (N, 2) array of points (not a copy)
+
+        Call invalidate() after modifying it in place.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        res = []
-        cdef double2 p
-        cdef int i
-        for i in range(<int>self._points.size()):
-            res.append(Coord.build(self._points[i].p))
-        return res
+        return self._points
     @points.setter
     def points(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        cdef double2 p
-        cdef int i
-        self._points.clear()
-        for i in range(len(value)):
-            read_coord(p.p, value[i])
-            self._points.push_back(p)
+        self._points = read_points_array(value)
+        self.bounds_changed()
     @property
     def color(self):
         """
@@ -1853,11 +4039,19 @@ cdef class DrawPolyline(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
+        self.bounds_changed()
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds_array(self, self._points)
+        self._bounds_margin = fabs(self._thickness)
 
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
-        if not(self._show) or self._points.size() < 2:
+        if not(self._show) or self._points.shape[0] < 2:
+            return
+        if is_culled(self, drawlist):
             return
 
         cdef float thickness = self._thickness
@@ -1866,23 +4060,18 @@ cdef class DrawPolyline(drawingItem):
             thickness *= self.context.viewport.size_multiplier
         thickness = abs(thickness)
 
-        cdef float[2] p
-        cdef imgui.ImVec2 ip1
-        cdef imgui.ImVec2 ip1_
-        cdef imgui.ImVec2 ip2
-        self.context.viewport.coordinate_to_screen(p, self._points[0].p)
-        ip1 = imgui.ImVec2(p[0], p[1])
-        ip1_ = ip1
-        # imgui requires clockwise order + convexity for correct AA of AddPolyline
-        # Thus we only call AddLine
-        cdef int i
-        for i in range(1, <int>self._points.size()):
-            self.context.viewport.coordinate_to_screen(p, self._points[i].p)
-            ip2 = imgui.ImVec2(p[0], p[1])
-            (<imgui.ImDrawList*>drawlist).AddLine(ip1, ip2, <imgui.ImU32>self._color, thickness)
-            ip1 = ip2
-        if self._closed and self._points.size() > 2:
-            (<imgui.ImDrawList*>drawlist).AddLine(ip1_, ip2, <imgui.ImU32>self._color, thickness)
+        cdef vector[imgui.ImVec2] ipoints
+        points_to_screen(self.context.viewport, ipoints, self._points)
+        cdef imgui.ImDrawFlags flags = 0
+        if self._closed and ipoints.size() > 2:
+            flags = imgui.ImDrawFlags_Closed
+        # A single call: the vertices of all the segments
+        # are reserved at once (PrimReserve)
+        (<imgui.ImDrawList*>drawlist).AddPolyline(ipoints.data(),
+                                                  <int>ipoints.size(),
+                                                  <imgui.ImU32>self._color,
+                                                  flags,
+                                                  thickness)
 
 
 cdef inline bint is_counter_clockwise(imgui.ImVec2 p1,
@@ -1897,17 +4086,23 @@ cdef class DrawPolygon(drawingItem):
     Draws a filled polygon in coordinate space.
 
     The polygon is defined by a sequence of points that form its vertices.
-    Can be filled and/or outlined. Non-convex polygons are automatically
-    triangulated for proper filling.
+    Can be filled and/or outlined. Non-convex polygons, and polygons
+    with holes, are triangulated (ear clipping) for proper filling.
+    The triangulation is cached until the points or holes change.
 
     Attributes:
-        points (list): List of (x,y) coordinates defining the vertices 
+        points (array): (N, 2) array of the vertices coordinates
+        holes (list): Arrays of the vertices of the holes
         color (list): RGBA color of the outline
         fill (list): RGBA color of the fill
         thickness (float): Outline thickness
     """
     def __cinit__(self):
-        # points is empty init by cython
+        self._bounds_dirty = True
+        self._points = np.zeros((0, 2), dtype=np.float64)
+        self._hole_points = np.zeros((0, 2), dtype=np.float64)
+        self._hole_starts.push_back(0)
+        self._triangulation_dirty = True
         self._color = 4294967295 # 0xffffffff
         self._fill = 0
         self._thickness = 1.
@@ -1915,30 +4110,60 @@ cdef class DrawPolygon(drawingItem):
     @property
     def points(self):
         """
-        List of vertex positions defining the shape.
-        
+        Vertex positions defining the shape.
+
+        Accepts a (N, 2) array or a list of (x, y)
+        coordinates. float64 and float32 arrays are
+        used directly for the internal backing (no copy)
+        as long as the x and y of each point are
+        contiguous.
+
         Returns:
-            list: List of (x,y) coordinate tuples
+            numpy.ndarray: The (N, 2) array of points (not a copy)
+
+        Call invalidate() after modifying it in place.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        res = []
-        cdef double2 p
-        cdef int i
-        for i in range(<int>self._points.size()):
-            res.append(Coord.build(self._points[i].p))
-        return res
+        return self._points
     @points.setter
     def points(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        cdef double2 p
+        self._points = read_points_array(value)
+        self._triangulation_dirty = True
+        self.bounds_changed()
+    @property
+    def holes(self):
+        """
+        Holes of the polygon.
+
+        List of (M, 2) arrays (or lists of coordinates)
+        of the vertices of each hole. Holes must be inside
+        the polygon and must not intersect each other.
+
+        Returns:
+            list: List of (M, 2) arrays
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
         cdef int i
-        self._points.clear()
-        for i in range(len(value)):
-            read_coord(p.p, value[i])
-            self._points.push_back(p)
-        self.__triangulate()
+        return [self._hole_points[self._hole_starts[i]:self._hole_starts[i+1]]
+                for i in range(<int>self._hole_starts.size()-1)]
+    @holes.setter
+    def holes(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        holes = [] if value is None else [read_points_array(hole) for hole in value]
+        self._hole_starts.clear()
+        self._hole_starts.push_back(0)
+        for hole in holes:
+            self._hole_starts.push_back(self._hole_starts.back() + hole.shape[0])
+        if len(holes) > 0:
+            self._hole_points = np.ascontiguousarray(np.concatenate(holes), dtype=np.float64)
+        else:
+            self._hole_points = np.zeros((0, 2), dtype=np.float64)
+        self._triangulation_dirty = True
     @property
     def color(self):
         """
@@ -1991,25 +4216,56 @@ cdef class DrawPolygon(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
+        self.bounds_changed()
 
     # ImGui Polygon fill requires clockwise order and convex polygon.
     # We want to be more lenient -> triangulate
-    cdef void __triangulate(self):
-        if self._fill & imgui.IM_COL32_A_MASK != 0:
+    cdef void triangulate(self) noexcept nogil:
+        self._triangulation_dirty = False
+        cdef int num_points = self._points.shape[0]
+        cdef int num_hole_points = self._hole_points.shape[0]
+        if num_points < 3:
+            self._triangulation_indices.clear()
             return
-        # TODO: optimize with arrays
-        points = []
+        # Packed float64 coordinates of the polygon, then of the holes
+        cdef vector[double] coords
+        coords.resize(2 * (num_points + num_hole_points))
+        cdef const char* data = <const char*>cnp.PyArray_DATA(self._points)
+        cdef Py_ssize_t stride = cnp.PyArray_STRIDE(self._points, 0)
+        cdef bint is_float = cnp.PyArray_TYPE(self._points) == cnp.NPY_FLOAT
         cdef int i
-        for i in range(<int>self._points.size()):
-            # For now perform only in 2D
-            points.append([self._points[i].p[0], self._points[i].p[1]])
-        # order is counter clock-wise
-        self._triangulation_indices = scipy.spatial.Delaunay(points).simplices
+        for i in range(num_points):
+            if is_float:
+                coords[2*i] = (<const float*>(data + i * stride))[0]
+                coords[2*i+1] = (<const float*>(data + i * stride))[1]
+            else:
+                coords[2*i] = (<const double*>(data + i * stride))[0]
+                coords[2*i+1] = (<const double*>(data + i * stride))[1]
+        if num_hole_points > 0:
+            memcpy(&coords[2*num_points],
+                   cnp.PyArray_DATA(self._hole_points),
+                   2 * num_hole_points * sizeof(double))
+        cdef vector[int] ring_starts
+        ring_starts.push_back(0)
+        for i in range(<int>self._hole_starts.size()):
+            ring_starts.push_back(num_points + self._hole_starts[i])
+        DCGTriangulatePolygon(coords.data(),
+                              ring_starts.data(),
+                              <int>ring_starts.size() - 1,
+                              self._triangulation_indices)
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        # The holes are inside the polygon
+        extend_bounds_array(self, self._points)
+        self._bounds_margin = fabs(self._thickness)
 
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
-        if not(self._show) or self._points.size() < 2:
+        if not(self._show) or self._points.shape[0] < 2:
+            return
+        if is_culled(self, drawlist):
             return
 
         cdef float thickness = self._thickness
@@ -2018,46 +4274,45 @@ cdef class DrawPolygon(drawingItem):
             thickness *= self.context.viewport.size_multiplier
         thickness = abs(thickness)
 
-        cdef float[2] p
-        cdef imgui.ImVec2 ip
+        cdef int num_points = self._points.shape[0]
         cdef vector[imgui.ImVec2] ipoints
-        cdef int i
-        cdef bint ccw
-        ipoints.reserve(self._points.size())
-        for i in range(<int>self._points.size()):
-            self.context.viewport.coordinate_to_screen(p, self._points[i].p)
-            ip = imgui.ImVec2(p[0], p[1])
-            ipoints.push_back(ip)
+        points_to_screen(self.context.viewport, ipoints, self._points)
+        points_to_screen(self.context.viewport, ipoints, self._hole_points, num_points)
 
+        cdef imgui.ImDrawList* draw_list = <imgui.ImDrawList*>drawlist
+        cdef int i
+        cdef unsigned int base_idx
+        cdef imgui.ImVec2 uv
         # Draw interior
-        if self._fill & imgui.IM_COL32_A_MASK != 0 and self._triangulation_indices.shape[0] > 0:
-            # imgui requires clockwise order + convexity for correct AA
-            # The triangulation always returns counter-clockwise
-            # but the matrix can change the order.
-            # The order should be the same for all triangles, except in plot with log
-            # scale.
-            for i in range(self._triangulation_indices.shape[0]):
-                ccw = is_counter_clockwise(ipoints[self._triangulation_indices[i, 0]],
-                                           ipoints[self._triangulation_indices[i, 1]],
-                                           ipoints[self._triangulation_indices[i, 2]])
-                if ccw:
-                    (<imgui.ImDrawList*>drawlist).AddTriangleFilled(ipoints[self._triangulation_indices[i, 0]],
-                                                      ipoints[self._triangulation_indices[i, 2]],
-                                                      ipoints[self._triangulation_indices[i, 1]],
-                                                      self._fill)
-                else:
-                    (<imgui.ImDrawList*>drawlist).AddTriangleFilled(ipoints[self._triangulation_indices[i, 0]],
-                                                      ipoints[self._triangulation_indices[i, 1]],
-                                                      ipoints[self._triangulation_indices[i, 2]],
-                                                      self._fill)
+        if self._fill & imgui.IM_COL32_A_MASK != 0:
+            if self._triangulation_dirty:
+                self.triangulate()
+            if self._triangulation_indices.size() > 0:
+                # The vertices are shared by the triangles.
+                # The outline hides the lack of antialiasing.
+                uv = imgui.GetFontTexUvWhitePixel()
+                draw_list.PrimReserve(<int>self._triangulation_indices.size(),
+                                      <int>ipoints.size())
+                base_idx = draw_list._VtxCurrentIdx
+                for i in range(<int>ipoints.size()):
+                    draw_list.PrimWriteVtx(ipoints[i], uv, self._fill)
+                for i in range(<int>self._triangulation_indices.size()):
+                    draw_list.PrimWriteIdx(<imgui.ImDrawIdx>(base_idx + self._triangulation_indices[i]))
 
         # Draw closed boundary
-        # imgui requires clockwise order + convexity for correct AA of AddPolyline
-        # Thus we only call AddLine
-        for i in range(1, <int>self._points.size()):
-            (<imgui.ImDrawList*>drawlist).AddLine(ipoints[i-1], ipoints[i], <imgui.ImU32>self._color, thickness)
-        if self._points.size() > 2:
-            (<imgui.ImDrawList*>drawlist).AddLine(ipoints[0], ipoints[<int>self._points.size()-1], <imgui.ImU32>self._color, thickness)
+        draw_list.AddPolyline(ipoints.data(),
+                              num_points,
+                              <imgui.ImU32>self._color,
+                              imgui.ImDrawFlags_Closed if num_points > 2 else 0,
+                              thickness)
+        for i in range(<int>self._hole_starts.size()-1):
+            if self._hole_starts[i+1] - self._hole_starts[i] < 2:
+                continue
+            draw_list.AddPolyline(ipoints.data() + num_points + self._hole_starts[i],
+                                  self._hole_starts[i+1] - self._hole_starts[i],
+                                  <imgui.ImU32>self._color,
+                                  imgui.ImDrawFlags_Closed,
+                                  thickness)
 
 cdef class DrawQuad(drawingItem):
     """
@@ -2076,6 +4331,7 @@ cdef class DrawQuad(drawingItem):
         thickness (float): Outline thickness
     """
     def __cinit__(self):
+        self._bounds_dirty = True
         # p1, p2, p3, p4 are zero init by cython
         self._color = 4294967295 # 0xffffffff
         self._fill = 0
@@ -2097,6 +4353,7 @@ cdef class DrawQuad(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p1, value)
+        self.bounds_changed()
     @property
     def p2(self):
         """
@@ -2113,6 +4370,7 @@ cdef class DrawQuad(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p2, value)
+        self.bounds_changed()
     @property
     def p3(self):
         """
@@ -2129,6 +4387,7 @@ cdef class DrawQuad(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p3, value)
+        self.bounds_changed()
     @property
     def p4(self):
         """ 
@@ -2145,6 +4404,7 @@ cdef class DrawQuad(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p4, value)
+        self.bounds_changed()
     @property
     def color(self):
         """
@@ -2197,12 +4457,23 @@ cdef class DrawQuad(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
+        self.bounds_changed()
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds(self, self._p1)
+        extend_bounds(self, self._p2)
+        extend_bounds(self, self._p3)
+        extend_bounds(self, self._p4)
+        self._bounds_margin = fabs(self._thickness)
 
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
+        if is_culled(self, drawlist):
+            return
 
         cdef float thickness = self._thickness
         thickness *= self.context.viewport.thickness_multiplier
@@ -2269,6 +4540,7 @@ cdef class DrawRect(drawingItem):
         rounding (float): Radius of rounded corners
     """
     def __cinit__(self):
+        self._bounds_dirty = True
         self._pmin = [0., 0.]
         self._pmax = [1., 1.]
         self._color = 4294967295 # 0xffffffff
@@ -2297,6 +4569,7 @@ cdef class DrawRect(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._pmin, value)
+        self.bounds_changed()
     @property
     def pmax(self):
         """
@@ -2313,6 +4586,7 @@ cdef class DrawRect(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._pmax, value)
+        self.bounds_changed()
     @property
     def color(self):
         """
@@ -2446,6 +4720,7 @@ cdef class DrawRect(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
+        self.bounds_changed()
     @property
     def rounding(self):
         """
@@ -2463,11 +4738,19 @@ cdef class DrawRect(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._rounding = value
 
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds(self, self._pmin)
+        extend_bounds(self, self._pmax)
+        self._bounds_margin = fabs(self._thickness)
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
+        if is_culled(self, drawlist):
+            return
 
         cdef float rounding = self._rounding
         cdef float thickness = self._thickness
@@ -2526,12 +4809,228 @@ cdef class DrawRect(drawingItem):
                                        rounding,
                                        imgui.ImDrawFlags_RoundCornersAll)
 
-        (<imgui.ImDrawList*>drawlist).AddRect(ipmin,
-                                ipmax,
-                                self._color,
-                                rounding,
-                                imgui.ImDrawFlags_RoundCornersAll,
-                                thickness)
+        (<imgui.ImDrawList*>drawlist).AddRect(ipmin,
+                                ipmax,
+                                self._color,
+                                rounding,
+                                imgui.ImDrawFlags_RoundCornersAll,
+                                thickness)
+
+
+cdef class DrawRects(drawingItem):
+    """
+    Draws a batch of rectangles in coordinate space.
+
+    All the rectangles are described by columnar arrays, and are
+    drawn in a single pass, skipping the ones outside the
+    clipping region. This is much faster than one DrawRect
+    item per rectangle (for instance to display the bounding
+    boxes of an object detector).
+
+    Each column can have a single element, in which case
+    it applies to all the rectangles. Arrays of the expected
+    type (float32 for thicknesses, uint32 for colors,
+    float64 or float32 for coordinates) are referenced without copy.
+
+    Attributes:
+        pmin (array): (N, 2) array of the top-left corners coordinates
+        pmax (array): (N, 2) array of the bottom-right corners coordinates
+        color (array): Packed RGBA outline color of each rectangle
+        fill (array): Packed RGBA fill color of each rectangle
+        thickness (array): Outline thickness of each rectangle
+        rounding (float): Radius of rounded corners
+    """
+    def __cinit__(self):
+        self._bounds_dirty = True
+        self._pmin = np.zeros((0, 2), dtype=np.float64)
+        self._pmax = np.zeros((0, 2), dtype=np.float64)
+        self._color = np.array([4294967295], dtype=np.uint32) # 0xffffffff
+        self._fill = np.zeros(1, dtype=np.uint32)
+        self._thickness = np.ones(1, dtype=np.float32)
+        self._rounding = 0.
+
+    @property
+    def pmin(self):
+        """
+        Top-left corner of each rectangle in coordinate space.
+
+        Returns:
+            array: (N, 2) array (not a copy)
+
+        Call invalidate() after modifying it in place.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._pmin
+    @pmin.setter
+    def pmin(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._pmin = read_points_array(value)
+        self.bounds_changed()
+    @property
+    def pmax(self):
+        """
+        Bottom-right corner of each rectangle in coordinate space.
+
+        Returns:
+            array: (N, 2) array (not a copy)
+
+        Call invalidate() after modifying it in place.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._pmax
+    @pmax.setter
+    def pmax(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._pmax = read_points_array(value)
+        self.bounds_changed()
+    @property
+    def color(self):
+        """
+        Outline color of each rectangle, or of all rectangles
+        if a single color is set.
+
+        Returns:
+            array: (N,) uint32 array of packed RGBA colors
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._color
+    @color.setter
+    def color(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._color = read_colors_array(value)
+    @property
+    def fill(self):
+        """
+        Fill color of each rectangle, or of all rectangles
+        if a single color is set.
+
+        Returns:
+            array: (N,) uint32 array of packed RGBA colors
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._fill
+    @fill.setter
+    def fill(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._fill = read_colors_array(value)
+    @property
+    def thickness(self):
+        """
+        Outline thickness of each rectangle, or of all rectangles
+        if a single value is set.
+
+        Returns:
+            array: (N,) float32 array (not a copy)
+
+        Call invalidate() after modifying it in place.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._thickness
+    @thickness.setter
+    def thickness(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._thickness = read_values_array(value)
+        self.bounds_changed()
+    @property
+    def rounding(self):
+        """
+        Rounding of the corners of the rectangles.
+
+        Returns:
+            float: Rounding radius
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._rounding
+    @rounding.setter
+    def rounding(self, float value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._rounding = value
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds_array(self, self._pmin)
+        extend_bounds_array(self, self._pmax)
+        self._bounds_margin = max_abs_value(self._thickness)
+
+    cdef void draw(self,
+                   void* drawlist) noexcept nogil:
+        cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
+        if not(self._show):
+            return
+        if is_culled(self, drawlist):
+            return
+
+        cdef int count = min(self._pmin.shape[0], self._pmax.shape[0])
+        count = batch_size(count, self._color)
+        count = batch_size(count, self._fill)
+        count = batch_size(count, self._thickness)
+        if count <= 0:
+            return
+
+        # pmin then pmax
+        cdef vector[imgui.ImVec2] points
+        points_to_screen(self.context.viewport, points, self._pmin)
+        points_to_screen(self.context.viewport, points, self._pmax, self._pmin.shape[0])
+        cdef int pmax_start = self._pmin.shape[0]
+
+        cdef imgui.ImDrawList* draw_list = <imgui.ImDrawList*>drawlist
+        cdef imgui.ImVec2 clip_min = draw_list.GetClipRectMin()
+        cdef imgui.ImVec2 clip_max = draw_list.GetClipRectMax()
+        cdef const imgui.ImU32* colors = <const imgui.ImU32*>cnp.PyArray_DATA(self._color)
+        cdef const imgui.ImU32* fills = <const imgui.ImU32*>cnp.PyArray_DATA(self._fill)
+        cdef const float* thicknesses = <const float*>cnp.PyArray_DATA(self._thickness)
+        cdef int color_step = batch_step(self._color)
+        cdef int fill_step = batch_step(self._fill)
+        cdef int thickness_step = batch_step(self._thickness)
+        cdef float thickness_multiplier = self.context.viewport.thickness_multiplier
+        cdef float size_multiplier = self.context.viewport.size_multiplier
+
+        cdef int i
+        cdef float thickness
+        cdef imgui.ImU32 fill
+        cdef imgui.ImVec2 ipmin, ipmax
+        for i in range(count):
+            ipmin = points[i]
+            ipmax = points[pmax_start + i]
+            # imgui requires clockwise order + convex for correct AA
+            # The transform might invert the order
+            if ipmin.x > ipmax.x:
+                swap(ipmin.x, ipmax.x)
+            if ipmin.y > ipmax.y:
+                swap(ipmin.y, ipmax.y)
+            thickness = thicknesses[i * thickness_step] * thickness_multiplier
+            if thickness > 0:
+                thickness *= size_multiplier
+            thickness = abs(thickness)
+            if is_outside_clip(clip_min, clip_max,
+                               ipmin.x - thickness, ipmin.y - thickness,
+                               ipmax.x + thickness, ipmax.y + thickness):
+                continue
+            fill = fills[i * fill_step]
+            if fill & imgui.IM_COL32_A_MASK != 0:
+                draw_list.AddRectFilled(ipmin,
+                                        ipmax,
+                                        fill,
+                                        self._rounding,
+                                        imgui.ImDrawFlags_RoundCornersAll)
+            draw_list.AddRect(ipmin,
+                              ipmax,
+                              colors[i * color_step],
+                              self._rounding,
+                              imgui.ImDrawFlags_RoundCornersAll,
+                              thickness)
 
 
 cdef class DrawRegularPolygon(drawingItem):
@@ -2545,6 +5044,7 @@ cdef class DrawRegularPolygon(drawingItem):
     Radius can be negative to mean screen space.
     """
     def __cinit__(self):
+        self._bounds_dirty = True
         # p1, p2 are zero init by cython
         self._color = 4294967295 # 0xffffffff
         self._thickness = 1.
@@ -2566,6 +5066,7 @@ cdef class DrawRegularPolygon(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._center, value)
+        self.bounds_changed()
     @property
     def radius(self):
         """
@@ -2582,6 +5083,7 @@ cdef class DrawRegularPolygon(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._radius = value
+        self.bounds_changed()
     @property
     def direction(self):
         """
@@ -2671,12 +5173,20 @@ cdef class DrawRegularPolygon(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
+        self.bounds_changed()
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds(self, self._center)
+        self._bounds_margin = fabs(self._radius) + fabs(self._thickness)
 
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
+        if is_culled(self, drawlist):
+            return
 
         cdef float thickness = self._thickness
         thickness *= self.context.viewport.thickness_multiplier
@@ -2760,6 +5270,7 @@ cdef class DrawStar(drawingItem):
     Radius can be negative to mean screen space.
     """
     def __cinit__(self):
+        self._bounds_dirty = True
         # p1, p2 are zero init by cython
         self._color = 4294967295 # 0xffffffff
         self._thickness = 1.
@@ -2782,6 +5293,7 @@ cdef class DrawStar(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._center, value)
+        self.bounds_changed()
     @property
     def radius(self):
         """
@@ -2798,6 +5310,7 @@ cdef class DrawStar(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._radius = value
+        self.bounds_changed()
     @property
     def inner_radius(self):
         """
@@ -2814,6 +5327,7 @@ cdef class DrawStar(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._inner_radius = value
+        self.bounds_changed()
     @property
     def direction(self):
         """
@@ -2903,12 +5417,20 @@ cdef class DrawStar(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
+        self.bounds_changed()
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds(self, self._center)
+        self._bounds_margin = fmax(fabs(self._radius), fabs(self._inner_radius)) + fabs(self._thickness)
 
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
+        if is_culled(self, drawlist):
+            return
 
         cdef float thickness = self._thickness
         thickness *= self.context.viewport.thickness_multiplier
@@ -3030,6 +5552,11 @@ cdef class DrawText(drawingItem):
     def __cinit__(self):
         self._color = 4294967295 # 0xffffffff
         self._size = 0. # 0: default size. DearPyGui uses 1. internally, then 10. in the wrapper.
+        self._layout = create_text_layout()
+
+    def __dealloc__(self):
+        if self._layout != NULL:
+            destroy_text_layout(self._layout)
 
     @property
     def pos(self):
@@ -3125,14 +5652,754 @@ cdef class DrawText(drawingItem):
         size = abs(size)
         if self._font is not None:
             self._font.push()
-        if size == 0:
-            (<imgui.ImDrawList*>drawlist).AddText(ip, <imgui.ImU32>self._color, self._text.c_str())
+        # Same as AddText, but the glyph quads are only
+        # computed again when the text, font or size change.
+        layout_text(self._layout, self._text, size, 0., self._color)
+        draw_text_layout(self._layout, drawlist, ip.x, ip.y)
+        if self._font is not None:
+            self._font.pop()
+
+
+
+cdef class DrawTexts(drawingItem):
+    """
+    Draws a batch of texts in coordinate space.
+
+    All the texts are described by columnar arrays, and are
+    drawn in a single pass, skipping the ones outside the
+    clipping region. This is much faster than one DrawText
+    item per text (for instance to label many points).
+
+    The color column can have a single element, in which case
+    it applies to all the texts. Arrays of the expected type
+    (uint32 for colors, float64 or float32 for positions) are
+    referenced without copy.
+
+    Attributes:
+        pos (array): (N, 2) array of the positions of the texts
+        text (list): The text strings to display
+        color (array): Packed RGBA color of each text
+        font (Font): Optional custom font to use
+        size (float): Text size. Negative means screen space units.
+    """
+    def __cinit__(self):
+        self._pos = np.zeros((0, 2), dtype=np.float64)
+        self._text_starts.push_back(0)
+        self._color = np.array([4294967295], dtype=np.uint32) # 0xffffffff
+        self._size = 0.
+
+    @property
+    def pos(self):
+        """
+        Position of each text in coordinate space.
+
+        Returns:
+            array: (N, 2) array (not a copy)
+
+        Call invalidate() after modifying it in place.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._pos
+    @pos.setter
+    def pos(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._pos = read_points_array(value)
+    @property
+    def text(self):
+        """
+        Text strings to display.
+
+        Returns:
+            list: list of str
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef int i
+        return [str(self._text_data.substr(self._text_starts[i],
+                                           self._text_starts[i+1] - self._text_starts[i]),
+                    encoding='utf-8')
+                for i in range(<int>self._text_starts.size()-1)]
+    @text.setter
+    def text(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        encoded = [bytes(text, 'utf-8') for text in value]
+        self._text_data = b''.join(encoded)
+        self._text_starts.clear()
+        self._text_starts.push_back(0)
+        for text in encoded:
+            self._text_starts.push_back(self._text_starts.back() + len(text))
+    @property
+    def color(self):
+        """
+        Color of each text, or of all texts
+        if a single color is set.
+
+        Returns:
+            array: (N,) uint32 array of packed RGBA colors
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._color
+    @color.setter
+    def color(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._color = read_colors_array(value)
+    @property
+    def font(self):
+        """
+        Writable attribute: font used for the texts rendered
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._font
+    @font.setter
+    def font(self, baseFont value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._font = value
+    @property
+    def size(self):
+        """
+        Text size. Negative means screen space units.
+
+        Returns:
+            float: Size value
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._size
+    @size.setter
+    def size(self, float value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._size = value
+
+    cdef void draw(self,
+                   void* drawlist) noexcept nogil:
+        cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
+        if not(self._show):
+            return
+
+        cdef int count = min(self._pos.shape[0], <int>self._text_starts.size() - 1)
+        count = batch_size(count, self._color)
+        if count <= 0:
+            return
+
+        cdef vector[imgui.ImVec2] positions
+        points_to_screen(self.context.viewport, positions, self._pos)
+
+        cdef float size = self._size
+        if size > 0:
+            size *= self.context.viewport.size_multiplier
         else:
-            (<imgui.ImDrawList*>drawlist).AddText(NULL, size, ip, <imgui.ImU32>self._color, self._text.c_str())
+            size *= self.context.viewport.global_scale
+        size = abs(size)
+        if self._font is not None:
+            self._font.push()
+        if size == 0:
+            size = imgui.GetFontSize()
+
+        cdef imgui.ImDrawList* draw_list = <imgui.ImDrawList*>drawlist
+        cdef imgui.ImVec2 clip_min = draw_list.GetClipRectMin()
+        cdef imgui.ImVec2 clip_max = draw_list.GetClipRectMax()
+        cdef const imgui.ImU32* colors = <const imgui.ImU32*>cnp.PyArray_DATA(self._color)
+        cdef int color_step = batch_step(self._color)
+        cdef const char* text_data = self._text_data.c_str()
+
+        cdef int i, length
+        cdef float ymax
+        for i in range(count):
+            length = self._text_starts[i+1] - self._text_starts[i]
+            if length == 0:
+                continue
+            # The text extent is unknown without computing the layout,
+            # thus only its start is tested horizontally, and multiline
+            # texts are not culled vertically. ImGui performs the finer
+            # clipping of long texts.
+            ymax = positions[i].y + size
+            if memchr(text_data + self._text_starts[i], 10, length) != NULL:
+                ymax = INFINITY
+            if is_outside_clip(clip_min, clip_max,
+                               positions[i].x, positions[i].y,
+                               INFINITY, ymax):
+                continue
+            draw_list.AddText(NULL,
+                              size,
+                              positions[i],
+                              colors[i * color_step],
+                              text_data + self._text_starts[i],
+                              text_data + self._text_starts[i+1])
         if self._font is not None:
             self._font.pop()
 
 
+cdef extern from * nogil:
+    """
+    #include <algorithm>
+    #include <cmath>
+    #include <vector>
+
+    /* Greedy placement of screen space rectangles: a rectangle
+       is accepted if it does not overlap the ones accepted
+       before. The accepted rectangles are indexed by a grid. */
+    struct DCGOverlapGrid {
+        struct Rect {
+            float x0, y0, x1, y1;
+        };
+        float x0 = 0.f, y0 = 0.f, cell = 1.f;
+        int cols = 0, rows = 0;
+        std::vector<std::vector<int>> cells;
+        std::vector<Rect> rects;
+    };
+
+    void* DCGOverlapGridCreate()
+    {
+        return new DCGOverlapGrid();
+    }
+
+    void DCGOverlapGridDestroy(void* data)
+    {
+        delete (DCGOverlapGrid*)data;
+    }
+
+    /* Starts a new placement. The rectangles are expected to
+       be mostly in the (x0, y0, x1, y1) region. */
+    void DCGOverlapGridReset(void* data, float x0, float y0, float x1, float y1, float cell)
+    {
+        DCGOverlapGrid* g = (DCGOverlapGrid*)data;
+        g->x0 = x0;
+        g->y0 = y0;
+        g->cell = std::max(cell, 1.f);
+        g->cols = std::min(std::max((int)std::ceil((x1 - x0) / g->cell), 1), 256);
+        g->rows = std::min(std::max((int)std::ceil((y1 - y0) / g->cell), 1), 256);
+        g->cells.resize((size_t)g->cols * g->rows);
+        for (std::vector<int>& cell_rects : g->cells)
+            cell_rects.clear();
+        g->rects.clear();
+    }
+
+    /* Accepts the rectangle if it does not overlap any of the
+       accepted ones. Rectangles outside the region are assigned
+       to the border cells. */
+    bool DCGOverlapGridInsert(void* data, float x0, float y0, float x1, float y1)
+    {
+        DCGOverlapGrid* g = (DCGOverlapGrid*)data;
+        int cx0 = std::min(std::max((int)std::floor((x0 - g->x0) / g->cell), 0), g->cols - 1);
+        int cx1 = std::min(std::max((int)std::floor((x1 - g->x0) / g->cell), 0), g->cols - 1);
+        int cy0 = std::min(std::max((int)std::floor((y0 - g->y0) / g->cell), 0), g->rows - 1);
+        int cy1 = std::min(std::max((int)std::floor((y1 - g->y0) / g->cell), 0), g->rows - 1);
+        for (int cy = cy0; cy <= cy1; cy++) {
+            for (int cx = cx0; cx <= cx1; cx++) {
+                for (int index : g->cells[(size_t)cy * g->cols + cx]) {
+                    const DCGOverlapGrid::Rect& r = g->rects[index];
+                    if (r.x0 < x1 && x0 < r.x1 && r.y0 < y1 && y0 < r.y1)
+                        return false;
+                }
+            }
+        }
+        int index = (int)g->rects.size();
+        g->rects.push_back({x0, y0, x1, y1});
+        for (int cy = cy0; cy <= cy1; cy++)
+            for (int cx = cx0; cx <= cx1; cx++)
+                g->cells[(size_t)cy * g->cols + cx].push_back(index);
+        return true;
+    }
+    """
+    void* DCGOverlapGridCreate()
+    void DCGOverlapGridDestroy(void*)
+    void DCGOverlapGridReset(void*, float, float, float, float, float)
+    bint DCGOverlapGridInsert(void*, float, float, float, float)
+
+# Width of the atlas of DrawLabels, and maximum height
+cdef int _LABEL_ATLAS_WIDTH = 2048
+cdef int _LABEL_ATLAS_MAX_HEIGHT = 16384
+
+cdef class DrawLabels(drawingItem):
+    """
+    Draws a batch of text labels in coordinate space.
+
+    Contrary to DrawTexts, the texts are not drawn with the
+    font, but rendered once by a FontRenderer into an atlas
+    texture shared by all the labels. Each frame, a label is
+    a single textured quad, which makes tens of thousands of
+    labels (map annotations, point names) cheap to draw.
+    Repeated strings are rendered once, and setting new texts
+    only renders the strings missing from the atlas.
+
+    The labels are drawn in screen space, with the top left of
+    the box of their ink at their position (see alignment), and
+    keep their size when zooming. They can be hidden when they
+    overlap labels of higher priority (avoid_overlaps), or when
+    zoomed out (min_scale).
+
+    The color, priority and min_scale columns can have a single
+    element, in which case it applies to all the labels.
+
+    Attributes:
+        pos (array): (N, 2) array of the positions of the labels
+        text (list): The text strings of the labels
+        color (array): Packed RGBA color of each label
+        priority (array): Labels of higher priority are placed first
+        min_scale (array): Zoom below which each label is hidden
+        font_renderer (FontRenderer): Font used to render the texts
+        size (float): Text size in pixels
+        alignment (tuple): Alignment of the labels on their position
+        avoid_overlaps (bool): Whether to hide overlapping labels
+    """
+    def __cinit__(self):
+        self._bounds_dirty = True
+        self._pos = np.zeros((0, 2), dtype=np.float64)
+        self._texts = []
+        self._color = np.array([4294967295], dtype=np.uint32) # 0xffffffff
+        self._priority = np.zeros(1, dtype=np.float32)
+        self._order = np.zeros(0, dtype=np.int32)
+        self._min_scale = np.zeros(1, dtype=np.float32)
+        self._size = 17.
+        self._alignment = [0., 0.]
+        self._avoid_overlaps = True
+        self._overlaps = DCGOverlapGridCreate()
+        self._atlas_entries = {}
+        self._rects = np.zeros((0, 4), dtype=np.int32)
+        self._label_entry = np.zeros(0, dtype=np.int32)
+        self._atlas_reset = True
+
+    def __dealloc__(self):
+        if self._overlaps != NULL:
+            DCGOverlapGridDestroy(self._overlaps)
+
+    @property
+    def pos(self):
+        """
+        Position of each label in coordinate space.
+
+        Returns:
+            array: (N, 2) array
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._pos
+    @pos.setter
+    def pos(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._pos = read_points_array(value)
+        self.bounds_changed()
+    @property
+    def text(self):
+        """
+        Text strings of the labels.
+
+        Only the strings not already in the atlas are
+        rendered when the texts are set.
+
+        Returns:
+            list: list of str
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return list(self._texts)
+    @text.setter
+    def text(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._texts = [str(text) for text in value]
+        self._atlas_dirty = True
+    @property
+    def color(self):
+        """
+        Color of each label, or of all labels
+        if a single color is set.
+
+        Colored glyphs (emojis) are multiplied by the color.
+
+        Returns:
+            array: (N,) uint32 array of packed RGBA colors
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._color
+    @color.setter
+    def color(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._color = read_colors_array(value)
+    @property
+    def priority(self):
+        """
+        Priority of each label, or of all labels
+        if a single value is set.
+
+        When avoid_overlaps is set, the labels are placed by
+        decreasing priority (then by increasing index), and a
+        label overlapping a label already placed is hidden.
+
+        Returns:
+            array: (N,) float32 array
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._priority
+    @priority.setter
+    def priority(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._priority = read_values_array(value)
+        if self._priority.shape[0] == 1:
+            self._order = np.zeros(0, dtype=np.int32)
+        else:
+            self._order = np.ascontiguousarray(
+                np.argsort(-self._priority, kind='stable'), dtype=np.int32)
+    @property
+    def min_scale(self):
+        """
+        Zoom level below which each label is hidden, or
+        all labels if a single value is set.
+
+        The zoom level is the number of pixels per unit of the
+        coordinate space (for instance the plot zoom when inside a
+        plot). It enables to show the less important labels
+        only when zoomed in. 0 (the default) always shows the labels.
+
+        Returns:
+            array: (N,) float32 array
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._min_scale
+    @min_scale.setter
+    def min_scale(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._min_scale = read_values_array(value)
+    @property
+    def font_renderer(self):
+        """
+        FontRenderer used to render the texts.
+
+        No label is drawn until it is set.
+        Changing it renders all the texts again.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._font_renderer
+    @font_renderer.setter
+    def font_renderer(self, FontRenderer value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._font_renderer = value
+        self._atlas_dirty = True
+        self._atlas_reset = True
+    @property
+    def size(self):
+        """
+        Text size in pixels. It is scaled by
+        the global scale, but not by the zoom.
+
+        Changing it renders all the texts again.
+
+        Returns:
+            float: Size value
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._size
+    @size.setter
+    def size(self, float value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value <= 0:
+            raise ValueError("size must be positive")
+        self._size = value
+        self._atlas_dirty = True
+        self._atlas_reset = True
+    @property
+    def alignment(self):
+        """
+        Alignment of the labels on their position, as fractions
+        of their width and height: (0, 0) (default) places the
+        top left corner of the label on the position, (0.5, 0.5)
+        centers the label, (0.5, 1) places the bottom center.
+
+        Returns:
+            tuple: (x, y) fractions
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._alignment[0], self._alignment[1])
+    @alignment.setter
+    def alignment(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef double[2] alignment
+        read_coord(alignment, value)
+        self._alignment[0] = alignment[0]
+        self._alignment[1] = alignment[1]
+    @property
+    def avoid_overlaps(self):
+        """
+        Whether labels overlapping a label of higher
+        priority are hidden. Enabled by default.
+
+        Returns:
+            bool: Whether overlaps are avoided
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._avoid_overlaps
+    @avoid_overlaps.setter
+    def avoid_overlaps(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._avoid_overlaps = value
+    @property
+    def texture(self):
+        """
+        Readonly attribute: atlas texture of the rendered texts,
+        or None if not rendered yet.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._texture
+
+    cdef void _reset_atlas(self, int height):
+        """Empties the atlas, with the target height"""
+        self._atlas = np.zeros((height, _LABEL_ATLAS_WIDTH, 4), dtype=np.uint8)
+        # The gray glyphs only write the alpha channel:
+        # the labels are white, multiplied by their color.
+        self._atlas[:, :, :3] = 255
+        self._atlas_entries = {}
+        self._rects = np.zeros((0, 4), dtype=np.int32)
+        self._shelf_x = 0
+        self._shelf_y = 0
+        self._shelf_height = 0
+        self._max_label_size = 0
+
+    cdef object _pack(self, cnp.ndarray boxes):
+        """
+        Places the (N, 3) boxes returned by FontRenderer.measure_texts
+        on the shelves of the atlas. Returns the (N, 2) positions of
+        the boxes, or None, without changing the shelves, if they
+        do not fit. Boxes wider than the atlas are cropped.
+        """
+        cdef int width = self._atlas.shape[1]
+        cdef int height = self._atlas.shape[0]
+        cdef int x = self._shelf_x
+        cdef int y = self._shelf_y
+        cdef int shelf_height = self._shelf_height
+        cdef int[:, ::1] sizes = boxes
+        positions = np.zeros((boxes.shape[0], 2), dtype=np.int32)
+        cdef int[:, ::1] positions_view = positions
+        cdef int i, w, h
+        for i in range(sizes.shape[0]):
+            # One pixel gap against filtering bleeding
+            w = min(sizes[i, 0], width - 1) + 1
+            h = sizes[i, 1] + 1
+            if x + w > width:
+                y += shelf_height
+                x = 0
+                shelf_height = 0
+            if y + h > height:
+                return None
+            positions_view[i, 0] = x
+            positions_view[i, 1] = y
+            x += w
+            shelf_height = max(shelf_height, h)
+        self._shelf_x = x
+        self._shelf_y = y
+        self._shelf_height = shelf_height
+        return positions
+
+    cdef void _update_atlas(self):
+        """
+        Renders the texts missing from the atlas, uploads
+        them, and updates the atlas entries of the labels.
+        """
+        self._atlas_dirty = False
+        cdef list texts = self._texts
+        if self._font_renderer is None:
+            self._label_entry = np.full(len(texts), -1, dtype=np.int32)
+            return
+        cdef int pixel_size = max(1, <int>cround(self._size * self._raster_scale))
+        cdef bint full_upload = self._atlas_reset or self._texture is None
+        if self._atlas_reset or self._atlas is None:
+            self._reset_atlas(256)
+            self._atlas_reset = False
+
+        cdef list new_texts = [text for text in dict.fromkeys(texts) \
+                               if text not in self._atlas_entries]
+        boxes = self._font_renderer.measure_texts(new_texts, pixel_size)
+        # Empty texts are not drawn
+        cdef list empty_texts = [new_texts[i] for i in np.flatnonzero(boxes[:, 0] * boxes[:, 1] == 0)]
+        non_empty = boxes[:, 0] * boxes[:, 1] > 0
+        new_texts = [text for (text, keep) in zip(new_texts, non_empty) if keep]
+        boxes = np.ascontiguousarray(boxes[non_empty])
+        positions = self._pack(boxes)
+        if positions is None:
+            # Drop the texts no longer used, if any, then
+            # grow the atlas until the texts fit.
+            used = set(texts)
+            if any(text not in used for text in self._atlas_entries):
+                self._reset_atlas(self._atlas.shape[0])
+                new_texts = list(dict.fromkeys(texts))
+                boxes = self._font_renderer.measure_texts(new_texts, pixel_size)
+                empty_texts = [new_texts[i] for i in np.flatnonzero(boxes[:, 0] * boxes[:, 1] == 0)]
+                non_empty = boxes[:, 0] * boxes[:, 1] > 0
+                new_texts = [text for (text, keep) in zip(new_texts, non_empty) if keep]
+                boxes = np.ascontiguousarray(boxes[non_empty])
+                positions = self._pack(boxes)
+            while positions is None:
+                if 2 * self._atlas.shape[0] > _LABEL_ATLAS_MAX_HEIGHT:
+                    self._label_entry = np.full(len(texts), -1, dtype=np.int32)
+                    self._atlas_reset = True
+                    raise ValueError("Too many distinct label texts to fit in the atlas")
+                atlas = self._atlas
+                self._atlas = np.zeros((2 * atlas.shape[0], atlas.shape[1], 4), dtype=np.uint8)
+                self._atlas[:, :, :3] = 255
+                self._atlas[:atlas.shape[0]] = atlas
+                positions = self._pack(boxes)
+            full_upload = True
+
+        for text in empty_texts:
+            self._atlas_entries[text] = -1
+        cdef int first = self._rects.shape[0]
+        cdef int i
+        if len(new_texts) > 0:
+            self._font_renderer.render_texts_to_array(new_texts, pixel_size,
+                                                      self._atlas, positions)
+            for i in range(len(new_texts)):
+                self._atlas_entries[new_texts[i]] = first + i
+            sizes = np.minimum(boxes[:, :2], self._atlas.shape[1] - 1)
+            self._rects = np.ascontiguousarray(
+                np.concatenate([self._rects, np.concatenate([positions, sizes], axis=1)]),
+                dtype=np.int32)
+            self._max_label_size = max(self._max_label_size, int(sizes.max()))
+        self._label_entry = np.array([self._atlas_entries[text] for text in texts],
+                                     dtype=np.int32)
+        self.bounds_changed()
+
+        # Upload the new texts
+        if self._texture is None:
+            self._texture = Texture(self.context)
+        if full_upload or self._texture.height != self._atlas.shape[0]:
+            self._texture.set_value(self._atlas)
+        elif len(new_texts) > 0:
+            y0 = int(positions[:, 1].min())
+            y1 = int((positions[:, 1] + boxes[:, 1]).max())
+            self._texture.set_content_region(self._atlas[y0:y1], 0, y0)
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds_array(self, self._pos)
+        # The labels extend in screen space from their position
+        if self._raster_scale > 0:
+            self._bounds_margin = self._max_label_size / self._raster_scale
+
+    cdef void draw(self,
+                   void* drawlist) noexcept nogil:
+        cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
+        if not(self._show):
+            return
+        if self._font_renderer is None:
+            return
+        if self._raster_scale != self.context.viewport.global_scale:
+            # Render again at the new scale to remain sharp
+            self._raster_scale = self.context.viewport.global_scale
+            self._atlas_dirty = True
+            self._atlas_reset = True
+        if self._atlas_dirty:
+            with gil:
+                try:
+                    self._update_atlas()
+                except Exception:
+                    print("An error occured while rendering the labels", traceback.format_exc())
+        if is_culled(self, drawlist):
+            return
+        if self._texture is None:
+            return
+        cdef unique_lock[recursive_mutex] m2 = unique_lock[recursive_mutex](self._texture.mutex)
+        if self._texture.allocated_texture == NULL:
+            return
+
+        cdef int count = min(self._pos.shape[0], self._label_entry.shape[0])
+        count = batch_size(count, self._color)
+        count = batch_size(count, self._priority)
+        count = batch_size(count, self._min_scale)
+        if count <= 0:
+            return
+
+        cdef vector[imgui.ImVec2] positions
+        points_to_screen(self.context.viewport, positions, self._pos)
+
+        cdef imgui.ImDrawList* draw_list = <imgui.ImDrawList*>drawlist
+        cdef imgui.ImVec2 clip_min = draw_list.GetClipRectMin()
+        cdef imgui.ImVec2 clip_max = draw_list.GetClipRectMax()
+        cdef const int* entries = <const int*>cnp.PyArray_DATA(self._label_entry)
+        cdef const int* rects = <const int*>cnp.PyArray_DATA(self._rects)
+        cdef int num_rects = self._rects.shape[0]
+        cdef const int* order = <const int*>cnp.PyArray_DATA(self._order)
+        cdef int order_size = self._order.shape[0]
+        cdef const imgui.ImU32* colors = <const imgui.ImU32*>cnp.PyArray_DATA(self._color)
+        cdef const float* min_scales = <const float*>cnp.PyArray_DATA(self._min_scale)
+        cdef int color_step = batch_step(self._color)
+        cdef int min_scale_step = batch_step(self._min_scale)
+        cdef float zoom = self.context.viewport.size_multiplier
+        if self._avoid_overlaps:
+            DCGOverlapGridReset(self._overlaps, clip_min.x, clip_min.y,
+                                clip_max.x, clip_max.y,
+                                2. * self._size * self._raster_scale)
+
+        # Select the labels to draw
+        cdef vector[int] visible
+        cdef vector[imgui.ImVec2] corners
+        cdef int k, i, e
+        cdef float x, y, w, h
+        for k in range(order_size if order_size > 0 else count):
+            i = order[k] if order_size > 0 else k
+            if i >= count:
+                continue
+            e = entries[i]
+            if e < 0 or e >= num_rects:
+                continue
+            if colors[i * color_step] & imgui.IM_COL32_A_MASK == 0:
+                continue
+            if min_scales[i * min_scale_step] > zoom:
+                continue
+            w = rects[4 * e + 2]
+            h = rects[4 * e + 3]
+            # Pixel aligned, for the texels to match the pixels
+            x = floor(positions[i].x - self._alignment[0] * w + 0.5)
+            y = floor(positions[i].y - self._alignment[1] * h + 0.5)
+            if is_outside_clip(clip_min, clip_max, x, y, x + w, y + h):
+                continue
+            if self._avoid_overlaps and \
+               not(DCGOverlapGridInsert(self._overlaps, x, y, x + w, y + h)):
+                continue
+            visible.push_back(i)
+            corners.push_back(imgui.ImVec2(x, y))
+
+        cdef int num_visible = visible.size()
+        if num_visible == 0:
+            return
+        cdef float inv_width = 1. / self._texture.width
+        cdef float inv_height = 1. / self._texture.height
+        cdef imgui.ImVec2 pmin, pmax, uv_min, uv_max
+        draw_list.PushTextureID(<imgui.ImTextureID>self._texture.allocated_texture)
+        draw_list.PrimReserve(6 * num_visible, 4 * num_visible)
+        for k in range(num_visible):
+            i = visible[k]
+            e = entries[i]
+            pmin = corners[k]
+            pmax = imgui.ImVec2(pmin.x + rects[4 * e + 2], pmin.y + rects[4 * e + 3])
+            uv_min = imgui.ImVec2(rects[4 * e] * inv_width, rects[4 * e + 1] * inv_height)
+            uv_max = imgui.ImVec2((rects[4 * e] + rects[4 * e + 2]) * inv_width,
+                                  (rects[4 * e + 1] + rects[4 * e + 3]) * inv_height)
+            draw_list.PrimRectUV(pmin, pmax, uv_min, uv_max, colors[i * color_step])
+        draw_list.PopTextureID()
+
 
 cdef class DrawTriangle(drawingItem):
     """
@@ -3150,6 +6417,7 @@ cdef class DrawTriangle(drawingItem):
         thickness (float): Outline thickness 
     """
     def __cinit__(self):
+        self._bounds_dirty = True
         # p1, p2, p3 are zero init by cython
         self._color = 4294967295 # 0xffffffff
         self._fill = 0
@@ -3171,6 +6439,7 @@ cdef class DrawTriangle(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p1, value)
+        self.bounds_changed()
     @property
     def p2(self):
         """
@@ -3187,6 +6456,7 @@ cdef class DrawTriangle(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p2, value)
+        self.bounds_changed()
     @property
     def p3(self):
         """
@@ -3203,6 +6473,7 @@ cdef class DrawTriangle(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         read_coord(self._p3, value)
+        self.bounds_changed()
     @property
     def color(self):
         """
@@ -3255,12 +6526,22 @@ cdef class DrawTriangle(drawingItem):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
+        self.bounds_changed()
+
+    cdef void update_bounds(self) noexcept nogil:
+        reset_bounds(self)
+        extend_bounds(self, self._p1)
+        extend_bounds(self, self._p2)
+        extend_bounds(self, self._p3)
+        self._bounds_margin = fabs(self._thickness)
 
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
+        if is_culled(self, drawlist):
+            return
 
         cdef float thickness = self._thickness
         thickness *= self.context.viewport.thickness_multiplier
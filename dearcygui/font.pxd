@@ -6,9 +6,10 @@ from .core cimport baseItem, baseFont, Texture
 
 cdef class Font(baseFont):
     cdef void* _font # imgui.ImFont*
-    cdef FontTexture _container
+    cdef baseItem _container # FontTexture or PagedFontTexture
     cdef bint _dpi_scaling
     cdef float _scale
+    cdef int _last_frame_used
     cdef vector[float] _scales_backup
     cdef void push(self) noexcept nogil
     cdef void pop(self) noexcept nogil
@@ -18,8 +19,12 @@ cdef class FontMultiScales(baseFont):
     cdef deque[float] _stored_scales # Store last 10 scales
     cdef vector[PyObject*] _callbacks # type Callback
     cdef vector[PyObject*] _applied_fonts # type Font
+    cdef float _cached_global_scale
+    cdef PyObject* _cached_font # type Font. Selected font for _cached_global_scale
     cdef void push(self) noexcept nogil
     cdef void pop(self) noexcept nogil
+    cdef PyObject* _select_font(self, float) noexcept nogil
+    cdef void _store_scale(self, float) noexcept nogil
 
 cdef class AutoFont(FontMultiScales):
     cdef str _main_font_path
@@ -31,9 +36,25 @@ cdef class AutoFont(FontMultiScales):
     cdef object _font_creation_executor  # ThreadPoolExecutor
     cdef set _pending_fonts  # set of scales being created
     cdef object _font_creator  # Callable that creates fonts
+    cdef PagedFontTexture _texture_pages # Holds the fonts of all scales
     cpdef void _create_font_at_scale(self, float scale, bint no_fail)
     cdef void _add_new_font_to_list(self, Font font)
 
+cdef class DynamicFont(Font):
+    cdef void* _atlas # imgui.ImFontAtlas *
+    cdef void* _glyphs # DCGDynamicGlyphs *
+    cdef Texture _texture
+    cdef object _pixels # CPU copy of the texture content
+    cdef bytes _font_data
+    cdef int _pixel_size
+    cdef int _load_flags
+    cdef int _render_mode
+    cdef int _max_texture_height
+    cdef double _eviction_delay
+    cdef bint _job_pending
+    cdef object _executor # ThreadPoolExecutor
+    cdef void end_frame(self) noexcept nogil
+
 cdef class FontTexture(baseItem):
     """
     Packs one or several fonts into
@@ -45,6 +66,15 @@ cdef class FontTexture(baseItem):
     cdef list _fonts_files # content of the font files
     cdef list _fonts
 
+cdef class PagedFontTexture(baseItem):
+    cdef int _page_size
+    cdef size_t _memory_budget
+    cdef list _pages # list of _FontTexturePage
+    cdef list _fonts # list of Font, in order of insertion
+    cdef dict _font_locations # Font -> (page, band_y, band_height)
+    cdef void _release_font(self, Font font)
+    cdef object _allocate_band(self, int height, bint color)
+
 cdef class GlyphSet:
     cdef readonly int height
     cdef readonly dict images
@@ -59,9 +89,14 @@ cdef class GlyphSet:
 
 cdef class FontRenderer:
     cdef object _face
+    cdef bytes _font_data
+    cdef void* _rasterizers # DCGTextRasterizers*
     cpdef GlyphSet render_glyph_set(self,
                                     target_pixel_height=?,
                                     target_size=?,
                                     str hinter=?,
                                     restrict_to=?,
-                                    allow_color=?)
\ No newline at end of file
+                                    allow_color=?,
+                                    bint sdf=?)
+    cdef object _render_texts(self, list, int, object, object,
+                              bint, bint, str, bint)
@@ -15,6 +15,7 @@
 #distutils: language=c++
 
 from libc.math cimport logf
+from libc.string cimport memcpy
 from libcpp cimport bool
 from libcpp.deque cimport deque
 
@@ -23,7 +24,8 @@ cimport cython.view
 from dearcygui.wrapper cimport imgui
 
 from .core cimport baseFont, baseItem, Texture, Callback, \
-    lock_gil_friendly, clear_obj_vector, append_obj_vector
+    lock_gil_friendly, clear_obj_vector, append_obj_vector, \
+    invalidate_text_layouts
 from .c_types cimport *
 from .types cimport *
 
@@ -62,7 +64,11 @@ What is up to you to provide:
 
 import freetype
 import freetype.raw
+import hashlib
 import os
+import sys
+import threading
+import traceback
 import numpy as np
 
 def get_system_fonts():
@@ -84,7 +90,7 @@ cdef class Font(baseFont):
     Represents a font that can be used in the UI.
 
     Attributes:
-    - texture: Texture for the font.
+    - texture: FontTexture or PagedFontTexture holding the font.
     - size: Size of the font.
     - scale: Scale of the font.
     - no_scaling: Boolean indicating if scaling should be disabled for the font.
@@ -95,9 +101,14 @@ cdef class Font(baseFont):
         self._container = None
         self._scale = 1.
         self._dpi_scaling = True
+        self._last_frame_used = 0
 
     @property
     def texture(self):
+        """
+        Readonly attribute: FontTexture or PagedFontTexture
+        holding the font. The font keeps it alive.
+        """
         return self._container
 
     @property
@@ -145,6 +156,7 @@ cdef class Font(baseFont):
             return
         self.mutex.lock()
         cdef imgui.ImFont *font = <imgui.ImFont*>self._font
+        self._last_frame_used = self.context.viewport.frame_count
         self._scales_backup.push_back(font.Scale)
         font.Scale = \
             (self.context.viewport.global_scale if self._dpi_scaling else 1.) * self._scale
@@ -173,10 +185,15 @@ cdef class FontMultiScales(baseFont):
 
     This is useful for having sharp fonts at different DPI scales without
     having to manually manage font switching.
+
+    The selected font is cached for the current global scale, and
+    selected again when the global scale changes or fonts is set.
     """
 
     def __cinit__(self, context, *args, **kwargs):
         self.can_have_sibling = False
+        self._cached_global_scale = 0.
+        self._cached_font = NULL
 
     def __dealloc__(self):
         clear_obj_vector(self._fonts)
@@ -199,6 +216,7 @@ cdef class FontMultiScales(baseFont):
     def fonts(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
+        self._cached_font = NULL
         if value is None:
             clear_obj_vector(self._fonts)
             return
@@ -256,14 +274,21 @@ cdef class FontMultiScales(baseFont):
         append_obj_vector(self._callbacks, items)
 
     cdef void push(self) noexcept nogil:
-        cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         self.mutex.lock()
         if self._fonts.empty():
             return
 
+        cdef float global_scale = self.context.viewport.global_scale
+        if self._cached_font == NULL or global_scale != self._cached_global_scale:
+            self._cached_font = self._select_font(global_scale)
+            self._cached_global_scale = global_scale
+            self._store_scale(global_scale)
+        (<Font>self._cached_font).push()
+        self._applied_fonts.push_back(self._cached_font)
+
+    cdef PyObject* _select_font(self, float global_scale) noexcept nogil:
         # Find font with closest invert scale to current global scale
         # (we want that scale * global_scale == 1, to have sharp fonts)
-        cdef float global_scale = self.context.viewport.global_scale
         cdef float target_scale = logf(global_scale)
         cdef float best_diff = 1e10
         cdef float diff
@@ -278,12 +303,12 @@ cdef class FontMultiScales(baseFont):
 
         if best_font == NULL:
             best_font = self._fonts[0]
-        (<Font>best_font).push()
-        self._applied_fonts.push_back(best_font)
+        return best_font
 
+    cdef void _store_scale(self, float global_scale) noexcept nogil:
         # Keep seen scales
-
         cdef float past_scale
+        cdef int i
         for past_scale in self._stored_scales:
             # scale already in list
             if abs(past_scale - global_scale) < 1e-6:
@@ -315,6 +340,9 @@ cdef class AutoFont(FontMultiScales):
     A self-managing font container that automatically creates and caches fonts at different scales.
     
     Automatically creates new font sizes when needed to match global_scale changes.
+    The fonts of all the scales share the pages of a PagedFontTexture,
+    which releases the least recently used scales when memory_budget
+    is exceeded.
     
     Parameters
     ----------
@@ -326,16 +354,20 @@ cdef class AutoFont(FontMultiScales):
         Function to create fonts. Takes size as first argument and optional kwargs.
         The output should be a GlyphSet.
         If None, uses make_extended_latin_font.
+    memory_budget : int = 33554432
+        Maximum size in bytes of the textures of the fonts
     **kwargs : 
         Additional arguments passed to font_creator
     """
     def __init__(self, context, 
                  float base_size=17.0,
                  font_creator=None,
+                 memory_budget=32 * 1024 * 1024,
                  **kwargs):
         super().__init__(context)
                  
         self._base_size = base_size
+        self._texture_pages = PagedFontTexture(context, memory_budget=memory_budget)
         self._kwargs = kwargs
         self._font_creator = font_creator if font_creator is not None else make_extended_latin_font
         self._font_creation_executor = ThreadPoolExecutor(max_workers=1)
@@ -366,9 +398,8 @@ cdef class AutoFont(FontMultiScales):
         
     cpdef void _create_font_at_scale(self, float scale, bint no_fail):
         """Create a new font at the given scale"""
+        cdef unique_lock[recursive_mutex] imgui_m
         cdef unique_lock[recursive_mutex] m
-        # Create texture and font
-        cdef FontTexture texture = FontTexture(self.context)
         cdef Font font = None
         
         # Calculate scaled size
@@ -378,12 +409,10 @@ cdef class AutoFont(FontMultiScales):
             # Create glyph set using the font creator
             glyph_set = self._font_creator(scaled_size, **self._kwargs)
 
-            # Add to texture and build
-            texture.add_custom_font(glyph_set)
-            texture.build()
-
-            # Get font and configure scale
-            font = texture._fonts[0] 
+            # Adding the font may release fonts of other scales:
+            # block rendering until the list of fonts is updated.
+            lock_gil_friendly(imgui_m, self.context.imgui_mutex)
+            font = self._texture_pages.add_glyph_set(glyph_set)
             font.scale = 1.0/scale
 
             self._add_new_font_to_list(font)
@@ -393,44 +422,21 @@ cdef class AutoFont(FontMultiScales):
             pass # ignore failures (maybe we have a huge scale and
                  # the font is too big to fit in the texture)
         finally:
+            if imgui_m.owns_lock():
+                imgui_m.unlock()
             # We do not lock the mutex before to not block rendering
             # during texture creation.
             lock_gil_friendly(m, self.mutex)
             self._pending_fonts.remove(scale)
 
     cdef void _add_new_font_to_list(self, Font new_font):
-        """Add new font and prune fonts list to keep best matches"""
+        """
+        Replace our fonts by the ones alive in the texture pages,
+        which include new_font and no longer the released ones.
+        """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        # Get recent scales we want to optimize for
-        cdef vector[float] target_scales = vector[float]()
-        for scale in self._stored_scales:
-            target_scales.push_back(scale)
-
-        # Calculate scores for all fonts including new one
-        cdef dict best_fonts = {}
-        cdef float score, current_score
-        cdef Font font
-        
-        for font in list(self.fonts) + [new_font]:
-            for target_scale in target_scales:
-                score = abs(logf(font._scale) + logf(target_scale))
-                current_score = best_fonts.get(target_scale, (1e10, None))[0]
-                if score < current_score:
-                    best_fonts[target_scale] = (score, font)
-
-        # Retain only the best fonts for each target scale
-        retained_fonts = set()
-        for target_scale in best_fonts:
-            retained_fonts.add(best_fonts[target_scale][1])
-
-        if len(retained_fonts) == 0:
-            # No font was retained, maybe we haven't been
-            # applied yet and the list of scales is empty.
-            # keep the new font
-            retained_fonts.add(new_font)
-        # Update the fonts list
-        self.fonts = list(retained_fonts)
+        self.fonts = self._texture_pages.fonts
 
 cdef class FontTexture(baseItem):
     """
@@ -532,11 +538,17 @@ cdef class FontTexture(baseItem):
         font_object._font = font
         self._fonts.append(font_object)
 
-    def add_custom_font(self, GlyphSet glyph_set):
+    def add_custom_font(self, GlyphSet glyph_set, bint sdf=False):
         """
         See fonts.py for a detailed explanation of
         the input arguments.
 
+        sdf: set if the glyph_set holds signed distance
+            fields (FontRenderer.render_glyph_set with sdf=True).
+            The texture is then rendered with a dedicated shader,
+            which gives sharp text at any font scale: a single
+            texture serves all sizes.
+
         Currently add_custom_font calls build()
         and thus prevents adding new fonts, but
         this might not be true in the future, thus
@@ -545,6 +557,10 @@ cdef class FontTexture(baseItem):
         cdef imgui.ImFontAtlas *atlas = <imgui.ImFontAtlas*>self._atlas
         if self._built:
             raise ValueError("Cannot add Font to built FontTexture")
+        if sdf:
+            # Drawn with the font texture, the baked antialiased
+            # lines would be thresholded by the distance field shader.
+            atlas.Flags |= imgui.ImFontAtlasFlags_NoBakedLines
 
         cdef imgui.ImFontConfig config = imgui.ImFontConfig()
         config.SizePixels = glyph_set.height
@@ -615,9 +631,14 @@ cdef class FontTexture(baseItem):
             array_view[yM-1, xm:xM,:] = 0
             array_view[ym:yM, xM-1,:] = 0
 
+        if sdf and (use_color or array.shape[2] != 1):
+            raise ValueError("Signed distance fields cannot be in color")
+
         # Upload texture
         if use_color:
             self._texture._filtering_mode = 0 # rgba bilinear
+        elif sdf:
+            self._texture._filtering_mode = 3 # 111A bilinear, distance field shader
         else:
             self._texture._filtering_mode = 2 # 111A bilinear
         self._texture.set_value(array)
@@ -701,6 +722,365 @@ cdef class FontTexture(baseItem):
         atlas.ClearInputData()
         self._built = True
 
+cdef extern from * nogil:
+    """
+    /* Fonts of a PagedFontTexture. They are not part of the
+       atlas Fonts list, and are thus owned by the page. */
+    ImFont* DCGPagedFontCreate(ImFontAtlas* atlas, float size,
+                               float ascent, float descent)
+    {
+        ImFont* font = IM_NEW(ImFont)();
+        font->ContainerAtlas = atlas;
+        font->FontSize = size;
+        font->Ascent = ascent;
+        font->Descent = descent;
+        return font;
+    }
+
+    void DCGPagedFontDestroy(ImFont* font)
+    {
+        IM_DELETE(font);
+    }
+    """
+    imgui.ImFont* DCGPagedFontCreate(imgui.ImFontAtlas*, float, float, float)
+    void DCGPagedFontDestroy(imgui.ImFont*)
+
+cdef class _FontTexturePage:
+    """
+    A page of a PagedFontTexture. The atlas holds the default
+    ImGui font, needed for the white pixel and lines data,
+    and reserves a rect which rows are allocated in bands
+    to the fonts.
+    """
+    cdef void* _atlas # imgui.ImFontAtlas *
+    cdef Texture texture
+    cdef bint color
+    cdef int x0
+    cdef int width
+    cdef size_t num_bytes
+    cdef list free_rows # sorted [y0, y1[ intervals
+    cdef vector[void*] fonts # imgui.ImFont*, owned
+
+    def __cinit__(self):
+        self._atlas = <void*>(new imgui.ImFontAtlas())
+
+    def __dealloc__(self):
+        cdef void* font
+        for font in self.fonts:
+            DCGPagedFontDestroy(<imgui.ImFont*>font)
+        self.fonts.clear()
+        cdef imgui.ImFontAtlas *atlas = <imgui.ImFontAtlas*>self._atlas
+        del atlas
+
+    def __init__(self, context, int page_size, bint color):
+        cdef imgui.ImFontAtlas *atlas = <imgui.ImFontAtlas*>self._atlas
+        cdef imgui.ImFontConfig config = imgui.ImFontConfig()
+        config.OversampleH = 1
+        config.OversampleV = 1
+        atlas.TexDesiredWidth = page_size
+        atlas.AddFontDefault(&config)
+        cdef int rect_index = atlas.AddCustomRectRegular(page_size - 8, (3 * page_size) // 4)
+        if not(atlas.Build()):
+            raise RuntimeError("Failed to build target texture data")
+        cdef unsigned char *data = NULL
+        cdef int width, height, bpp
+        if color:
+            atlas.GetTexDataAsRGBA32(&data, &width, &height, &bpp)
+        else:
+            atlas.GetTexDataAsAlpha8(&data, &width, &height, &bpp)
+        cdef cython.view.array data_array = cython.view.array(shape=(height, width, bpp), itemsize=1, format='B', mode='c', allocate_buffer=False)
+        data_array.data = <char*>data
+        self.texture = Texture(context)
+        self.texture._filtering_mode = 0 if color else 2 # rgba/111A bilinear
+        self.texture.set_value(np.asarray(data_array, dtype=np.uint8))
+        assert(self.texture.allocated_texture != NULL)
+        self.texture._readonly = True
+        atlas.SetTexID(<imgui.ImTextureID>self.texture.allocated_texture)
+        cdef imgui.ImFontAtlasCustomRect *rect = atlas.GetCustomRectByIndex(rect_index)
+        self.color = color
+        self.x0 = rect.X
+        self.width = rect.Width
+        self.num_bytes = <size_t>width * height * bpp
+        self.free_rows = [[rect.Y, rect.Y + rect.Height]]
+        # Release temporary CPU memory
+        atlas.ClearInputData()
+        atlas.ClearTexData()
+
+    def allocate(self, int height):
+        """Returns the first row of a free band, or -1"""
+        for interval in self.free_rows:
+            if interval[1] - interval[0] >= height:
+                y = interval[0]
+                interval[0] += height
+                if interval[0] == interval[1]:
+                    self.free_rows.remove(interval)
+                return y
+        return -1
+
+    def free(self, int y, int height):
+        """Returns a band to the free rows"""
+        self.free_rows.append([y, y + height])
+        self.free_rows.sort()
+        last = self.free_rows[0]
+        merged = [last]
+        for interval in self.free_rows[1:]:
+            if interval[0] == last[1]:
+                last[1] = interval[1]
+            else:
+                merged.append(interval)
+                last = interval
+        self.free_rows = merged
+
+    def largest_band(self):
+        """Height of the largest free band"""
+        return max([interval[1] - interval[0] for interval in self.free_rows] + [0])
+
+cdef class PagedFontTexture(baseItem):
+    """
+    Packs the glyphs of several fonts, typically the same
+    font rendered at several scales, into shared texture pages.
+
+    Each font occupies a band of rows of a page, which
+    is the only part of the texture uploaded when the font
+    is added. When no page has room for a new font, and
+    creating a new page would exceed memory_budget, the least
+    recently used fonts are released to make room.
+    The fonts used during the last two frames are never released,
+    thus the budget can be exceeded if they do not fit in it.
+
+    Released fonts are removed from the fonts list, and render
+    nothing if still referenced.
+
+    Parameters
+    ----------
+    context : Context
+        The context this texture belongs to
+    page_size : int = 2048
+        Width and height of the pages
+    memory_budget : int = 33554432
+        Maximum size in bytes of the pages
+    """
+    def __cinit__(self, context, *args, **kwargs):
+        self.can_have_sibling = False
+        self._page_size = 2048
+        self._memory_budget = 32 * 1024 * 1024
+        self._pages = []
+        self._fonts = []
+        self._font_locations = {}
+
+    def __init__(self, context, int page_size=2048, memory_budget=32 * 1024 * 1024, **kwargs):
+        if page_size < 256:
+            raise ValueError(f"Invalid page size {page_size}")
+        self._page_size = page_size
+        self._memory_budget = memory_budget
+        super().__init__(context, **kwargs)
+
+    @property
+    def fonts(self):
+        """
+        Readonly attribute: list of the fonts packed in the
+        pages, from the oldest to the most recently added.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return list(self._fonts)
+
+    @property
+    def pages(self):
+        """
+        Readonly attribute: list of the Textures of the pages
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return [(<_FontTexturePage>page).texture for page in self._pages]
+
+    @property
+    def memory_usage(self):
+        """
+        Readonly attribute: size in bytes of the pages
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef size_t total = 0
+        for page in self._pages:
+            total += (<_FontTexturePage>page).num_bytes
+        return total
+
+    @property
+    def memory_budget(self):
+        """
+        Writable attribute: maximum size in bytes of the pages.
+        Lowering it does not release fonts until a new one is added.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._memory_budget
+
+    @memory_budget.setter
+    def memory_budget(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value < 0:
+            raise ValueError(f"Invalid memory budget {value}")
+        self._memory_budget = value
+
+    def add_glyph_set(self, GlyphSet glyph_set):
+        """
+        Packs a GlyphSet into the pages and returns the
+        corresponding Font. Least recently used fonts
+        may be released to make room for it.
+        """
+        cdef unique_lock[recursive_mutex] imgui_m
+        cdef unique_lock[recursive_mutex] m
+        if len(glyph_set.images) == 0:
+            raise ValueError("Empty GlyphSet")
+        cdef bint use_color = False
+        for image in glyph_set.images.values():
+            if len(image.shape) == 3 and image.shape[2] > 1:
+                if image.shape[2] != 4:
+                    raise ValueError("Color data must be rgba (4 channels)")
+                use_color = True
+
+        # Shelf packing of the glyphs, tallest first, with one
+        # texel of padding. Coordinates are relative to the band.
+        cdef int width = self._page_size - 8
+        keys = sorted(glyph_set.images.keys(),
+                      key=lambda k: -glyph_set.images[k].shape[0])
+        cdef dict positions = {}
+        cdef int x = 0
+        cdef int y = 0
+        cdef int shelf_height = 0
+        cdef int w, h
+        for key in keys:
+            h = glyph_set.images[key].shape[0] + 1
+            w = glyph_set.images[key].shape[1] + 1
+            if w > width:
+                raise ValueError("Glyph larger than the page")
+            if x + w > width:
+                y += shelf_height
+                x = 0
+                shelf_height = 0
+            positions[key] = (x, y)
+            x += w
+            shelf_height = max(shelf_height, h)
+        cdef int band_height = y + shelf_height
+
+        # Fonts are released, and the pages uploaded,
+        # while rendering is blocked.
+        lock_gil_friendly(imgui_m, self.context.imgui_mutex)
+        lock_gil_friendly(m, self.mutex)
+        cdef _FontTexturePage page = <_FontTexturePage>self._allocate_band(band_height, use_color)
+        cdef int band_y = page.allocate(band_height)
+
+        # Fill the band. The texels between the glyphs are zero.
+        cdef int channels = 4 if use_color else 1
+        band = np.zeros((band_height, page.width, channels), dtype=np.uint8)
+        for (key, (x, y)) in positions.items():
+            image = glyph_set.images[key]
+            if len(image.shape) == 2:
+                image = image[:, :, np.newaxis]
+            h = image.shape[0]
+            w = image.shape[1]
+            if use_color and image.shape[2] == 1:
+                band[y:y+h, x:x+w, :3] = 255
+                band[y:y+h, x:x+w, 3:] = image
+            else:
+                band[y:y+h, x:x+w, :] = image
+        page.texture._readonly = False
+        try:
+            page.texture.set_content_region(band, page.x0, band_y)
+        finally:
+            page.texture._readonly = True
+
+        # Create the ImFont referencing the band
+        cdef imgui.ImFontAtlas *atlas = <imgui.ImFontAtlas*>page._atlas
+        cdef imgui.ImFont *font = DCGPagedFontCreate(atlas,
+                                                     glyph_set.height,
+                                                     glyph_set.origin_y,
+                                                     glyph_set.origin_y - glyph_set.height)
+        cdef float inv_width = 1. / atlas.TexWidth
+        cdef float inv_height = 1. / atlas.TexHeight
+        cdef float dy, dx, advance
+        for (key, (x, y)) in positions.items():
+            image = glyph_set.images[key]
+            h = image.shape[0]
+            w = image.shape[1]
+            (dy, dx, advance) = glyph_set.positioning[key]
+            x += page.x0
+            y += band_y
+            font.AddGlyph(NULL, <imgui.ImWchar>int(key),
+                          dx, dy, dx + w, dy + h,
+                          x * inv_width, y * inv_height,
+                          (x + w) * inv_width, (y + h) * inv_height,
+                          advance)
+        font.BuildLookupTable()
+        page.fonts.push_back(<void*>font)
+
+        cdef Font font_object = Font(self.context)
+        font_object._font = font
+        # Keeps the pages, which own the ImFont, alive
+        font_object._container = self
+        font_object._last_frame_used = self.context.viewport.frame_count
+        self._fonts.append(font_object)
+        self._font_locations[font_object] = (page, band_y, band_height)
+        return font_object
+
+    def release(self, Font font):
+        """
+        Releases a font of the pages. It renders
+        nothing afterwards.
+        """
+        cdef unique_lock[recursive_mutex] imgui_m
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(imgui_m, self.context.imgui_mutex)
+        lock_gil_friendly(m, self.mutex)
+        if font not in self._font_locations:
+            raise KeyError(f"{font} is not part of the texture")
+        self._release_font(font)
+
+    cdef void _release_font(self, Font font):
+        # Both the imgui mutex and our mutex must be held
+        cdef unique_lock[recursive_mutex] font_m
+        lock_gil_friendly(font_m, font.mutex)
+        (page, band_y, band_height) = self._font_locations.pop(font)
+        self._fonts.remove(font)
+        cdef vector[void*]* page_fonts = &(<_FontTexturePage>page).fonts
+        cdef size_t i
+        for i in range(page_fonts.size()):
+            if page_fonts[0][i] == font._font:
+                page_fonts.erase(page_fonts.begin() + i)
+                break
+        DCGPagedFontDestroy(<imgui.ImFont*>font._font)
+        font._font = NULL
+        # The address may be reused by another font
+        invalidate_text_layouts()
+        (<_FontTexturePage>page).free(band_y, band_height)
+
+    cdef object _allocate_band(self, int height, bint color):
+        # Returns a page with room for a band of the target height.
+        # Both the imgui mutex and our mutex must be held
+        if height > (3 * self._page_size) // 4:
+            raise ValueError("GlyphSet too large for the page size")
+        cdef _FontTexturePage page
+        cdef size_t usage
+        cdef size_t page_bytes = <size_t>self._page_size * self._page_size * (4 if color else 1)
+        cdef int recent_frame = self.context.viewport.frame_count - 2
+        while True:
+            usage = 0
+            for page in self._pages:
+                usage += page.num_bytes
+                if page.color == color and page.largest_band() >= height:
+                    return page
+            candidates = [font for font in self._fonts
+                          if (<Font>font)._last_frame_used < recent_frame]
+            if usage + page_bytes <= self._memory_budget or len(candidates) == 0:
+                page = _FontTexturePage(self.context, self._page_size, color)
+                self._pages.append(page)
+                return page
+            # Release the least recently used font.
+            # The pages are kept for reuse.
+            self._release_font(min(candidates, key=lambda f: (<Font>f)._last_frame_used))
+
 cdef class GlyphSet:
     """Container for font glyph data with convenient access methods"""
 
@@ -884,6 +1264,76 @@ cdef class GlyphSet:
                 dst_code = ord(dst_code)
             self.add_glyph(dst_code, image, dy, dx, advance)
 
+    def save(self, path) -> None:
+        """
+        Write the GlyphSet to a single uncompressed
+        binary file (numpy npz format).
+
+        The images of all glyphs are concatenated into a
+        single buffer, and glyphs sharing the same image
+        (for instance after remap) share the same storage.
+        """
+        cdef int n = len(self.images)
+        codes = np.empty(n, dtype=np.int64)
+        positioning = np.empty((n, 3), dtype=np.float32)
+        shapes = np.empty((n, 3), dtype=np.int32)
+        offsets = np.empty(n, dtype=np.int64)
+        buffers = []
+        stored = {} # id(image) -> offset
+        cdef long long total = 0
+        cdef int i
+        for i, key in enumerate(self.images):
+            image = self.images[key]
+            image3d = image if image.ndim == 3 else image.reshape(image.shape[0], image.shape[1], -1)
+            codes[i] = key
+            positioning[i] = self.positioning[key]
+            shapes[i] = image3d.shape
+            offset = stored.get(id(image), None)
+            if offset is None:
+                offset = total
+                stored[id(image)] = offset
+                buffers.append(np.ascontiguousarray(image3d).reshape(-1))
+                total += image3d.size
+            offsets[i] = offset
+        pixels = np.concatenate(buffers) if len(buffers) > 0 else np.zeros(0, dtype=np.uint8)
+        with open(path, "wb") as fp:
+            np.savez(fp,
+                     header=np.array([GLYPHSET_FORMAT_VERSION, self.height, self.origin_y], dtype=np.int64),
+                     codes=codes,
+                     positioning=positioning,
+                     shapes=shapes,
+                     offsets=offsets,
+                     pixels=pixels)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a GlyphSet written by save().
+
+        The glyph images are views into a single
+        buffer read from the file.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            header = data["header"]
+            if int(header[0]) != GLYPHSET_FORMAT_VERSION:
+                raise ValueError(f"Unsupported GlyphSet file version in {path}")
+            codes = data["codes"]
+            positioning = data["positioning"]
+            shapes = data["shapes"]
+            offsets = data["offsets"]
+            pixels = data["pixels"]
+        cdef GlyphSet glyph_set = GlyphSet(int(header[1]), int(header[2]))
+        cdef int i
+        cdef long long offset, size
+        for i in range(codes.shape[0]):
+            offset = offsets[i]
+            size = shapes[i, 0] * shapes[i, 1] * shapes[i, 2]
+            glyph_set.images[int(codes[i])] = \
+                pixels[offset:offset+size].reshape(tuple(shapes[i]))
+            glyph_set.positioning[int(codes[i])] = \
+                (float(positioning[i, 0]), float(positioning[i, 1]), float(positioning[i, 2]))
+        return glyph_set
+
     @classmethod
     def fit_glyph_sets(cls, list[GlyphSet] glyphs) -> None:
         """
@@ -948,6 +1398,155 @@ cdef class GlyphSet:
         return new_glyphset
 
 
+"""
+On-disk cache of rendered GlyphSets.
+
+Rendering glyphs is slow compared to reading them back,
+thus make_extended_latin_font stores its result in
+a cache directory, keyed by the content of the font files
+and the rendering parameters.
+"""
+
+GLYPHSET_FORMAT_VERSION = 1
+
+def _default_glyph_cache_directory():
+    path = os.environ.get("DEARCYGUI_CACHE_DIR", None)
+    if path is None:
+        if sys.platform == "win32":
+            path = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+        elif sys.platform == "darwin":
+            path = os.path.expanduser("~/Library/Caches")
+        else:
+            path = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+        path = os.path.join(path, "dearcygui")
+    return os.path.join(path, "glyphs")
+
+_glyph_cache_directory = _default_glyph_cache_directory()
+_glyph_cache_max_size = 256 * 1024 * 1024 # bytes
+_font_file_digests = {} # (path, size, mtime) -> digest
+
+def get_glyph_cache_directory():
+    """
+    Returns the directory in which rendered GlyphSets are
+    cached, or None if the cache is disabled.
+    """
+    return _glyph_cache_directory
+
+def set_glyph_cache_directory(path):
+    """
+    Set the directory in which rendered GlyphSets are
+    cached. None disables the cache.
+
+    The default is the dearcygui/glyphs subdirectory
+    of the user cache directory, or of the directory
+    set in the DEARCYGUI_CACHE_DIR environment variable.
+    """
+    global _glyph_cache_directory
+    _glyph_cache_directory = None if path is None else str(path)
+
+def get_glyph_cache_max_size():
+    """
+    Returns the maximum size in bytes of the
+    GlyphSet cache directory.
+    """
+    return _glyph_cache_max_size
+
+def set_glyph_cache_max_size(size):
+    """
+    Set the maximum size in bytes of the GlyphSet
+    cache directory (default: 256MB).
+
+    When a new entry makes the cache exceed this size,
+    the least recently used entries are removed.
+    """
+    global _glyph_cache_max_size
+    size = int(size)
+    if size < 0:
+        raise ValueError("The cache size cannot be negative")
+    _glyph_cache_max_size = size
+
+def _font_file_digest(path):
+    """Hash of the content of a font file, memoized"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    digest = _font_file_digests.get(key, None)
+    if digest is None:
+        with open(path, "rb") as fp:
+            digest = hashlib.sha256(fp.read()).hexdigest()
+        _font_file_digests[key] = digest
+    return digest
+
+def _load_cached_glyph_set(key):
+    """Returns the cached GlyphSet for key, or None"""
+    if _glyph_cache_directory is None:
+        return None
+    path = os.path.join(_glyph_cache_directory, key + ".npz")
+    if not(os.path.exists(path)):
+        return None
+    try:
+        glyph_set = GlyphSet.load(path)
+    except Exception:
+        # Corrupted or outdated entry
+        return None
+    try:
+        # The modification time tracks the last use,
+        # as access times are often not maintained
+        os.utime(path)
+    except Exception:
+        pass
+    return glyph_set
+
+def _trim_glyph_cache(keep):
+    """Removes the least recently used entries until
+    the cache fits in _glyph_cache_max_size"""
+    entries = []
+    total = 0
+    with os.scandir(_glyph_cache_directory) as it:
+        for entry in it:
+            if not(entry.name.endswith(".npz")) or not(entry.is_file()):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            total += stat.st_size
+    entries.sort()
+    for (_, size, path) in entries:
+        if total <= _glyph_cache_max_size:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def _store_cached_glyph_set(key, GlyphSet glyph_set):
+    """Writes glyph_set in the cache. Failures are ignored."""
+    if _glyph_cache_directory is None:
+        return
+    temp_path = None
+    try:
+        os.makedirs(_glyph_cache_directory, exist_ok=True)
+        path = os.path.join(_glyph_cache_directory, key + ".npz")
+        # Write then rename, for concurrent readers
+        # to never see a partial file
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        glyph_set.save(temp_path)
+        os.replace(temp_path, path)
+        temp_path = None
+        _trim_glyph_cache(path)
+    except Exception:
+        pass
+    finally:
+        if temp_path is not None:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
 cdef inline int get_freetype_load_flags(str hinter, bint allow_color):
     """Prepare FreeType loading flags"""
 
@@ -1005,6 +1604,529 @@ cdef inline int get_freetype_load_flags(str hinter, bint allow_color):
         
     return load_flags
 
+cdef inline int get_freetype_render_mode(str hinter):
+    """FreeType rendering mode matching the hinter"""
+    if hinter == "monochrome":
+        return freetype.FT_RENDER_MODES["FT_RENDER_MODE_MONO"]
+    elif hinter == "light":
+        return freetype.FT_RENDER_MODES["FT_RENDER_MODE_LIGHT"]
+    return freetype.FT_RENDER_MODES["FT_RENDER_MODE_NORMAL"]
+
+cdef extern from * nogil:
+    """
+    #include <ft2build.h>
+    #include FT_FREETYPE_H
+    #include FT_OUTLINE_H
+    #include <algorithm>
+    #include <atomic>
+    #include <climits>
+    #include <cmath>
+    #include <cstdint>
+    #include <cstring>
+    #include <memory>
+    #include <mutex>
+    #include <thread>
+    #include <unordered_map>
+    #include <vector>
+
+    struct DCGRenderedGlyph {
+        unsigned int codepoint;
+        int rows, cols, channels;
+        int left, top;
+        float advance;
+        size_t offset; // position of the bitmap in its buffer
+        int valid;
+    };
+
+    /* Glyphs rendered by DCGRenderGlyphs. Each thread writes
+       its bitmaps in its own buffer, and they are gathered at
+       the end in a single one. */
+    struct DCGGlyphRendering {
+        std::vector<DCGRenderedGlyph> glyphs;
+        std::vector<int> owner; // thread that rendered each glyph
+        std::vector<std::vector<unsigned char>> buffers;
+        size_t total_size = 0;
+    };
+
+    /* Appends the FreeType bitmap to buffer, as 1 (gray)
+       or 4 (RGBA) channels. Returns the number of channels,
+       or 0 if the bitmap format is not supported. */
+    static int DCGAppendBitmap(const FT_Bitmap& bitmap, std::vector<unsigned char>& buffer)
+    {
+        int rows = (int)bitmap.rows, cols = (int)bitmap.width, pitch = bitmap.pitch;
+        size_t base = buffer.size();
+        if (pitch < 0)
+            return 0;
+        if (bitmap.pixel_mode == FT_PIXEL_MODE_MONO) {
+            buffer.resize(base + (size_t)rows * cols);
+            unsigned char* dst = &buffer[base];
+            for (int y = 0; y < rows; y++) {
+                const unsigned char* src = bitmap.buffer + (size_t)y * pitch;
+                for (int x = 0; x < cols; x++)
+                    *dst++ = (src[x >> 3] & (0x80 >> (x & 7))) ? 255 : 0;
+            }
+            return 1;
+        }
+        if (bitmap.pixel_mode == FT_PIXEL_MODE_GRAY) {
+            buffer.resize(base + (size_t)rows * cols);
+            for (int y = 0; y < rows; y++)
+                memcpy(&buffer[base + (size_t)y * cols],
+                       bitmap.buffer + (size_t)y * pitch, cols);
+            return 1;
+        }
+        if (bitmap.pixel_mode == FT_PIXEL_MODE_BGRA) {
+            buffer.resize(base + (size_t)rows * cols * 4);
+            unsigned char* dst = &buffer[base];
+            for (int y = 0; y < rows; y++) {
+                const unsigned char* src = bitmap.buffer + (size_t)y * pitch;
+                for (int x = 0; x < cols; x++, src += 4, dst += 4) {
+                    dst[0] = src[2];
+                    dst[1] = src[1];
+                    dst[2] = src[0];
+                    dst[3] = src[3];
+                }
+            }
+            return 4;
+        }
+        return 0;
+    }
+
+    /* FreeType faces are not thread safe: each thread opens
+       its own library and face on the font data, and renders
+       blocks of glyphs until none is left. */
+    static void DCGRenderGlyphsWorker(DCGGlyphRendering* r, int thread_index,
+                                      std::atomic<int>* next,
+                                      const unsigned char* data, size_t data_size,
+                                      int pixel_size, int load_flags, int render_mode)
+    {
+        FT_Library library;
+        FT_Face face;
+        if (FT_Init_FreeType(&library) != 0)
+            return;
+        if (FT_New_Memory_Face(library, data, (FT_Long)data_size, 0, &face) != 0) {
+            FT_Done_FreeType(library);
+            return;
+        }
+        FT_Set_Pixel_Sizes(face, 0, pixel_size);
+        std::vector<unsigned char>& buffer = r->buffers[thread_index];
+        const int count = (int)r->glyphs.size();
+        while (true) {
+            int start = next->fetch_add(16);
+            if (start >= count)
+                break;
+            int end = std::min(start + 16, count);
+            for (int i = start; i < end; i++) {
+                DCGRenderedGlyph& glyph = r->glyphs[i];
+                FT_UInt index = FT_Get_Char_Index(face, glyph.codepoint);
+                if (FT_Load_Glyph(face, index, load_flags) != 0)
+                    continue;
+                FT_GlyphSlot slot = face->glyph;
+                if (FT_Render_Glyph(slot, (FT_Render_Mode)render_mode) != 0)
+                    continue;
+                const FT_Bitmap& bitmap = slot->bitmap;
+                int rows = (int)bitmap.rows, cols = (int)bitmap.width;
+                // See render_glyph_set for the pre-rounding
+                glyph.advance = std::nearbyint((slot->lsb_delta - slot->rsb_delta +
+                                              slot->metrics.horiAdvance) / 64.);
+                glyph.left = slot->bitmap_left;
+                glyph.top = slot->bitmap_top;
+                size_t base = buffer.size();
+                glyph.offset = base;
+                if (rows == 0 || cols == 0) {
+                    // Empty bitmap (space character for instance)
+                    glyph.rows = glyph.cols = glyph.channels = 1;
+                    glyph.left = glyph.top = 0;
+                    buffer.push_back(0);
+                } else {
+                    glyph.channels = DCGAppendBitmap(bitmap, buffer);
+                    if (glyph.channels == 0)
+                        continue; // Unsupported bitmap mode
+                }
+                if (rows != 0 && cols != 0) {
+                    glyph.rows = rows;
+                    glyph.cols = cols;
+                }
+                glyph.valid = 1;
+                r->owner[i] = thread_index;
+            }
+        }
+        FT_Done_Face(face);
+        FT_Done_FreeType(library);
+    }
+
+    /* Renders the codepoints of the font data at the target
+       pixel size, using up to num_threads threads. */
+    void* DCGRenderGlyphs(const unsigned char* data, size_t data_size,
+                          int pixel_size, int load_flags, int render_mode,
+                          const unsigned int* codepoints, int count,
+                          int num_threads)
+    {
+        DCGGlyphRendering* r = new DCGGlyphRendering();
+        r->glyphs.resize(count);
+        r->owner.assign(count, 0);
+        for (int i = 0; i < count; i++) {
+            memset(&r->glyphs[i], 0, sizeof(DCGRenderedGlyph));
+            r->glyphs[i].codepoint = codepoints[i];
+        }
+        // Below a few dozens glyphs per thread, threads cost more than they bring
+        num_threads = std::max(1, std::min(num_threads, (count + 31) / 32));
+        r->buffers.resize(num_threads);
+        std::atomic<int> next(0);
+        std::vector<std::thread> threads;
+        for (int t = 1; t < num_threads; t++) {
+            try {
+                threads.emplace_back(DCGRenderGlyphsWorker, r, t, &next, data,
+                                     data_size, pixel_size, load_flags, render_mode);
+            } catch (...) {
+                break; // The running threads take the remaining glyphs
+            }
+        }
+        DCGRenderGlyphsWorker(r, 0, &next, data, data_size, pixel_size,
+                              load_flags, render_mode);
+        for (std::thread& thread : threads)
+            thread.join();
+        for (const DCGRenderedGlyph& glyph : r->glyphs)
+            if (glyph.valid)
+                r->total_size += (size_t)glyph.rows * glyph.cols * glyph.channels;
+        return r;
+    }
+
+    size_t DCGGlyphRenderingSize(void* data)
+    {
+        return ((DCGGlyphRendering*)data)->total_size;
+    }
+
+    int DCGGlyphRenderingCount(void* data)
+    {
+        return (int)((DCGGlyphRendering*)data)->glyphs.size();
+    }
+
+    const DCGRenderedGlyph* DCGGlyphRenderingGlyphs(void* data)
+    {
+        return ((DCGGlyphRendering*)data)->glyphs.data();
+    }
+
+    /* Copies all the bitmaps in dst (of DCGGlyphRenderingSize bytes),
+       in the order of the codepoints. The offsets are updated to
+       refer to dst. */
+    void DCGGlyphRenderingGather(void* data, unsigned char* dst)
+    {
+        DCGGlyphRendering* r = (DCGGlyphRendering*)data;
+        size_t position = 0;
+        for (size_t i = 0; i < r->glyphs.size(); i++) {
+            DCGRenderedGlyph& glyph = r->glyphs[i];
+            if (!glyph.valid)
+                continue;
+            size_t size = (size_t)glyph.rows * glyph.cols * glyph.channels;
+            memcpy(dst + position, &r->buffers[r->owner[i]][glyph.offset], size);
+            glyph.offset = position;
+            position += size;
+        }
+        r->buffers.clear();
+    }
+
+    void DCGGlyphRenderingFree(void* data)
+    {
+        delete (DCGGlyphRendering*)data;
+    }
+
+    /* Lists the character codes of the charmap of the font data */
+    void DCGFontCharCodes(const unsigned char* data, size_t data_size,
+                          std::vector<unsigned int>& codes)
+    {
+        FT_Library library;
+        FT_Face face;
+        if (FT_Init_FreeType(&library) != 0)
+            return;
+        if (FT_New_Memory_Face(library, data, (FT_Long)data_size, 0, &face) == 0) {
+            FT_UInt index;
+            FT_ULong code = FT_Get_First_Char(face, &index);
+            while (index != 0) {
+                codes.push_back((unsigned int)code);
+                code = FT_Get_Next_Char(face, code, &index);
+            }
+            FT_Done_Face(face);
+        }
+        FT_Done_FreeType(library);
+    }
+
+    /* Glyph of the cache of a text rasterizer */
+    struct DCGCachedGlyph {
+        int rows = 0, cols = 0;
+        int channels = 0; // 0: nothing to draw
+        int left = 0, top = 0;
+        float advance = 0.f; // pixel aligned
+        float linear_advance = 0.f; // unhinted
+        std::vector<unsigned char> pixels;
+    };
+
+    /* FreeType face at a given size and rendering mode, with
+       the glyphs it rendered. The face and the cache are only
+       accessed under the mutex, but the cached glyphs are
+       never moved nor freed until the rasterizer is. */
+    struct DCGTextRasterizer {
+        int pixel_size = 0, load_flags = 0, render_mode = 0;
+        FT_Library library = nullptr;
+        FT_Face face = nullptr;
+        std::mutex mutex;
+        // key: glyph index * 4 + horizontal offset in quarters of pixel
+        std::unordered_map<uint64_t, std::unique_ptr<DCGCachedGlyph>> glyphs;
+
+        ~DCGTextRasterizer() {
+            if (face != nullptr)
+                FT_Done_Face(face);
+            if (library != nullptr)
+                FT_Done_FreeType(library);
+        }
+    };
+
+    /* Text rasterizers of a font data, one per rendering setting */
+    struct DCGTextRasterizers {
+        const unsigned char* data;
+        size_t data_size;
+        std::mutex mutex;
+        std::vector<std::unique_ptr<DCGTextRasterizer>> rasterizers;
+    };
+
+    struct DCGPlacedGlyph {
+        const DCGCachedGlyph* glyph;
+        int x, y; // top left, relative to the origin of the text
+    };
+
+    /* font data must outlive the result */
+    void* DCGTextRasterizersCreate(const unsigned char* data, size_t data_size)
+    {
+        DCGTextRasterizers* t = new DCGTextRasterizers();
+        t->data = data;
+        t->data_size = data_size;
+        return t;
+    }
+
+    void DCGTextRasterizersFree(void* data)
+    {
+        delete (DCGTextRasterizers*)data;
+    }
+
+    static DCGTextRasterizer* DCGGetTextRasterizer(DCGTextRasterizers* t, int pixel_size,
+                                                   int load_flags, int render_mode)
+    {
+        std::lock_guard<std::mutex> lock(t->mutex);
+        for (auto& r : t->rasterizers)
+            if (r->pixel_size == pixel_size && r->load_flags == load_flags &&
+                r->render_mode == render_mode)
+                return r.get();
+        std::unique_ptr<DCGTextRasterizer> r(new DCGTextRasterizer());
+        r->pixel_size = pixel_size;
+        r->load_flags = load_flags;
+        r->render_mode = render_mode;
+        if (FT_Init_FreeType(&r->library) != 0) {
+            r->library = nullptr;
+            return nullptr;
+        }
+        if (FT_New_Memory_Face(r->library, t->data, (FT_Long)t->data_size, 0, &r->face) != 0) {
+            r->face = nullptr;
+            return nullptr;
+        }
+        FT_Set_Pixel_Sizes(r->face, 0, pixel_size);
+        t->rasterizers.push_back(std::move(r));
+        return t->rasterizers.back().get();
+    }
+
+    /* Returns the glyph from the cache, rendering it if needed.
+       The mutex of the rasterizer must be held. */
+    static const DCGCachedGlyph* DCGRasterizerGlyph(DCGTextRasterizer* r, FT_UInt index,
+                                                    int subpixel)
+    {
+        uint64_t key = ((uint64_t)index << 2) | (uint64_t)subpixel;
+        auto it = r->glyphs.find(key);
+        if (it != r->glyphs.end())
+            return it->second.get();
+        std::unique_ptr<DCGCachedGlyph> glyph(new DCGCachedGlyph());
+        if (FT_Load_Glyph(r->face, index, r->load_flags) == 0) {
+            FT_GlyphSlot slot = r->face->glyph;
+            glyph->advance = std::round(slot->advance.x / 64.f);
+            glyph->linear_advance = slot->linearHoriAdvance / 65536.f;
+            if (slot->format == FT_GLYPH_FORMAT_OUTLINE && subpixel != 0)
+                FT_Outline_Translate(&slot->outline, subpixel * 16, 0);
+            if (FT_Render_Glyph(slot, (FT_Render_Mode)r->render_mode) == 0 &&
+                slot->bitmap.rows > 0 && slot->bitmap.width > 0) {
+                glyph->channels = DCGAppendBitmap(slot->bitmap, glyph->pixels);
+                glyph->rows = (int)slot->bitmap.rows;
+                glyph->cols = (int)slot->bitmap.width;
+                glyph->left = slot->bitmap_left;
+                glyph->top = slot->bitmap_top;
+            }
+        }
+        const DCGCachedGlyph* result = glyph.get();
+        r->glyphs.emplace(key, std::move(glyph));
+        return result;
+    }
+
+    /* Draws the glyph with its top left at (x0, y0), clipped
+       to the image. Gray glyphs only write the alpha channel. */
+    static void DCGBlitGlyph(const DCGCachedGlyph* glyph, int x0, int y0,
+                             unsigned char* image, int width, int height)
+    {
+        int xs = std::max(0, -x0), xe = std::min(glyph->cols, width - x0);
+        int ys = std::max(0, -y0), ye = std::min(glyph->rows, height - y0);
+        for (int y = ys; y < ye; y++) {
+            unsigned char* dst = image + ((size_t)(y0 + y) * width + x0 + xs) * 4;
+            if (glyph->channels == 1) {
+                const unsigned char* src = &glyph->pixels[(size_t)y * glyph->cols + xs];
+                for (int x = xs; x < xe; x++, src++, dst += 4)
+                    dst[3] = std::max(dst[3], *src);
+            } else {
+                const unsigned char* src = &glyph->pixels[((size_t)y * glyph->cols + xs) * 4];
+                for (int x = xs; x < xe; x++, src += 4, dst += 4)
+                    if (src[3] >= dst[3])
+                        memcpy(dst, src, 4);
+            }
+        }
+    }
+
+    /* Lays out the texts codepoints[starts[i]:starts[i+1]] and
+       writes in boxes[3*i:3*i+3] the width, height and baseline
+       of the ink of each text. If image (of shape (height, width, 4))
+       is not NULL, the texts are drawn with the top left of their
+       box at positions[2*i:2*i+2].
+       Only the layout holds the lock of the rasterizer, thus
+       several threads can draw with the same font.
+       Returns false if the font could not be loaded. */
+    bool DCGRenderTexts(void* data, int pixel_size, int load_flags, int render_mode,
+                        const unsigned int* codepoints, const int* starts, int count,
+                        bool align_to_pixels, bool enable_kerning,
+                        unsigned char* image, int width, int height,
+                        const int* positions, int* boxes)
+    {
+        DCGTextRasterizer* r = DCGGetTextRasterizer((DCGTextRasterizers*)data, pixel_size,
+                                                    load_flags, render_mode);
+        if (r == nullptr)
+            return false;
+        FT_UInt kerning_mode = align_to_pixels ? FT_KERNING_DEFAULT : FT_KERNING_UNFITTED;
+        bool use_kerning = enable_kerning && FT_HAS_KERNING(r->face);
+        std::vector<DCGPlacedGlyph> placed;
+        for (int i = 0; i < count; i++) {
+            int x_min = INT_MAX, x_max = INT_MIN, y_min = INT_MAX, y_max = INT_MIN;
+            placed.clear();
+            {
+                std::lock_guard<std::mutex> lock(r->mutex);
+                float pen = 0.f;
+                FT_UInt previous = 0;
+                for (int c = starts[i]; c < starts[i + 1]; c++) {
+                    FT_UInt index = FT_Get_Char_Index(r->face, codepoints[c]);
+                    if (use_kerning && previous != 0 && index != 0) {
+                        FT_Vector delta;
+                        if (FT_Get_Kerning(r->face, previous, index, kerning_mode, &delta) == 0)
+                            pen += delta.x / 64.f;
+                    }
+                    previous = index;
+                    float origin = std::floor(pen);
+                    int subpixel = align_to_pixels ? 0 :
+                        std::min((int)((pen - origin) * 4.f), 3);
+                    const DCGCachedGlyph* glyph = DCGRasterizerGlyph(r, index, subpixel);
+                    pen += align_to_pixels ? glyph->advance : glyph->linear_advance;
+                    if (glyph->channels == 0)
+                        continue;
+                    int x = (int)origin + glyph->left, y = -glyph->top;
+                    placed.push_back({glyph, x, y});
+                    x_min = std::min(x_min, x);
+                    x_max = std::max(x_max, x + glyph->cols);
+                    y_min = std::min(y_min, y);
+                    y_max = std::max(y_max, y + glyph->rows);
+                }
+            }
+            if (placed.empty()) {
+                boxes[3 * i] = boxes[3 * i + 1] = boxes[3 * i + 2] = 0;
+                continue;
+            }
+            boxes[3 * i] = x_max - x_min;
+            boxes[3 * i + 1] = y_max - y_min;
+            boxes[3 * i + 2] = -y_min;
+            if (image == nullptr)
+                continue;
+            int x0 = positions[2 * i] - x_min, y0 = positions[2 * i + 1] - y_min;
+            for (const DCGPlacedGlyph& p : placed)
+                DCGBlitGlyph(p.glyph, x0 + p.x, y0 + p.y, image, width, height);
+        }
+        return true;
+    }
+    """
+    struct DCGRenderedGlyph:
+        unsigned int codepoint
+        int rows
+        int cols
+        int channels
+        int left
+        int top
+        float advance
+        size_t offset
+        int valid
+    void* DCGRenderGlyphs(const unsigned char*, size_t, int, int, int,
+                          const unsigned int*, int, int)
+    size_t DCGGlyphRenderingSize(void*)
+    int DCGGlyphRenderingCount(void*)
+    const DCGRenderedGlyph* DCGGlyphRenderingGlyphs(void*)
+    void DCGGlyphRenderingGather(void*, unsigned char*)
+    void DCGGlyphRenderingFree(void*)
+    void DCGFontCharCodes(const unsigned char*, size_t, vector[unsigned int]&)
+    void* DCGTextRasterizersCreate(const unsigned char*, size_t)
+    void DCGTextRasterizersFree(void*)
+    bint DCGRenderTexts(void*, int, int, int,
+                        const unsigned int*, const int*, int,
+                        bint, bint,
+                        unsigned char*, int, int,
+                        const int*, int*)
+
+cdef list _render_glyphs(const unsigned char[::1] font_data,
+                         int pixel_size,
+                         int load_flags,
+                         int render_mode,
+                         vector[unsigned int] &codepoints):
+    """
+    Renders the codepoints of the font data in parallel, outside
+    the GIL. Returns a list of (codepoint, image, bitmap_top,
+    bitmap_left, advance) for the glyphs successfully rendered.
+    The images are views of a single buffer.
+    """
+    cdef int num_threads = min(os.cpu_count() or 1, 16)
+    cdef void *rendering
+    with nogil:
+        rendering = DCGRenderGlyphs(&font_data[0], font_data.shape[0],
+                                    pixel_size, load_flags, render_mode,
+                                    codepoints.data(), <int>codepoints.size(),
+                                    num_threads)
+    cdef const DCGRenderedGlyph *rendered
+    cdef unsigned char[::1] pixels_view
+    cdef size_t start, end
+    cdef int i
+    cdef list glyphs_data = []
+    try:
+        pixels = np.empty((DCGGlyphRenderingSize(rendering),), dtype=np.uint8)
+        pixels_view = pixels
+        with nogil:
+            DCGGlyphRenderingGather(rendering,
+                                    &pixels_view[0] if pixels_view.shape[0] > 0 else NULL)
+        rendered = DCGGlyphRenderingGlyphs(rendering)
+        for i in range(DCGGlyphRenderingCount(rendering)):
+            if not(rendered[i].valid):
+                continue
+            start = rendered[i].offset
+            end = start + rendered[i].rows * rendered[i].cols * rendered[i].channels
+            image = pixels[start:end].reshape((rendered[i].rows,
+                                               rendered[i].cols,
+                                               rendered[i].channels))
+            glyphs_data.append((rendered[i].codepoint, image, rendered[i].top,
+                                rendered[i].left, rendered[i].advance))
+    finally:
+        DCGGlyphRenderingFree(rendering)
+    return glyphs_data
+
+# Not exposed by all freetype-py versions
+cdef int _FT_RENDER_MODE_SDF = 5
+# Default FreeType distance, in pixels, covered by the
+# distance fields on each side of the glyph edges
+cdef int _SDF_SPREAD = 8
+
 cdef class FontRenderer:
     """
     A class that manages font loading,
@@ -1015,6 +2137,16 @@ cdef class FontRenderer:
         self._face = freetype.Face(path)
         if self._face is None:
             raise ValueError("Failed to open the font")
+        with open(path, "rb") as f:
+            self._font_data = f.read()
+        if self._rasterizers != NULL:
+            DCGTextRasterizersFree(self._rasterizers)
+        self._rasterizers = DCGTextRasterizersCreate(<const unsigned char*>self._font_data,
+                                                     len(self._font_data))
+
+    def __dealloc__(self):
+        if self._rasterizers != NULL:
+            DCGTextRasterizersFree(self._rasterizers)
 
     def render_text_to_array(self, text: str,
                              target_size : int,
@@ -1022,73 +2154,156 @@ cdef class FontRenderer:
                              enable_kerning=True,
                              str hinter="light",
                              allow_color=True) -> tuple[np.ndarray, int]:
-        """Render text string to a numpy array and return the array and bitmap_top"""
-        self._face.set_pixel_sizes(0, int(round(target_size)))
-
-        load_flags = get_freetype_load_flags(hinter, allow_color)
-
-        # Calculate rough dimensions for initial buffer
-        rough_width, rough_height, _, _ = self.estimate_text_dimensions(
-            text, load_flags, align_to_pixels, enable_kerning
-        )
-        
-        # Add margins to prevent overflow
-        margin = target_size
-        height = int(np.ceil(rough_height)) + 2 * margin
-        width = int(np.ceil(rough_width)) + 2 * margin
-        
-        # Create output image array with margins
-        image = np.zeros((height, width, 4), dtype=np.uint8)
-        
-        # Track actual bounds with local variables
-        min_x = float('inf')
-        max_x = float('-inf')
-        min_y = float('inf')
-        max_y = float('-inf')
-        max_top = float('-inf')
-        
-        # Render each character
-        x_offset = margin
-        y_offset = margin
-        previous_char = None
-        kerning_mode = freetype.FT_KERNING_DEFAULT if align_to_pixels else freetype.FT_KERNING_UNFITTED
-        
-        for char in text:
-            self._face.load_char(char, flags=load_flags)
-            glyph = self._face.glyph
-            bitmap = glyph.bitmap
-            
-            if enable_kerning and previous_char is not None:
-                kerning = self._face.get_kerning(previous_char, char, mode=kerning_mode)
-                x_offset += kerning.x / 64.0
-
-            # Update bounds
-            min_x = min(min_x, x_offset)
-            max_x = max(max_x, x_offset + bitmap.width)
-            min_y = min(min_y, y_offset + bitmap.rows - glyph.bitmap_top)
-            max_y = max(max_y, y_offset + bitmap.rows)
-            max_top = max(max_top, glyph.bitmap_top)
-
-            self._render_glyph_to_image(glyph, image, x_offset, y_offset, align_to_pixels)
+        """
+        Render a text string to a RGBA numpy array.
 
-            if align_to_pixels:
-                x_offset += round(glyph.advance.x/64)
-            else:
-                x_offset += glyph.linearHoriAdvance/65536
-            previous_char = char
+        Returns the array, cropped to the ink of the text,
+        and the distance in pixels from its top to the baseline
+        (bitmap_top). The text is black (colored glyphs keep their
+        colors), with the coverage in the alpha channel.
 
-        # Handle empty text
-        if min_x == float('inf'):
+        Use render_texts_to_array to render many strings.
+        """
+        cdef list texts = [text]
+        cdef int[:, ::1] boxes = self._render_texts(texts, target_size, None, None,
+                                                    align_to_pixels, enable_kerning,
+                                                    hinter, allow_color)
+        if boxes[0, 0] == 0 or boxes[0, 1] == 0:
             return np.zeros((1, 1, 4), dtype=np.uint8), 0
+        image = np.zeros((boxes[0, 1], boxes[0, 0], 4), dtype=np.uint8)
+        self._render_texts(texts, target_size, image, np.zeros((1, 2), dtype=np.int32),
+                           align_to_pixels, enable_kerning, hinter, allow_color)
+        return image, boxes[0, 2]
+
+    def measure_texts(self, texts,
+                      target_size : int,
+                      align_to_pixels=True,
+                      enable_kerning=True,
+                      str hinter="light",
+                      allow_color=True) -> np.ndarray:
+        """
+        Measure the ink boxes of a batch of text strings.
+
+        Returns a (N, 3) int32 array of the width, height and
+        baseline (distance from the top of the box) of each
+        string, as rendered by render_texts_to_array with the
+        same settings. Empty boxes are (0, 0, 0).
+        The result can be used to pack the strings before
+        allocating the target buffer.
+        """
+        return self._render_texts(self._text_list(texts), target_size,
+                                  None, None, align_to_pixels,
+                                  enable_kerning, hinter, allow_color)
+
+    def render_texts_to_array(self, texts,
+                              target_size : int,
+                              image,
+                              positions,
+                              align_to_pixels=True,
+                              enable_kerning=True,
+                              str hinter="light",
+                              allow_color=True) -> np.ndarray:
+        """
+        Render a batch of text strings into a preallocated RGBA array.
 
-        # Crop to actual content plus small margin
-        crop_margin = 2
-        min_x = max(int(min_x) - crop_margin, 0)
-        min_y = max(int(min_y) - crop_margin, 0)
-        max_x = min(int(np.ceil(max_x)) + crop_margin, width)
-        max_y = min(int(np.ceil(max_y)) + crop_margin, height)
+        Inputs:
+        -------
+        texts: sequence of N strings.
+        target_size: font size in pixels.
+        image: C contiguous uint8 array of shape (height, width, 4),
+            written in place. Only the alpha channel is written
+            for non-colored glyphs, thus the RGB content of the
+            array gives the color of the text. Glyphs outside
+            the array are clipped.
+        positions: (N, 2) integer array of the (x, y) coordinates in
+            image of the top left of the box of each string.
+
+        The glyphs are rendered once and cached by the FontRenderer,
+        and the GIL is released during the layout and the copies:
+        batches can be rendered by several threads at once,
+        with the same FontRenderer.
 
-        return image[min_y:max_y, min_x:max_x], max_top
+        Outputs:
+        --------
+        (N, 3) int32 array of the width, height and baseline of
+        the box of each string (see measure_texts).
+        """
+        texts = self._text_list(texts)
+        positions = np.ascontiguousarray(positions, dtype=np.int32)
+        if positions.ndim != 2 or positions.shape[0] != len(texts) or \
+           positions.shape[1] != 2:
+            raise ValueError("positions must be of shape (len(texts), 2)")
+        return self._render_texts(texts, target_size, image,
+                                  positions, align_to_pixels,
+                                  enable_kerning, hinter, allow_color)
+
+    @staticmethod
+    def _text_list(texts):
+        if isinstance(texts, str):
+            raise TypeError("texts must be a sequence of strings")
+        return list(texts)
+
+    cdef object _render_texts(self,
+                              list texts,
+                              int target_size,
+                              object image,
+                              object positions,
+                              bint align_to_pixels,
+                              bint enable_kerning,
+                              str hinter,
+                              bint allow_color):
+        """
+        Lays out the texts, and if image is not None, draws them
+        at positions. Returns the boxes of the texts.
+        """
+        cdef int load_flags = get_freetype_load_flags(hinter, allow_color)
+        cdef int render_mode = get_freetype_render_mode(hinter)
+        cdef int count = len(texts)
+        # Convert all the texts at once to UTF-32
+        cdef vector[int] starts
+        cdef int start = 0
+        starts.reserve(count + 1)
+        for text in texts:
+            starts.push_back(start)
+            start += len(<str>text)
+        starts.push_back(start)
+        cdef bytes encoded = "".join(texts).encode("utf-32-le")
+        cdef vector[unsigned int] codepoints
+        codepoints.resize(start)
+        if start > 0:
+            memcpy(codepoints.data(), <const char*>encoded, start * sizeof(unsigned int))
+
+        boxes = np.zeros((count, 3), dtype=np.int32)
+        cdef int[:, ::1] boxes_view = boxes
+        cdef unsigned char[:, :, ::1] image_view
+        cdef const int[:, ::1] positions_view
+        cdef unsigned char *image_data = NULL
+        cdef const int *positions_data = NULL
+        cdef int width = 0, height = 0
+        if image is not None:
+            image_view = image
+            if image_view.shape[2] != 4:
+                raise ValueError("image must be of shape (height, width, 4)")
+            height = image_view.shape[0]
+            width = image_view.shape[1]
+            if height > 0 and width > 0:
+                image_data = &image_view[0, 0, 0]
+            positions_view = positions
+            if count > 0:
+                positions_data = &positions_view[0, 0]
+        if count == 0:
+            return boxes
+        cdef bint success
+        with nogil:
+            success = DCGRenderTexts(self._rasterizers, target_size,
+                                     load_flags, render_mode,
+                                     codepoints.data(), starts.data(), count,
+                                     align_to_pixels, enable_kerning,
+                                     image_data, width, height,
+                                     positions_data, &boxes_view[0, 0])
+        if not(success):
+            raise RuntimeError("Failed to load the font")
+        return boxes
 
     def estimate_text_dimensions(self, text: str, load_flags : int, align_to_pixels: bool, enable_kerning: bool):
         """Calculate the dimensions needed for the text"""
@@ -1117,38 +2332,13 @@ cdef class FontRenderer:
             
         return width, max_top + max_bottom, max_top, max_bottom
 
-    def _render_glyph_to_image(self, glyph, image, x_offset, y_offset, align_to_pixels):
-        """Render a single glyph to the image array"""
-        if glyph.format == freetype.FT_GLYPH_FORMAT_BITMAP:
-            bitmap = glyph.bitmap
-            self._copy_bitmap_to_image(bitmap, image, x_offset, y_offset)
-        else:
-            # Handle non-bitmap glyphs
-            if not align_to_pixels:
-                subpixel_offset = freetype.FT_Vector(
-                    int((x_offset - float(int(x_offset))) * 64), 0
-                )
-                gglyph = glyph.get_glyph()
-                bglyph = gglyph.to_bitmap(freetype.FT_RENDER_MODE_NORMAL, subpixel_offset, True)
-                self._copy_bitmap_to_image(bglyph.bitmap, image, x_offset, y_offset)
-
-    def _copy_bitmap_to_image(self, bitmap, image, x_offset, y_offset):
-        """Copy bitmap data to the image array"""
-        for y in range(bitmap.rows):
-            for x in range(bitmap.width):
-                if bitmap.pixel_mode == freetype.FT_PIXEL_MODE_GRAY:
-                    image[y + y_offset, int(x + x_offset), 3] = bitmap.buffer[y * bitmap.pitch + x]
-                elif bitmap.pixel_mode == freetype.FT_PIXEL_MODE_BGRA:
-                    image[y + y_offset, int(x + x_offset), :] = bitmap.buffer[
-                        y * bitmap.pitch + x * 4:(y + 1) * bitmap.pitch + x * 4
-                    ]
-
     cpdef GlyphSet render_glyph_set(self,
                                     target_pixel_height=None,
                                     target_size=0,
                                     str hinter="light",
                                     restrict_to=None,
-                                    allow_color=True):
+                                    allow_color=True,
+                                    bint sdf=False):
         """
         Render the glyphs of the font at the target scale,
         in order to them load them in a Font object.
@@ -1182,6 +2372,12 @@ cdef class FontRenderer:
             available.
         allow_color: If the font contains colored glyphs, this enables
             to render them in color.
+        sdf: If set, render signed distance fields rather than
+            coverage. The GlyphSet must then be passed to
+            FontTexture.add_custom_font with sdf=True, and the
+            font renders sharply at any scale. hinter and
+            allow_color are ignored. A target_size of about
+            32 or more is recommended.
 
         Outputs:
         --------
@@ -1197,113 +2393,44 @@ cdef class FontRenderer:
         else:
             self._face.set_pixel_sizes(0, int(round(target_size)))
 
-        load_flags = get_freetype_load_flags(hinter, allow_color)
+        # Apply appropriate rendering mode
+        if sdf:
+            # Hinting is specific to a pixel size
+            load_flags = get_freetype_load_flags("none", False)
+            render_mode = _FT_RENDER_MODE_SDF
+        else:
+            load_flags = get_freetype_load_flags(hinter, allow_color)
+            render_mode = get_freetype_render_mode(hinter)
+
+        cdef const unsigned char[::1] font_data = self._font_data
+        cdef vector[unsigned int] all_codepoints
+        cdef vector[unsigned int] codepoints
+        cdef unsigned int codepoint
+        with nogil:
+            DCGFontCharCodes(&font_data[0], font_data.shape[0], all_codepoints)
+        if restrict_to is None:
+            codepoints = all_codepoints
+        else:
+            for codepoint in all_codepoints:
+                if codepoint in restrict_to:
+                    codepoints.push_back(codepoint)
 
-        # Track max dimensions while loading glyphs
+        # Render the glyphs in parallel, outside the GIL.
+        # Each thread uses its own FreeType face.
+        glyphs_data = _render_glyphs(font_data, int(round(target_size)),
+                                     load_flags, render_mode, codepoints)
+
+        # Track max dimensions of the glyphs
         max_bitmap_top = 0
         max_bitmap_bot = 0
-
-        cdef const unsigned char* buffer_view
-        cdef unsigned char[:,::1] image_view
-        cdef unsigned char[:,:,::1] color_image_view
-        cdef int rows, cols, pitch, i, j, idx
-        cdef uintptr_t buffer_ptr
-        
-        # First pass - collect all glyphs and find dimensions
-        glyphs_data = []  # Store temporary glyph data
-        for unicode_key, glyph_index in self._face.get_chars():
-            if (restrict_to is not None) and (unicode_key not in restrict_to):
-                continue
-                
-            # Render at target scale
-            self._face.load_glyph(glyph_index, flags=load_flags)
-            glyph : freetype.GlyphSlot = self._face.glyph
-            
-            # Apply appropriate rendering mode
-            if hinter == "monochrome":
-                glyph.render(freetype.FT_RENDER_MODES["FT_RENDER_MODE_MONO"])
-            elif hinter == "light":
-                glyph.render(freetype.FT_RENDER_MODES["FT_RENDER_MODE_LIGHT"])
-            else:
-                glyph.render(freetype.FT_RENDER_MODES["FT_RENDER_MODE_NORMAL"])
-
-            bitmap : freetype.Bitmap = glyph.bitmap
-            metric : freetype.FT_Glyph_Metrics = glyph.metrics
-            rows = bitmap.rows
-            cols = bitmap.width
-            pitch = bitmap.pitch
-
-            # Calculate advance (positioning relative to the next glyph)
-
-            # lsb is the subpixel offset of our origin compared to the previous advance
-            # rsb is the subpixel offset of the next origin compared to our origin
-            # horiadvance is the horizontal displacement between
-            # our origin and the next one
-            # Currently the backend does not support rounding the advance when rendering
-            # the font (which would enable best support for lsb and rsb), thus we pre-round.
-            advance = (glyph._FT_GlyphSlot.contents.lsb_delta - 
-                      glyph._FT_GlyphSlot.contents.rsb_delta + 
-                      metric.horiAdvance) / 64.
-            advance = round(advance)
-            
-            bitmap_top = glyph.bitmap_top
-            bitmap_left = glyph.bitmap_left
-
-            # Create image array based on bitmap mode
-            if rows == 0 or cols == 0:
-                # Handle empty bitmap (space character for instance)
-                image = np.zeros([1, 1, 1], dtype=np.uint8)
-                bitmap_top = 0
-                bitmap_left = 0
-            elif bitmap.pixel_mode == freetype.FT_PIXEL_MODE_MONO:
-                #image = 255*np.unpackbits(np.array(bitmap.buffer, dtype=np.uint8), 
-                #                        count=bitmap.rows * 8*bitmap.pitch).reshape([bitmap.rows, 8*bitmap.pitch])
-                #image = image[:, :bitmap.width, np.newaxis]
-                buffer_ptr = <uintptr_t>ctypes.addressof(bitmap._FT_Bitmap.buffer.contents)
-                buffer_view = <unsigned char*>buffer_ptr
-                image = np.empty((rows, cols, 1), dtype=np.uint8)
-                image_view = image[:,:,0]
-        
-                # Unpack bits
-                for i in range(rows):
-                    for j in range(cols):
-                        image_view[i,j] = 255 if (buffer_view[i * pitch + (j >> 3)] & (1 << (7 - (j & 7)))) else 0
-            elif bitmap.pixel_mode == freetype.FT_PIXEL_MODE_GRAY:
-                #image = np.array(bitmap.buffer, dtype=np.uint8).reshape([bitmap.rows, bitmap.pitch])
-                #image = image[:, :bitmap.width, np.newaxis]
-                buffer_ptr = <uintptr_t>ctypes.addressof(bitmap._FT_Bitmap.buffer.contents)
-                buffer_view = <unsigned char*>buffer_ptr
-                image = np.empty((rows, cols, 1), dtype=np.uint8)
-                image_view = image[:,:,0]
-        
-                for i in range(rows):
-                    for j in range(cols):
-                        image_view[i,j] = buffer_view[i * pitch + j]
-            elif bitmap.pixel_mode == freetype.FT_PIXEL_MODE_BGRA:
-                #image = np.array(bitmap.buffer, dtype=np.uint8).reshape([bitmap.rows, bitmap.pitch//4, 4])
-                #image = image[:, :bitmap.width, :]
-                #image[:, :, [0, 2]] = image[:, :, [2, 0]]  # swap B and R
-                buffer_ptr = <uintptr_t>ctypes.addressof(bitmap._FT_Bitmap.buffer.contents)
-                buffer_view = <unsigned char*>buffer_ptr
-                image = np.empty((rows, cols, 4), dtype=np.uint8)
-                color_image_view = image
-                # Copy and swap R/B channels directly
-                for i in range(rows):
-                    for j in range(cols):
-                        idx = i * pitch + j * 4
-                        color_image_view[i,j,0] = buffer_view[idx + 2]  # R
-                        color_image_view[i,j,1] = buffer_view[idx + 1]  # G
-                        color_image_view[i,j,2] = buffer_view[idx]      # B
-                        color_image_view[i,j,3] = buffer_view[idx + 3]  # A
-            else:
-                continue  # Skip unsupported bitmap modes
-
-            # Update max dimensions
+        for (_, image, bitmap_top, _, _) in glyphs_data:
             max_bitmap_top = max(max_bitmap_top, bitmap_top)
             max_bitmap_bot = max(max_bitmap_bot, image.shape[0] - bitmap_top)
-            
-            # Store glyph data for second pass
-            glyphs_data.append((unicode_key, image, bitmap_top, bitmap_left, advance))
+
+        # The distance fields extend beyond the glyphs
+        if sdf:
+            max_bitmap_top -= _SDF_SPREAD
+            max_bitmap_bot -= _SDF_SPREAD
 
         # Calculate final dimensions
         height = max_bitmap_top + max_bitmap_bot + 1
@@ -1319,6 +2446,727 @@ cdef class FontRenderer:
 
         return glyph_set
 
+cdef extern from * nogil:
+    """
+    #include "imgui_internal.h"
+    #include <algorithm>
+    #include <climits>
+    #include <cmath>
+    #include <cstring>
+    #include <unordered_map>
+    #include <vector>
+
+    /* Glyphs of a DynamicFont, rasterized on demand.
+       The codepoints that are not rasterized yet use a placeholder
+       glyph whose uvs all point to a unique texel of the pending
+       strip: scanning the vertices of the frame reveals which
+       codepoints were needed. The rasterized glyphs are packed in
+       shelves inside the areas of the texture reserved for them. */
+    struct DCGDynamicGlyphs {
+        struct Area { int x, y, w, h, y_end; };
+        struct Shelf { int area, y, h, x_end; };
+        struct Slot { int shelf, x, w; unsigned int codepoint; double last_used; bool free, pinned; };
+        ImFontAtlas* atlas = nullptr;
+        ImFont* font = nullptr;
+        unsigned char* pixels = nullptr; // alpha8 copy of the texture
+        int tex_w = 0, tex_h = 0;
+        std::vector<Area> areas;
+        std::vector<Shelf> shelves;
+        std::vector<Slot> slots;
+        std::vector<int> free_slots;
+        int strip_x = 0, strip_y = 0, strip_w = 1, strip_rows = 0;
+        std::vector<unsigned int> strip_codepoints;
+        std::vector<char> requested;
+        std::vector<unsigned int> to_request;
+        std::unordered_map<unsigned int, int> strip_index; // codepoint -> strip texel
+        std::unordered_map<unsigned int, int> glyph_slot; // codepoint -> slot
+        std::unordered_map<unsigned long long, int> uv_slot; // (U0, V0) -> slot
+        float pending_advance = 0.f;
+        double now = 0.;
+        double last_usage_scan = -1e30;
+        int dirty[4] = {0, 0, 0, 0}; // x0, y0, x1, y1 of the texels to upload
+    };
+
+    static inline unsigned long long DCGDynamicGlyphsUVKey(float u, float v)
+    {
+        unsigned int a, b;
+        memcpy(&a, &u, sizeof(a));
+        memcpy(&b, &v, sizeof(b));
+        return ((unsigned long long)a << 32) | b;
+    }
+
+    static void DCGDynamicGlyphsSetAdvance(DCGDynamicGlyphs* d, ImFontGlyph* glyph)
+    {
+        if (glyph->Codepoint < (unsigned int)d->font->IndexAdvanceX.Size)
+            d->font->IndexAdvanceX[glyph->Codepoint] = glyph->AdvanceX;
+    }
+
+    /* Turns the glyph into the placeholder of the k-th strip texel */
+    static void DCGDynamicGlyphsSetPending(DCGDynamicGlyphs* d, ImFontGlyph* glyph, int k)
+    {
+        float advance = d->pending_advance;
+        glyph->X0 = std::floor(advance * 0.15f);
+        glyph->X1 = std::ceil(advance * 0.85f);
+        glyph->Y0 = std::max(0.f, std::floor(d->font->Ascent - d->font->FontSize * 0.6f));
+        glyph->Y1 = std::floor(d->font->Ascent);
+        glyph->U0 = glyph->U1 = (d->strip_x + (k % d->strip_w) + 0.5f) / d->tex_w;
+        glyph->V0 = glyph->V1 = (d->strip_y + (k / d->strip_w) + 0.5f) / d->tex_h;
+        glyph->AdvanceX = advance;
+        glyph->Visible = 1;
+        DCGDynamicGlyphsSetAdvance(d, glyph);
+    }
+
+    static void DCGDynamicGlyphsMarkDirty(DCGDynamicGlyphs* d, int x0, int y0, int x1, int y1)
+    {
+        int* r = d->dirty;
+        if (r[2] <= r[0] || r[3] <= r[1]) {
+            r[0] = x0; r[1] = y0; r[2] = x1; r[3] = y1;
+            return;
+        }
+        r[0] = std::min(r[0], x0); r[1] = std::min(r[1], y0);
+        r[2] = std::max(r[2], x1); r[3] = std::max(r[3], y1);
+    }
+
+    void* DCGDynamicGlyphsCreate()
+    {
+        return new DCGDynamicGlyphs();
+    }
+
+    void DCGDynamicGlyphsDestroy(void* data)
+    {
+        delete (DCGDynamicGlyphs*)data;
+    }
+
+    /* Replaces the glyphs of the font by placeholders for all
+       the codepoints. The first rows of the custom rect hold the
+       pending strip, the remaining rows receive the rasterized glyphs.
+       pixels is the alpha8 content of the atlas texture. */
+    bool DCGDynamicGlyphsSetup(void* data, ImFontAtlas* atlas, ImFont* font,
+                               int rect_index, const unsigned int* codepoints,
+                               int count, float size, float ascent,
+                               float descent, float pending_advance,
+                               unsigned char* pixels, int tex_w, int tex_h)
+    {
+        DCGDynamicGlyphs* d = (DCGDynamicGlyphs*)data;
+        ImFontAtlasCustomRect* rect = atlas->GetCustomRectByIndex(rect_index);
+        if (rect == NULL || !rect->IsPacked() || rect->Width == 0)
+            return false;
+        d->atlas = atlas;
+        d->font = font;
+        d->pixels = pixels;
+        d->tex_w = tex_w;
+        d->tex_h = tex_h;
+        d->strip_x = rect->X;
+        d->strip_y = rect->Y;
+        d->strip_w = rect->Width;
+        d->strip_rows = (count + d->strip_w - 1) / d->strip_w;
+        if (d->strip_rows >= rect->Height)
+            return false;
+        int glyphs_y = rect->Y + d->strip_rows;
+        d->areas.push_back({(int)rect->X, glyphs_y, (int)rect->Width,
+                            (int)rect->Height - d->strip_rows, glyphs_y});
+        // The faint strip texels draw the placeholder box
+        for (int y = d->strip_y; y < glyphs_y; y++)
+            memset(&pixels[(size_t)y * tex_w + d->strip_x], 48, d->strip_w);
+
+        font->ClearOutputData();
+        font->ContainerAtlas = atlas;
+        font->FontSize = size;
+        font->Ascent = ascent;
+        font->Descent = descent;
+        d->pending_advance = pending_advance;
+        d->strip_codepoints.assign(codepoints, codepoints + count);
+        d->requested.assign(count, 0);
+        for (int k = 0; k < count; k++) {
+            font->AddGlyph(NULL, (ImWchar)codepoints[k], 0.f, 0.f, 0.f, 0.f,
+                           0.f, 0.f, 0.f, 0.f, pending_advance);
+            DCGDynamicGlyphsSetPending(d, &font->Glyphs.back(), k);
+            d->strip_index[codepoints[k]] = k;
+        }
+        font->BuildLookupTable();
+        return true;
+    }
+
+    /* Refreshes the glyphs derived by ImGui (tab, fallback) */
+    void DCGDynamicGlyphsRefreshLookup(void* data)
+    {
+        DCGDynamicGlyphs* d = (DCGDynamicGlyphs*)data;
+        d->font->BuildLookupTable();
+    }
+
+    /* Looks in the draw lists of the frame for the vertices
+       using the texture. Placeholders reveal codepoints to
+       rasterize, and twice per second the use of the rasterized
+       glyphs is recorded for eviction. */
+    void DCGDynamicGlyphsScan(void* data, ImTextureID texture, double now)
+    {
+        DCGDynamicGlyphs* d = (DCGDynamicGlyphs*)data;
+        ImGuiContext& g = *GImGui;
+        d->now = now;
+        bool mark_usage = (now - d->last_usage_scan) >= 0.5;
+        if (mark_usage)
+            d->last_usage_scan = now;
+        const float u0 = (float)d->strip_x / d->tex_w;
+        const float u1 = (float)(d->strip_x + d->strip_w) / d->tex_w;
+        const float v0 = (float)d->strip_y / d->tex_h;
+        const float v1 = (float)(d->strip_y + d->strip_rows) / d->tex_h;
+        const int count = (int)d->requested.size();
+        auto scan = [&](ImDrawList* list) {
+            for (const ImDrawCmd& cmd : list->CmdBuffer) {
+                if (cmd.UserCallback != NULL || cmd.TextureId != texture)
+                    continue;
+                const ImDrawIdx* indices = list->IdxBuffer.Data + cmd.IdxOffset;
+                const ImDrawVert* vertices = list->VtxBuffer.Data + cmd.VtxOffset;
+                for (unsigned int i = 0; i < cmd.ElemCount; i++) {
+                    const ImVec2 uv = vertices[indices[i]].uv;
+                    if (uv.y >= v0 && uv.y < v1 && uv.x >= u0 && uv.x < u1) {
+                        int k = ((int)(uv.y * d->tex_h) - d->strip_y) * d->strip_w +
+                                (int)(uv.x * d->tex_w) - d->strip_x;
+                        if (k >= 0 && k < count && !d->requested[k]) {
+                            d->requested[k] = 1;
+                            d->to_request.push_back(d->strip_codepoints[k]);
+                        }
+                    } else if (mark_usage) {
+                        auto it = d->uv_slot.find(DCGDynamicGlyphsUVKey(uv.x, uv.y));
+                        if (it != d->uv_slot.end())
+                            d->slots[it->second].last_used = now;
+                    }
+                }
+            }
+        };
+        for (ImGuiWindow* window : g.Windows)
+            if (window->Active)
+                scan(window->DrawList);
+        scan(ImGui::GetBackgroundDrawList());
+        scan(ImGui::GetForegroundDrawList());
+    }
+
+    bool DCGDynamicGlyphsHasRequests(void* data)
+    {
+        return !((DCGDynamicGlyphs*)data)->to_request.empty();
+    }
+
+    void DCGDynamicGlyphsTakeRequests(void* data, std::vector<unsigned int>& codepoints)
+    {
+        DCGDynamicGlyphs* d = (DCGDynamicGlyphs*)data;
+        codepoints.swap(d->to_request);
+        d->to_request.clear();
+    }
+
+    /* Returns a slot of at least w x h texels, or -1 */
+    static int DCGDynamicGlyphsAllocate(DCGDynamicGlyphs* d, int w, int h)
+    {
+        // Reuse a released slot of similar height
+        int best = -1;
+        long long best_area = LLONG_MAX;
+        for (int i = 0; i < (int)d->free_slots.size(); i++) {
+            const DCGDynamicGlyphs::Slot& slot = d->slots[d->free_slots[i]];
+            int shelf_h = d->shelves[slot.shelf].h;
+            if (slot.w < w || shelf_h < h || shelf_h > 2 * h + 2)
+                continue;
+            long long area = (long long)slot.w * shelf_h;
+            if (area < best_area) {
+                best = i;
+                best_area = area;
+            }
+        }
+        if (best >= 0) {
+            int s = d->free_slots[best];
+            d->free_slots.erase(d->free_slots.begin() + best);
+            d->slots[s].free = false;
+            return s;
+        }
+        // Append to the tightest shelf with room left
+        int shelf_index = -1;
+        for (int i = 0; i < (int)d->shelves.size(); i++) {
+            const DCGDynamicGlyphs::Shelf& shelf = d->shelves[i];
+            const DCGDynamicGlyphs::Area& area = d->areas[shelf.area];
+            if (shelf.h < h || shelf.h > h + h / 3 + 2 ||
+                shelf.x_end + w > area.x + area.w)
+                continue;
+            if (shelf_index < 0 || shelf.h < d->shelves[shelf_index].h)
+                shelf_index = i;
+        }
+        // Else open a new shelf
+        if (shelf_index < 0) {
+            int shelf_h = (h + 3) & ~3;
+            for (int a = 0; a < (int)d->areas.size(); a++) {
+                DCGDynamicGlyphs::Area& area = d->areas[a];
+                if (w > area.w || area.y_end + shelf_h > area.y + area.h)
+                    continue;
+                d->shelves.push_back({a, area.y_end, shelf_h, area.x});
+                area.y_end += shelf_h;
+                shelf_index = (int)d->shelves.size() - 1;
+                break;
+            }
+        }
+        if (shelf_index < 0)
+            return -1;
+        DCGDynamicGlyphs::Shelf& shelf = d->shelves[shelf_index];
+        d->slots.push_back({shelf_index, shelf.x_end, w, 0, 0., false, false});
+        shelf.x_end += w;
+        return (int)d->slots.size() - 1;
+    }
+
+    /* Turns the glyph of the slot back into a placeholder */
+    static void DCGDynamicGlyphsRelease(DCGDynamicGlyphs* d, int s)
+    {
+        DCGDynamicGlyphs::Slot& slot = d->slots[s];
+        ImFontGlyph* glyph = d->font->FindGlyphNoFallback((ImWchar)slot.codepoint);
+        auto it = d->strip_index.find(slot.codepoint);
+        if (glyph != NULL) {
+            d->uv_slot.erase(DCGDynamicGlyphsUVKey(glyph->U0, glyph->V0));
+            if (it != d->strip_index.end()) {
+                DCGDynamicGlyphsSetPending(d, glyph, it->second);
+                d->requested[it->second] = 0;
+            }
+        }
+        d->glyph_slot.erase(slot.codepoint);
+        slot.free = true;
+        d->free_slots.push_back(s);
+    }
+
+    /* Releases the glyphs not displayed since the limit time */
+    static int DCGDynamicGlyphsEvict(DCGDynamicGlyphs* d, double limit)
+    {
+        int count = 0;
+        for (int s = 0; s < (int)d->slots.size(); s++) {
+            const DCGDynamicGlyphs::Slot& slot = d->slots[s];
+            if (slot.free || slot.pinned || slot.last_used >= limit)
+                continue;
+            DCGDynamicGlyphsRelease(d, s);
+            count++;
+        }
+        return count;
+    }
+
+    /* Stores the rasterized glyph of a codepoint. x0 and y0 are the
+       offsets of the image relative to the pen position and the top
+       of the line. Returns false if no space could be found. */
+    bool DCGDynamicGlyphsInsert(void* data, unsigned int codepoint,
+                                const unsigned char* image, int w, int h,
+                                int stride, float x0, float y0, float advance,
+                                bool pinned, double eviction_delay)
+    {
+        DCGDynamicGlyphs* d = (DCGDynamicGlyphs*)data;
+        ImFontGlyph* glyph = d->font->FindGlyphNoFallback((ImWchar)codepoint);
+        if (glyph == NULL || d->glyph_slot.count(codepoint) != 0)
+            return true;
+        if (w <= 0 || h <= 0) {
+            glyph->X0 = glyph->X1 = x0;
+            glyph->Y0 = glyph->Y1 = y0;
+            glyph->U0 = glyph->U1 = d->atlas->TexUvWhitePixel.x;
+            glyph->V0 = glyph->V1 = d->atlas->TexUvWhitePixel.y;
+            glyph->AdvanceX = advance;
+            glyph->Visible = 0;
+            DCGDynamicGlyphsSetAdvance(d, glyph);
+            return true;
+        }
+        // One texel of padding for bilinear filtering
+        int s = DCGDynamicGlyphsAllocate(d, w + 1, h + 1);
+        if (s < 0 && eviction_delay >= 0. &&
+            DCGDynamicGlyphsEvict(d, d->now - eviction_delay) > 0)
+            s = DCGDynamicGlyphsAllocate(d, w + 1, h + 1);
+        if (s < 0)
+            return false;
+        DCGDynamicGlyphs::Slot& slot = d->slots[s];
+        slot.codepoint = codepoint;
+        slot.last_used = d->now;
+        slot.pinned = pinned;
+        const DCGDynamicGlyphs::Shelf& shelf = d->shelves[slot.shelf];
+        int x = slot.x, y = shelf.y;
+        // Clear as well the padding and the remains of a released glyph
+        for (int j = 0; j < shelf.h; j++) {
+            unsigned char* dst = &d->pixels[(size_t)(y + j) * d->tex_w + x];
+            if (j < h) {
+                memcpy(dst, &image[(size_t)j * stride], w);
+                memset(dst + w, 0, slot.w - w);
+            } else {
+                memset(dst, 0, slot.w);
+            }
+        }
+        DCGDynamicGlyphsMarkDirty(d, x, y, x + slot.w, y + shelf.h);
+        glyph->X0 = x0;
+        glyph->Y0 = y0;
+        glyph->X1 = x0 + w;
+        glyph->Y1 = y0 + h;
+        glyph->U0 = (float)x / d->tex_w;
+        glyph->V0 = (float)y / d->tex_h;
+        glyph->U1 = (float)(x + w) / d->tex_w;
+        glyph->V1 = (float)(y + h) / d->tex_h;
+        glyph->AdvanceX = advance;
+        glyph->Visible = 1;
+        DCGDynamicGlyphsSetAdvance(d, glyph);
+        d->glyph_slot[codepoint] = s;
+        d->uv_slot[DCGDynamicGlyphsUVKey(glyph->U0, glyph->V0)] = s;
+        return true;
+    }
+
+    /* The texture was enlarged to new_h rows, the previous content
+       being kept at the top: the new rows receive glyphs, and the
+       v coordinates are rescaled. */
+    void DCGDynamicGlyphsGrow(void* data, unsigned char* pixels, int new_h)
+    {
+        DCGDynamicGlyphs* d = (DCGDynamicGlyphs*)data;
+        ImFontAtlas* atlas = d->atlas;
+        float ratio = (float)d->tex_h / (float)new_h;
+        d->areas.push_back({0, d->tex_h, d->tex_w, new_h - d->tex_h, d->tex_h});
+        for (ImFontGlyph& glyph : d->font->Glyphs) {
+            glyph.V0 *= ratio;
+            glyph.V1 *= ratio;
+        }
+        atlas->TexHeight = new_h;
+        atlas->TexUvScale.y = 1.f / (float)new_h;
+        atlas->TexUvWhitePixel.y *= ratio;
+        for (int i = 0; i < IM_ARRAYSIZE(atlas->TexUvLines); i++) {
+            atlas->TexUvLines[i].y *= ratio;
+            atlas->TexUvLines[i].w *= ratio;
+        }
+        d->pixels = pixels;
+        d->tex_h = new_h;
+        d->uv_slot.clear();
+        for (const auto& entry : d->glyph_slot) {
+            ImFontGlyph* glyph = d->font->FindGlyphNoFallback((ImWchar)entry.first);
+            if (glyph != NULL)
+                d->uv_slot[DCGDynamicGlyphsUVKey(glyph->U0, glyph->V0)] = entry.second;
+        }
+        DCGDynamicGlyphsMarkDirty(d, 0, 0, d->tex_w, new_h);
+    }
+
+    float DCGDynamicGlyphsAscent(void* data)
+    {
+        return ((DCGDynamicGlyphs*)data)->font->Ascent;
+    }
+
+    /* Retrieves and resets the region of the texture to upload */
+    bool DCGDynamicGlyphsTakeDirty(void* data, int* rect)
+    {
+        DCGDynamicGlyphs* d = (DCGDynamicGlyphs*)data;
+        memcpy(rect, d->dirty, 4 * sizeof(int));
+        memset(d->dirty, 0, 4 * sizeof(int));
+        return rect[2] > rect[0] && rect[3] > rect[1];
+    }
+    """
+    void* DCGDynamicGlyphsCreate()
+    void DCGDynamicGlyphsDestroy(void*)
+    bint DCGDynamicGlyphsSetup(void*, imgui.ImFontAtlas*, imgui.ImFont*,
+                               int, const unsigned int*, int, float, float,
+                               float, float, unsigned char*, int, int)
+    void DCGDynamicGlyphsRefreshLookup(void*)
+    void DCGDynamicGlyphsScan(void*, imgui.ImTextureID, double)
+    bint DCGDynamicGlyphsHasRequests(void*)
+    void DCGDynamicGlyphsTakeRequests(void*, vector[unsigned int]&)
+    bint DCGDynamicGlyphsInsert(void*, unsigned int, const unsigned char*,
+                                int, int, int, float, float, float, bint, double)
+    void DCGDynamicGlyphsGrow(void*, unsigned char*, int)
+    float DCGDynamicGlyphsAscent(void*)
+    bint DCGDynamicGlyphsTakeDirty(void*, int*)
+
+cdef class DynamicFont(Font):
+    """
+    A font which glyphs are rendered on demand.
+
+    Contrary to the fonts of a FontTexture, for which all the
+    glyphs are rendered and packed before use, a DynamicFont only
+    renders the printable ASCII characters (and the preload ones)
+    at creation. The other characters of the font file are rendered
+    in a background thread the first frame they are displayed.
+    Meanwhile they are drawn as a faint box, usually for a single frame.
+
+    This enables to use fonts with large character sets (CJK,
+    symbols, etc) without rendering thousands of glyphs upfront,
+    and keeps the texture small.
+    When the texture is full, the glyphs that have not been displayed
+    for eviction_delay seconds are released, and if not enough
+    space could be freed, the texture height is doubled.
+
+    Colored glyphs are not supported.
+
+    Parameters
+    ----------
+    context : Context
+        The context this font belongs to
+    path : str
+        Path to the font file
+    size : float
+        Target font size in pixels
+    hinter : str = "light"
+        See FontRenderer.render_glyph_set
+    preload : str or iterable of int = None
+        Additional characters to render at creation
+    texture_width : int = 1024
+        Width of the texture holding the glyphs
+    max_texture_height : int = 8192
+        The texture height is not grown beyond this value
+    eviction_delay : float = 30.
+        Time in seconds after which a glyph that has not been
+        displayed can be released to make room for new glyphs.
+        A negative value disables eviction.
+    """
+    def __cinit__(self, context, *args, **kwargs):
+        self._atlas = <void*>(new imgui.ImFontAtlas())
+        self._glyphs = DCGDynamicGlyphsCreate()
+        self._texture = Texture(context)
+        self._texture._filtering_mode = 2 # 111A bilinear
+        self._pixels = None
+        self._job_pending = False
+        self._executor = None
+
+    def __init__(self, context,
+                 str path,
+                 float size,
+                 str hinter="light",
+                 preload=None,
+                 int texture_width=1024,
+                 int max_texture_height=8192,
+                 double eviction_delay=30.,
+                 **kwargs):
+        if not os.path.exists(path):
+            raise ValueError(f"Font file {path} not found")
+        if size <= 0:
+            raise ValueError(f"Invalid size {size}")
+        if texture_width < 64:
+            raise ValueError(f"Invalid texture width {texture_width}")
+        super().__init__(context, **kwargs)
+        face = freetype.Face(path)
+        self._pixel_size = int(round(size))
+        face.set_pixel_sizes(0, self._pixel_size)
+        with open(path, "rb") as f:
+            self._font_data = f.read()
+        self._load_flags = get_freetype_load_flags(hinter, False)
+        if hinter == "monochrome":
+            self._render_mode = freetype.FT_RENDER_MODES["FT_RENDER_MODE_MONO"]
+        elif hinter == "light":
+            self._render_mode = freetype.FT_RENDER_MODES["FT_RENDER_MODE_LIGHT"]
+        else:
+            self._render_mode = freetype.FT_RENDER_MODES["FT_RENDER_MODE_NORMAL"]
+        self._max_texture_height = max_texture_height
+        self._eviction_delay = eviction_delay
+
+        cdef vector[unsigned int] codepoints
+        for codepoint in sorted(set(c for (c, _) in face.get_chars()
+                                    if c >= 32 and c <= 0x10FFFF)):
+            codepoints.push_back(codepoint)
+        if codepoints.empty():
+            raise ValueError("The font has no characters")
+
+        # The atlas contains the default font, needed by ImGui
+        # to fill the white pixel and lines data, and a rect
+        # that we fill with our glyphs.
+        cdef imgui.ImFontAtlas *atlas = <imgui.ImFontAtlas*>self._atlas
+        cdef imgui.ImFontConfig config = imgui.ImFontConfig()
+        config.OversampleH = 1
+        config.OversampleV = 1
+        atlas.TexDesiredWidth = texture_width
+        cdef imgui.ImFont *font = atlas.AddFontDefault(&config)
+        cdef int strip_width = texture_width - 8
+        cdef int strip_rows = (<int>codepoints.size() + strip_width - 1) // strip_width
+        cdef int rect_index = atlas.AddCustomRectRegular(strip_width,
+                                                         strip_rows + texture_width // 4)
+        if not(atlas.Build()):
+            raise RuntimeError("Failed to build target texture data")
+        cdef unsigned char *data = NULL
+        cdef int width, height, bpp
+        atlas.GetTexDataAsAlpha8(&data, &width, &height, &bpp)
+        cdef cython.view.array data_array = cython.view.array(shape=(height, width), itemsize=1, format='B', mode='c', allocate_buffer=False)
+        data_array.data = <char*>data
+        self._pixels = np.array(data_array, dtype=np.uint8)
+        cdef unsigned char[:, ::1] pixels_view = self._pixels
+
+        ascent = round(face.size.ascender / 64.)
+        descent = round(face.size.descender / 64.)
+        if not(DCGDynamicGlyphsSetup(self._glyphs, atlas, font, rect_index,
+                                     codepoints.data(), <int>codepoints.size(),
+                                     ascent - descent, ascent, descent,
+                                     round(0.6 * size),
+                                     &pixels_view[0, 0], width, height)):
+            raise RuntimeError("Failed to reserve the glyphs area")
+        atlas.ClearInputData()
+        atlas.ClearTexData()
+
+        # Render the common characters right away
+        preloaded = set(range(32, 127))
+        if preload is not None:
+            preloaded |= set(ord(c) if isinstance(c, str) else int(c) for c in preload)
+        self._store_glyphs(self._rasterize(sorted(preloaded)), True)
+        DCGDynamicGlyphsRefreshLookup(self._glyphs)
+
+        self._upload_texture(True)
+        self._font = font
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+        # Get end_frame called by the viewport. The viewport
+        # does not own the reference: it is removed in __del__.
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.context.viewport.mutex)
+        self.context.viewport._frame_end_fonts.push_back(<PyObject*>self)
+
+    def __del__(self):
+        # Unregister before finalization, while the context is
+        # still valid, and before the executor is shut down.
+        # The viewport mutex is held during end_frame.
+        cdef unique_lock[recursive_mutex] m
+        cdef int i
+        if self.context is not None and self.context.viewport is not None:
+            lock_gil_friendly(m, self.context.viewport.mutex)
+            for i in range(<int>self.context.viewport._frame_end_fonts.size()):
+                if self.context.viewport._frame_end_fonts[i] == <PyObject*>self:
+                    self.context.viewport._frame_end_fonts.erase(
+                        self.context.viewport._frame_end_fonts.begin() + i)
+                    break
+            m.unlock()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        super().__del__()
+
+    def __dealloc__(self):
+        DCGDynamicGlyphsDestroy(self._glyphs)
+        self._glyphs = NULL
+        cdef imgui.ImFontAtlas *atlas = <imgui.ImFontAtlas*>self._atlas
+        del atlas
+        self._atlas = NULL
+        invalidate_text_layouts()
+        self._font = NULL
+
+    @property
+    def texture(self):
+        """
+        Readonly texture containing the rendered glyphs.
+        Its content changes as glyphs are rendered.
+        """
+        return self._texture
+
+    @property
+    def eviction_delay(self):
+        """
+        Writable attribute: time in seconds after which a glyph
+        that has not been displayed can be released.
+        A negative value disables eviction.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._eviction_delay
+
+    @eviction_delay.setter
+    def eviction_delay(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._eviction_delay = value
+
+    def _rasterize(self, codepoints):
+        """Renders the glyphs of the codepoints, outside the GIL"""
+        cdef vector[unsigned int] targets
+        for codepoint in codepoints:
+            targets.push_back(codepoint)
+        return _render_glyphs(self._font_data, self._pixel_size,
+                              self._load_flags, self._render_mode, targets)
+
+    def _store_glyphs(self, list rendered, bint pinned):
+        """
+        Packs rendered glyphs into the texture and uploads it.
+        The imgui mutex and the font mutex must be held.
+        """
+        cdef imgui.ImFontAtlas *atlas = <imgui.ImFontAtlas*>self._atlas
+        cdef float ascent = DCGDynamicGlyphsAscent(self._glyphs)
+        cdef unsigned char[:, ::1] image_view
+        cdef unsigned char[:, ::1] pixels_view
+        cdef const unsigned char *image_data
+        cdef bint grown = False
+        cdef int rect[4]
+        cdef int height
+        for (codepoint, image, top, left, advance) in rendered:
+            if not(image.any()):
+                image = np.zeros((0, 0), dtype=np.uint8) # no need for a slot
+            image_view = image[:, :, 0] if image.ndim == 3 else image
+            image_data = &image_view[0, 0] if image.size > 0 else NULL
+            while not(DCGDynamicGlyphsInsert(self._glyphs, codepoint, image_data,
+                                             image_view.shape[1], image_view.shape[0],
+                                             image_view.shape[1], left, ascent - top,
+                                             advance, pinned, self._eviction_delay)):
+                # Grow the texture. The old content stays at the top
+                height = 2 * self._pixels.shape[0]
+                if height > self._max_texture_height:
+                    break # Keep the placeholder
+                pixels = np.zeros((height, self._pixels.shape[1]), dtype=np.uint8)
+                pixels[:self._pixels.shape[0], :] = self._pixels
+                self._pixels = pixels
+                pixels_view = self._pixels
+                DCGDynamicGlyphsGrow(self._glyphs, &pixels_view[0, 0], height)
+                grown = True
+        # The glyphs (or their placeholders) have changed
+        invalidate_text_layouts()
+        if self._texture.allocated_texture == NULL:
+            return
+        if grown:
+            self._upload_texture(True)
+        elif DCGDynamicGlyphsTakeDirty(self._glyphs, rect):
+            self._upload_texture(False, rect[0], rect[1], rect[2], rect[3])
+
+    def _upload_texture(self, bint full, int x0=0, int y0=0, int x1=0, int y1=0):
+        """Uploads the whole texture or the target region"""
+        cdef int rect[4]
+        self._texture._readonly = False
+        try:
+            if full:
+                DCGDynamicGlyphsTakeDirty(self._glyphs, rect)
+                self._texture.set_value(self._pixels[:, :, np.newaxis])
+                (<imgui.ImFontAtlas*>self._atlas).SetTexID(
+                    <imgui.ImTextureID>self._texture.allocated_texture)
+            else:
+                self._texture.set_content_region(
+                    self._pixels[y0:y1, x0:x1, np.newaxis], x0, y0)
+        finally:
+            self._texture._readonly = True
+
+    def _rasterize_requests(self):
+        """Renders in the background the glyphs requested by end_frame"""
+        cdef unique_lock[recursive_mutex] imgui_m
+        cdef unique_lock[recursive_mutex] m
+        cdef unique_lock[recursive_mutex] m2
+        cdef vector[unsigned int] codepoints
+        try:
+            while True:
+                lock_gil_friendly(m, self.mutex)
+                DCGDynamicGlyphsTakeRequests(self._glyphs, codepoints)
+                if codepoints.empty():
+                    self._job_pending = False
+                    return
+                m.unlock()
+                # Render without blocking the frames
+                rendered = self._rasterize(codepoints)
+                lock_gil_friendly(imgui_m, self.context.imgui_mutex)
+                lock_gil_friendly(m, self.mutex)
+                self._store_glyphs(rendered, False)
+                m.unlock()
+                imgui_m.unlock()
+                self.context.viewport.wake()
+        except Exception:
+            print("An error occured while rendering glyphs", traceback.format_exc())
+            if imgui_m.owns_lock():
+                imgui_m.unlock()
+            lock_gil_friendly(m2, self.mutex)
+            self._job_pending = False
+
+    cdef void end_frame(self) noexcept nogil:
+        cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
+        if self._font == NULL or self._texture.allocated_texture == NULL:
+            return
+        # The draw lists can only reference the glyphs
+        # (or their placeholders) if the font was pushed
+        if self._last_frame_used != self.context.viewport.frame_count:
+            return
+        DCGDynamicGlyphsScan(self._glyphs,
+                             <imgui.ImTextureID>self._texture.allocated_texture,
+                             imgui.GetTime())
+        if self._job_pending or not(DCGDynamicGlyphsHasRequests(self._glyphs)):
+            return
+        self._job_pending = True
+        with gil:
+            try:
+                self._executor.submit(self._rasterize_requests)
+            except Exception:
+                self._job_pending = False
+
 A_int = ord('A')
 Z_int = ord('Z')
 a_int = ord('a')
@@ -1411,6 +3259,27 @@ def make_extended_latin_font(size: int,
     restricted_latin = [ord(c) for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"]
     main_restrict = kwargs.pop("restrict_to", set(range(0, 256)))
 
+    # Reuse a previous rendering with the same parameters
+    cache_key = None
+    if _glyph_cache_directory is not None:
+        try:
+            cache_key = hashlib.sha256(repr((
+                "make_extended_latin_font",
+                GLYPHSET_FORMAT_VERSION,
+                freetype.version(),
+                [_font_file_digest(p) for p in
+                 (main_font_path, italic_font_path, bold_font_path, bold_italic_path)],
+                size,
+                sorted(main_restrict),
+                sorted(kwargs.items())
+            )).encode()).hexdigest()
+        except Exception:
+            cache_key = None
+    if cache_key is not None:
+        cached = _load_cached_glyph_set(cache_key)
+        if cached is not None:
+            return cached
+
     def make_bold_map(key):
         if key < a_int:
             return key - A_int + A_bold
@@ -1426,10 +3295,17 @@ def make_extended_latin_font(size: int,
             return key - A_int + A_bitalic
         return key - a_int + a_bitalic
 
-    main = FontRenderer(main_font_path).render_glyph_set(target_size=size, restrict_to=main_restrict, **kwargs)
-    bold = FontRenderer(main_font_path).render_glyph_set(target_size=size, restrict_to=restricted_latin, **kwargs)
-    bold_italic = FontRenderer(bold_italic_path).render_glyph_set(target_size=size, restrict_to=restricted_latin, **kwargs)
-    italic = FontRenderer(italic_font_path).render_glyph_set(target_size=size, restrict_to=restricted_latin, **kwargs)
+    # The rendering mostly runs outside the GIL,
+    # thus the four variants are rendered concurrently.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        main = executor.submit(lambda: FontRenderer(main_font_path).render_glyph_set(target_size=size, restrict_to=main_restrict, **kwargs))
+        bold = executor.submit(lambda: FontRenderer(main_font_path).render_glyph_set(target_size=size, restrict_to=restricted_latin, **kwargs))
+        bold_italic = executor.submit(lambda: FontRenderer(bold_italic_path).render_glyph_set(target_size=size, restrict_to=restricted_latin, **kwargs))
+        italic = executor.submit(lambda: FontRenderer(italic_font_path).render_glyph_set(target_size=size, restrict_to=restricted_latin, **kwargs))
+        main = main.result()
+        bold = bold.result()
+        bold_italic = bold_italic.result()
+        italic = italic.result()
 
     bold.remap(restricted_latin,
                [make_bold_map(c) for c in restricted_latin])
@@ -1439,6 +3315,8 @@ def make_extended_latin_font(size: int,
                  [make_italic_map(c) for c in restricted_latin])
     merged = GlyphSet.merge_glyph_sets([main, bold, bold_italic, italic])
     merged.center_on_glyph("B")
+    if cache_key is not None:
+        _store_cached_glyph_set(cache_key, merged)
     return merged
 
 
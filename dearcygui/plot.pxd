@@ -1,9 +1,10 @@
 from .core cimport baseItem, baseFont, itemState, \
-    plotElement, uiItem, Callback, baseHandler
+    plotElement, uiItem, Callback, baseHandler, Texture
 from .types cimport *
 
 from libcpp.string cimport string
 from libcpp.vector cimport vector
+from libc.stdint cimport int64_t
 
 cimport numpy as cnp
 
@@ -85,16 +86,42 @@ cdef class plotElementWithLegend(plotElement):
 cdef class plotElementXY(plotElementWithLegend):
     cdef cnp.ndarray _X
     cdef cnp.ndarray _Y
-    cdef void check_arrays(self) noexcept nogil
+    cdef object _source
+    cdef object _source_x
+    cdef object _source_y
+    cdef bint _source_takes_points # callable source accepts points
+    cdef object _source_cache # OrderedDict of the loaded pages
+    cdef set _source_pending
+    cdef set _source_wanted
+    cdef list _source_view
+    cdef int _source_cache_size
+    cdef double _source_extent_min
+    cdef double _source_extent_max
+    cdef double _source_view_min
+    cdef double _source_view_max
+    cdef float _source_view_width
+    cdef bint _source_updated
+    cdef void reset_source(self, value)
+    cdef void update_source(self) noexcept nogil
+    cdef void update_source_pages(self, double, double, float)
 
 cdef class PlotLine(plotElementXY):
     cdef void draw_element(self) noexcept nogil
 
+cdef class PlotLines(plotElementWithLegend):
+    cdef cnp.ndarray _X # may be None
+    cdef cnp.ndarray _Y
+    cdef cnp.ndarray _offsets
+    cdef cnp.ndarray _colors
+    cdef cnp.ndarray _visible
+    cdef vector[string] _labels
+    cdef vector[string] _imgui_labels
+    cdef void draw_element(self) noexcept nogil
+
 cdef class plotElementXYY(plotElementWithLegend):
     cdef cnp.ndarray _X
     cdef cnp.ndarray _Y1
     cdef cnp.ndarray _Y2
-    cdef void check_arrays(self) noexcept nogil
 
 cdef class PlotShadedLine(plotElementXYY):
     cdef void draw_element(self) noexcept nogil
@@ -159,3 +186,70 @@ cdef class PlotAnnotation(plotElement):
     cdef bint _clamp
     cdef void draw_element(self) noexcept nogil
 
+
+cdef class PlotHeatmap(plotElementWithLegend):
+    cdef cnp.ndarray _values
+    cdef bint _col_major
+    cdef double _scale_min
+    cdef double _scale_max
+    cdef double _actual_scale_min
+    cdef double _actual_scale_max
+    cdef double[2] _bounds_min
+    cdef double[2] _bounds_max
+    cdef string _label_format
+    cdef int _colormap # implot.ImPlotColormap
+    cdef int _lut_colormap
+    cdef unsigned int[256] _lut # imgui.ImU32
+    cdef Texture _texture
+    cdef cnp.ndarray _image
+    cdef bint _dirty
+    cdef int _dirty_row_min
+    cdef int _dirty_row_max
+    cdef double _values_min # NaNs ignored
+    cdef double _values_max
+    cdef bint _values_minmax_valid
+    cdef void rows_minmax(self, int, int, double*, double*) noexcept nogil
+    cdef void update_scale(self) noexcept nogil
+    cdef void colorize(self, int, int) noexcept nogil
+    cdef void draw_cells(self, int, int) noexcept nogil
+    cdef void draw_element(self) noexcept nogil
+
+cdef class PlotHistogram(plotElementWithLegend):
+    cdef cnp.ndarray _X
+    cdef cnp.ndarray _storage
+    cdef int _bins
+    cdef double _bar_scale
+    cdef double _min_range
+    cdef double _max_range
+    cdef bint _dirty
+    cdef bint _range_degenerate # automated range widened artificially
+    cdef int64_t _num_samples
+    cdef double _bin_min
+    cdef double _bin_max
+    cdef vector[int64_t] _counts
+    cdef vector[double] _centers
+    cdef vector[double] _heights
+    cdef void compute_bins(self) noexcept nogil
+    cdef void compute_heights(self) noexcept nogil
+    cdef void draw_element(self) noexcept nogil
+
+cdef class PlotHistogram2D(plotElementWithLegend):
+    cdef cnp.ndarray _X
+    cdef cnp.ndarray _Y
+    cdef cnp.ndarray _X_storage
+    cdef cnp.ndarray _Y_storage
+    cdef int _x_bins_spec
+    cdef int _y_bins_spec
+    cdef int _x_bins
+    cdef int _y_bins
+    cdef double[4] _range # x_min, x_max, y_min, y_max
+    cdef double[4] _bin_range
+    cdef bint _dirty
+    cdef bint _range_degenerate # automated range widened artificially
+    cdef int64_t _num_samples
+    cdef double _max_height
+    cdef vector[int64_t] _counts
+    cdef vector[double] _heights
+    cdef void compute_bins(self) noexcept nogil
+    cdef void compute_heights(self) noexcept nogil
+    cdef void draw_element(self) noexcept nogil
@@ -17,24 +17,31 @@
 from libcpp cimport bool
 
 from dearcygui.wrapper cimport imgui, implot
-from libc.math cimport INFINITY
+from libc.math cimport INFINITY, ceil, floor, sqrt, log2, cbrt, round
+from libc.stdint cimport uint8_t, uint16_t, int64_t
+from libc.string cimport memcpy
 from cpython cimport PyObject
 
 from .core cimport baseHandler, baseItem, uiItem, AxisTag, \
     lock_gil_friendly, clear_obj_vector, append_obj_vector, \
-    draw_drawing_children, \
+    draw_drawing_children, draw_drawing_children_cached, \
     draw_ui_children, baseFont, plotElement, \
     update_current_mouse_states, \
-    draw_plot_element_children, itemState
+    draw_plot_element_children, itemState, Texture, read_coord
 from .imgui_types cimport *
 from .c_types cimport *
 from .types cimport *
 from .types import KeyMod
+from .core import _cached_property
 
 
 import numpy as np
 cimport numpy as cnp
 cnp.import_array()
+import inspect
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 
 cdef extern from * nogil:
@@ -63,6 +70,558 @@ cdef extern from * nogil:
     implot.ImPlotFlags GetPlotConfig()
     bint IsItemHidden(const char*)
 
+cdef extern from * nogil:
+    """
+    #include <algorithm>
+    #include <cmath>
+    #include <cstdint>
+    #include <thread>
+    #include <vector>
+
+    /* Calls F<T>(...) with T the C type matching the DCG type code.
+       The type codes (see array_type_code) match implot's
+       template instantiations. */
+    #define DCG_DISPATCH_TYPE(type_code, F, ...) \\
+        switch (type_code) { \\
+            case 0: F<ImS32>(__VA_ARGS__); break; \\
+            case 1: F<float>(__VA_ARGS__); break; \\
+            case 3: F<ImS8>(__VA_ARGS__); break; \\
+            case 4: F<ImU8>(__VA_ARGS__); break; \\
+            case 5: F<ImS16>(__VA_ARGS__); break; \\
+            case 6: F<ImU16>(__VA_ARGS__); break; \\
+            case 7: F<ImU32>(__VA_ARGS__); break; \\
+            case 8: F<ImS64>(__VA_ARGS__); break; \\
+            case 9: F<ImU64>(__VA_ARGS__); break; \\
+            default: F<double>(__VA_ARGS__); break; \\
+        }
+
+    template <typename T>
+    inline double DCGReadValue(const char* data, Py_ssize_t stride, Py_ssize_t idx)
+    {
+        return (double)*(const T*)(data + idx * stride);
+    }
+
+    /* Description of X/Y data of any (and possibly different) types */
+    struct DCGPlotData {
+        const char* x; /* nullptr: the sample index is used as X */
+        const char* y;
+        Py_ssize_t x_stride;
+        Py_ssize_t y_stride;
+        double y_offset;
+    };
+
+    template <typename TY>
+    struct DCGPlotDataGetters {
+        template <typename TX>
+        static ImPlotPoint getter(int idx, void* data)
+        {
+            const DCGPlotData* d = (const DCGPlotData*)data;
+            return ImPlotPoint(DCGReadValue<TX>(d->x, d->x_stride, idx),
+                               DCGReadValue<TY>(d->y, d->y_stride, idx) + d->y_offset);
+        }
+
+        static ImPlotPoint index_getter(int idx, void* data)
+        {
+            const DCGPlotData* d = (const DCGPlotData*)data;
+            return ImPlotPoint((double)idx,
+                               DCGReadValue<TY>(d->y, d->y_stride, idx) + d->y_offset);
+        }
+
+        template <typename TX>
+        static ImPlotGetter select()
+        {
+            return getter<TX>;
+        }
+    };
+
+    template <typename TY>
+    ImPlotGetter DCGSelectGetterY(int x_type)
+    {
+        if (x_type < 0)
+            return DCGPlotDataGetters<TY>::index_getter;
+        DCG_DISPATCH_TYPE(x_type, return DCGPlotDataGetters<TY>::template select, )
+        return nullptr;
+    }
+
+    ImPlotGetter DCGSelectGetter(int x_type, int y_type)
+    {
+        DCG_DISPATCH_TYPE(y_type, return DCGSelectGetterY, x_type)
+        return nullptr;
+    }
+
+    /* Whether the typed implot functions (which require X and Y to
+       share type and stride) can be used rather than a getter */
+    inline bool DCGIsHomogeneous(const DCGPlotData& d, int x_type, int y_type)
+    {
+        return d.y_offset == 0. &&
+            (d.x == nullptr || (x_type == y_type && d.x_stride == d.y_stride));
+    }
+
+    template <typename T>
+    void DCGPlotLineT(const char* label_id, const DCGPlotData& d, int count, ImPlotLineFlags flags)
+    {
+        if (d.x == nullptr)
+            ImPlot::PlotLine<T>(label_id, (const T*)d.y, count, 1., 0., flags, 0, (int)d.y_stride);
+        else
+            ImPlot::PlotLine<T>(label_id, (const T*)d.x, (const T*)d.y, count, flags, 0, (int)d.x_stride);
+    }
+
+    void DCGPlotLine(const char* label_id, DCGPlotData& d, int x_type, int y_type,
+                     int count, ImPlotLineFlags flags)
+    {
+        if (DCGIsHomogeneous(d, x_type, y_type)) {
+            DCG_DISPATCH_TYPE(y_type, DCGPlotLineT, label_id, d, count, flags)
+        } else
+            ImPlot::PlotLineG(label_id, DCGSelectGetter(x_type, y_type), (void*)&d, count, flags);
+    }
+
+    template <typename T>
+    void DCGPlotScatterT(const char* label_id, const DCGPlotData& d, int count, ImPlotScatterFlags flags)
+    {
+        if (d.x == nullptr)
+            ImPlot::PlotScatter<T>(label_id, (const T*)d.y, count, 1., 0., flags, 0, (int)d.y_stride);
+        else
+            ImPlot::PlotScatter<T>(label_id, (const T*)d.x, (const T*)d.y, count, flags, 0, (int)d.x_stride);
+    }
+
+    void DCGPlotScatter(const char* label_id, DCGPlotData& d, int x_type, int y_type,
+                        int count, ImPlotScatterFlags flags)
+    {
+        if (DCGIsHomogeneous(d, x_type, y_type)) {
+            DCG_DISPATCH_TYPE(y_type, DCGPlotScatterT, label_id, d, count, flags)
+        } else
+            ImPlot::PlotScatterG(label_id, DCGSelectGetter(x_type, y_type), (void*)&d, count, flags);
+    }
+
+    template <typename T>
+    void DCGPlotStairsT(const char* label_id, const DCGPlotData& d, int count, ImPlotStairsFlags flags)
+    {
+        if (d.x == nullptr)
+            ImPlot::PlotStairs<T>(label_id, (const T*)d.y, count, 1., 0., flags, 0, (int)d.y_stride);
+        else
+            ImPlot::PlotStairs<T>(label_id, (const T*)d.x, (const T*)d.y, count, flags, 0, (int)d.x_stride);
+    }
+
+    void DCGPlotStairs(const char* label_id, DCGPlotData& d, int x_type, int y_type,
+                       int count, ImPlotStairsFlags flags)
+    {
+        if (DCGIsHomogeneous(d, x_type, y_type)) {
+            DCG_DISPATCH_TYPE(y_type, DCGPlotStairsT, label_id, d, count, flags)
+        } else
+            ImPlot::PlotStairsG(label_id, DCGSelectGetter(x_type, y_type), (void*)&d, count, flags);
+    }
+
+    template <typename T>
+    void DCGPlotBarsT(const char* label_id, const DCGPlotData& d, int count, double bar_size, ImPlotBarsFlags flags)
+    {
+        if (d.x == nullptr)
+            ImPlot::PlotBars<T>(label_id, (const T*)d.y, count, bar_size, 0., flags, 0, (int)d.y_stride);
+        else
+            ImPlot::PlotBars<T>(label_id, (const T*)d.x, (const T*)d.y, count, bar_size, flags, 0, (int)d.x_stride);
+    }
+
+    void DCGPlotBars(const char* label_id, DCGPlotData& d, int x_type, int y_type,
+                     int count, double bar_size, ImPlotBarsFlags flags)
+    {
+        if (DCGIsHomogeneous(d, x_type, y_type)) {
+            DCG_DISPATCH_TYPE(y_type, DCGPlotBarsT, label_id, d, count, bar_size, flags)
+        } else
+            ImPlot::PlotBarsG(label_id, DCGSelectGetter(x_type, y_type), (void*)&d, count, bar_size, flags);
+    }
+
+    template <typename T>
+    void DCGPlotDigitalT(const char* label_id, const DCGPlotData& d, int count, ImPlotDigitalFlags flags)
+    {
+        ImPlot::PlotDigital<T>(label_id, (const T*)d.x, (const T*)d.y, count, flags, 0, (int)d.x_stride);
+    }
+
+    void DCGPlotDigital(const char* label_id, DCGPlotData& d, int x_type, int y_type,
+                        int count, ImPlotDigitalFlags flags)
+    {
+        if (d.x != nullptr && DCGIsHomogeneous(d, x_type, y_type)) {
+            DCG_DISPATCH_TYPE(y_type, DCGPlotDigitalT, label_id, d, count, flags)
+        } else
+            ImPlot::PlotDigitalG(label_id, DCGSelectGetter(x_type, y_type), (void*)&d, count, flags);
+    }
+
+    template <typename T>
+    void DCGPlotShadedT(const char* label_id, const DCGPlotData& d1, const DCGPlotData& d2,
+                        int count, ImPlotShadedFlags flags)
+    {
+        ImPlot::PlotShaded<T>(label_id, (const T*)d1.x, (const T*)d1.y, (const T*)d2.y,
+                              count, flags, 0, (int)d1.x_stride);
+    }
+
+    void DCGPlotShaded(const char* label_id, DCGPlotData& d1, DCGPlotData& d2,
+                       int x_type, int y1_type, int y2_type,
+                       int count, ImPlotShadedFlags flags)
+    {
+        if (d1.x != nullptr && y1_type == y2_type && d1.y_stride == d2.y_stride &&
+            DCGIsHomogeneous(d1, x_type, y1_type) && d2.y_offset == 0.) {
+            DCG_DISPATCH_TYPE(y1_type, DCGPlotShadedT, label_id, d1, d2, count, flags)
+        } else
+            ImPlot::PlotShadedG(label_id,
+                                DCGSelectGetter(x_type, y1_type), (void*)&d1,
+                                DCGSelectGetter(x_type, y2_type), (void*)&d2,
+                                count, flags);
+    }
+
+    template <typename T>
+    void DCGPlotStemsT(const char* label_id, const DCGPlotData& d, int count, ImPlotStemsFlags flags)
+    {
+        ImPlot::PlotStems<T>(label_id, (const T*)d.x, (const T*)d.y, count, 0., flags, 0, (int)d.x_stride);
+    }
+
+    void DCGPlotStems(const char* label_id, DCGPlotData& d, int x_type, int y_type,
+                      int count, ImPlotStemsFlags flags)
+    {
+        if (d.x != nullptr && DCGIsHomogeneous(d, x_type, y_type)) {
+            DCG_DISPATCH_TYPE(y_type, DCGPlotStemsT, label_id, d, count, flags)
+            return;
+        }
+        /* implot has no getter version of PlotStems */
+        ImPlotGetter getter = DCGSelectGetter(x_type, y_type);
+        std::vector<double> xs(count), ys(count);
+        for (int i = 0; i < count; i++) {
+            ImPlotPoint p = getter(i, (void*)&d);
+            xs[i] = p.x;
+            ys[i] = p.y;
+        }
+        ImPlot::PlotStems<double>(label_id, xs.data(), ys.data(), count, 0., flags, 0, sizeof(double));
+    }
+
+    template <typename T>
+    void DCGPlotInfLinesT(const char* label_id, const char* data, int count,
+                          ImPlotInfLinesFlags flags, Py_ssize_t stride)
+    {
+        ImPlot::PlotInfLines<T>(label_id, (const T*)data, count, flags, 0, (int)stride);
+    }
+
+    void DCGPlotInfLines(const char* label_id, const char* data, int type,
+                         int count, ImPlotInfLinesFlags flags, Py_ssize_t stride)
+    {
+        DCG_DISPATCH_TYPE(type, DCGPlotInfLinesT, label_id, data, count, flags, stride)
+    }
+
+    template <typename T>
+    void DCGPlotBarGroupsT(const char* const label_ids[], const char* data, int item_count,
+                           int group_count, double group_size, double shift,
+                           ImPlotBarGroupsFlags flags)
+    {
+        ImPlot::PlotBarGroups<T>(label_ids, (const T*)data, item_count, group_count,
+                                 group_size, shift, flags);
+    }
+
+    /* data must be C contiguous */
+    void DCGPlotBarGroups(const char* const label_ids[], const char* data, int type,
+                          int item_count, int group_count, double group_size,
+                          double shift, ImPlotBarGroupsFlags flags)
+    {
+        DCG_DISPATCH_TYPE(type, DCGPlotBarGroupsT, label_ids, data, item_count, group_count,
+                          group_size, shift, flags)
+    }
+
+    template <typename T>
+    void DCGPlotPieChartT(const char* const label_ids[], const char* data, int count,
+                          double x, double y, double radius, const char* label_fmt,
+                          double angle0, ImPlotPieChartFlags flags)
+    {
+        ImPlot::PlotPieChart<T>(label_ids, (const T*)data, count, x, y, radius,
+                                label_fmt, angle0, flags);
+    }
+
+    /* data must be C contiguous */
+    void DCGPlotPieChart(const char* const label_ids[], const char* data, int type,
+                         int count, double x, double y, double radius,
+                         const char* label_fmt, double angle0,
+                         ImPlotPieChartFlags flags)
+    {
+        DCG_DISPATCH_TYPE(type, DCGPlotPieChartT, label_ids, data, count, x, y, radius,
+                          label_fmt, angle0, flags)
+    }
+    """
+    struct DCGPlotData:
+        const char* x
+        const char* y
+        Py_ssize_t x_stride
+        Py_ssize_t y_stride
+        double y_offset
+    void DCGPlotLine(const char*, DCGPlotData&, int, int, int, implot.ImPlotLineFlags)
+    void DCGPlotScatter(const char*, DCGPlotData&, int, int, int, implot.ImPlotScatterFlags)
+    void DCGPlotStairs(const char*, DCGPlotData&, int, int, int, implot.ImPlotStairsFlags)
+    void DCGPlotBars(const char*, DCGPlotData&, int, int, int, double, implot.ImPlotBarsFlags)
+    void DCGPlotDigital(const char*, DCGPlotData&, int, int, int, implot.ImPlotDigitalFlags)
+    void DCGPlotShaded(const char*, DCGPlotData&, DCGPlotData&, int, int, int, int, implot.ImPlotShadedFlags)
+    void DCGPlotStems(const char*, DCGPlotData&, int, int, int, implot.ImPlotStemsFlags)
+    void DCGPlotInfLines(const char*, const char*, int, int, implot.ImPlotInfLinesFlags, Py_ssize_t)
+    void DCGPlotBarGroups(const char**, const char*, int, int, int, double, double, implot.ImPlotBarGroupsFlags)
+    void DCGPlotPieChart(const char**, const char*, int, int, double, double, double, const char*, double, implot.ImPlotPieChartFlags)
+
+cdef inline int array_type_code(cnp.ndarray array) noexcept nogil:
+    """
+    Returns the type code used by the DCG* plot helpers
+    for the type of the array, or -1 if the type is not
+    supported without conversion.
+    """
+    cdef int t = cnp.PyArray_TYPE(array)
+    if t == cnp.NPY_INT:
+        return 0
+    if t == cnp.NPY_FLOAT:
+        return 1
+    if t == cnp.NPY_DOUBLE:
+        return 2
+    if t == cnp.NPY_BYTE:
+        return 3
+    if t == cnp.NPY_UBYTE:
+        return 4
+    if t == cnp.NPY_SHORT:
+        return 5
+    if t == cnp.NPY_USHORT:
+        return 6
+    if t == cnp.NPY_UINT:
+        return 7
+    # long is 32 bits on Windows
+    if t == cnp.NPY_LONG or t == cnp.NPY_LONGLONG:
+        return 8 if cnp.PyArray_ITEMSIZE(array) == 8 else 0
+    if t == cnp.NPY_ULONG or t == cnp.NPY_ULONGLONG:
+        return 9 if cnp.PyArray_ITEMSIZE(array) == 8 else 7
+    return -1
+
+cdef cnp.ndarray plot_data_array(value, int ndim=1, bint contiguous=False):
+    """
+    Converts value to an array that can be passed to the
+    DCG* plot helpers. The array is used without copy if
+    its type is supported natively (int8, uint8, int16,
+    uint16, int32, uint32, int64, uint64, float32 and float64).
+    datetime64 and timedelta64 arrays are viewed as int64
+    (counts of their time unit), also without copy.
+    Else it is converted to float64.
+    """
+    cdef cnp.ndarray array = np.asarray(value)
+    if array.dtype.kind in 'mM':
+        array = array.view(np.dtype(np.int64).newbyteorder(array.dtype.byteorder))
+    if ndim == 1:
+        array = array.reshape([-1])
+    elif array.ndim != ndim:
+        raise ValueError(f"Expected a {ndim}D array")
+    # We don't support array of pointers. Must be data,
+    # with eventually a non-standard stride
+    if array_type_code(array) < 0 or \
+       not(cnp.PyArray_ISNOTSWAPPED(array)) or \
+       not(cnp.PyArray_CHKFLAGS(array, cnp.NPY_ARRAY_ELEMENTSTRIDES)):
+        return np.ascontiguousarray(array, dtype=np.float64)
+    if contiguous and not(cnp.PyArray_IS_C_CONTIGUOUS(array)):
+        return np.ascontiguousarray(array)
+    return array
+
+cdef inline void fill_plot_data(DCGPlotData &data,
+                                cnp.ndarray x,
+                                cnp.ndarray y) noexcept nogil:
+    """Fills data to describe x (which can be None) and y"""
+    if x is None:
+        data.x = NULL
+        data.x_stride = 0
+    else:
+        data.x = <const char*>cnp.PyArray_DATA(x)
+        data.x_stride = cnp.PyArray_STRIDE(x, 0)
+    data.y = <const char*>cnp.PyArray_DATA(y)
+    data.y_stride = cnp.PyArray_STRIDE(y, 0)
+    data.y_offset = 0.
+
+cdef extern from * nogil:
+    """
+    /* Inputs larger than this are binned with several threads */
+    #define DCG_HISTOGRAM_THREADED_SIZE (1 << 20)
+
+    template <typename T>
+    void DCGHistogramStatsT(const char* data, Py_ssize_t stride, Py_ssize_t count, double* stats)
+    {
+        double vmin = INFINITY, vmax = -INFINITY, sum = 0., sum_sq = 0.;
+        int64_t n = 0;
+        for (Py_ssize_t i = 0; i < count; i++) {
+            double v = DCGReadValue<T>(data, stride, i);
+            if (std::isnan(v))
+                continue;
+            vmin = std::min(vmin, v);
+            vmax = std::max(vmax, v);
+            sum += v;
+            sum_sq += v * v;
+            n++;
+        }
+        double mean = n > 0 ? sum / n : 0.;
+        stats[0] = vmin;
+        stats[1] = vmax;
+        stats[2] = mean;
+        stats[3] = n > 0 ? std::sqrt(std::max(0., sum_sq / n - mean * mean)) : 0.;
+    }
+
+    /* stats: min, max, mean, standard deviation (NaNs ignored) */
+    void DCGHistogramStats(const char* data, int type, Py_ssize_t stride, Py_ssize_t count, double* stats)
+    {
+        DCG_DISPATCH_TYPE(type, DCGHistogramStatsT, data, stride, count, stats)
+    }
+
+    template <typename TX, typename TY>
+    void DCGHistogramRange(const char* x, Py_ssize_t x_stride,
+                           const char* y, Py_ssize_t y_stride,
+                           Py_ssize_t start, Py_ssize_t end,
+                           double x_min, double x_max, int x_bins,
+                           double y_min, double y_max, int y_bins,
+                           int64_t* counts)
+    {
+        /* y == nullptr for 1D histograms. For 2D histograms,
+           rows are stored from the top (y_max) to the bottom (y_min) */
+        double x_scale = x_max > x_min ? x_bins / (x_max - x_min) : 0.;
+        double y_scale = y_max > y_min ? y_bins / (y_max - y_min) : 0.;
+        for (Py_ssize_t i = start; i < end; i++) {
+            double vx = DCGReadValue<TX>(x, x_stride, i);
+            if (!(vx >= x_min && vx <= x_max))
+                continue;
+            int bx = std::min((int)((vx - x_min) * x_scale), x_bins - 1);
+            if (y == nullptr) {
+                counts[bx] += 1;
+                continue;
+            }
+            double vy = DCGReadValue<TY>(y, y_stride, i);
+            if (!(vy >= y_min && vy <= y_max))
+                continue;
+            int by = std::min((int)((vy - y_min) * y_scale), y_bins - 1);
+            counts[(size_t)(y_bins - 1 - by) * x_bins + bx] += 1;
+        }
+    }
+
+    template <typename TX, typename TY>
+    void DCGHistogramBinT(const char* x, Py_ssize_t x_stride,
+                          const char* y, Py_ssize_t y_stride,
+                          Py_ssize_t count,
+                          double x_min, double x_max, int x_bins,
+                          double y_min, double y_max, int y_bins,
+                          int64_t* counts)
+    {
+        unsigned num_threads = 1;
+        if (count >= DCG_HISTOGRAM_THREADED_SIZE)
+            num_threads = std::max(1u, std::min(8u, std::thread::hardware_concurrency()));
+        if (num_threads == 1) {
+            DCGHistogramRange<TX, TY>(x, x_stride, y, y_stride, 0, count,
+                                      x_min, x_max, x_bins, y_min, y_max, y_bins, counts);
+            return;
+        }
+        /* Each thread bins a contiguous chunk in its own
+           buffer, and the buffers are summed at the end */
+        size_t num_bins = (size_t)x_bins * y_bins;
+        std::vector<std::vector<int64_t>> partial(num_threads, std::vector<int64_t>(num_bins, 0));
+        std::vector<std::thread> threads;
+        Py_ssize_t chunk = (Py_ssize_t)((count + num_threads - 1) / num_threads);
+        for (unsigned t = 0; t < num_threads; t++) {
+            Py_ssize_t start = (Py_ssize_t)t * chunk;
+            Py_ssize_t end = std::min(count, start + chunk);
+            threads.emplace_back(DCGHistogramRange<TX, TY>, x, x_stride, y, y_stride,
+                                 start, end, x_min, x_max, x_bins, y_min, y_max, y_bins,
+                                 partial[t].data());
+        }
+        for (auto& thread : threads)
+            thread.join();
+        for (unsigned t = 0; t < num_threads; t++)
+            for (size_t b = 0; b < num_bins; b++)
+                counts[b] += partial[t][b];
+    }
+
+    template <typename TX>
+    struct DCGHistogramBinY {
+        template <typename TY>
+        static void bin(const char* x, Py_ssize_t x_stride,
+                        const char* y, Py_ssize_t y_stride,
+                        Py_ssize_t count,
+                        double x_min, double x_max, int x_bins,
+                        double y_min, double y_max, int y_bins,
+                        int64_t* counts)
+        {
+            DCGHistogramBinT<TX, TY>(x, x_stride, y, y_stride, count,
+                                     x_min, x_max, x_bins, y_min, y_max, y_bins, counts);
+        }
+    };
+
+    template <typename TX>
+    void DCGHistogramBinX(const char* x, Py_ssize_t x_stride,
+                          const char* y, int y_type, Py_ssize_t y_stride,
+                          Py_ssize_t count,
+                          double x_min, double x_max, int x_bins,
+                          double y_min, double y_max, int y_bins,
+                          int64_t* counts)
+    {
+        DCG_DISPATCH_TYPE(y_type, DCGHistogramBinY<TX>::template bin,
+                          x, x_stride, y, y_stride, count,
+                          x_min, x_max, x_bins, y_min, y_max, y_bins, counts)
+    }
+
+    /* Adds the counts of the samples to counts (which is not reset).
+       For 1D histograms, y is nullptr and y_bins is 1. */
+    void DCGHistogramBin(const char* x, int x_type, Py_ssize_t x_stride,
+                         const char* y, int y_type, Py_ssize_t y_stride,
+                         Py_ssize_t count,
+                         double x_min, double x_max, int x_bins,
+                         double y_min, double y_max, int y_bins,
+                         int64_t* counts)
+    {
+        DCG_DISPATCH_TYPE(x_type, DCGHistogramBinX,
+                          x, x_stride, y, y_type, y_stride, count,
+                          x_min, x_max, x_bins, y_min, y_max, y_bins, counts)
+    }
+    """
+    void DCGHistogramStats(const char*, int, Py_ssize_t, Py_ssize_t, double*)
+    void DCGHistogramBin(const char*, int, Py_ssize_t,
+                         const char*, int, Py_ssize_t,
+                         Py_ssize_t,
+                         double, double, int,
+                         double, double, int,
+                         int64_t*)
+
+cdef cnp.ndarray histogram_counts_to_array(vector[int64_t] &counts):
+    """Copies the bin counts into a new int64 array"""
+    cdef cnp.ndarray result = np.empty(counts.size(), dtype=np.int64)
+    if counts.size() > 0:
+        memcpy(cnp.PyArray_DATA(result), counts.data(),
+               counts.size() * sizeof(int64_t))
+    return result
+
+cdef int histogram_bin_count(int bins, Py_ssize_t count, double range_width, double std_dev) noexcept nogil:
+    """Resolves the implot.ImPlotBin_* binning methods"""
+    if bins > 0:
+        return bins
+    if count <= 0:
+        return 1
+    if bins == implot.ImPlotBin_Sqrt:
+        bins = <int>ceil(sqrt(<double>count))
+    elif bins == implot.ImPlotBin_Sturges:
+        bins = <int>ceil(1. + log2(<double>count))
+    elif bins == implot.ImPlotBin_Rice:
+        bins = <int>ceil(2. * cbrt(<double>count))
+    elif std_dev > 0.: # Scott
+        bins = <int>round(range_width / (3.49 * std_dev / cbrt(<double>count)))
+    else:
+        bins = 1
+    return max(1, bins)
+
+cdef cnp.ndarray append_samples(cnp.ndarray storage,
+                                cnp.ndarray current,
+                                cnp.ndarray values):
+    """
+    Returns an array starting with the content of current
+    followed by values. storage must be either None or an
+    array of which current is the beginning. It is reused
+    if it is large enough, else a larger one is allocated
+    (with spare capacity to amortize future appends).
+    """
+    cdef Py_ssize_t n = current.shape[0]
+    cdef Py_ssize_t total = n + values.shape[0]
+    cdef cnp.ndarray new_storage
+    if storage is None or total > storage.shape[0]:
+        new_storage = np.empty(shape=(max(2 * total, 1024),), dtype=current.dtype)
+        new_storage[:n] = current
+        storage = new_storage
+    storage[n:total] = values
+    return storage
+
 cdef class AxesResizeHandler(baseHandler):
     """
     Handler that can only be bound to a plot,
@@ -1962,10 +2521,144 @@ cdef class plotElementWithLegend(plotElement):
     cdef void draw_element(self) noexcept nogil:
         return
 
+# Background loader shared by all the paged plot data sources.
+# A single worker serializes the disk accesses.
+_plot_source_loader = None
+
+cdef object get_plot_source_loader():
+    global _plot_source_loader
+    if _plot_source_loader is None:
+        _plot_source_loader = ThreadPoolExecutor(max_workers=1,
+                                                 thread_name_prefix="dcg_plot_source")
+    return _plot_source_loader
+
+cdef Py_ssize_t source_bisect(x, Py_ssize_t n, double value):
+    """First index i such that x[i] >= value (x sorted)"""
+    cdef Py_ssize_t lo = 0
+    cdef Py_ssize_t hi = n
+    cdef Py_ssize_t mid
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if x[mid] < value:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+cdef object decimate_minmax_indices(cnp.ndarray y, int max_points):
+    """
+    Indices of the samples of y to keep to reduce it to at
+    most max_points samples: the minimum and maximum of each
+    group of samples, such that peaks remain visible.
+    Returns None if y has no more than max_points samples.
+    """
+    cdef Py_ssize_t n = y.shape[0]
+    if n <= max_points:
+        return None
+    cdef Py_ssize_t bucket = (2 * n + max_points - 1) // max_points
+    cdef Py_ssize_t num_full = n // bucket
+    cdef Py_ssize_t num_buckets = (n + bucket - 1) // bucket
+    # The full buckets are processed by chunks, which bounds
+    # the copies made by reshape for strided inputs (for
+    # instance a column of a np.memmap).
+    cdef Py_ssize_t chunk = max(1, (1 << 20) // bucket)
+    cdef Py_ssize_t b0, b1, tail_start
+    indices = np.empty((num_buckets, 2), dtype=np.intp)
+    for b0 in range(0, num_full, chunk):
+        b1 = min(num_full, b0 + chunk)
+        values = y[b0 * bucket:b1 * bucket].reshape(b1 - b0, bucket)
+        i_min = values.argmin(axis=1)
+        i_max = values.argmax(axis=1)
+        base = np.arange(b0, b1, dtype=np.intp) * bucket
+        indices[b0:b1, 0] = base + np.minimum(i_min, i_max)
+        indices[b0:b1, 1] = base + np.maximum(i_min, i_max)
+    if num_buckets > num_full:
+        # Partial last bucket
+        tail_start = num_full * bucket
+        values = y[tail_start:]
+        i_min = values.argmin()
+        i_max = values.argmax()
+        indices[num_full, 0] = tail_start + min(i_min, i_max)
+        indices[num_full, 1] = tail_start + max(i_min, i_max)
+    return indices.reshape(-1)
+
+def _load_plot_source_page(plotElementXY item, tuple key):
+    """Runs in the loader thread"""
+    cdef unique_lock[recursive_mutex] m
+    lock_gil_friendly(m, item.mutex)
+    source = item._source
+    source_x = item._source_x
+    source_y = item._source_y
+    cdef bint takes_points = item._source_takes_points
+    if source is None or key not in item._source_wanted:
+        # The source changed, or the view moved on
+        item._source_pending.discard(key)
+        return
+    m.unlock()
+
+    cdef double page_width = 2. ** key[0]
+    cdef double start = key[1] * page_width
+    cdef double stop = start + page_width
+    cdef Py_ssize_t n, i0, i1
+    try:
+        if source_y is None:
+            if takes_points:
+                (X, Y) = source(start, stop, key[2])
+            else:
+                (X, Y) = source(start, stop)
+            X = np.asarray(X).reshape([-1])
+            Y = np.asarray(Y).reshape([-1])
+            n = min(X.shape[0], Y.shape[0])
+            X = X[:n]
+            Y = Y[:n]
+        else:
+            n = len(source_y)
+            if source_x is None:
+                i0 = max(0, min(n, <Py_ssize_t>ceil(start)))
+                i1 = max(0, min(n, <Py_ssize_t>ceil(stop)))
+                X = None
+            else:
+                n = min(n, len(source_x))
+                i0 = source_bisect(source_x, n, start)
+                i1 = source_bisect(source_x, n, stop)
+                X = np.asarray(source_x[i0:i1]).reshape([-1])
+            Y = np.asarray(source_y[i0:i1]).reshape([-1])
+        indices = decimate_minmax_indices(Y, key[2])
+        if indices is not None:
+            Y = Y[indices]
+            if X is None:
+                # The sample index: no need to build the full range
+                X = indices.astype(np.int64) + i0
+            else:
+                X = X[indices]
+        elif X is None:
+            X = np.arange(i0, i1, dtype=np.int64)
+        page = (X, Y)
+    except Exception as e:
+        print("An error occured while loading plot data", traceback.format_exc())
+        page = None
+
+    lock_gil_friendly(m, item.mutex)
+    item._source_pending.discard(key)
+    if item._source is not source or page is None:
+        # A failed page is not cached, and is
+        # requested again when the view changes
+        return
+    item._source_cache[key] = page
+    while len(item._source_cache) > item._source_cache_size:
+        item._source_cache.popitem(last=False)
+    item._source_updated = True
+    m.unlock()
+    item.context.viewport.wake()
+
 cdef class plotElementXY(plotElementWithLegend):
     def __cinit__(self):
         self._X = np.zeros(shape=(1,), dtype=np.float64)
         self._Y = np.zeros(shape=(1,), dtype=np.float64)
+        self._source_cache = OrderedDict()
+        self._source_pending = set()
+        self._source_wanted = set()
+        self._source_cache_size = 64
 
     @property
     def X(self):
@@ -1973,8 +2666,10 @@ cdef class plotElementXY(plotElementWithLegend):
 
         By default, will try to use the passed array
         directly for its internal backing (no copy).
-        Supported types for no copy are np.int32,
-        np.float32, np.float64.
+        Supported types for no copy are the signed and
+        unsigned 8, 16, 32 and 64 bits integers,
+        np.float32 and np.float64. The type of X does not
+        need to match the type of Y.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
@@ -1984,17 +2679,8 @@ cdef class plotElementXY(plotElementWithLegend):
     def X(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        cdef cnp.ndarray array = np.asarray(value).reshape([-1])
-        # We don't support array of pointers. Must be data,
-        # with eventually a non-standard stride
-        # type must also be one of the supported types
-        if cnp.PyArray_CHKFLAGS(array, cnp.NPY_ARRAY_ELEMENTSTRIDES) and \
-           (cnp.PyArray_TYPE(array) == cnp.NPY_INT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_FLOAT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_DOUBLE):
-            self._X = array
-        else:
-            self._X = np.ascontiguousarray(array, dtype=np.float64)
+        self.reset_source(None)
+        self._X = plot_data_array(value)
 
     @property
     def Y(self):
@@ -2006,28 +2692,171 @@ cdef class plotElementXY(plotElementWithLegend):
     def Y(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        cdef cnp.ndarray array = np.asarray(value).reshape([-1])
-        # We don't support array of pointers. Must be data,
-        # with eventually a non-standard stride
-        # type must also be one of the supported types
-        if cnp.PyArray_CHKFLAGS(array, cnp.NPY_ARRAY_ELEMENTSTRIDES) and \
-           (cnp.PyArray_TYPE(array) == cnp.NPY_INT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_FLOAT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_DOUBLE):
-            self._Y = array
+        self.reset_source(None)
+        self._Y = plot_data_array(value)
+
+    @property
+    def source(self):
+        """
+        Writable attribute: lazily paged data source.
+
+        Enables to plot data that does not fit in memory.
+        Accepted sources are:
+        - A 1D array-like, for instance a np.memmap, of
+            the Y values. X is the sample index.
+        - A tuple (X, Y) of 1D array-likes. X must be sorted.
+        - A callable (start, stop) -> (X, Y) returning the
+            samples whose X coordinate is in [start, stop[.
+            If the callable accepts a third argument, it is called
+            as (start, stop, points), with points the resolution
+            wanted for this range: it can then return about that
+            many samples (for instance a pre-decimated level of
+            detail). Larger results are reduced to points samples.
+
+        Only the visible X range (plus a margin) is fetched,
+        by pages reduced to the resolution of the plot.
+        The pages are loaded on a background thread, and until
+        they are available the last completed data is shown.
+        The X and Y attributes reflect the displayed data.
+
+        Setting X or Y resets source to None.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._source
+
+    @source.setter
+    def source(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self.reset_source(value)
+
+    @property
+    def source_cache_size(self):
+        """
+        Writable attribute: maximum number of pages of the
+        source kept in memory. Defaults to 64.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._source_cache_size
+
+    @source_cache_size.setter
+    def source_cache_size(self, int value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        # Must hold the pages of the view and its margins
+        self._source_cache_size = max(16, value)
+        while len(self._source_cache) > self._source_cache_size:
+            self._source_cache.popitem(last=False)
+
+    cdef void reset_source(self, value):
+        self._source_cache.clear()
+        self._source_pending.clear()
+        self._source_wanted.clear()
+        self._source_view = None
+        self._source_updated = True
+        self._source_extent_min = -INFINITY
+        self._source_extent_max = INFINITY
+        self._source_x = None
+        self._source_y = None
+        self._source_takes_points = False
+        self._source = None
+        if value is None:
+            return
+        if isinstance(value, tuple):
+            if len(value) != 2:
+                raise ValueError("Expected a (X, Y) tuple as source")
+            (source_x, source_y) = value
+            n = min(len(source_x), len(source_y))
+            if n > 0:
+                if source_x[n-1] < source_x[0]:
+                    raise ValueError("The X values of the source must be sorted")
+                self._source_extent_min = float(source_x[0])
+                self._source_extent_max = float(source_x[n-1])
+            self._source_x = source_x
+            self._source_y = source_y
+        elif callable(value):
+            try:
+                inspect.signature(value).bind(0., 1., 64)
+                self._source_takes_points = True
+            except (TypeError, ValueError):
+                # (start, stop) only, or no signature available
+                self._source_takes_points = False
         else:
-            self._Y = np.ascontiguousarray(array, dtype=np.float64)
+            self._source_y = value
+            self._source_extent_min = 0.
+            self._source_extent_max = float(len(value))
+        self._source = value
 
-    cdef void check_arrays(self) noexcept nogil:
-        # X and Y must be same type and same stride
-        if cnp.PyArray_TYPE(self._X) != cnp.PyArray_TYPE(self._Y):
-            with gil:
-                self._X = np.ascontiguousarray(self._X, dtype=np.float64)
-                self._Y = np.ascontiguousarray(self._Y, dtype=np.float64)
-        if cnp.PyArray_STRIDE(self._X, 0) != cnp.PyArray_STRIDE(self._Y, 0):
-            with gil:
-                self._X = np.ascontiguousarray(self._X, dtype=np.float64)
-                self._Y = np.ascontiguousarray(self._Y, dtype=np.float64)
+    cdef void update_source(self) noexcept nogil:
+        """
+        Updates X and Y from the source. Must be called
+        during draw_element.
+        """
+        if self._source is None:
+            return
+        cdef implot.ImPlotRect limits = implot.GetPlotLimits(self._axes[0], self._axes[1])
+        cdef float width = implot.GetPlotSize().x
+        if limits.X.Min == self._source_view_min and \
+           limits.X.Max == self._source_view_max and \
+           width == self._source_view_width and \
+           not(self._source_updated):
+            return
+        self._source_view_min = limits.X.Min
+        self._source_view_max = limits.X.Max
+        self._source_view_width = width
+        self._source_updated = False
+        with gil:
+            try:
+                self.update_source_pages(limits.X.Min, limits.X.Max, width)
+            except Exception as e:
+                print("An error occured while updating the plot data", traceback.format_exc())
+
+    cdef void update_source_pages(self, double x_min, double x_max, float width):
+        if self._source_view is None and \
+           self._source_extent_min > -INFINITY and \
+           self._source_extent_max < INFINITY and \
+           self._source_extent_max > self._source_extent_min:
+            # Nothing shown yet: start with an overview of the
+            # whole data, which enables axes fitting.
+            x_min = self._source_extent_min
+            x_max = self._source_extent_max
+        if not(x_max > x_min) or x_max - x_min == INFINITY or width <= 0:
+            return
+        # Each page covers between a quarter and half of the view,
+        # thus the view spans about 2 to 5 pages, plus a page of
+        # margin on each side. Pages are reduced to 2 points per pixel.
+        cdef int level = <int>ceil(log2((x_max - x_min) / 4.))
+        cdef double page_width = 2. ** level
+        cdef int points = 1 << max(6, <int>ceil(log2(2. * width * page_width / (x_max - x_min))))
+        cdef long long first = <long long>floor(x_min / page_width) - 1
+        cdef long long last = <long long>floor(x_max / page_width) + 1
+        if self._source_extent_min > -INFINITY:
+            first = max(first, <long long>floor(self._source_extent_min / page_width))
+        if self._source_extent_max < INFINITY:
+            last = min(last, <long long>floor(self._source_extent_max / page_width))
+        cdef long long k
+        keys = [(level, k, points) for k in range(first, last + 1)]
+
+        self._source_wanted = set(keys)
+        missing = [key for key in keys if key not in self._source_cache]
+        for key in keys:
+            if key in self._source_cache:
+                self._source_cache.move_to_end(key)
+        for key in missing:
+            if key not in self._source_pending:
+                self._source_pending.add(key)
+                get_plot_source_loader().submit(_load_plot_source_page, self, key)
+        if len(missing) > 0:
+            # Keep showing the last completed data
+            return
+        if self._source_view == keys:
+            return
+        self._source_view = keys
+        pages = [self._source_cache[key] for key in keys]
+        self._X = plot_data_array(np.concatenate([page[0] for page in pages]))
+        self._Y = plot_data_array(np.concatenate([page[1] for page in pages]))
 
 cdef class PlotLine(plotElementXY):
     @property
@@ -2118,50 +2947,59 @@ cdef class PlotLine(plotElementXY):
             self._flags |= implot.ImPlotLineFlags_Shaded
 
     cdef void draw_element(self) noexcept nogil:
-        self.check_arrays()
+        self.update_source()
         cdef int size = min(self._X.shape[0], self._Y.shape[0])
         if size == 0:
             return
 
-        if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
-            implot.PlotLine[int](self._imgui_label.c_str(),
-                                 <const int*>cnp.PyArray_DATA(self._X),
-                                 <const int*>cnp.PyArray_DATA(self._Y),
-                                 size,
-                                 self._flags,
-                                 0,
-                                 cnp.PyArray_STRIDE(self._X, 0))
-        elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
-            implot.PlotLine[float](self._imgui_label.c_str(),
-                                   <const float*>cnp.PyArray_DATA(self._X),
-                                   <const float*>cnp.PyArray_DATA(self._Y),
-                                   size,
-                                   self._flags,
-                                   0,
-                                   cnp.PyArray_STRIDE(self._X, 0))
-        else:
-            implot.PlotLine[double](self._imgui_label.c_str(),
-                                    <const double*>cnp.PyArray_DATA(self._X),
-                                    <const double*>cnp.PyArray_DATA(self._Y),
-                                    size,
-                                    self._flags,
-                                    0,
-                                    cnp.PyArray_STRIDE(self._X, 0))
+        cdef DCGPlotData data
+        fill_plot_data(data, self._X, self._Y)
+        DCGPlotLine(self._imgui_label.c_str(),
+                    data,
+                    array_type_code(self._X),
+                    array_type_code(self._Y),
+                    size,
+                    self._flags)
 
-cdef class plotElementXYY(plotElementWithLegend):
+cdef class PlotLines(plotElementWithLegend):
+    """
+    Plots several lines (channels) sharing the same
+    X coordinates in a single element.
+
+    Y is a 2D array of shape (channels, samples). All
+    channels are submitted in a single native loop,
+    which is much cheaper than one PlotLine per channel.
+
+    Per-channel Y offsets, colors and visibility are
+    stored as arrays and can be updated without
+    touching the data.
+
+    By default all channels share the legend entry of
+    the element (hiding it hides all channels).
+    If labels are set, each channel gets its own
+    legend entry instead.
+    """
     def __cinit__(self):
-        self._X = np.zeros(shape=(1,), dtype=np.float64)
-        self._Y1 = np.zeros(shape=(1,), dtype=np.float64)
-        self._Y2 = np.zeros(shape=(1,), dtype=np.float64)
+        self._X = None
+        self._Y = np.zeros(shape=(1, 1), dtype=np.float64)
+        self._offsets = np.zeros(shape=(0,), dtype=np.float64)
+        self._colors = np.zeros(shape=(0,), dtype=np.uint32)
+        self._visible = np.ones(shape=(0,), dtype=np.uint8)
 
     @property
     def X(self):
-        """Values on the X axis.
+        """
+        Writable attribute: values on the X axis shared by
+        all channels.
+
+        If None (default), the sample index is used.
 
         By default, will try to use the passed array
         directly for its internal backing (no copy).
-        Supported types for no copy are np.int32,
-        np.float32, np.float64.
+        Supported types for no copy are the signed and
+        unsigned 8, 16, 32 and 64 bits integers,
+        np.float32 and np.float64. The type of X does not
+        need to match the type of Y.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
@@ -2171,233 +3009,412 @@ cdef class plotElementXYY(plotElementWithLegend):
     def X(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        cdef cnp.ndarray array = np.asarray(value).reshape([-1])
-        # We don't support array of pointers. Must be data,
-        # with eventually a non-standard stride
-        # type must also be one of the supported types
-        if cnp.PyArray_CHKFLAGS(array, cnp.NPY_ARRAY_ELEMENTSTRIDES) and \
-           (cnp.PyArray_TYPE(array) == cnp.NPY_INT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_FLOAT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_DOUBLE):
-            self._X = array
-        else:
-            self._X = np.ascontiguousarray(array, dtype=np.float64)
+        if value is None:
+            self._X = None
+            return
+        self._X = plot_data_array(value)
 
     @property
-    def Y1(self):
+    def Y(self):
+        """
+        Writable attribute: 2D array of shape (channels, samples).
+        A 1D array is interpreted as a single channel.
+
+        By default, will try to use the passed array
+        directly for its internal backing (no copy).
+        Supported types for no copy are the signed and
+        unsigned 8, 16, 32 and 64 bits integers,
+        np.float32 and np.float64. Both C and Fortran
+        ordered arrays (and strided views) are accepted.
+        """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        return self._Y1
+        return self._Y
 
-    @Y1.setter
-    def Y1(self, value):
+    @Y.setter
+    def Y(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        cdef cnp.ndarray array = np.asarray(value).reshape([-1])
-        # We don't support array of pointers. Must be data,
-        # with eventually a non-standard stride
-        # type must also be one of the supported types
-        if cnp.PyArray_CHKFLAGS(array, cnp.NPY_ARRAY_ELEMENTSTRIDES) and \
-           (cnp.PyArray_TYPE(array) == cnp.NPY_INT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_FLOAT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_DOUBLE):
-            self._Y1 = array
-        else:
-            self._Y1 = np.ascontiguousarray(array, dtype=np.float64)
+        cdef cnp.ndarray array = np.asarray(value)
+        if array.ndim == 1:
+            array = array.reshape([1, -1])
+        if array.ndim != 2:
+            raise ValueError("Y must be a 2D array (channels, samples)")
+        self._Y = plot_data_array(array, 2)
 
     @property
-    def Y2(self):
+    def offsets(self):
+        """
+        Writable attribute: per-channel offset added
+        to the Y values of each channel.
+
+        Useful to stack channels on top of each other
+        without modifying the data. Channels without
+        an entry use an offset of 0.
+        """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        return self._Y2
+        return self._offsets
 
-    @Y2.setter
-    def Y2(self, value):
+    @offsets.setter
+    def offsets(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        cdef cnp.ndarray array = np.asarray(value).reshape([-1])
-        # We don't support array of pointers. Must be data,
-        # with eventually a non-standard stride
-        # type must also be one of the supported types
-        if cnp.PyArray_CHKFLAGS(array, cnp.NPY_ARRAY_ELEMENTSTRIDES) and \
-           (cnp.PyArray_TYPE(array) == cnp.NPY_INT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_FLOAT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_DOUBLE):
-            self._Y2 = array
-        else:
-            self._Y2 = np.ascontiguousarray(array, dtype=np.float64)
-
-    cdef void check_arrays(self) noexcept nogil:
-        # X, Y1 and Y2 must be same type and same stride
-        if cnp.PyArray_TYPE(self._X) != cnp.PyArray_TYPE(self._Y1) or \
-           cnp.PyArray_TYPE(self._X) != cnp.PyArray_TYPE(self._Y2):
-            with gil:
-                self._X = np.ascontiguousarray(self._X, dtype=np.float64)
-                self._Y1 = np.ascontiguousarray(self._Y1, dtype=np.float64)
-                self._Y2 = np.ascontiguousarray(self._Y2, dtype=np.float64)
-        if cnp.PyArray_STRIDE(self._X, 0) != cnp.PyArray_STRIDE(self._Y1, 0) or \
-           cnp.PyArray_STRIDE(self._X, 0) != cnp.PyArray_STRIDE(self._Y2, 0):
-            with gil:
-                self._X = np.ascontiguousarray(self._X, dtype=np.float64)
-                self._Y1 = np.ascontiguousarray(self._Y1, dtype=np.float64)
-                self._Y2 = np.ascontiguousarray(self._Y2, dtype=np.float64)
-
-cdef class PlotShadedLine(plotElementXYY):
-    cdef void draw_element(self) noexcept nogil:
-        self.check_arrays()
-        cdef int size = min(min(self._X.shape[0], self._Y1.shape[0]), self._Y2.shape[0])
-        if size == 0:
+        if value is None:
+            self._offsets = np.zeros(shape=(0,), dtype=np.float64)
             return
+        self._offsets = np.ascontiguousarray(np.asarray(value).reshape([-1]),
+                                             dtype=np.float64)
 
-        if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
-            implot.PlotShaded[int](self._imgui_label.c_str(),
-                                   <const int*>cnp.PyArray_DATA(self._X),
-                                   <const int*>cnp.PyArray_DATA(self._Y1),
-                                   <const int*>cnp.PyArray_DATA(self._Y2),
-                                   size,
-                                   self._flags,
-                                   0,
-                                   cnp.PyArray_STRIDE(self._X, 0))
-        elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
-            implot.PlotShaded[float](self._imgui_label.c_str(),
-                                     <const float*>cnp.PyArray_DATA(self._X),
-                                     <const float*>cnp.PyArray_DATA(self._Y1),
-                                     <const float*>cnp.PyArray_DATA(self._Y2),
-                                     size,
-                                     self._flags,
-                                     0,
-                                     cnp.PyArray_STRIDE(self._X, 0))
-        else:
-            implot.PlotShaded[double](self._imgui_label.c_str(),
-                                      <const double*>cnp.PyArray_DATA(self._X),
-                                      <const double*>cnp.PyArray_DATA(self._Y1),
-                                      <const double*>cnp.PyArray_DATA(self._Y2),
-                                      size,
-                                      self._flags,
-                                      0,
-                                      cnp.PyArray_STRIDE(self._X, 0))
-
-cdef class PlotStems(plotElementXY):
     @property
-    def horizontal(self):
+    def colors(self):
         """
-        Stems will be rendered horizontally
+        Writable attribute: per-channel line colors.
+
+        Accepts a list of colors (in any format accepted
+        for colors), or an array of packed RGBA (little endian)
+        np.uint32 values, which is used without copy.
+        The returned value is the packed np.uint32 array.
+        A value of 0, or a missing entry, means the color
+        is chosen automatically by the plot.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        return (self._flags & implot.ImPlotStemsFlags_Horizontal) != 0
+        return self._colors
 
-    @horizontal.setter
-    def horizontal(self, bint value):
+    @colors.setter
+    def colors(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        self._flags &= ~implot.ImPlotStemsFlags_Horizontal
-        if value:
-            self._flags |= implot.ImPlotStemsFlags_Horizontal
-
-    cdef void draw_element(self) noexcept nogil:
-        self.check_arrays()
-        cdef int size = min(self._X.shape[0], self._Y.shape[0])
-        if size == 0:
+        if value is None:
+            self._colors = np.zeros(shape=(0,), dtype=np.uint32)
             return
-
-        if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
-            implot.PlotStems[int](self._imgui_label.c_str(),
-                                 <const int*>cnp.PyArray_DATA(self._X),
-                                 <const int*>cnp.PyArray_DATA(self._Y),
-                                 size,
-                                 0.,
-                                 self._flags,
-                                 0,
-                                 cnp.PyArray_STRIDE(self._X, 0))
-        elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
-            implot.PlotStems[float](self._imgui_label.c_str(),
-                                   <const float*>cnp.PyArray_DATA(self._X),
-                                   <const float*>cnp.PyArray_DATA(self._Y),
-                                   size,
-                                   0.,
-                                   self._flags,
-                                   0,
-                                   cnp.PyArray_STRIDE(self._X, 0))
-        else:
-            implot.PlotStems[double](self._imgui_label.c_str(),
-                                    <const double*>cnp.PyArray_DATA(self._X),
-                                    <const double*>cnp.PyArray_DATA(self._Y),
-                                    size,
-                                    0.,
-                                    self._flags,
-                                    0,
-                                    cnp.PyArray_STRIDE(self._X, 0))
-
-cdef class PlotBars(plotElementXY):
-    def __cinit__(self):
-        self._weight = 1.
+        if isinstance(value, np.ndarray) and value.ndim == 1 and \
+           np.issubdtype(value.dtype, np.integer):
+            self._colors = np.ascontiguousarray(value, dtype=np.uint32)
+            return
+        cdef int i
+        cdef cnp.ndarray[cnp.uint32_t, ndim=1] colors = \
+            np.zeros(shape=(len(value),), dtype=np.uint32)
+        for i in range(len(value)):
+            colors[i] = parse_color(value[i])
+        self._colors = colors
 
     @property
-    def weight(self):
+    def visible(self):
         """
-        bar_size. TODO better document
+        Writable attribute: per-channel visibility mask.
+
+        Channels with a False entry are not drawn.
+        Channels without an entry are visible.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        return self._weight
+        return self._visible.astype(np.bool_)
 
-    @weight.setter
-    def weight(self, double value):
+    @visible.setter
+    def visible(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        self._weight = value
+        if value is None:
+            self._visible = np.ones(shape=(0,), dtype=np.uint8)
+            return
+        self._visible = np.ascontiguousarray(np.asarray(value).reshape([-1]),
+                                             dtype=np.uint8)
 
     @property
-    def horizontal(self):
+    def labels(self):
         """
-        Bars will be rendered horizontally
+        Writable attribute: per-channel legend labels.
+
+        If None or empty (default), all channels are grouped
+        under the legend entry of this element.
+        Else each channel gets its own legend entry, which
+        can be hidden independently. Channels without a
+        label are named after their index.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        return (self._flags & implot.ImPlotBarsFlags_Horizontal) != 0
+        return [str(v, encoding='utf-8') for v in self._labels]
 
-    @horizontal.setter
-    def horizontal(self, bint value):
+    @labels.setter
+    def labels(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        self._flags &= ~implot.ImPlotBarsFlags_Horizontal
-        if value:
-            self._flags |= implot.ImPlotBarsFlags_Horizontal
-
-    cdef void draw_element(self) noexcept nogil:
-        self.check_arrays()
-        cdef int size = min(self._X.shape[0], self._Y.shape[0])
-        if size == 0:
+        self._labels.clear()
+        self._imgui_labels.clear()
+        if value is None:
             return
+        if not hasattr(value, '__len__'):
+            raise ValueError(f"Invalid type {type(value)} passed as labels. Expected array of strings")
+        for v in value:
+            self._labels.push_back(bytes(v, 'utf-8'))
 
-        if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
-            implot.PlotBars[int](self._imgui_label.c_str(),
-                                 <const int*>cnp.PyArray_DATA(self._X),
-                                 <const int*>cnp.PyArray_DATA(self._Y),
-                                 size,
-                                 self._weight,
-                                 self._flags,
-                                 0,
-                                 cnp.PyArray_STRIDE(self._X, 0))
-        elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
-            implot.PlotBars[float](self._imgui_label.c_str(),
-                                   <const float*>cnp.PyArray_DATA(self._X),
-                                   <const float*>cnp.PyArray_DATA(self._Y),
-                                   size,
-                                   self._weight,
-                                   self._flags,
-                                   0,
-                                   cnp.PyArray_STRIDE(self._X, 0))
-        else:
-            implot.PlotBars[double](self._imgui_label.c_str(),
-                                    <const double*>cnp.PyArray_DATA(self._X),
-                                    <const double*>cnp.PyArray_DATA(self._Y),
-                                    size,
-                                    self._weight,
-                                    self._flags,
-                                    0,
-                                    cnp.PyArray_STRIDE(self._X, 0))
+    @property
+    def segments(self):
+        """
+        Plot segments rather than full lines
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._flags & implot.ImPlotLineFlags_Segments) != 0
+
+    @segments.setter
+    def segments(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._flags &= ~implot.ImPlotLineFlags_Segments
+        if value:
+            self._flags |= implot.ImPlotLineFlags_Segments
+
+    @property
+    def skip_nan(self):
+        """
+        A NaN data point will be ignored instead of
+        being rendered as missing data.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._flags & implot.ImPlotLineFlags_SkipNaN) != 0
+
+    @skip_nan.setter
+    def skip_nan(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._flags &= ~implot.ImPlotLineFlags_SkipNaN
+        if value:
+            self._flags |= implot.ImPlotLineFlags_SkipNaN
+
+    @property
+    def no_clip(self):
+        """
+        Markers (if displayed) on the edge of a plot will not be clipped.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._flags & implot.ImPlotLineFlags_NoClip) != 0
+
+    @no_clip.setter
+    def no_clip(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._flags &= ~implot.ImPlotLineFlags_NoClip
+        if value:
+            self._flags |= implot.ImPlotLineFlags_NoClip
+
+    cdef void draw_element(self) noexcept nogil:
+        cdef int num_channels = self._Y.shape[0]
+        cdef int size = self._Y.shape[1]
+        cdef int x_type = -1
+        if self._X is not None:
+            size = min(size, <int>self._X.shape[0])
+            x_type = array_type_code(self._X)
+        if size == 0 or num_channels == 0:
+            return
+
+        cdef int y_type = array_type_code(self._Y)
+        cdef DCGPlotData channel
+        channel.x = NULL
+        channel.x_stride = 0
+        if self._X is not None:
+            channel.x = <const char*>cnp.PyArray_DATA(self._X)
+            channel.x_stride = cnp.PyArray_STRIDE(self._X, 0)
+        channel.y_stride = cnp.PyArray_STRIDE(self._Y, 1)
+        cdef const char* y_data = <const char*>cnp.PyArray_DATA(self._Y)
+        cdef Py_ssize_t channel_stride = cnp.PyArray_STRIDE(self._Y, 0)
+
+        cdef const double* offsets = <const double*>cnp.PyArray_DATA(self._offsets)
+        cdef int num_offsets = self._offsets.shape[0]
+        cdef const imgui.ImU32* colors = <const imgui.ImU32*>cnp.PyArray_DATA(self._colors)
+        cdef int num_colors = self._colors.shape[0]
+        cdef const unsigned char* visible = <const unsigned char*>cnp.PyArray_DATA(self._visible)
+        cdef int num_visible = self._visible.shape[0]
+
+        cdef bint grouped = self._labels.empty()
+        cdef int k
+        if not(grouped) and <int>self._imgui_labels.size() != num_channels:
+            # Regenerated only when labels or the number of channels change
+            with gil:
+                self._imgui_labels.clear()
+                for k in range(num_channels):
+                    if k < <int>self._labels.size():
+                        self._imgui_labels.push_back(self._labels[k] + \
+                            <string>(b'###%ld_%d' % (self.uuid, k)))
+                    else:
+                        self._imgui_labels.push_back(b'%d###%ld_%d' % (k, self.uuid, k))
+
+        cdef const char* label
+        for k in range(num_channels):
+            if k < num_visible and not(visible[k]):
+                continue
+            channel.y = y_data + k * channel_stride
+            channel.y_offset = offsets[k] if k < num_offsets else 0.
+            if k < num_colors and colors[k] != 0:
+                implot.SetNextLineStyle(imgui.ColorConvertU32ToFloat4(colors[k]))
+            if grouped:
+                label = self._imgui_label.c_str()
+            else:
+                label = self._imgui_labels[k].c_str()
+            DCGPlotLine(label,
+                        channel,
+                        x_type,
+                        y_type,
+                        size,
+                        self._flags)
+
+cdef class plotElementXYY(plotElementWithLegend):
+    def __cinit__(self):
+        self._X = np.zeros(shape=(1,), dtype=np.float64)
+        self._Y1 = np.zeros(shape=(1,), dtype=np.float64)
+        self._Y2 = np.zeros(shape=(1,), dtype=np.float64)
+
+    @property
+    def X(self):
+        """Values on the X axis.
+
+        By default, will try to use the passed array
+        directly for its internal backing (no copy).
+        Supported types for no copy are the signed and
+        unsigned 8, 16, 32 and 64 bits integers,
+        np.float32 and np.float64. The types of X, Y1
+        and Y2 do not need to match.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._X
+
+    @X.setter
+    def X(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._X = plot_data_array(value)
+
+    @property
+    def Y1(self):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._Y1
+
+    @Y1.setter
+    def Y1(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._Y1 = plot_data_array(value)
+
+    @property
+    def Y2(self):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._Y2
+
+    @Y2.setter
+    def Y2(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._Y2 = plot_data_array(value)
+
+cdef class PlotShadedLine(plotElementXYY):
+    cdef void draw_element(self) noexcept nogil:
+        cdef int size = min(min(self._X.shape[0], self._Y1.shape[0]), self._Y2.shape[0])
+        if size == 0:
+            return
+
+        cdef DCGPlotData data1, data2
+        fill_plot_data(data1, self._X, self._Y1)
+        fill_plot_data(data2, self._X, self._Y2)
+        DCGPlotShaded(self._imgui_label.c_str(),
+                      data1,
+                      data2,
+                      array_type_code(self._X),
+                      array_type_code(self._Y1),
+                      array_type_code(self._Y2),
+                      size,
+                      self._flags)
+
+cdef class PlotStems(plotElementXY):
+    @property
+    def horizontal(self):
+        """
+        Stems will be rendered horizontally
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._flags & implot.ImPlotStemsFlags_Horizontal) != 0
+
+    @horizontal.setter
+    def horizontal(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._flags &= ~implot.ImPlotStemsFlags_Horizontal
+        if value:
+            self._flags |= implot.ImPlotStemsFlags_Horizontal
+
+    cdef void draw_element(self) noexcept nogil:
+        self.update_source()
+        cdef int size = min(self._X.shape[0], self._Y.shape[0])
+        if size == 0:
+            return
+
+        cdef DCGPlotData data
+        fill_plot_data(data, self._X, self._Y)
+        DCGPlotStems(self._imgui_label.c_str(),
+                     data,
+                     array_type_code(self._X),
+                     array_type_code(self._Y),
+                     size,
+                     self._flags)
+
+cdef class PlotBars(plotElementXY):
+    def __cinit__(self):
+        self._weight = 1.
+
+    @property
+    def weight(self):
+        """
+        bar_size. TODO better document
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._weight
+
+    @weight.setter
+    def weight(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._weight = value
+
+    @property
+    def horizontal(self):
+        """
+        Bars will be rendered horizontally
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._flags & implot.ImPlotBarsFlags_Horizontal) != 0
+
+    @horizontal.setter
+    def horizontal(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._flags &= ~implot.ImPlotBarsFlags_Horizontal
+        if value:
+            self._flags |= implot.ImPlotBarsFlags_Horizontal
+
+    cdef void draw_element(self) noexcept nogil:
+        self.update_source()
+        cdef int size = min(self._X.shape[0], self._Y.shape[0])
+        if size == 0:
+            return
+
+        cdef DCGPlotData data
+        fill_plot_data(data, self._X, self._Y)
+        DCGPlotBars(self._imgui_label.c_str(),
+                    data,
+                    array_type_code(self._X),
+                    array_type_code(self._Y),
+                    size,
+                    self._weight,
+                    self._flags)
 
 cdef class PlotStairs(plotElementXY):
     @property
@@ -2439,35 +3456,19 @@ cdef class PlotStairs(plotElementXY):
             self._flags |= implot.ImPlotStairsFlags_Shaded
 
     cdef void draw_element(self) noexcept nogil:
-        self.check_arrays()
+        self.update_source()
         cdef int size = min(self._X.shape[0], self._Y.shape[0])
         if size == 0:
             return
 
-        if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
-            implot.PlotStairs[int](self._imgui_label.c_str(),
-                                 <const int*>cnp.PyArray_DATA(self._X),
-                                 <const int*>cnp.PyArray_DATA(self._Y),
-                                 size,
-                                 self._flags,
-                                 0,
-                                 cnp.PyArray_STRIDE(self._X, 0))
-        elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
-            implot.PlotStairs[float](self._imgui_label.c_str(),
-                                   <const float*>cnp.PyArray_DATA(self._X),
-                                   <const float*>cnp.PyArray_DATA(self._Y),
-                                   size,
-                                   self._flags,
-                                   0,
-                                   cnp.PyArray_STRIDE(self._X, 0))
-        else:
-            implot.PlotStairs[double](self._imgui_label.c_str(),
-                                    <const double*>cnp.PyArray_DATA(self._X),
-                                    <const double*>cnp.PyArray_DATA(self._Y),
-                                    size,
-                                    self._flags,
-                                    0,
-                                    cnp.PyArray_STRIDE(self._X, 0))
+        cdef DCGPlotData data
+        fill_plot_data(data, self._X, self._Y)
+        DCGPlotStairs(self._imgui_label.c_str(),
+                      data,
+                      array_type_code(self._X),
+                      array_type_code(self._Y),
+                      size,
+                      self._flags)
 
 cdef class plotElementX(plotElementWithLegend):
     def __cinit__(self):
@@ -2479,8 +3480,9 @@ cdef class plotElementX(plotElementWithLegend):
 
         By default, will try to use the passed array
         directly for its internal backing (no copy).
-        Supported types for no copy are np.int32,
-        np.float32, np.float64.
+        Supported types for no copy are the signed and
+        unsigned 8, 16, 32 and 64 bits integers,
+        np.float32 and np.float64.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
@@ -2490,17 +3492,7 @@ cdef class plotElementX(plotElementWithLegend):
     def X(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        cdef cnp.ndarray array = np.asarray(value).reshape([-1])
-        # We don't support array of pointers. Must be data,
-        # with eventually a non-standard stride
-        # type must also be one of the supported types
-        if cnp.PyArray_CHKFLAGS(array, cnp.NPY_ARRAY_ELEMENTSTRIDES) and \
-           (cnp.PyArray_TYPE(array) == cnp.NPY_INT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_FLOAT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_DOUBLE):
-            self._X = array
-        else:
-            self._X = np.ascontiguousarray(array, dtype=np.float64)
+        self._X = plot_data_array(value)
 
     cdef void check_arrays(self) noexcept nogil:
         return
@@ -2529,32 +3521,16 @@ cdef class PlotInfLines(plotElementX):
             self._flags |= implot.ImPlotInfLinesFlags_Horizontal
 
     cdef void draw_element(self) noexcept nogil:
-        self.check_arrays()
         cdef int size = self._X.shape[0]
         if size == 0:
             return
 
-        if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
-            implot.PlotInfLines[int](self._imgui_label.c_str(),
-                                 <const int*>cnp.PyArray_DATA(self._X),
-                                 size,
-                                 self._flags,
-                                 0,
-                                 cnp.PyArray_STRIDE(self._X, 0))
-        elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
-            implot.PlotInfLines[float](self._imgui_label.c_str(),
-                                   <const float*>cnp.PyArray_DATA(self._X),
-                                   size,
-                                   self._flags,
-                                   0,
-                                   cnp.PyArray_STRIDE(self._X, 0))
-        else:
-            implot.PlotInfLines[double](self._imgui_label.c_str(),
-                                    <const double*>cnp.PyArray_DATA(self._X),
-                                    size,
-                                    self._flags,
-                                    0,
-                                    cnp.PyArray_STRIDE(self._X, 0))
+        DCGPlotInfLines(self._imgui_label.c_str(),
+                        <const char*>cnp.PyArray_DATA(self._X),
+                        array_type_code(self._X),
+                        size,
+                        self._flags,
+                        cnp.PyArray_STRIDE(self._X, 0))
 
 cdef class PlotScatter(plotElementXY):
     @property
@@ -2575,35 +3551,19 @@ cdef class PlotScatter(plotElementXY):
             self._flags |= implot.ImPlotScatterFlags_NoClip
 
     cdef void draw_element(self) noexcept nogil:
-        self.check_arrays()
+        self.update_source()
         cdef int size = min(self._X.shape[0], self._Y.shape[0])
         if size == 0:
             return
 
-        if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
-            implot.PlotScatter[int](self._imgui_label.c_str(),
-                                 <const int*>cnp.PyArray_DATA(self._X),
-                                 <const int*>cnp.PyArray_DATA(self._Y),
-                                 size,
-                                 self._flags,
-                                 0,
-                                 cnp.PyArray_STRIDE(self._X, 0))
-        elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
-            implot.PlotScatter[float](self._imgui_label.c_str(),
-                                   <const float*>cnp.PyArray_DATA(self._X),
-                                   <const float*>cnp.PyArray_DATA(self._Y),
-                                   size,
-                                   self._flags,
-                                   0,
-                                   cnp.PyArray_STRIDE(self._X, 0))
-        else:
-            implot.PlotScatter[double](self._imgui_label.c_str(),
-                                    <const double*>cnp.PyArray_DATA(self._X),
-                                    <const double*>cnp.PyArray_DATA(self._Y),
-                                    size,
-                                    self._flags,
-                                    0,
-                                    cnp.PyArray_STRIDE(self._X, 0))
+        cdef DCGPlotData data
+        fill_plot_data(data, self._X, self._Y)
+        DCGPlotScatter(self._imgui_label.c_str(),
+                       data,
+                       array_type_code(self._X),
+                       array_type_code(self._Y),
+                       size,
+                       self._flags)
 
 '''
 cdef class plotDraggable(plotElement):
@@ -2804,6 +3764,8 @@ cdef class DrawInPlot(plotElementWithLegend):
         self._legend = False
         self._ignore_fit = False
 
+    cached = _cached_property
+
     @property
     def ignore_fit(self):
         """
@@ -2866,7 +3828,10 @@ cdef class DrawInPlot(plotElementWithLegend):
         self.context.viewport.parent_pos = ImVec2Vec2(implot.GetPlotPos())
 
         if render:
-            draw_drawing_children(self, implot.GetPlotDrawList())
+            if self._draw_cache != NULL:
+                draw_drawing_children_cached(self, implot.GetPlotDrawList())
+            else:
+                draw_drawing_children(self, implot.GetPlotDrawList())
 
             if self._legend:
                 implot.EndItem()
@@ -3244,8 +4209,9 @@ cdef class PlotBarGroups(plotElementWithLegend):
 
         By default, will try to use the passed array
         directly for its internal backing (no copy).
-        Supported types for no copy are np.int32,
-        np.float32, np.float64.
+        Supported types for no copy are the signed and
+        unsigned 8, 16, 32 and 64 bits integers,
+        np.float32 and np.float64.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
@@ -3258,16 +4224,8 @@ cdef class PlotBarGroups(plotElementWithLegend):
         cdef cnp.ndarray array = np.asarray(value)
         if array.ndim != 2:
             raise ValueError("values must be a 2D array")
-        # We don't support array of pointers. Must be data,
-        # with eventually a non-standard stride
-        # type must also be one of the supported types
-        if cnp.PyArray_CHKFLAGS(array, cnp.NPY_ARRAY_ELEMENTSTRIDES) and \
-           (cnp.PyArray_TYPE(array) == cnp.NPY_INT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_FLOAT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_DOUBLE):
-            self._values = array
-        else:
-            self._values = np.ascontiguousarray(array, dtype=np.float64)
+        # PlotBarGroups requires C contiguous data
+        self._values = plot_data_array(array, 2, True)
         cdef int k
         for k in range(<int>self._labels.size(), self._values.shape[0]):
             self._labels.push_back(string(b"Item %d" % k))
@@ -3376,30 +4334,14 @@ cdef class PlotBarGroups(plotElementWithLegend):
         for i in range(self._values.shape[0]):
             labels_cstr.push_back(self._labels[i].c_str())
 
-        if cnp.PyArray_TYPE(self._values) == cnp.NPY_INT:
-            implot.PlotBarGroups[int](labels_cstr.data(),
-                                      <const int*>cnp.PyArray_DATA(self._values),
-                                      <int>self._values.shape[0],
-                                      <int>self._values.shape[1],
-                                      self._group_size,
-                                      self._shift,
-                                      self._flags)
-        elif cnp.PyArray_TYPE(self._values) == cnp.NPY_FLOAT:
-            implot.PlotBarGroups[float](labels_cstr.data(),
-                                      <const float*>cnp.PyArray_DATA(self._values),
-                                      <int>self._values.shape[0],
-                                      <int>self._values.shape[1],
-                                      self._group_size,
-                                      self._shift,
-                                      self._flags)
-        else:
-            implot.PlotBarGroups[double](labels_cstr.data(),
-                                       <const double*>cnp.PyArray_DATA(self._values),
-                                       <int>self._values.shape[0],
-                                       <int>self._values.shape[1],
-                                       self._group_size,
-                                       self._shift,
-                                       self._flags)
+        DCGPlotBarGroups(labels_cstr.data(),
+                         <const char*>cnp.PyArray_DATA(self._values),
+                         array_type_code(self._values),
+                         <int>self._values.shape[0],
+                         <int>self._values.shape[1],
+                         self._group_size,
+                         self._shift,
+                         self._flags)
 
 cdef class PlotPieChart(plotElementWithLegend):
     """
@@ -3421,8 +4363,9 @@ cdef class PlotPieChart(plotElementWithLegend):
         Array of values for each pie slice.
 
         By default, will try to use the passed array directly for its 
-        internal backing (no copy). Supported types for no copy are 
-        np.int32, np.float32, np.float64.
+        internal backing (no copy). Supported types for no copy are
+        the signed and unsigned 8, 16, 32 and 64 bits integers,
+        np.float32 and np.float64.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
@@ -3432,14 +4375,8 @@ cdef class PlotPieChart(plotElementWithLegend):
     def values(self, value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        cdef cnp.ndarray array = np.asarray(value).reshape([-1])
-        if cnp.PyArray_CHKFLAGS(array, cnp.NPY_ARRAY_ELEMENTSTRIDES) and \
-           (cnp.PyArray_TYPE(array) == cnp.NPY_INT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_FLOAT or \
-            cnp.PyArray_TYPE(array) == cnp.NPY_DOUBLE):
-            self._values = array
-        else:
-            self._values = np.ascontiguousarray(array, dtype=np.float64)
+        # PlotPieChart requires contiguous data
+        self._values = plot_data_array(value, 1, True)
         cdef int k
         for k in range(<int>self._labels.size(), self._values.shape[0]):
             self._labels.push_back(string(b"Slice %d" % k))
@@ -3568,75 +4505,1355 @@ cdef class PlotPieChart(plotElementWithLegend):
         for i in range(self._values.shape[0]):
             labels_cstr.push_back(self._labels[i].c_str())
 
-        if cnp.PyArray_TYPE(self._values) == cnp.NPY_INT:
-            implot.PlotPieChart[int](labels_cstr.data(),
-                                    <const int*>cnp.PyArray_DATA(self._values),
-                                    <int>self._values.shape[0],
-                                    self._x,
-                                    self._y,
-                                    self._radius,
-                                    "%.1f",
-                                    self._angle,
-                                    self._flags)
-        elif cnp.PyArray_TYPE(self._values) == cnp.NPY_FLOAT:
-            implot.PlotPieChart[float](labels_cstr.data(),
-                                      <const float*>cnp.PyArray_DATA(self._values),
-                                      <int>self._values.shape[0],
-                                      self._x,
-                                      self._y,
-                                      self._radius,
-                                      "%.1f",
-                                      self._angle,
-                                      self._flags)
-        else:
-            implot.PlotPieChart[double](labels_cstr.data(),
-                                       <const double*>cnp.PyArray_DATA(self._values),
-                                       <int>self._values.shape[0],
-                                       self._x,
-                                       self._y,
-                                       self._radius,
-                                       "%.1f",
-                                       self._angle,
-                                       self._flags)
-
-cdef class PlotDigital(plotElementXY):
+        DCGPlotPieChart(labels_cstr.data(),
+                        <const char*>cnp.PyArray_DATA(self._values),
+                        array_type_code(self._values),
+                        <int>self._values.shape[0],
+                        self._x,
+                        self._y,
+                        self._radius,
+                        "%.1f",
+                        self._angle,
+                        self._flags)
+
+cdef class PlotHistogram(plotElementWithLegend):
     """
-    Plots a digital signal as a step function from X,Y data.
-    Digital plots are always referenced to the bottom of the plot,
-    do not respond to y axis zooming.
+    Plots the histogram of the passed samples.
+
+    The samples are binned natively (without the gil, and
+    with several threads for large inputs), and the bin counts
+    are cached until the samples or the bin specification
+    change. Samples can be added with append(), in which case
+    only the new samples are binned when possible.
     """
+    def __cinit__(self):
+        self._X = np.zeros(shape=(0,), dtype=np.float64)
+        self._bins = implot.ImPlotBin_Sturges
+        self._bar_scale = 1.
+        self._min_range = 0.
+        self._max_range = 0.
+        self._dirty = True
+        self._num_samples = 0
+        self._bin_min = 0.
+        self._bin_max = 1.
 
-    cdef void draw_element(self) noexcept nogil:
-        self.check_arrays()
-        cdef int size = min(self._X.shape[0], self._Y.shape[0])
-        if size == 0:
+    @property
+    def X(self):
+        """
+        Writable attribute: samples of the histogram.
+
+        By default, will try to use the passed array
+        directly for its internal backing (no copy).
+        Supported types for no copy are the signed and
+        unsigned 8, 16, 32 and 64 bits integers,
+        np.float32 and np.float64.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._X
+
+    @X.setter
+    def X(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._X = plot_data_array(value)
+        self._storage = None
+        self._dirty = True
+
+    def append(self, values):
+        """
+        Append samples to the histogram.
+
+        If the number of bins is fixed (bins > 0), and the
+        new samples fit inside the current range, only the
+        new samples are binned. Else the histogram is
+        recomputed on next rendering.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef cnp.ndarray array = np.asarray(values).reshape([-1])
+        cdef Py_ssize_t n = self._X.shape[0]
+        cdef Py_ssize_t count = array.shape[0]
+        if count == 0:
             return
+        if not(np.can_cast(array.dtype, self._X.dtype, 'safe')):
+            self._X = np.ascontiguousarray(self._X, dtype=np.float64)
+            self._storage = None
+        array = np.ascontiguousarray(array, dtype=self._X.dtype)
+        self._storage = append_samples(self._storage, self._X, array)
+        self._X = self._storage[:n+count]
+        if self._dirty or self._bins <= 0:
+            self._dirty = True
+            return
+        cdef double[4] stats
+        cdef const char* data = <const char*>cnp.PyArray_DATA(array)
+        cdef int data_type = array_type_code(array)
+        with nogil:
+            if self._min_range == 0. and self._max_range == 0.:
+                DCGHistogramStats(data, data_type,
+                                  cnp.PyArray_STRIDE(array, 0),
+                                  count, stats)
+                # The automated range must be extended. An artificial
+                # range (single value or no valid sample) is
+                # recomputed from all the samples.
+                self._dirty = self._range_degenerate or \
+                              stats[0] < self._bin_min or stats[1] > self._bin_max
+            if not(self._dirty):
+                DCGHistogramBin(data, data_type,
+                                cnp.PyArray_STRIDE(array, 0),
+                                NULL, 0, 0,
+                                count,
+                                self._bin_min, self._bin_max,
+                                <int>self._counts.size(),
+                                0., 1., 1,
+                                self._counts.data())
+                self._num_samples += count
+                self.compute_heights()
 
-        if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
-            implot.PlotDigital[int](self._imgui_label.c_str(),
-                                   <const int*>cnp.PyArray_DATA(self._X),
-                                   <const int*>cnp.PyArray_DATA(self._Y),
-                                   size,
-                                   self._flags,
-                                   0,
-                                   cnp.PyArray_STRIDE(self._X, 0))
-        elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
-            implot.PlotDigital[float](self._imgui_label.c_str(),
-                                     <const float*>cnp.PyArray_DATA(self._X),
-                                     <const float*>cnp.PyArray_DATA(self._Y),
-                                     size,
-                                     self._flags,
-                                     0,
-                                     cnp.PyArray_STRIDE(self._X, 0))
-        else:
-            implot.PlotDigital[double](self._imgui_label.c_str(),
-                                      <const double*>cnp.PyArray_DATA(self._X),
-                                      <const double*>cnp.PyArray_DATA(self._Y),
-                                      size,
-                                      self._flags,
-                                      0,
-                                      cnp.PyArray_STRIDE(self._X, 0))
+    @property
+    def bins(self):
+        """
+        Writable attribute: number of bins.
+
+        If negative, the number of bins is computed from
+        the samples with one of the following methods:
+        -1: square root of the number of samples
+        -2: Sturges formula (default)
+        -3: Rice rule
+        -4: Scott's normal reference rule
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._bins
+
+    @bins.setter
+    def bins(self, int value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value == 0 or value < implot.ImPlotBin_Scott:
+            raise ValueError("Invalid number of bins")
+        if value != self._bins:
+            self._dirty = True
+        self._bins = value
+
+    @property
+    def bar_scale(self):
+        """
+        Writable attribute: width of the bars relative
+        to the width of the bins. Default is 1.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._bar_scale
+
+    @bar_scale.setter
+    def bar_scale(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._bar_scale = value
+
+    @property
+    def min_range(self):
+        """
+        Writable attribute: lower bound of the binned range.
+        Samples under it are not counted.
+
+        If min_range and max_range are both 0 (default),
+        the range is the minimum and maximum of the samples.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._min_range
+
+    @min_range.setter
+    def min_range(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value != self._min_range:
+            self._dirty = True
+        self._min_range = value
+
+    @property
+    def max_range(self):
+        """
+        Writable attribute: upper bound of the binned range.
+        Samples above it are not counted.
+
+        If min_range and max_range are both 0 (default),
+        the range is the minimum and maximum of the samples.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._max_range
+
+    @max_range.setter
+    def max_range(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value != self._max_range:
+            self._dirty = True
+        self._max_range = value
+
+    @property
+    def horizontal(self):
+        """
+        Histogram bars will be rendered horizontally
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._flags & implot.ImPlotHistogramFlags_Horizontal) != 0
+
+    @horizontal.setter
+    def horizontal(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._flags &= ~implot.ImPlotHistogramFlags_Horizontal
+        if value:
+            self._flags |= implot.ImPlotHistogramFlags_Horizontal
+
+    @property
+    def cumulative(self):
+        """
+        Each bin will contain its count plus the
+        counts of all previous bins
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._flags & implot.ImPlotHistogramFlags_Cumulative) != 0
+
+    @cumulative.setter
+    def cumulative(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._flags &= ~implot.ImPlotHistogramFlags_Cumulative
+        if value:
+            self._flags |= implot.ImPlotHistogramFlags_Cumulative
+        self.compute_heights()
+
+    @property
+    def density(self):
+        """
+        Counts will be normalized, i.e. the PDF will
+        be visualized, or the CDF will be visualized
+        if cumulative is also set
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._flags & implot.ImPlotHistogramFlags_Density) != 0
+
+    @density.setter
+    def density(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._flags &= ~implot.ImPlotHistogramFlags_Density
+        if value:
+            self._flags |= implot.ImPlotHistogramFlags_Density
+        self.compute_heights()
+
+    @property
+    def no_outliers(self):
+        """
+        Exclude values outside the range from the
+        count used for normalizing and cumulative counts
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._flags & implot.ImPlotHistogramFlags_NoOutliers) != 0
+
+    @no_outliers.setter
+    def no_outliers(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._flags &= ~implot.ImPlotHistogramFlags_NoOutliers
+        if value:
+            self._flags |= implot.ImPlotHistogramFlags_NoOutliers
+        self.compute_heights()
+
+    @property
+    def bin_counts(self):
+        """
+        Readonly attribute: number of samples in each bin
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if self._dirty:
+            self.compute_bins()
+        return histogram_counts_to_array(self._counts)
+
+    @property
+    def bin_edges(self):
+        """
+        Readonly attribute: edges of the bins.
+        The length is the number of bins plus one.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if self._dirty:
+            self.compute_bins()
+        return np.linspace(self._bin_min, self._bin_max, self._counts.size() + 1)
+
+    cdef void compute_bins(self) noexcept nogil:
+        cdef Py_ssize_t count = self._X.shape[0]
+        cdef const char* data = <const char*>cnp.PyArray_DATA(self._X)
+        cdef int data_type = array_type_code(self._X)
+        cdef double[4] stats
+        stats[0] = 0.
+        stats[1] = 1.
+        stats[3] = 0.
+        cdef bint auto_range = self._min_range == 0. and self._max_range == 0.
+        if auto_range or self._bins == implot.ImPlotBin_Scott:
+            DCGHistogramStats(data, data_type,
+                              cnp.PyArray_STRIDE(self._X, 0),
+                              count, stats)
+        if auto_range:
+            self._bin_min = stats[0]
+            self._bin_max = stats[1]
+        else:
+            self._bin_min = self._min_range
+            self._bin_max = self._max_range
+        self._range_degenerate = False
+        if not(self._bin_min <= self._bin_max): # No valid sample
+            self._bin_min = 0.
+            self._bin_max = 1.
+            self._range_degenerate = auto_range
+        elif self._bin_min == self._bin_max:
+            self._bin_min -= 0.5
+            self._bin_max += 0.5
+            self._range_degenerate = auto_range
+        cdef int num_bins = histogram_bin_count(self._bins, count,
+                                                self._bin_max - self._bin_min,
+                                                stats[3])
+        self._counts.assign(num_bins, 0)
+        DCGHistogramBin(data, data_type,
+                        cnp.PyArray_STRIDE(self._X, 0),
+                        NULL, 0, 0,
+                        count,
+                        self._bin_min, self._bin_max, num_bins,
+                        0., 1., 1,
+                        self._counts.data())
+        self._num_samples = count
+        self._dirty = False
+        self.compute_heights()
+
+    cdef void compute_heights(self) noexcept nogil:
+        if self._dirty:
+            return
+        cdef int num_bins = <int>self._counts.size()
+        cdef double width = (self._bin_max - self._bin_min) / <double>max(1, num_bins)
+        cdef double total = 0.
+        cdef int i
+        for i in range(num_bins):
+            total += <double>self._counts[i]
+        if (self._flags & implot.ImPlotHistogramFlags_NoOutliers) == 0:
+            total = self._num_samples
+        self._centers.resize(num_bins)
+        self._heights.resize(num_bins)
+        cdef double accumulated = 0.
+        for i in range(num_bins):
+            self._centers[i] = self._bin_min + width * (<double>i + 0.5)
+            accumulated = <double>self._counts[i]
+            if (self._flags & implot.ImPlotHistogramFlags_Cumulative) != 0 and i > 0:
+                accumulated += self._heights[i-1]
+            self._heights[i] = accumulated
+        if (self._flags & implot.ImPlotHistogramFlags_Density) == 0 or total == 0.:
+            return
+        # normalize
+        if (self._flags & implot.ImPlotHistogramFlags_Cumulative) == 0:
+            total *= width
+        for i in range(num_bins):
+            self._heights[i] /= total
+
+    cdef void draw_element(self) noexcept nogil:
+        if self._dirty:
+            self.compute_bins()
+        cdef int num_bins = <int>self._heights.size()
+        if num_bins == 0 or self._num_samples == 0:
+            return
+        cdef double bar_size = (self._bin_max - self._bin_min) / <double>num_bins * self._bar_scale
+        # Keep only the item flags and the horizontal flag,
+        # which is shared with ImPlotBarsFlags_Horizontal
+        cdef int flags = self._flags & ~(implot.ImPlotHistogramFlags_Cumulative | \
+                                         implot.ImPlotHistogramFlags_Density | \
+                                         implot.ImPlotHistogramFlags_NoOutliers)
+        if (self._flags & implot.ImPlotHistogramFlags_Horizontal) != 0:
+            implot.PlotBars[double](self._imgui_label.c_str(),
+                                    self._heights.data(),
+                                    self._centers.data(),
+                                    num_bins,
+                                    bar_size,
+                                    flags,
+                                    0,
+                                    sizeof(double))
+        else:
+            implot.PlotBars[double](self._imgui_label.c_str(),
+                                    self._centers.data(),
+                                    self._heights.data(),
+                                    num_bins,
+                                    bar_size,
+                                    flags,
+                                    0,
+                                    sizeof(double))
+
+
+cdef class PlotHistogram2D(plotElementWithLegend):
+    """
+    Plots the 2D histogram of the passed (X, Y) samples
+    as a heatmap.
+
+    The samples are binned natively (without the gil, and
+    with several threads for large inputs), and the bin counts
+    are cached until the samples or the bin specification
+    change. Samples can be added with append(), in which case
+    only the new samples are binned when possible.
+    """
+    def __cinit__(self):
+        self._X = np.zeros(shape=(0,), dtype=np.float64)
+        self._Y = np.zeros(shape=(0,), dtype=np.float64)
+        self._x_bins_spec = 10
+        self._y_bins_spec = 10
+        self._x_bins = 1
+        self._y_bins = 1
+        self._range = [0., 0., 0., 0.]
+        self._bin_range = [0., 1., 0., 1.]
+        self._dirty = True
+        self._num_samples = 0
+        self._max_height = 0.
+
+    @property
+    def X(self):
+        """
+        Writable attribute: X coordinates of the samples.
+
+        By default, will try to use the passed array
+        directly for its internal backing (no copy).
+        Supported types for no copy are the signed and
+        unsigned 8, 16, 32 and 64 bits integers,
+        np.float32 and np.float64. The type of X does not
+        need to match the type of Y.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._X
+
+    @X.setter
+    def X(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._X = plot_data_array(value)
+        self._X_storage = None
+        self._dirty = True
+
+    @property
+    def Y(self):
+        """
+        Writable attribute: Y coordinates of the samples.
+
+        By default, will try to use the passed array
+        directly for its internal backing (no copy).
+        Supported types for no copy are the signed and
+        unsigned 8, 16, 32 and 64 bits integers,
+        np.float32 and np.float64.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._Y
+
+    @Y.setter
+    def Y(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._Y = plot_data_array(value)
+        self._Y_storage = None
+        self._dirty = True
+
+    def append(self, x, y):
+        """
+        Append samples to the histogram.
+
+        If the new samples fit inside the current range,
+        only the new samples are binned. Else the histogram
+        is recomputed on next rendering.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef cnp.ndarray array_x = np.asarray(x).reshape([-1])
+        cdef cnp.ndarray array_y = np.asarray(y).reshape([-1])
+        if array_x.shape[0] != array_y.shape[0]:
+            raise ValueError("x and y must have the same length")
+        cdef Py_ssize_t count = array_x.shape[0]
+        if count == 0:
+            return
+        # Samples already binned
+        cdef Py_ssize_t n = min(self._X.shape[0], self._Y.shape[0])
+        self._X = self._X[:n]
+        self._Y = self._Y[:n]
+        if not(np.can_cast(array_x.dtype, self._X.dtype, 'safe')):
+            self._X = np.ascontiguousarray(self._X, dtype=np.float64)
+            self._X_storage = None
+        if not(np.can_cast(array_y.dtype, self._Y.dtype, 'safe')):
+            self._Y = np.ascontiguousarray(self._Y, dtype=np.float64)
+            self._Y_storage = None
+        array_x = np.ascontiguousarray(array_x, dtype=self._X.dtype)
+        array_y = np.ascontiguousarray(array_y, dtype=self._Y.dtype)
+        self._X_storage = append_samples(self._X_storage, self._X, array_x)
+        self._Y_storage = append_samples(self._Y_storage, self._Y, array_y)
+        self._X = self._X_storage[:n+count]
+        self._Y = self._Y_storage[:n+count]
+        if self._dirty or self._x_bins_spec <= 0 or self._y_bins_spec <= 0:
+            self._dirty = True
+            return
+        cdef double[4] stats_x
+        cdef double[4] stats_y
+        cdef const char* data_x = <const char*>cnp.PyArray_DATA(array_x)
+        cdef const char* data_y = <const char*>cnp.PyArray_DATA(array_y)
+        cdef int type_x = array_type_code(array_x)
+        cdef int type_y = array_type_code(array_y)
+        with nogil:
+            if self._range[0] == 0. and self._range[1] == 0. and \
+               self._range[2] == 0. and self._range[3] == 0.:
+                DCGHistogramStats(data_x, type_x,
+                                  cnp.PyArray_STRIDE(array_x, 0),
+                                  count, stats_x)
+                DCGHistogramStats(data_y, type_y,
+                                  cnp.PyArray_STRIDE(array_y, 0),
+                                  count, stats_y)
+                # The automated range must be extended. An artificial
+                # range (single value or no valid sample) is
+                # recomputed from all the samples.
+                self._dirty = self._range_degenerate or \
+                              stats_x[0] < self._bin_range[0] or \
+                              stats_x[1] > self._bin_range[1] or \
+                              stats_y[0] < self._bin_range[2] or \
+                              stats_y[1] > self._bin_range[3]
+            if not(self._dirty):
+                DCGHistogramBin(data_x, type_x,
+                                cnp.PyArray_STRIDE(array_x, 0),
+                                data_y, type_y,
+                                cnp.PyArray_STRIDE(array_y, 0),
+                                count,
+                                self._bin_range[0], self._bin_range[1],
+                                self._x_bins,
+                                self._bin_range[2], self._bin_range[3],
+                                self._y_bins,
+                                self._counts.data())
+                self._num_samples += count
+                self.compute_heights()
+
+    @property
+    def x_bins(self):
+        """
+        Writable attribute: number of bins along X.
+        Default is 10.
+
+        If negative, the number of bins is computed from
+        the samples, using the same methods as
+        PlotHistogram.bins.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._x_bins_spec
+
+    @x_bins.setter
+    def x_bins(self, int value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value == 0 or value < implot.ImPlotBin_Scott:
+            raise ValueError("Invalid number of bins")
+        if value != self._x_bins_spec:
+            self._dirty = True
+        self._x_bins_spec = value
+
+    @property
+    def y_bins(self):
+        """
+        Writable attribute: number of bins along Y.
+        Default is 10.
+
+        If negative, the number of bins is computed from
+        the samples, using the same methods as
+        PlotHistogram.bins.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._y_bins_spec
+
+    @y_bins.setter
+    def y_bins(self, int value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value == 0 or value < implot.ImPlotBin_Scott:
+            raise ValueError("Invalid number of bins")
+        if value != self._y_bins_spec:
+            self._dirty = True
+        self._y_bins_spec = value
+
+    @property
+    def x_min_range(self):
+        """
+        Writable attribute: lower bound of the binned
+        range along X.
+
+        If all range bounds are 0 (default), the range
+        is the minimum and maximum of the samples.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._range[0]
+
+    @x_min_range.setter
+    def x_min_range(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value != self._range[0]:
+            self._dirty = True
+        self._range[0] = value
+
+    @property
+    def x_max_range(self):
+        """
+        Writable attribute: upper bound of the binned
+        range along X.
+
+        If all range bounds are 0 (default), the range
+        is the minimum and maximum of the samples.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._range[1]
+
+    @x_max_range.setter
+    def x_max_range(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value != self._range[1]:
+            self._dirty = True
+        self._range[1] = value
+
+    @property
+    def y_min_range(self):
+        """
+        Writable attribute: lower bound of the binned
+        range along Y.
+
+        If all range bounds are 0 (default), the range
+        is the minimum and maximum of the samples.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._range[2]
+
+    @y_min_range.setter
+    def y_min_range(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value != self._range[2]:
+            self._dirty = True
+        self._range[2] = value
+
+    @property
+    def y_max_range(self):
+        """
+        Writable attribute: upper bound of the binned
+        range along Y.
+
+        If all range bounds are 0 (default), the range
+        is the minimum and maximum of the samples.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._range[3]
+
+    @y_max_range.setter
+    def y_max_range(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value != self._range[3]:
+            self._dirty = True
+        self._range[3] = value
+
+    @property
+    def density(self):
+        """
+        Counts will be normalized, i.e. the PDF
+        will be visualized
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._flags & implot.ImPlotHistogramFlags_Density) != 0
+
+    @density.setter
+    def density(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._flags &= ~implot.ImPlotHistogramFlags_Density
+        if value:
+            self._flags |= implot.ImPlotHistogramFlags_Density
+        self.compute_heights()
+
+    @property
+    def no_outliers(self):
+        """
+        Exclude values outside the range from the
+        count used for normalizing
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._flags & implot.ImPlotHistogramFlags_NoOutliers) != 0
+
+    @no_outliers.setter
+    def no_outliers(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._flags &= ~implot.ImPlotHistogramFlags_NoOutliers
+        if value:
+            self._flags |= implot.ImPlotHistogramFlags_NoOutliers
+        self.compute_heights()
+
+    @property
+    def bin_counts(self):
+        """
+        Readonly attribute: number of samples in each bin,
+        as an array of shape (y_bins, x_bins). Row 0
+        corresponds to the highest Y values.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if self._dirty:
+            self.compute_bins()
+        return histogram_counts_to_array(self._counts)\
+            .reshape((self._y_bins, self._x_bins))
+
+    cdef void compute_bins(self) noexcept nogil:
+        cdef Py_ssize_t count = min(self._X.shape[0], self._Y.shape[0])
+        cdef const char* data_x = <const char*>cnp.PyArray_DATA(self._X)
+        cdef const char* data_y = <const char*>cnp.PyArray_DATA(self._Y)
+        cdef int type_x = array_type_code(self._X)
+        cdef int type_y = array_type_code(self._Y)
+        cdef double[4] stats_x
+        cdef double[4] stats_y
+        stats_x[0] = 0.
+        stats_x[1] = 1.
+        stats_x[3] = 0.
+        stats_y[0] = 0.
+        stats_y[1] = 1.
+        stats_y[3] = 0.
+        cdef bint auto_range = self._range[0] == 0. and self._range[1] == 0. and \
+                               self._range[2] == 0. and self._range[3] == 0.
+        if auto_range or self._x_bins_spec == implot.ImPlotBin_Scott:
+            DCGHistogramStats(data_x, type_x,
+                              cnp.PyArray_STRIDE(self._X, 0),
+                              count, stats_x)
+        if auto_range or self._y_bins_spec == implot.ImPlotBin_Scott:
+            DCGHistogramStats(data_y, type_y,
+                              cnp.PyArray_STRIDE(self._Y, 0),
+                              count, stats_y)
+        cdef int i
+        if auto_range:
+            self._bin_range[0] = stats_x[0]
+            self._bin_range[1] = stats_x[1]
+            self._bin_range[2] = stats_y[0]
+            self._bin_range[3] = stats_y[1]
+        else:
+            for i in range(4):
+                self._bin_range[i] = self._range[i]
+        self._range_degenerate = False
+        for i in range(0, 4, 2):
+            if not(self._bin_range[i] <= self._bin_range[i+1]): # No valid sample
+                self._bin_range[i] = 0.
+                self._bin_range[i+1] = 1.
+                self._range_degenerate = auto_range
+            elif self._bin_range[i] == self._bin_range[i+1]:
+                self._bin_range[i] -= 0.5
+                self._bin_range[i+1] += 0.5
+                self._range_degenerate = auto_range
+        self._x_bins = histogram_bin_count(self._x_bins_spec, count,
+                                           self._bin_range[1] - self._bin_range[0],
+                                           stats_x[3])
+        self._y_bins = histogram_bin_count(self._y_bins_spec, count,
+                                           self._bin_range[3] - self._bin_range[2],
+                                           stats_y[3])
+        self._counts.assign(<size_t>self._x_bins * self._y_bins, 0)
+        DCGHistogramBin(data_x, type_x,
+                        cnp.PyArray_STRIDE(self._X, 0),
+                        data_y, type_y,
+                        cnp.PyArray_STRIDE(self._Y, 0),
+                        count,
+                        self._bin_range[0], self._bin_range[1], self._x_bins,
+                        self._bin_range[2], self._bin_range[3], self._y_bins,
+                        self._counts.data())
+        self._num_samples = count
+        self._dirty = False
+        self.compute_heights()
+
+    cdef void compute_heights(self) noexcept nogil:
+        if self._dirty:
+            return
+        cdef int num_bins = <int>self._counts.size()
+        cdef double total = 0.
+        cdef int i
+        for i in range(num_bins):
+            total += <double>self._counts[i]
+        if (self._flags & implot.ImPlotHistogramFlags_NoOutliers) == 0:
+            total = self._num_samples
+        cdef double scale = 1.
+        if (self._flags & implot.ImPlotHistogramFlags_Density) != 0 and total > 0.:
+            scale = (<double>self._x_bins * <double>self._y_bins) / \
+                ((self._bin_range[1] - self._bin_range[0]) * \
+                 (self._bin_range[3] - self._bin_range[2]) * total)
+        self._heights.resize(num_bins)
+        self._max_height = 0.
+        for i in range(num_bins):
+            self._heights[i] = <double>self._counts[i] * scale
+            self._max_height = max(self._max_height, self._heights[i])
+
+    cdef void draw_element(self) noexcept nogil:
+        if self._dirty:
+            self.compute_bins()
+        if self._heights.empty() or self._num_samples == 0:
+            return
+        # Keep only the item flags
+        cdef int flags = self._flags & ~(implot.ImPlotHistogramFlags_Density | \
+                                         implot.ImPlotHistogramFlags_NoOutliers)
+        implot.PlotHeatmap[double](self._imgui_label.c_str(),
+                                   self._heights.data(),
+                                   self._y_bins,
+                                   self._x_bins,
+                                   0.,
+                                   self._max_height,
+                                   NULL,
+                                   implot.ImPlotPoint(self._bin_range[0], self._bin_range[2]),
+                                   implot.ImPlotPoint(self._bin_range[1], self._bin_range[3]),
+                                   flags)
+
+
+ctypedef fused heatmap_types:
+    uint8_t
+    uint16_t
+    float
+    double
+
+cdef void heatmap_minmax(const heatmap_types* data,
+                         bint col_major,
+                         int rows,
+                         int cols,
+                         int row_start,
+                         int row_end,
+                         double *vmin,
+                         double *vmax) noexcept nogil:
+    """Minimum and maximum of the rows, ignoring NaNs.
+    vmin > vmax if there are only NaNs."""
+    cdef double lo = INFINITY
+    cdef double hi = -INFINITY
+    cdef double v
+    cdef Py_ssize_t i, j, end
+    if not(col_major):
+        # The rows are contiguous
+        end = <Py_ssize_t>row_end * cols
+        for i in range(<Py_ssize_t>row_start * cols, end):
+            v = <double>data[i]
+            if v < lo:
+                lo = v
+            if v > hi:
+                hi = v
+    else:
+        for j in range(cols):
+            for i in range(<Py_ssize_t>j * rows + row_start,
+                           <Py_ssize_t>j * rows + row_end):
+                v = <double>data[i]
+                if v < lo:
+                    lo = v
+                if v > hi:
+                    hi = v
+    vmin[0] = lo
+    vmax[0] = hi
+
+cdef void heatmap_colorize(const heatmap_types* data,
+                           bint col_major,
+                           int rows,
+                           int cols,
+                           int row_start,
+                           int row_end,
+                           double scale_min,
+                           double scale_max,
+                           const unsigned int* lut,
+                           unsigned int* image) noexcept nogil:
+    cdef double scale = 0.
+    if scale_max != scale_min:
+        scale = 255. / (scale_max - scale_min)
+    cdef double v
+    cdef int i, j
+    cdef unsigned int* row
+    for i in range(row_start, row_end):
+        row = image + <size_t>i * cols
+        for j in range(cols):
+            if col_major:
+                v = <double>data[<size_t>j * rows + i]
+            else:
+                v = <double>data[<size_t>i * cols + j]
+            v = (v - scale_min) * scale
+            if v != v: # NaN
+                row[j] = 0
+            elif v <= 0.:
+                row[j] = lut[0]
+            elif v >= 255.:
+                row[j] = lut[255]
+            else:
+                row[j] = lut[<int>(v + 0.5)]
+
+cdef class PlotHeatmap(plotElementWithLegend):
+    """
+    Plots a 2D array of values as a colormapped heatmap.
+
+    The values are mapped through a colormap lookup table
+    into a RGBA texture, which is drawn as a single image
+    in plot coordinates. This scales to large grids, as
+    the cost of rendering does not depend on the number
+    of cells. The texture is only recomputed and uploaded
+    when the values, the scale or the colormap change, and
+    update_rows() only uploads the modified rows.
+
+    When label_format is set and the grid is small (at most
+    1024 cells), the heatmap is instead drawn cell per cell
+    with the value printed on each cell.
+    """
+    def __cinit__(self):
+        self._values = np.zeros(shape=(1, 1), dtype=np.float64)
+        self._col_major = False
+        self._scale_min = 0.
+        self._scale_max = 0.
+        self._actual_scale_min = 0.
+        self._actual_scale_max = 1.
+        self._bounds_min = [0., 0.]
+        self._bounds_max = [1., 1.]
+        self._colormap = -1
+        self._lut_colormap = -2
+        self._texture = Texture(self.context)
+        self._texture._hint_dynamic = True
+        self._texture._filtering_mode = 1 # nearest
+        self._dirty = True
+        self._dirty_row_min = 0
+        self._dirty_row_max = 0
+        self._values_minmax_valid = False
+
+    @property
+    def values(self):
+        """
+        Writable attribute: 2D array of shape (rows, cols).
+
+        Row 0 is displayed at the top of the heatmap.
+
+        By default, will try to use the passed array
+        directly for its internal backing (no copy).
+        Supported types for no copy are np.uint8, np.uint16,
+        np.float32 and np.float64, either C or Fortran
+        contiguous.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._values
+
+    @values.setter
+    def values(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef cnp.ndarray array = np.asarray(value)
+        if array.ndim != 2:
+            raise ValueError("values must be a 2D array")
+        if not(cnp.PyArray_TYPE(array) == cnp.NPY_UBYTE or \
+               cnp.PyArray_TYPE(array) == cnp.NPY_USHORT or \
+               cnp.PyArray_TYPE(array) == cnp.NPY_FLOAT or \
+               cnp.PyArray_TYPE(array) == cnp.NPY_DOUBLE):
+            array = np.asarray(array, dtype=np.float64)
+        if cnp.PyArray_IS_C_CONTIGUOUS(array):
+            self._col_major = False
+        elif cnp.PyArray_IS_F_CONTIGUOUS(array):
+            self._col_major = True
+        else:
+            array = np.ascontiguousarray(array)
+            self._col_major = False
+        self._values = array
+        self._values_minmax_valid = False
+        self._dirty = True
+
+    def update_rows(self, int start, rows):
+        """
+        Replace the rows of values starting at row start
+        with the content of rows (an array of shape (n, cols)).
+
+        Only the modified rows are recolored and uploaded
+        to the texture, which is much cheaper than
+        setting values when a few rows change (for instance
+        for a scrolling spectrogram).
+
+        The rows are written into the values array, which
+        is the array passed to values when it was used without
+        copy: update_rows then modifies the caller's array.
+
+        If the values array was modified in place, passing
+        the modified slice of values as rows is allowed,
+        and no copy occurs.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef cnp.ndarray array = np.asarray(rows)
+        if array.ndim == 1:
+            array = array.reshape([1, -1])
+        cdef int n = array.shape[0]
+        if start < 0 or start + n > self._values.shape[0]:
+            raise ValueError("Rows outside the values array")
+        if n == 0:
+            return
+        cdef cnp.ndarray target = self._values[start:start+n]
+        cdef double old_min, old_max, new_min, new_max
+        # A new slice object is returned by each indexing:
+        # compare the memory described by the arrays.
+        if cnp.PyArray_DATA(array) != cnp.PyArray_DATA(target) or \
+           array.dtype != target.dtype or \
+           (<object>array).shape != (<object>target).shape or \
+           (<object>array).strides != (<object>target).strides:
+            if self._values_minmax_valid:
+                # A rescan is needed only if the replaced
+                # rows may hold the current extremum
+                self.rows_minmax(start, start + n, &old_min, &old_max)
+                if old_min <= self._values_min or old_max >= self._values_max:
+                    self._values_minmax_valid = False
+            target[...] = array
+        else:
+            # Modified in place: the previous rows are unknown
+            self._values_minmax_valid = False
+        if self._values_minmax_valid:
+            self.rows_minmax(start, start + n, &new_min, &new_max)
+            self._values_min = min(self._values_min, new_min)
+            self._values_max = max(self._values_max, new_max)
+        if self._dirty_row_min == self._dirty_row_max:
+            self._dirty_row_min = start
+            self._dirty_row_max = start + n
+        else:
+            self._dirty_row_min = min(self._dirty_row_min, start)
+            self._dirty_row_max = max(self._dirty_row_max, start + n)
+
+    @property
+    def scale_min(self):
+        """
+        Writable attribute: value mapped to the bottom
+        of the colormap.
+
+        If scale_min and scale_max are both 0 (default),
+        the scale is computed from the minimum and maximum
+        of the values.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._scale_min
+
+    @scale_min.setter
+    def scale_min(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value != self._scale_min:
+            self._dirty = True
+        self._scale_min = value
+
+    @property
+    def scale_max(self):
+        """
+        Writable attribute: value mapped to the top
+        of the colormap.
+
+        If scale_min and scale_max are both 0 (default),
+        the scale is computed from the minimum and maximum
+        of the values.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._scale_max
+
+    @scale_max.setter
+    def scale_max(self, double value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value != self._scale_max:
+            self._dirty = True
+        self._scale_max = value
+
+    @property
+    def bounds_min(self):
+        """
+        Writable attribute: bottom-left corner of the
+        heatmap in plot coordinates. Default is (0, 0).
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return Coord.build(self._bounds_min)
+
+    @bounds_min.setter
+    def bounds_min(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        read_coord(self._bounds_min, value)
+
+    @property
+    def bounds_max(self):
+        """
+        Writable attribute: top-right corner of the
+        heatmap in plot coordinates. Default is (1, 1).
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return Coord.build(self._bounds_max)
+
+    @bounds_max.setter
+    def bounds_max(self, value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        read_coord(self._bounds_max, value)
+
+    @property
+    def colormap(self):
+        """
+        Writable attribute: index of the implot colormap
+        used to map the values to colors.
+
+        -1 (default) uses the colormap of the current theme.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._colormap
+
+    @colormap.setter
+    def colormap(self, int value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value < -1:
+            raise ValueError("Invalid colormap")
+        self._colormap = value
+
+    @property
+    def label_format(self):
+        """
+        Writable attribute: printf format used to display
+        the value of each cell, for instance "%.1f".
+
+        Labels are only displayed for small grids (at most
+        1024 cells), as they would not be readable for
+        larger ones. Default is "" (no labels).
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return str(self._label_format, encoding='utf-8')
+
+    @label_format.setter
+    def label_format(self, str value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._label_format = bytes(value, 'utf-8')
+
+    cdef void rows_minmax(self, int row_start, int row_end,
+                          double* vmin, double* vmax) noexcept nogil:
+        cdef int rows = self._values.shape[0]
+        cdef int cols = self._values.shape[1]
+        cdef const void* data = cnp.PyArray_DATA(self._values)
+        if cnp.PyArray_TYPE(self._values) == cnp.NPY_UBYTE:
+            heatmap_minmax(<const uint8_t*>data, self._col_major,
+                           rows, cols, row_start, row_end, vmin, vmax)
+        elif cnp.PyArray_TYPE(self._values) == cnp.NPY_USHORT:
+            heatmap_minmax(<const uint16_t*>data, self._col_major,
+                           rows, cols, row_start, row_end, vmin, vmax)
+        elif cnp.PyArray_TYPE(self._values) == cnp.NPY_FLOAT:
+            heatmap_minmax(<const float*>data, self._col_major,
+                           rows, cols, row_start, row_end, vmin, vmax)
+        else:
+            heatmap_minmax(<const double*>data, self._col_major,
+                           rows, cols, row_start, row_end, vmin, vmax)
+
+    cdef void update_scale(self) noexcept nogil:
+        if self._scale_min != 0. or self._scale_max != 0.:
+            self._actual_scale_min = self._scale_min
+            self._actual_scale_max = self._scale_max
+            return
+        # The minimum and maximum are kept up to date
+        # by update_rows, thus a full scan is only needed
+        # when values change or an extremum was replaced.
+        if not(self._values_minmax_valid):
+            self.rows_minmax(0, self._values.shape[0],
+                             &self._values_min, &self._values_max)
+            self._values_minmax_valid = True
+        if self._values_min > self._values_max:
+            # NaNs only
+            self._actual_scale_min = 0.
+            self._actual_scale_max = 1.
+        else:
+            self._actual_scale_min = self._values_min
+            self._actual_scale_max = self._values_max
+
+    cdef void colorize(self, int row_start, int row_end) noexcept nogil:
+        cdef int rows = self._values.shape[0]
+        cdef int cols = self._values.shape[1]
+        cdef const void* data = cnp.PyArray_DATA(self._values)
+        cdef unsigned int* image = <unsigned int*>cnp.PyArray_DATA(self._image)
+        if cnp.PyArray_TYPE(self._values) == cnp.NPY_UBYTE:
+            heatmap_colorize(<const uint8_t*>data, self._col_major,
+                             rows, cols, row_start, row_end,
+                             self._actual_scale_min, self._actual_scale_max,
+                             self._lut, image)
+        elif cnp.PyArray_TYPE(self._values) == cnp.NPY_USHORT:
+            heatmap_colorize(<const uint16_t*>data, self._col_major,
+                             rows, cols, row_start, row_end,
+                             self._actual_scale_min, self._actual_scale_max,
+                             self._lut, image)
+        elif cnp.PyArray_TYPE(self._values) == cnp.NPY_FLOAT:
+            heatmap_colorize(<const float*>data, self._col_major,
+                             rows, cols, row_start, row_end,
+                             self._actual_scale_min, self._actual_scale_max,
+                             self._lut, image)
+        else:
+            heatmap_colorize(<const double*>data, self._col_major,
+                             rows, cols, row_start, row_end,
+                             self._actual_scale_min, self._actual_scale_max,
+                             self._lut, image)
+
+    cdef void draw_cells(self, int rows, int cols) noexcept nogil:
+        cdef implot.ImPlotPoint bounds_min = implot.ImPlotPoint(self._bounds_min[0], self._bounds_min[1])
+        cdef implot.ImPlotPoint bounds_max = implot.ImPlotPoint(self._bounds_max[0], self._bounds_max[1])
+        cdef int flags = self._flags
+        if self._col_major:
+            flags |= implot.ImPlotHeatmapFlags_ColMajor
+        cdef const void* data = cnp.PyArray_DATA(self._values)
+        if cnp.PyArray_TYPE(self._values) == cnp.NPY_UBYTE:
+            implot.PlotHeatmap[uint8_t](self._imgui_label.c_str(),
+                                              <const uint8_t*>data,
+                                              rows, cols,
+                                              self._actual_scale_min,
+                                              self._actual_scale_max,
+                                              self._label_format.c_str(),
+                                              bounds_min, bounds_max, flags)
+        elif cnp.PyArray_TYPE(self._values) == cnp.NPY_USHORT:
+            implot.PlotHeatmap[uint16_t](self._imgui_label.c_str(),
+                                               <const uint16_t*>data,
+                                               rows, cols,
+                                               self._actual_scale_min,
+                                               self._actual_scale_max,
+                                               self._label_format.c_str(),
+                                               bounds_min, bounds_max, flags)
+        elif cnp.PyArray_TYPE(self._values) == cnp.NPY_FLOAT:
+            implot.PlotHeatmap[float](self._imgui_label.c_str(),
+                                      <const float*>data,
+                                      rows, cols,
+                                      self._actual_scale_min,
+                                      self._actual_scale_max,
+                                      self._label_format.c_str(),
+                                      bounds_min, bounds_max, flags)
+        else:
+            implot.PlotHeatmap[double](self._imgui_label.c_str(),
+                                       <const double*>data,
+                                       rows, cols,
+                                       self._actual_scale_min,
+                                       self._actual_scale_max,
+                                       self._label_format.c_str(),
+                                       bounds_min, bounds_max, flags)
+
+    cdef void draw_element(self) noexcept nogil:
+        cdef int rows = self._values.shape[0]
+        cdef int cols = self._values.shape[1]
+        if rows == 0 or cols == 0:
+            return
+
+        if self._colormap >= 0:
+            implot.PushColormap(self._colormap)
+        cdef int colormap = implot.GetStyle().Colormap
+
+        # Small grids with labels: one rectangle per cell
+        if not(self._label_format.empty()) and <Py_ssize_t>rows * cols <= 1024:
+            if self._dirty or self._dirty_row_min != self._dirty_row_max:
+                self.update_scale()
+                # The texture will need to be recomputed
+                # if we go back to texture mode
+                self._lut_colormap = -2
+                self._dirty = False
+                self._dirty_row_min = 0
+                self._dirty_row_max = 0
+            self.draw_cells(rows, cols)
+            if self._colormap >= 0:
+                implot.PopColormap(1)
+            return
+
+        cdef int i
+        cdef double prev_min, prev_max
+        cdef bint full_update = self._dirty or self._lut_colormap != colormap
+        if colormap != self._lut_colormap:
+            for i in range(256):
+                self._lut[i] = imgui.ColorConvertFloat4ToU32(
+                    implot.SampleColormap(<float>i / 255., colormap))
+            self._lut_colormap = colormap
+        if self._colormap >= 0:
+            implot.PopColormap(1)
+
+        if not(full_update) and self._dirty_row_min != self._dirty_row_max:
+            prev_min = self._actual_scale_min
+            prev_max = self._actual_scale_max
+            self.update_scale()
+            full_update = prev_min != self._actual_scale_min or \
+                          prev_max != self._actual_scale_max
+
+        if full_update:
+            self.update_scale()
+            with gil:
+                try:
+                    if self._image is None or \
+                       self._image.shape[0] != rows or \
+                       self._image.shape[1] != cols:
+                        self._image = np.empty((rows, cols, 4), dtype=np.uint8)
+                    self.colorize(0, rows)
+                    self._texture.set_content(self._image)
+                except Exception as e:
+                    print("An error occured while uploading the heatmap", traceback.format_exc())
+        elif self._dirty_row_min != self._dirty_row_max:
+            self.colorize(self._dirty_row_min, self._dirty_row_max)
+            with gil:
+                try:
+                    self._texture.set_content_region(
+                        self._image[self._dirty_row_min:self._dirty_row_max],
+                        0, self._dirty_row_min)
+                except Exception as e:
+                    print("An error occured while uploading the heatmap", traceback.format_exc())
+        self._dirty = False
+        self._dirty_row_min = 0
+        self._dirty_row_max = 0
+
+        cdef unique_lock[recursive_mutex] m2 = unique_lock[recursive_mutex](self._texture.mutex)
+        if self._texture.allocated_texture == NULL:
+            return
+        implot.PlotImage(self._imgui_label.c_str(),
+                         <imgui.ImTextureID>self._texture.allocated_texture,
+                         implot.ImPlotPoint(self._bounds_min[0], self._bounds_min[1]),
+                         implot.ImPlotPoint(self._bounds_max[0], self._bounds_max[1]),
+                         imgui.ImVec2(0., 0.),
+                         imgui.ImVec2(1., 1.),
+                         imgui.ImVec4(1., 1., 1., 1.),
+                         self._flags)
+
+
+cdef class PlotDigital(plotElementXY):
+    """
+    Plots a digital signal as a step function from X,Y data.
+    Digital plots are always referenced to the bottom of the plot,
+    do not respond to y axis zooming.
+    """
+
+    cdef void draw_element(self) noexcept nogil:
+        self.update_source()
+        cdef int size = min(self._X.shape[0], self._Y.shape[0])
+        if size == 0:
+            return
 
+        cdef DCGPlotData data
+        fill_plot_data(data, self._X, self._Y)
+        DCGPlotDigital(self._imgui_label.c_str(),
+                       data,
+                       array_type_code(self._X),
+                       array_type_code(self._Y),
+                       size,
+                       self._flags)
 
 cdef class PlotAnnotation(plotElement):
     """
@@ -17,6 +17,8 @@ cdef class DrawInvisibleButton(drawingItem):
     cdef double[2] _p1
     cdef double[2] _p2
     cdef Vec2 _initial_mouse_position
+    cdef void draw_button(self, void*, bint) noexcept nogil
+    cdef void draw_children_in_rect(self, void*, Vec2, Vec2) noexcept nogil
 
 cdef class DrawInWindow(uiItem):
     cdef bint draw_item(self) noexcept nogil
@@ -79,9 +81,8 @@ cdef class InputText(uiItem):
     cdef string _hint
     cdef bint _multiline
     cdef int _max_characters
-    cdef char* _buffer
-    cdef int _last_frame_update
     cdef int _flags # imgui.ImGuiInputTextFlags
+    cdef string _edit_buffer # edited text when on_enter is set
     cdef bint draw_item(self) noexcept nogil
 
 
@@ -102,11 +103,20 @@ cdef class Text(uiItem):
     cdef int _wrap
     cdef bint _bullet
     cdef bint _show_label
+    cdef void* _layout
     cdef bint draw_item(self) noexcept nogil
 
 cdef class TextValue(uiItem):
     cdef string _print_format
     cdef int _type
+    cdef void* _layout
+    cdef bint draw_item(self) noexcept nogil
+
+cdef class TextLog(uiItem):
+    cdef void* _store
+    cdef bint _auto_scroll
+    cdef bint _scroll_to_end
+    cdef void append_line(self, const char*, size_t, unsigned int, int) noexcept nogil
     cdef bint draw_item(self) noexcept nogil
 
 cdef class Selectable(uiItem):
@@ -25,7 +25,9 @@ from libc.math cimport INFINITY
 
 from .core cimport baseHandler, drawingItem, uiItem, \
     lock_gil_friendly, read_point, clear_obj_vector, append_obj_vector, \
-    draw_drawing_children, draw_menubar_children, \
+    draw_drawing_children, draw_drawing_children_cached, \
+    draw_menubar_children, \
+    create_text_layout, destroy_text_layout, layout_text, draw_text_layout, \
     draw_ui_children, button_area, \
     draw_tab_children, Callback, \
     Context, read_vec4, read_point, \
@@ -34,6 +36,7 @@ from .c_types cimport *
 from .imgui_types cimport unparse_color, parse_color, Vec2ImVec2, \
     Vec4ImVec4, ImVec2Vec2, ImVec4Vec4, ButtonDirection
 from .types cimport *
+from .core import _cached_property
 
 import numpy as np
 cimport numpy as cnp
@@ -405,11 +408,21 @@ cdef class DrawInvisibleButton(drawingItem):
 
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
+        self.draw_button(drawlist, True)
+
+    cdef void draw_button(self,
+                          void* drawlist,
+                          bint interactive) noexcept nogil:
+        """
+        Draw the children of the button, and if interactive
+        is set, update the states and run the handlers.
+        """
         cdef unique_lock[recursive_mutex] m = unique_lock[recursive_mutex](self.mutex)
         if not(self._show):
             return
 
-        self.set_previous_states()
+        if interactive:
+            self.set_previous_states()
 
         # Get button position in screen space
         cdef float[2] p1
@@ -450,6 +463,11 @@ cdef class DrawInvisibleButton(drawingItem):
         bottom_right.x = top_left.x + size.x * 0.5
         top_left.y = center.y - size.y * 0.5
         bottom_right.y = top_left.y + size.y
+        if not(interactive) and not(imgui.IsRectVisible(top_left, bottom_right)):
+            return
+        if not(interactive):
+            self.draw_children_in_rect(drawlist, ImVec2Vec2(top_left), ImVec2Vec2(size))
+            return
         # Update rect and position size
         self.state.cur.rect_size = ImVec2Vec2(size)
         self.state.cur.pos_to_viewport = ImVec2Vec2(top_left)
@@ -467,25 +485,7 @@ cdef class DrawInvisibleButton(drawingItem):
             return
 
         # Render children if any
-        cdef double[2] cur_scales = self.context.viewport.scales
-        cdef double[2] cur_shifts = self.context.viewport.shifts
-        cdef bint cur_in_plot = self.context.viewport.in_plot
-
-        # draw children
-        if self.last_drawings_child is not None:
-            self.context.viewport.shifts[0] = <double>top_left.x
-            self.context.viewport.shifts[1] = <double>top_left.y
-            self.context.viewport.scales = [<double>size.x, <double>size.y]
-            self.context.viewport.in_plot = False
-            # TODO: Unsure...
-            self.context.viewport.thickness_multiplier = 1.
-            self.context.viewport.size_multiplier = 1.
-            draw_drawing_children(self, drawlist)
-
-        # restore states
-        self.context.viewport.scales = cur_scales
-        self.context.viewport.shifts = cur_shifts
-        self.context.viewport.in_plot = cur_in_plot
+        self.draw_children_in_rect(drawlist, ImVec2Vec2(top_left), ImVec2Vec2(size))
 
         cdef bint mouse_down = False
         if (self._button & 1) != 0 and imgui.IsMouseDown(imgui.ImGuiMouseButton_Left):
@@ -558,6 +558,31 @@ cdef class DrawInvisibleButton(drawingItem):
 
         self.run_handlers()
 
+    cdef void draw_children_in_rect(self,
+                                    void* drawlist,
+                                    Vec2 top_left,
+                                    Vec2 size) noexcept nogil:
+        if self.last_drawings_child is None:
+            return
+        cdef double[2] cur_scales = self.context.viewport.scales
+        cdef double[2] cur_shifts = self.context.viewport.shifts
+        cdef bint cur_in_plot = self.context.viewport.in_plot
+
+        # draw children
+        self.context.viewport.shifts[0] = <double>top_left.x
+        self.context.viewport.shifts[1] = <double>top_left.y
+        self.context.viewport.scales = [<double>size.x, <double>size.y]
+        self.context.viewport.in_plot = False
+        # TODO: Unsure...
+        self.context.viewport.thickness_multiplier = 1.
+        self.context.viewport.size_multiplier = 1.
+        draw_drawing_children(self, drawlist)
+
+        # restore states
+        self.context.viewport.scales = cur_scales
+        self.context.viewport.shifts = cur_shifts
+        self.context.viewport.in_plot = cur_in_plot
+
 
 cdef class DrawInWindow(uiItem):
     """
@@ -597,6 +622,8 @@ cdef class DrawInWindow(uiItem):
         self.state.cap.can_be_active = True
         self.state.cap.has_rect_size = True
 
+    cached = _cached_property
+
     cdef bint draw_item(self) noexcept nogil:
         # negative width is used to indicate UI alignment
         cdef Vec2 requested_size = self.scaled_requested_size()
@@ -627,7 +654,10 @@ cdef class DrawInWindow(uiItem):
                                         starty + clip_height),
                            True)
 
-        draw_drawing_children(self, drawlist)
+        if self._draw_cache != NULL:
+            draw_drawing_children_cached(self, drawlist)
+        else:
+            draw_drawing_children(self, drawlist)
 
         imgui.PopClipRect()
 
@@ -1766,6 +1796,56 @@ cdef class RadioButton(uiItem):
         return changed
 
 
+cdef extern from * nogil:
+    """
+    #include <string>
+
+    struct DCGInputTextData {
+        std::string* str;
+        int max_characters;
+    };
+
+    static int DCGInputTextCallback(ImGuiInputTextCallbackData* data)
+    {
+        DCGInputTextData* user = (DCGInputTextData*)data->UserData;
+        if (data->EventFlag == ImGuiInputTextFlags_CallbackResize) {
+            // The text is edited in place in the string
+            user->str->resize(data->BufTextLen);
+            data->Buf = &(*user->str)[0];
+        } else if (data->EventFlag == ImGuiInputTextFlags_CallbackEdit &&
+                   user->max_characters > 0 && data->BufTextLen > user->max_characters) {
+            // Truncate to the limit, without splitting a utf-8 sequence
+            int end = user->max_characters;
+            while (end > 0 && (data->Buf[end] & 0xC0) == 0x80)
+                end--;
+            data->DeleteChars(end, data->BufTextLen - end);
+        }
+        return 0;
+    }
+
+    /* InputText, InputTextWithHint or InputTextMultiline editing
+       str directly, the string being resized as needed.
+       max_characters <= 0 means no limit. */
+    bool DCGInputText(const char* label, const char* hint, std::string* str,
+                      bool multiline, ImVec2 size, ImGuiInputTextFlags flags,
+                      int max_characters)
+    {
+        DCGInputTextData user = {str, max_characters};
+        flags |= ImGuiInputTextFlags_CallbackResize | ImGuiInputTextFlags_CallbackEdit;
+        char* buf = &(*str)[0];
+        size_t buf_size = str->capacity() + 1;
+        if (multiline)
+            return ImGui::InputTextMultiline(label, buf, buf_size, size, flags,
+                                             DCGInputTextCallback, &user);
+        if (hint != nullptr && hint[0] != 0)
+            return ImGui::InputTextWithHint(label, hint, buf, buf_size, flags,
+                                            DCGInputTextCallback, &user);
+        return ImGui::InputText(label, buf, buf_size, flags,
+                                DCGInputTextCallback, &user);
+    }
+    """
+    bint DCGInputText(const char*, const char*, string*, bint, imgui.ImVec2, int, int)
+
 cdef class InputText(uiItem):
     def __cinit__(self):
         self._theme_condition_category = ThemeCategories.t_inputtext
@@ -1780,19 +1860,6 @@ cdef class InputText(uiItem):
         self._multiline = False
         self._max_characters = 1024
         self._flags = imgui.ImGuiInputTextFlags_None
-        self._buffer = <char*>malloc(self._max_characters + 1)
-        if self._buffer == NULL:
-            raise MemoryError("Failed to allocate input buffer")
-        memset(<void*>self._buffer, 0, self._max_characters + 1)
-
-    def __dealloc__(self):
-        if self._buffer != NULL:
-            free(<void*>self._buffer)
-
-    def configure(self, **kwargs):
-        if 'max_characters' in kwargs:
-            self.max_characters = kwargs.pop('max_characters')
-        return super().configure(**kwargs)
 
     @property
     def hint(self):
@@ -1833,7 +1900,12 @@ cdef class InputText(uiItem):
     @property
     def max_characters(self):
         """
-        Writable attribute: Maximal number of characters that can be written
+        Writable attribute: Maximal number of bytes (utf-8)
+        that can be written. 0 for no limit.
+
+        The text is stored in a buffer that grows as needed,
+        thus large limits do not allocate memory upfront.
+        Text set through value is not truncated.
         """
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
@@ -1843,20 +1915,8 @@ cdef class InputText(uiItem):
     def max_characters(self, int value):
         cdef unique_lock[recursive_mutex] m
         lock_gil_friendly(m, self.mutex)
-        if value < 1:
-            raise ValueError("There must be at least space for one character")
-        if value == self._max_characters:
-            return
-        # Reallocate buffer
-        cdef char* new_buffer = <char*>malloc(value + 1)
-        if new_buffer == NULL:
-            raise MemoryError("Failed to allocate input buffer")
-        if self._buffer != NULL:
-            # Copy old content 
-            memcpy(<void*>new_buffer, <void*>self._buffer, min(value, self._max_characters))
-            new_buffer[value] = 0
-            free(<void*>self._buffer)
-        self._buffer = new_buffer
+        if value < 0:
+            raise ValueError("max_characters must be non-negative")
         self._max_characters = value
 
     @property
@@ -2120,50 +2180,37 @@ cdef class InputText(uiItem):
             self._flags |= imgui.ImGuiInputTextFlags_NoUndoRedo
 
     cdef bint draw_item(self) noexcept nogil:
-        cdef string current_value
-        cdef int size
         cdef imgui.ImGuiInputTextFlags flags = self._flags
-        
-        # Get current value from source if needed
-        SharedStr.get(<SharedStr>self._value, current_value)
-        cdef bint need_update = (<SharedStr>self._value)._last_frame_change >= self._last_frame_update 
-
-        if need_update:
-            size = min(current_value.size(), self._max_characters)
-            # Copy value to buffer
-            memcpy(self._buffer, current_value.data(), size)
-            self._buffer[size] = 0
-            self._last_frame_update = (<SharedStr>self._value)._last_frame_update
-
-        cdef bint changed = False
         if not(self._enabled):
             flags |= imgui.ImGuiInputTextFlags_ReadOnly
 
-        if self._multiline:
-            changed = imgui.InputTextMultiline(
-                self._imgui_label.c_str(),
-                self._buffer,
-                self._max_characters+1,
-                Vec2ImVec2(self.scaled_requested_size()),
-                flags)
-        elif self._hint.empty():
-            changed = imgui.InputText(
-                self._imgui_label.c_str(),
-                self._buffer,
-                self._max_characters+1,
-                flags)
-        else:
-            changed = imgui.InputTextWithHint(
-                self._imgui_label.c_str(),
-                self._hint.c_str(),
-                self._buffer,
-                self._max_characters+1,
-                flags)
+        # The text is edited in place in the storage of the
+        # shared value, rather than copied to and from a buffer.
+        # ImGui only copies the text when it is edited.
+        # With on_enter, the shared value must only change when
+        # Enter is pressed: the edit happens in a private buffer,
+        # which is refreshed from the value while not editing.
+        cdef unique_lock[recursive_mutex] value_m = unique_lock[recursive_mutex](self._value.mutex)
+        cdef bint on_enter = (flags & imgui.ImGuiInputTextFlags_EnterReturnsTrue) != 0
+        cdef string* edited = &(<SharedStr>self._value)._value
+        if on_enter:
+            if not(self.state.cur.active):
+                self._edit_buffer = (<SharedStr>self._value)._value
+            edited = &self._edit_buffer
+        cdef bint changed = DCGInputText(self._imgui_label.c_str(),
+                                         self._hint.c_str(),
+                                         edited,
+                                         self._multiline,
+                                         Vec2ImVec2(self.scaled_requested_size()),
+                                         flags,
+                                         self._max_characters)
+        if changed:
+            if on_enter:
+                (<SharedStr>self._value)._value = self._edit_buffer
+            self._value.on_update(True)
+        value_m.unlock()
 
         self.update_current_state()
-        if changed:
-            current_value.assign(<char*>self._buffer)
-            SharedStr.set(<SharedStr>self._value, current_value)
 
         if not(self._enabled):
             changed = False
@@ -2748,6 +2795,71 @@ cdef class InputValue(uiItem):
         return modified
 
 
+cdef extern from * nogil:
+    """
+    #include <cstdio>
+    #include <string>
+
+    /* Wrap width used by ImGui::TextUnformatted at the cursor
+       position. 0 if wrapping is disabled. */
+    float DCGTextWrapWidth()
+    {
+        ImGuiWindow* window = ImGui::GetCurrentWindow();
+        if (window->DC.TextWrapPos < 0.f)
+            return 0.f;
+        return ImGui::CalcWrapWidthForPos(window->DC.CursorPos, window->DC.TextWrapPos);
+    }
+
+    /* Item logic of ImGui::TextUnformatted for a text of the target
+       size. Returns false if the item is clipped, else sets the
+       position of the text. */
+    bool DCGTextItemAdd(ImVec2 size, ImVec2* pos)
+    {
+        ImGuiWindow* window = ImGui::GetCurrentWindow();
+        if (window->SkipItems)
+            return false;
+        const ImVec2 text_pos(window->DC.CursorPos.x,
+                              window->DC.CursorPos.y + window->DC.CurrLineTextBaseOffset);
+        ImRect bb(text_pos, text_pos + size);
+        ImGui::ItemSize(size, 0.0f);
+        if (!ImGui::ItemAdd(bb, 0))
+            return false;
+        *pos = text_pos;
+        return true;
+    }
+
+    /* snprintf into a std::string */
+    template <typename... Args>
+    void DCGFormatText(std::string& out, const char* fmt, Args... args)
+    {
+        int n = snprintf(nullptr, 0, fmt, args...);
+        if (n <= 0) {
+            out.clear();
+            return;
+        }
+        out.resize(n);
+        snprintf(&out[0], (size_t)n + 1, fmt, args...);
+    }
+    """
+    float DCGTextWrapWidth()
+    bint DCGTextItemAdd(imgui.ImVec2, imgui.ImVec2*)
+    void DCGFormatText(string&, const char*, int)
+    void DCGFormatText(string&, const char*, double)
+    void DCGFormatText(string&, const char*, int, int, int, int)
+    void DCGFormatText(string&, const char*, double, double, double, double)
+
+cdef inline void draw_text_item(void* layout, const string& text) noexcept nogil:
+    """
+    Same as imgui.TextUnformatted, but the layout of the
+    text is kept in layout (see layout_text) between frames.
+    """
+    cdef Vec2 size = layout_text(layout, text, 0., DCGTextWrapWidth(),
+                                 imgui.GetColorU32(<imgui.ImGuiCol>imgui.ImGuiCol_Text, 1.))
+    cdef imgui.ImVec2 pos
+    if DCGTextItemAdd(Vec2ImVec2(size), &pos):
+        draw_text_layout(layout, imgui.GetWindowDrawList(), pos.x, pos.y)
+
+
 cdef class Text(uiItem):
     def __cinit__(self):
         self._theme_condition_category = ThemeCategories.t_text
@@ -2756,12 +2868,17 @@ cdef class Text(uiItem):
         self._bullet = False
         self._show_label = False
         self._value = <SharedValue>(SharedStr.__new__(SharedStr, self.context))
+        self._layout = create_text_layout()
         self.state.cap.can_be_active = True # unsure
         self.state.cap.can_be_clicked = True
         self.state.cap.can_be_dragged = True
         self.state.cap.can_be_focused = True
         self.state.cap.can_be_hovered = True
 
+    def __dealloc__(self):
+        if self._layout != NULL:
+            destroy_text_layout(self._layout)
+
     @property
     def color(self):
         """
@@ -2868,7 +2985,7 @@ cdef class Text(uiItem):
         cdef string current_value
         SharedStr.get(<SharedStr>self._value, current_value)
 
-        imgui.TextUnformatted(current_value.c_str(), current_value.c_str()+current_value.size())
+        draw_text_item(self._layout, current_value)
 
         if self._wrap >= 0:
             imgui.PopTextWrapPos()
@@ -2904,6 +3021,7 @@ cdef class TextValue(uiItem):
         self._print_format = b"%.3f"
         self._value = <SharedValue>(SharedFloat.__new__(SharedFloat, self.context))
         self._type = 2
+        self._layout = create_text_layout()
         self.state.cap.can_be_active = False
         self.state.cap.can_be_clicked = True
         self.state.cap.can_be_dragged = True
@@ -2911,6 +3029,10 @@ cdef class TextValue(uiItem):
         self.state.cap.can_be_focused = False
         self.state.cap.can_be_hovered = True
 
+    def __dealloc__(self):
+        if self._layout != NULL:
+            destroy_text_layout(self._layout)
+
     @property
     def shareable_value(self):
         """
@@ -2997,47 +3119,419 @@ cdef class TextValue(uiItem):
         cdef float[4] value_float4
         cdef double[4] value_double4
         cdef float[:] value_vect
+        cdef string text
         cdef int i
         if self._type == 0:
             value_bool = SharedBool.get(<SharedBool>self._value)
-            imgui.Text(self._print_format.c_str(), value_bool)
+            DCGFormatText(text, self._print_format.c_str(), <int>value_bool)
         elif self._type == 1:
             value_int = SharedInt.get(<SharedInt>self._value)
-            imgui.Text(self._print_format.c_str(), value_int)
+            DCGFormatText(text, self._print_format.c_str(), value_int)
         elif self._type == 2:
             value_float = SharedFloat.get(<SharedFloat>self._value)
-            imgui.Text(self._print_format.c_str(), value_float)
+            DCGFormatText(text, self._print_format.c_str(), <double>value_float)
         elif self._type == 3:
             value_double = SharedDouble.get(<SharedDouble>self._value)
-            imgui.Text(self._print_format.c_str(), value_double)
+            DCGFormatText(text, self._print_format.c_str(), value_double)
         elif self._type == 4:
             value_color = SharedColor.getF4(<SharedColor>self._value)
-            imgui.Text(self._print_format.c_str(), 
-                       value_color.x, value_color.y, 
-                       value_color.z, value_color.w)
+            DCGFormatText(text, self._print_format.c_str(),
+                          <double>value_color.x, <double>value_color.y,
+                          <double>value_color.z, <double>value_color.w)
         elif self._type == 5:
             SharedInt4.get(<SharedInt4>self._value, value_int4)
-            imgui.Text(self._print_format.c_str(),
-                       value_int4[0], value_int4[1],
-                       value_int4[2], value_int4[3])
+            DCGFormatText(text, self._print_format.c_str(),
+                          value_int4[0], value_int4[1],
+                          value_int4[2], value_int4[3])
         elif self._type == 6:
             SharedFloat4.get(<SharedFloat4>self._value, value_float4)
-            imgui.Text(self._print_format.c_str(),
-                       value_float4[0], value_float4[1],
-                       value_float4[2], value_float4[3])
+            DCGFormatText(text, self._print_format.c_str(),
+                          <double>value_float4[0], <double>value_float4[1],
+                          <double>value_float4[2], <double>value_float4[3])
         elif self._type == 7:
             SharedDouble4.get(<SharedDouble4>self._value, value_double4)
-            imgui.Text(self._print_format.c_str(),
-                       value_double4[0], value_double4[1],
-                       value_double4[2], value_double4[3])
-        elif self._type == 8:
+            DCGFormatText(text, self._print_format.c_str(),
+                          value_double4[0], value_double4[1],
+                          value_double4[2], value_double4[3])
+        if self._type == 8:
             value_vect = SharedFloatVect.get(<SharedFloatVect>self._value)
             for i in range(value_vect.shape[0]):
                 imgui.Text(self._print_format.c_str(), value_vect[i])
+        else:
+            # The layout is only computed again when the formatted text changes
+            draw_text_item(self._layout, text)
 
         self.update_current_state()
         return False
 
+cdef extern from * nogil:
+    """
+    #include <cstdint>
+    #include <deque>
+    #include <mutex>
+    #include <string>
+    #include <vector>
+
+    /* Append-only storage of the lines of a TextLog. The lines are
+       grouped in chunks of fixed line count, such that any line is
+       found in constant time, and that appending never moves the
+       entries of the previous lines. */
+    struct DCGLogStore {
+        static const size_t lines_per_chunk = 4096;
+        struct Line { size_t offset, size; ImU32 color; int level; };
+        struct Chunk { std::string text; std::vector<Line> lines; };
+        std::mutex mutex;
+        std::deque<Chunk> chunks;
+        uint64_t first = 0; // index of the first line kept
+        uint64_t end = 0; // index after the last line
+        size_t max_lines = 0; // 0: no limit
+        bool filtered = false;
+        int min_level = 0;
+        std::deque<uint64_t> filtered_lines; // indices of the lines passing the filter
+    };
+
+    void* DCGLogStoreCreate()
+    {
+        return new DCGLogStore();
+    }
+
+    void DCGLogStoreDestroy(void* data)
+    {
+        delete (DCGLogStore*)data;
+    }
+
+    /* Removes the oldest chunks while enough lines remain */
+    static void DCGLogStoreTrim(DCGLogStore* s)
+    {
+        if (s->max_lines == 0)
+            return;
+        while (s->chunks.size() > 1 &&
+               s->end - s->first - s->chunks.front().lines.size() >= s->max_lines) {
+            s->first += s->chunks.front().lines.size();
+            s->chunks.pop_front();
+        }
+        while (!s->filtered_lines.empty() && s->filtered_lines.front() < s->first)
+            s->filtered_lines.pop_front();
+    }
+
+    static void DCGLogStorePush(DCGLogStore* s, const char* text, size_t size,
+                                ImU32 color, int level)
+    {
+        if (size > 0 && text[size - 1] == '\\r')
+            size--;
+        if (s->chunks.empty() || s->chunks.back().lines.size() == DCGLogStore::lines_per_chunk) {
+            s->chunks.emplace_back();
+            s->chunks.back().lines.reserve(DCGLogStore::lines_per_chunk);
+        }
+        DCGLogStore::Chunk& chunk = s->chunks.back();
+        chunk.lines.push_back({chunk.text.size(), size, color, level});
+        chunk.text.append(text, size);
+        if (s->filtered && level >= s->min_level)
+            s->filtered_lines.push_back(s->end);
+        s->end++;
+    }
+
+    /* Appends one line per line return in the text */
+    void DCGLogStoreAppend(void* data, const char* text, size_t size,
+                           ImU32 color, int level)
+    {
+        DCGLogStore* s = (DCGLogStore*)data;
+        std::lock_guard<std::mutex> lock(s->mutex);
+        const char* end = text + size;
+        while (true) {
+            const char* eol = (const char*)memchr(text, '\\n', end - text);
+            if (eol == nullptr) {
+                DCGLogStorePush(s, text, end - text, color, level);
+                break;
+            }
+            DCGLogStorePush(s, text, eol - text, color, level);
+            text = eol + 1;
+        }
+        DCGLogStoreTrim(s);
+    }
+
+    void DCGLogStoreClear(void* data)
+    {
+        DCGLogStore* s = (DCGLogStore*)data;
+        std::lock_guard<std::mutex> lock(s->mutex);
+        s->chunks.clear();
+        s->filtered_lines.clear();
+        s->first = 0;
+        s->end = 0;
+    }
+
+    size_t DCGLogStoreSize(void* data)
+    {
+        DCGLogStore* s = (DCGLogStore*)data;
+        std::lock_guard<std::mutex> lock(s->mutex);
+        return (size_t)(s->end - s->first);
+    }
+
+    size_t DCGLogStoreGetMaxLines(void* data)
+    {
+        DCGLogStore* s = (DCGLogStore*)data;
+        std::lock_guard<std::mutex> lock(s->mutex);
+        return s->max_lines;
+    }
+
+    void DCGLogStoreSetMaxLines(void* data, size_t max_lines)
+    {
+        DCGLogStore* s = (DCGLogStore*)data;
+        std::lock_guard<std::mutex> lock(s->mutex);
+        s->max_lines = max_lines;
+        DCGLogStoreTrim(s);
+    }
+
+    bool DCGLogStoreGetFilter(void* data, int* min_level)
+    {
+        DCGLogStore* s = (DCGLogStore*)data;
+        std::lock_guard<std::mutex> lock(s->mutex);
+        *min_level = s->min_level;
+        return s->filtered;
+    }
+
+    /* Only the lines of level >= min_level are displayed
+       when filtered is set. The index of the lines passing
+       the filter is built once, and extended by the appends. */
+    void DCGLogStoreSetFilter(void* data, bool filtered, int min_level)
+    {
+        DCGLogStore* s = (DCGLogStore*)data;
+        std::lock_guard<std::mutex> lock(s->mutex);
+        if (s->filtered == filtered && (!filtered || s->min_level == min_level))
+            return;
+        s->filtered = filtered;
+        s->min_level = min_level;
+        s->filtered_lines.clear();
+        if (!filtered)
+            return;
+        uint64_t index = s->first;
+        for (const DCGLogStore::Chunk& chunk : s->chunks) {
+            for (const DCGLogStore::Line& line : chunk.lines) {
+                if (line.level >= min_level)
+                    s->filtered_lines.push_back(index);
+                index++;
+            }
+        }
+    }
+
+    /* Draws the lines in the current window. Only the visible
+       lines are submitted, thanks to ImGuiListClipper. */
+    void DCGLogStoreDraw(void* data, bool scroll_to_end, bool auto_scroll)
+    {
+        DCGLogStore* s = (DCGLogStore*)data;
+        std::lock_guard<std::mutex> lock(s->mutex);
+        const bool at_end = ImGui::GetScrollY() >= ImGui::GetScrollMaxY();
+        const size_t count = s->filtered ? s->filtered_lines.size() : (size_t)(s->end - s->first);
+        ImGui::PushStyleVar(ImGuiStyleVar_ItemSpacing, ImVec2(0.f, 0.f));
+        ImGuiListClipper clipper;
+        clipper.Begin((int)count);
+        while (clipper.Step()) {
+            for (int i = clipper.DisplayStart; i < clipper.DisplayEnd; i++) {
+                uint64_t index = s->filtered ? s->filtered_lines[i] - s->first : (uint64_t)i;
+                const DCGLogStore::Chunk& chunk = s->chunks[index / DCGLogStore::lines_per_chunk];
+                const DCGLogStore::Line& line = chunk.lines[index % DCGLogStore::lines_per_chunk];
+                const char* text = chunk.text.data() + line.offset;
+                if (line.color != 0)
+                    ImGui::PushStyleColor(ImGuiCol_Text, line.color);
+                ImGui::TextUnformatted(text, text + line.size);
+                if (line.color != 0)
+                    ImGui::PopStyleColor();
+            }
+        }
+        clipper.End();
+        ImGui::PopStyleVar();
+        // The clipper has set the cursor at the end of the content
+        if (scroll_to_end || (auto_scroll && at_end))
+            ImGui::SetScrollHereY(1.0f);
+    }
+    """
+    void* DCGLogStoreCreate()
+    void DCGLogStoreDestroy(void*)
+    void DCGLogStoreAppend(void*, const char*, size_t, unsigned int, int)
+    void DCGLogStoreClear(void*)
+    size_t DCGLogStoreSize(void*)
+    size_t DCGLogStoreGetMaxLines(void*)
+    void DCGLogStoreSetMaxLines(void*, size_t)
+    bint DCGLogStoreGetFilter(void*, int*)
+    void DCGLogStoreSetFilter(void*, bint, int)
+    void DCGLogStoreDraw(void*, bint, bint)
+
+
+cdef class TextLog(uiItem):
+    """
+    A scrollable view of a large number of text lines,
+    for instance the output of a program.
+
+    The lines are kept in a native append-only storage,
+    and only the visible lines are rendered, such that
+    millions of lines can be held. Appending is thread-safe,
+    and does not wait for the rendering of the frame.
+    Each line can have a color and a level. The level
+    enables to filter the lines displayed (min_level).
+
+    The lines are not wrapped. Use max_lines to
+    bound the memory usage.
+    """
+    def __cinit__(self):
+        self._store = DCGLogStoreCreate()
+        self._auto_scroll = True
+        self._scroll_to_end = False
+        self._theme_condition_category = ThemeCategories.t_child
+        self.state.cap.can_be_clicked = True
+        self.state.cap.can_be_dragged = True
+        self.state.cap.can_be_focused = True
+        self.state.cap.can_be_hovered = True
+        self.state.cap.has_content_region = True
+
+    def __dealloc__(self):
+        if self._store != NULL:
+            DCGLogStoreDestroy(self._store)
+
+    @property
+    def num_lines(self):
+        """
+        Readonly attribute: number of lines held,
+        including the ones hidden by min_level
+        """
+        return DCGLogStoreSize(self._store)
+
+    @property
+    def max_lines(self):
+        """
+        Writable attribute: maximum number of lines to keep.
+        When exceeded, the oldest lines are removed
+        (by blocks of 4096 lines). 0 (default) for no limit.
+        """
+        return DCGLogStoreGetMaxLines(self._store)
+
+    @max_lines.setter
+    def max_lines(self, int value):
+        if value < 0:
+            raise ValueError("max_lines must be positive")
+        DCGLogStoreSetMaxLines(self._store, value)
+
+    @property
+    def min_level(self):
+        """
+        Writable attribute: only the lines of level
+        greater or equal to min_level are displayed.
+        None (default) displays all the lines.
+        """
+        cdef int min_level
+        if DCGLogStoreGetFilter(self._store, &min_level):
+            return min_level
+        return None
+
+    @min_level.setter
+    def min_level(self, value):
+        if value is None:
+            DCGLogStoreSetFilter(self._store, False, 0)
+        else:
+            DCGLogStoreSetFilter(self._store, True, int(value))
+
+    @property
+    def auto_scroll(self):
+        """
+        Writable attribute: if set (default), the view follows
+        the new lines when it is scrolled to the end.
+        """
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._auto_scroll
+
+    @auto_scroll.setter
+    def auto_scroll(self, bint value):
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._auto_scroll = value
+
+    def append(self, str text, color=0, int level=0):
+        """
+        Appends text. Every line return starts a new line.
+
+        color: color of the text. 0 (default) for the
+            color given by the theme.
+        level: level of the lines (see min_level).
+        """
+        cdef string data = bytes(text, 'utf-8')
+        cdef unsigned int line_color = parse_color(color)
+        with nogil:
+            self.append_line(data.c_str(), data.size(), line_color, level)
+
+    def append_lines(self, lines, colors=None, levels=None):
+        """
+        Appends a sequence of lines.
+
+        colors: None, or one color per element of lines.
+            0 for the color given by the theme.
+        levels: None, or one level per element of lines.
+
+        Elements containing line returns produce several
+        lines, sharing the same color and level.
+        """
+        cdef vector[string] data
+        cdef vector[unsigned int] line_colors
+        cdef vector[int] line_levels
+        for line in lines:
+            data.push_back(bytes(str(line), 'utf-8'))
+        if colors is not None:
+            for color in colors:
+                line_colors.push_back(parse_color(color))
+        else:
+            line_colors.resize(data.size())
+        if levels is not None:
+            for level in levels:
+                line_levels.push_back(level)
+        else:
+            line_levels.resize(data.size())
+        if line_colors.size() != data.size() or line_levels.size() != data.size():
+            raise ValueError("colors and levels must have one element per line")
+        cdef int i
+        with nogil:
+            for i in range(<int>data.size()):
+                self.append_line(data[i].c_str(), data[i].size(),
+                                 line_colors[i], line_levels[i])
+
+    cdef void append_line(self, const char* text, size_t size,
+                          unsigned int color, int level) noexcept nogil:
+        """
+        Appends text (of size bytes, utf-8) from native code.
+        Every line return starts a new line.
+        Does not need the gil nor the item mutex.
+        """
+        DCGLogStoreAppend(self._store, text, size, color, level)
+
+    def clear(self):
+        """Removes all the lines"""
+        DCGLogStoreClear(self._store)
+
+    def scroll_to_end(self):
+        """Scrolls to the last line the next time the item is rendered"""
+        cdef unique_lock[recursive_mutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._scroll_to_end = True
+
+    cdef bint draw_item(self) noexcept nogil:
+        cdef Vec2 requested_size = self.scaled_requested_size()
+        if imgui.BeginChild(self._imgui_label.c_str(),
+                            Vec2ImVec2(requested_size),
+                            imgui.ImGuiChildFlags_Borders,
+                            imgui.ImGuiWindowFlags_NoSavedSettings |
+                            imgui.ImGuiWindowFlags_HorizontalScrollbar):
+            self.state.cur.content_region_size = ImVec2Vec2(imgui.GetContentRegionAvail())
+            DCGLogStoreDraw(self._store, self._scroll_to_end, self._auto_scroll)
+            self._scroll_to_end = False
+            self.state.cur.rendered = True
+            self.state.cur.hovered = imgui.IsWindowHovered(imgui.ImGuiHoveredFlags_None)
+            self.state.cur.focused = imgui.IsWindowFocused(imgui.ImGuiFocusedFlags_None)
+            self.state.cur.rect_size = ImVec2Vec2(imgui.GetWindowSize())
+            update_current_mouse_states(self.state)
+        else:
+            self.set_hidden_no_handler_and_propagate_to_children_with_handlers()
+        imgui.EndChild()
+        return False
+
+
 cdef class Selectable(uiItem):
     def __cinit__(self):
         self._theme_condition_category = ThemeCategories.t_selectable